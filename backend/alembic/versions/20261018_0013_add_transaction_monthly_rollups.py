@@ -0,0 +1,75 @@
+"""add transaction monthly rollups
+
+Revision ID: 20261018_0013
+Revises: 20260311_0012
+Create Date: 2026-10-18 09:00:00
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "20261018_0013"
+down_revision = "20260311_0012"
+branch_labels = None
+depends_on = None
+
+
+def _is_sqlite() -> bool:
+    return op.get_context().dialect.name == "sqlite"
+
+
+def upgrade() -> None:
+    op.create_table(
+        "transaction_monthly_rollups",
+        sa.Column("user_id", sa.String(length=36), nullable=False),
+        sa.Column("month", sa.String(length=7), nullable=False),
+        sa.Column("category_id", sa.String(length=36), nullable=False),
+        sa.Column("income_source_key", sa.String(length=36), nullable=False),
+        sa.Column("income_total_cents", sa.BigInteger(), nullable=False),
+        sa.Column("expense_total_cents", sa.BigInteger(), nullable=False),
+        sa.Column("transaction_count", sa.Integer(), nullable=False),
+        sa.Column("impulse_count", sa.Integer(), nullable=False),
+        sa.Column("intentional_count", sa.Integer(), nullable=False),
+        sa.Column("untagged_count", sa.Integer(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(["category_id"], ["categories.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint(
+            "user_id",
+            "month",
+            "category_id",
+            "income_source_key",
+            name="pk_transaction_monthly_rollups",
+        ),
+    )
+
+    month_sql = "strftime('%Y-%m', date)" if _is_sqlite() else "to_char(date, 'YYYY-MM')"
+    op.execute(
+        f"""
+        INSERT INTO transaction_monthly_rollups (
+            user_id, month, category_id, income_source_key,
+            income_total_cents, expense_total_cents, transaction_count,
+            impulse_count, intentional_count, untagged_count, updated_at
+        )
+        SELECT
+            user_id,
+            {month_sql},
+            category_id,
+            COALESCE(income_source_id, ''),
+            COALESCE(SUM(CASE WHEN type = 'income' THEN amount_cents ELSE 0 END), 0),
+            COALESCE(SUM(CASE WHEN type = 'expense' THEN amount_cents ELSE 0 END), 0),
+            COUNT(id),
+            COALESCE(SUM(CASE WHEN is_impulse IS TRUE THEN 1 ELSE 0 END), 0),
+            COALESCE(SUM(CASE WHEN is_impulse IS FALSE THEN 1 ELSE 0 END), 0),
+            COALESCE(SUM(CASE WHEN is_impulse IS NULL THEN 1 ELSE 0 END), 0),
+            CURRENT_TIMESTAMP
+        FROM transactions
+        WHERE archived_at IS NULL
+        GROUP BY user_id, {month_sql}, category_id, COALESCE(income_source_id, '')
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("transaction_monthly_rollups")
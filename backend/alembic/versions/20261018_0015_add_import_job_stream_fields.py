@@ -0,0 +1,46 @@
+"""add import job source and progress fields
+
+Revision ID: 20261018_0015
+Revises: 20261018_0014
+Create Date: 2026-10-18 12:00:00
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "20261018_0015"
+down_revision = "20261018_0014"
+branch_labels = None
+depends_on = None
+
+
+def _is_sqlite() -> bool:
+    return op.get_context().dialect.name == "sqlite"
+
+
+def upgrade() -> None:
+    if _is_sqlite():
+        with op.batch_alter_table("import_jobs") as batch_op:
+            batch_op.add_column(
+                sa.Column("source", sa.String(length=16), nullable=False, server_default="payload")
+            )
+            batch_op.add_column(sa.Column("progress", sa.Text(), nullable=True))
+        return
+
+    op.add_column(
+        "import_jobs",
+        sa.Column("source", sa.String(length=16), nullable=False, server_default="payload"),
+    )
+    op.add_column("import_jobs", sa.Column("progress", sa.Text(), nullable=True))
+
+
+def downgrade() -> None:
+    if _is_sqlite():
+        with op.batch_alter_table("import_jobs") as batch_op:
+            batch_op.drop_column("progress")
+            batch_op.drop_column("source")
+        return
+
+    op.drop_column("import_jobs", "progress")
+    op.drop_column("import_jobs", "source")
@@ -0,0 +1,27 @@
+"""add transactions (user_id, updated_at, id) index for the change feed
+
+Revision ID: 20261018_0016
+Revises: 20261018_0015
+Create Date: 2026-10-18 14:00:00
+"""
+
+from alembic import op
+
+
+revision = "20261018_0016"
+down_revision = "20261018_0015"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "idx_transactions_user_updated_id",
+        "transactions",
+        ["user_id", "updated_at", "id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("idx_transactions_user_updated_id", table_name="transactions")
@@ -0,0 +1,35 @@
+"""add shared rate limit buckets table
+
+Revision ID: 20261018_0017
+Revises: 20261018_0016
+Create Date: 2026-10-18 15:00:00
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "20261018_0017"
+down_revision = "20261018_0016"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "rate_limit_buckets",
+        sa.Column("key", sa.String(length=64), nullable=False),
+        sa.Column("window_index", sa.BigInteger(), nullable=False),
+        sa.Column("window_seconds", sa.Integer(), nullable=False),
+        sa.Column("previous_count", sa.Integer(), nullable=False),
+        sa.Column("current_count", sa.Integer(), nullable=False),
+        sa.Column("lock_until", sa.Float(), nullable=True),
+        sa.Column("expires_at", sa.Float(), nullable=False),
+        sa.PrimaryKeyConstraint("key"),
+    )
+    op.create_index("idx_rate_limit_buckets_expires_at", "rate_limit_buckets", ["expires_at"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index("idx_rate_limit_buckets_expires_at", table_name="rate_limit_buckets")
+    op.drop_table("rate_limit_buckets")
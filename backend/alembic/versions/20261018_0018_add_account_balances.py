@@ -0,0 +1,50 @@
+"""add account balances
+
+Revision ID: 20261018_0018
+Revises: 20261018_0017
+Create Date: 2026-10-18 16:00:00
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "20261018_0018"
+down_revision = "20261018_0017"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "account_balances",
+        sa.Column("account_id", sa.String(length=36), nullable=False),
+        sa.Column("user_id", sa.String(length=36), nullable=False),
+        sa.Column("balance_cents", sa.BigInteger(), nullable=False),
+        sa.Column("transaction_count", sa.Integer(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(["account_id"], ["accounts.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("account_id"),
+    )
+    op.create_index("idx_account_balances_user", "account_balances", ["user_id"])
+
+    op.execute(
+        """
+        INSERT INTO account_balances (account_id, user_id, balance_cents, transaction_count, updated_at)
+        SELECT
+            account_id,
+            user_id,
+            COALESCE(SUM(CASE WHEN type = 'income' THEN amount_cents ELSE -amount_cents END), 0),
+            COUNT(id),
+            CURRENT_TIMESTAMP
+        FROM transactions
+        WHERE archived_at IS NULL
+        GROUP BY account_id, user_id
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("idx_account_balances_user", table_name="account_balances")
+    op.drop_table("account_balances")
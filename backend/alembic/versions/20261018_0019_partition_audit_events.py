@@ -0,0 +1,112 @@
+"""partition audit events by month and add the archive table
+
+Revision ID: 20261018_0019
+Revises: 20261018_0018
+Create Date: 2026-10-18 18:00:00
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "20261018_0019"
+down_revision = "20261018_0018"
+branch_labels = None
+depends_on = None
+
+# Monthly partitions are named audit_events_pYYYYMM; app.core.audit_archive creates
+# upcoming ones and drops compacted ones using the same scheme.
+_CREATE_PARTITIONS_SQL = """
+DO $$
+DECLARE
+    first_month date := date_trunc('month', COALESCE(
+        (SELECT MIN(created_at) FROM audit_events_unpartitioned), now()
+    ) AT TIME ZONE 'UTC')::date;
+    last_month date := (date_trunc('month', now() AT TIME ZONE 'UTC') + interval '3 months')::date;
+    month_start date;
+BEGIN
+    month_start := first_month;
+    WHILE month_start <= last_month LOOP
+        EXECUTE format(
+            'CREATE TABLE %I PARTITION OF audit_events FOR VALUES FROM (%L) TO (%L)',
+            'audit_events_p' || to_char(month_start, 'YYYYMM'),
+            month_start::text || ' 00:00:00+00',
+            (month_start + interval '1 month')::date::text || ' 00:00:00+00'
+        );
+        month_start := (month_start + interval '1 month')::date;
+    END LOOP;
+END $$;
+"""
+
+
+def _is_postgresql() -> bool:
+    return op.get_context().dialect.name == "postgresql"
+
+
+def _audit_columns() -> list[sa.Column]:
+    return [
+        sa.Column("id", sa.String(length=36), nullable=False),
+        sa.Column("request_id", sa.String(length=64), nullable=False),
+        sa.Column("user_id", sa.String(length=36), nullable=False),
+        sa.Column("resource_type", sa.String(length=40), nullable=False),
+        sa.Column("resource_id", sa.String(length=64), nullable=True),
+        sa.Column("action", sa.String(length=64), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+    ]
+
+
+def _rename_audit_table(source: str, target: str) -> None:
+    op.execute(f"ALTER TABLE {source} RENAME TO {target}")
+    op.execute(f"ALTER TABLE {target} RENAME CONSTRAINT {source}_pkey TO {target}_pkey")
+    op.execute(f"ALTER TABLE {target} RENAME CONSTRAINT {source}_user_id_fkey TO {target}_user_id_fkey")
+    op.execute(f"ALTER INDEX idx_{source}_user_created RENAME TO idx_{target}_user_created")
+
+
+def upgrade() -> None:
+    op.create_table(
+        "audit_events_archive",
+        *_audit_columns(),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "idx_audit_events_archive_user_created",
+        "audit_events_archive",
+        ["user_id", "created_at"],
+        unique=False,
+    )
+
+    if not _is_postgresql():
+        return
+
+    # The partition key has to be part of the primary key on a partitioned table.
+    _rename_audit_table("audit_events", "audit_events_unpartitioned")
+    op.create_table(
+        "audit_events",
+        *_audit_columns(),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id", "created_at"),
+        postgresql_partition_by="RANGE (created_at)",
+    )
+    op.create_index("idx_audit_events_user_created", "audit_events", ["user_id", "created_at"], unique=False)
+    op.execute(_CREATE_PARTITIONS_SQL)
+    op.execute("CREATE TABLE audit_events_default PARTITION OF audit_events DEFAULT")
+    op.execute("INSERT INTO audit_events SELECT * FROM audit_events_unpartitioned")
+    op.drop_table("audit_events_unpartitioned")
+
+
+def downgrade() -> None:
+    if _is_postgresql():
+        _rename_audit_table("audit_events", "audit_events_partitioned")
+        op.create_table(
+            "audit_events",
+            *_audit_columns(),
+            sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+            sa.PrimaryKeyConstraint("id"),
+        )
+        op.create_index("idx_audit_events_user_created", "audit_events", ["user_id", "created_at"], unique=False)
+        op.execute("INSERT INTO audit_events SELECT * FROM audit_events_partitioned")
+        op.drop_table("audit_events_partitioned")
+
+    op.drop_index("idx_audit_events_archive_user_created", table_name="audit_events_archive")
+    op.drop_table("audit_events_archive")
@@ -0,0 +1,26 @@
+"""add details to audit events
+
+Revision ID: 20261018_0020
+Revises: 20261018_0019
+Create Date: 2026-10-18 20:00:00
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "20261018_0020"
+down_revision = "20261018_0019"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # On PostgreSQL the column added to the partitioned parent reaches every partition.
+    op.add_column("audit_events", sa.Column("details", sa.JSON(), nullable=True))
+    op.add_column("audit_events_archive", sa.Column("details", sa.JSON(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("audit_events_archive", "details")
+    op.drop_column("audit_events", "details")
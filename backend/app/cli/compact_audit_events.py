@@ -0,0 +1,49 @@
+import sys
+from pathlib import Path
+
+from app.core.audit_archive import (
+    compact_audit_events,
+    count_compactable_events,
+    ensure_audit_partitions,
+    retention_cutoff,
+)
+from app.core.config import settings
+from app.db import SessionLocal
+
+
+def run(*, check_only: bool = False, log_fn=print) -> int:
+    cutoff = retention_cutoff()
+    with SessionLocal() as db:
+        if check_only:
+            pending = count_compactable_events(db, cutoff=cutoff)
+            log_fn(f"compact-audit-events status=checked cutoff={cutoff.date().isoformat()} pending={pending}")
+            return 0
+
+        partitions = ensure_audit_partitions(db)
+        result = compact_audit_events(
+            db,
+            cutoff=cutoff,
+            storage_dir=Path(settings.audit_cold_storage_dir),
+            codec=settings.audit_cold_storage_codec,
+            log_fn=log_fn,
+        )
+
+    log_fn(
+        "compact-audit-events status=done "
+        f"cutoff={cutoff.date().isoformat()} months={result.months} files={result.files} "
+        f"events={result.events} partitions_checked={partitions}"
+    )
+    return 0
+
+
+def main() -> int:
+    check_only = "--check" in sys.argv
+    try:
+        return run(check_only=check_only)
+    except Exception as exc:
+        print(f"compact-audit-events status=error detail={exc}", file=sys.stderr)
+        return 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
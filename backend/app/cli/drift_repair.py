@@ -0,0 +1,55 @@
+"""Shared skeleton for CLIs that check a maintained table for drift and rebuild it.
+
+``--check`` reports every drifted row and exits 1 when any were found;
+without it the table is rebuilt from the source rows in one transaction.
+``--user-id=<id>`` limits both to a single user.
+"""
+
+import sys
+from collections.abc import Callable
+from typing import Any
+
+from app.db import SessionLocal
+
+DriftItem = dict[str, Any]
+
+
+def parse_user_id(argv: list[str]) -> str | None:
+    for arg in argv:
+        if arg.startswith("--user-id="):
+            return arg.split("=", 1)[1] or None
+    return None
+
+
+def run_drift_repair(
+    name: str,
+    *,
+    find_drift: Callable[..., list[DriftItem]],
+    rebuild: Callable[..., int],
+    describe: Callable[[DriftItem], str],
+    check_only: bool = False,
+    user_id: str | None = None,
+    log_fn=print,
+) -> int:
+    with SessionLocal() as db:
+        drift = find_drift(db, user_id=user_id)
+        for item in drift:
+            log_fn(f"{name} drift {describe(item)}")
+        if check_only:
+            log_fn(f"{name} status=checked drift_count={len(drift)}")
+            return 1 if drift else 0
+
+        rows = rebuild(db, user_id=user_id)
+        db.commit()
+
+    log_fn(f"{name} status=done rows={rows} drift_count={len(drift)}")
+    return 0
+
+
+def drift_repair_main(name: str, run: Callable[..., int], argv: list[str] | None = None) -> int:
+    args = sys.argv[1:] if argv is None else argv
+    try:
+        return run(check_only="--check" in args, user_id=parse_user_id(args))
+    except Exception as exc:
+        print(f"{name} status=error detail={exc}", file=sys.stderr)
+        return 1
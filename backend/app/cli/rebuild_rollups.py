@@ -0,0 +1,31 @@
+from app.cli.drift_repair import DriftItem, drift_repair_main, run_drift_repair
+from app.transactions.rollups import find_rollup_drift, rebuild_rollups
+
+_NAME = "rebuild-rollups"
+
+
+def _describe(item: DriftItem) -> str:
+    return (
+        f"user={item['user_id']} month={item['month']} category={item['category_id']} "
+        f"income_source={item['income_source_id']} expected={item['expected']} stored={item['stored']}"
+    )
+
+
+def run(*, check_only: bool = False, user_id: str | None = None, log_fn=print) -> int:
+    return run_drift_repair(
+        _NAME,
+        find_drift=find_rollup_drift,
+        rebuild=rebuild_rollups,
+        describe=_describe,
+        check_only=check_only,
+        user_id=user_id,
+        log_fn=log_fn,
+    )
+
+
+def main() -> int:
+    return drift_repair_main(_NAME, run)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
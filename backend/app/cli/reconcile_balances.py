@@ -0,0 +1,32 @@
+from app.cli.drift_repair import DriftItem, drift_repair_main, run_drift_repair
+from app.transactions.balances import find_balance_drift, rebuild_balances
+
+_NAME = "reconcile-balances"
+
+
+def _describe(item: DriftItem) -> str:
+    return (
+        f"user={item['user_id']} account={item['account_id']} "
+        f"expected_cents={item['expected_cents']} stored_cents={item['stored_cents']} "
+        f"expected_count={item['expected_count']} stored_count={item['stored_count']}"
+    )
+
+
+def run(*, check_only: bool = False, user_id: str | None = None, log_fn=print) -> int:
+    return run_drift_repair(
+        _NAME,
+        find_drift=find_balance_drift,
+        rebuild=rebuild_balances,
+        describe=_describe,
+        check_only=check_only,
+        user_id=user_id,
+        log_fn=log_fn,
+    )
+
+
+def main() -> int:
+    return drift_repair_main(_NAME, run)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,19 +1,58 @@
+"""Audit event emission.
+
+``emit_audit_event`` and ``emit_audit_events`` build plain rows and hand them
+to the configured sink, so the request path never creates identity-mapped
+``AuditEvent`` objects:
+
+* ``direct`` (``InsertAuditSink``): one Core INSERT per call, in the caller's
+  transaction.
+* ``buffered`` (``BufferedAuditSink``): rows are held on the session and
+  written with a single INSERT when it commits. With
+  ``AUDIT_SAME_TRANSACTION`` (the default) that INSERT runs inside the
+  committing transaction, so events still commit or roll back with the change
+  they describe. Without it, rows are handed after commit to a
+  ``BackgroundAuditWriter`` that batches across requests on its own
+  one-connection ``audit`` pool; the write leaves the request path, but
+  events are lost if that insert fails or the process exits before it
+  drains.
+
+Rolled-back sessions discard their buffered rows in either mode.
+"""
+
+import logging
 import re
+import uuid
+from collections import deque
+from collections.abc import Callable, Iterable
 from datetime import datetime
+from threading import Event, Lock, Thread
+from typing import Any, Protocol
 
 from fastapi import Request
+from sqlalchemy import event, insert
 from sqlalchemy.orm import Session
 
+from app.core.config import settings
+from app.core.utils import utcnow
+from app.db import build_dedicated_session_factory
 from app.models import AuditEvent
-from app.repositories import SQLAlchemyAuditEventRepository
 
+_LOGGER = logging.getLogger("app.audit")
 _TOKEN_LIKE_RE = re.compile(r"(?i)(bearer\s+|^[A-Za-z0-9_-]+\.[A-Za-z0-9_-]+\.[A-Za-z0-9_-]+$)")
 _SECRET_MARKER_RE = re.compile(r"(?i)(token|password|secret|authorization)")
+_UUID_CHARS = frozenset("0123456789abcdefABCDEF-")
+_AUDIT_TABLE = AuditEvent.__table__
+_BUFFER_KEY = "audit_buffers"
+
+AuditRow = dict[str, Any]
 
 
 def _safe_resource_id(value: str | None) -> str | None:
     if value is None:
         return None
+    # Nearly every resource id is a canonical UUID, which can match neither pattern below.
+    if len(value) == 36 and _UUID_CHARS.issuperset(value):
+        return value
     trimmed = value.strip()
     if not trimmed:
         return None
@@ -24,6 +63,156 @@ def _safe_resource_id(value: str | None) -> str | None:
     return trimmed[:64]
 
 
+def _request_id_for(request: Request | None) -> str:
+    request_id = getattr(request.state, "request_id", "") if request is not None else ""
+    return (request_id or "unknown")[:64]
+
+
+def _insert_rows(db: Session, rows: list[AuditRow]) -> None:
+    # A Core table INSERT does not autoflush, so pending ORM changes still fail at the caller's commit.
+    db.execute(insert(_AUDIT_TABLE), rows)
+
+
+class AuditSink(Protocol):
+    def write(self, db: Session, rows: list[AuditRow]) -> None: ...
+
+
+class InsertAuditSink:
+    def write(self, db: Session, rows: list[AuditRow]) -> None:
+        _insert_rows(db, rows)
+
+
+class BackgroundAuditWriter:
+    """Insert rows submitted after commit from a daemon thread, up to ``batch_size`` per statement."""
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        *,
+        batch_size: int,
+        flush_interval_seconds: float = 1.0,
+    ) -> None:
+        self._session_factory = session_factory
+        self._batch_size = max(1, batch_size)
+        self._flush_interval_seconds = flush_interval_seconds
+        self._pending: deque[AuditRow] = deque()
+        self._pending_lock = Lock()
+        self._write_lock = Lock()
+        self._wakeup = Event()
+        self._stopped = Event()
+        self._thread: Thread | None = None
+        self._thread_lock = Lock()
+
+    def submit(self, rows: list[AuditRow]) -> None:
+        with self._pending_lock:
+            self._pending.extend(rows)
+            full = len(self._pending) >= self._batch_size
+        self.start()
+        if full:
+            self._wakeup.set()
+
+    def pending_count(self) -> int:
+        with self._pending_lock:
+            return len(self._pending)
+
+    def flush(self) -> int:
+        """Write everything submitted so far; returns the number of rows written."""
+        written = 0
+        with self._write_lock:
+            while True:
+                with self._pending_lock:
+                    batch = [self._pending.popleft() for _ in range(min(self._batch_size, len(self._pending)))]
+                if not batch:
+                    return written
+                try:
+                    with self._session_factory() as db:
+                        _insert_rows(db, batch)
+                        db.commit()
+                    written += len(batch)
+                except Exception:
+                    _LOGGER.error("event=audit_async_write_failed dropped=%s", len(batch), exc_info=True)
+
+    def start(self) -> None:
+        with self._thread_lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stopped.clear()
+            self._thread = Thread(target=self._run, name="audit-writer", daemon=True)
+            self._thread.start()
+
+    def stop(self, *, timeout_seconds: float = 5.0) -> None:
+        self._stopped.set()
+        self._wakeup.set()
+        with self._thread_lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            thread.join(timeout=timeout_seconds)
+        self.flush()
+
+    def _run(self) -> None:
+        while not self._stopped.is_set():
+            self._wakeup.wait(self._flush_interval_seconds)
+            self._wakeup.clear()
+            self.flush()
+
+
+class BufferedAuditSink:
+    def __init__(self, *, writer: BackgroundAuditWriter | None = None) -> None:
+        self.writer = writer
+
+    def write(self, db: Session, rows: list[AuditRow]) -> None:
+        db.info.setdefault(_BUFFER_KEY, {}).setdefault(self, []).extend(rows)
+
+
+@event.listens_for(Session, "before_commit")
+def _flush_buffers_in_transaction(session: Session) -> None:
+    buffers: dict[BufferedAuditSink, list[AuditRow]] = session.info.get(_BUFFER_KEY, {})
+    for sink in [sink for sink in buffers if sink.writer is None]:
+        rows = buffers.pop(sink)
+        if rows:
+            _insert_rows(session, rows)
+
+
+@event.listens_for(Session, "after_commit")
+def _hand_off_buffers(session: Session) -> None:
+    for sink, rows in session.info.pop(_BUFFER_KEY, {}).items():
+        if rows and sink.writer is not None:
+            sink.writer.submit(rows)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_buffers(session: Session, _previous_transaction: object) -> None:
+    session.info.pop(_BUFFER_KEY, None)
+
+
+def build_audit_sink() -> AuditSink:
+    if settings.audit_sink_mode != "buffered":
+        return InsertAuditSink()
+    if settings.audit_same_transaction:
+        return BufferedAuditSink()
+    # The writer flushes one batch at a time, so a single connection of its own is enough and
+    # import jobs holding the jobs pool cannot delay or drop audit rows.
+    session_factory = build_dedicated_session_factory("audit", pool_size=1)
+    return BufferedAuditSink(
+        writer=BackgroundAuditWriter(session_factory, batch_size=settings.audit_async_batch_size)
+    )
+
+
+_SINK: AuditSink = build_audit_sink()
+
+
+def configure_audit_sink(sink: AuditSink) -> None:
+    global _SINK
+    _SINK = sink
+
+
+def shutdown_audit_sink(*, timeout_seconds: float = 5.0) -> None:
+    """Drain the background writer, if the configured sink has one."""
+    writer = getattr(_SINK, "writer", None)
+    if writer is not None:
+        writer.stop(timeout_seconds=timeout_seconds)
+
+
 def emit_audit_event(
     db: Session,
     *,
@@ -33,15 +222,51 @@ def emit_audit_event(
     resource_id: str | None,
     action: str,
     created_at: datetime | None = None,
+    details: dict[str, Any] | None = None,
 ) -> None:
-    request_id = getattr(request.state, "request_id", "") if request is not None else ""
-    event = AuditEvent(
-        request_id=(request_id or "unknown")[:64],
-        user_id=user_id,
-        resource_type=resource_type[:40],
-        resource_id=_safe_resource_id(resource_id),
-        action=action[:64],
+    _SINK.write(
+        db,
+        [
+            {
+                "id": str(uuid.uuid4()),
+                "request_id": _request_id_for(request),
+                "user_id": user_id,
+                "resource_type": resource_type[:40],
+                "resource_id": _safe_resource_id(resource_id),
+                "action": action[:64],
+                "created_at": created_at or utcnow(),
+                "details": details,
+            }
+        ],
     )
-    if created_at is not None:
-        event.created_at = created_at
-    SQLAlchemyAuditEventRepository(db).add(event)
+
+
+def emit_audit_events(
+    db: Session,
+    *,
+    request: Request | None,
+    user_id: str,
+    resource_type: str,
+    resource_ids: Iterable[str | None],
+    action: str,
+) -> None:
+    """Write one audit event per resource id through a single sink call."""
+    request_id = _request_id_for(request)
+    resource_type = resource_type[:40]
+    action = action[:64]
+    created_at = utcnow()
+    rows = [
+        {
+            "id": str(uuid.uuid4()),
+            "request_id": request_id,
+            "user_id": user_id,
+            "resource_type": resource_type,
+            "resource_id": _safe_resource_id(resource_id),
+            "action": action,
+            "created_at": created_at,
+            "details": None,
+        }
+        for resource_id in resource_ids
+    ]
+    if rows:
+        _SINK.write(db, rows)
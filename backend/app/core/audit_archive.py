@@ -0,0 +1,371 @@
+"""Audit retention: compaction of old events into compressed cold storage.
+
+Hot events live in ``audit_events``. On PostgreSQL that table is range
+partitioned by month (``audit_events_pYYYYMM`` plus a default partition), so a
+compacted month is removed by dropping its partition instead of deleting rows.
+Other databases have no partitions; there, compaction first moves everything
+past the horizon into ``audit_events_archive`` with one INSERT ... SELECT and
+DELETE, and exports from that table.
+
+Each user-month is written to
+``<AUDIT_COLD_STORAGE_DIR>/<user_id>/<YYYY-MM>.ndjson.zst`` (``.ndjson.gz``
+with the gzip codec) as one JSON object per line, newest first. A file is merged by id with
+any existing file for the same month and swapped in with ``os.replace``, and
+rows are only removed from the database once their file is in place, so an
+interrupted run can simply be repeated.
+
+``load_compacted_audit_events`` reads the archive table and the cold files
+back for ``GET /audit?include_compacted=true``. Cold files are decompressed as
+a stream and, being newest first, read only until a page's worth of rows past
+the cursor has been found.
+"""
+
+import gzip
+import io
+import itertools
+import json
+import os
+import re
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any
+
+from sqlalchemy import Table, and_, delete, func, insert, or_, select, text
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.utils import as_utc, utcnow
+from app.models import AuditEvent, AuditEventArchive
+
+_HOT_TABLE: Table = AuditEvent.__table__
+_ARCHIVE_TABLE: Table = AuditEventArchive.__table__
+_FIELDS = ("id", "request_id", "user_id", "resource_type", "resource_id", "action", "created_at", "details")
+_SUFFIXES = {"zstd": ".ndjson.zst", "gzip": ".ndjson.gz"}
+_COLD_FILE_RE = re.compile(r"^(\d{4})-(\d{2})\.ndjson\.(zst|gz)$")
+_PARTITION_PREMAKE_MONTHS = 3
+_EXPORT_YIELD_PER = 1000
+
+
+@dataclass(frozen=True)
+class ColdAuditEvent:
+    id: str
+    request_id: str
+    user_id: str
+    resource_type: str
+    resource_id: str | None
+    action: str
+    created_at: datetime
+    details: dict[str, Any] | None = None
+
+
+@dataclass(frozen=True)
+class CompactionResult:
+    months: int
+    files: int
+    events: int
+
+
+def _month_start(value: datetime) -> datetime:
+    return as_utc(value).replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def _next_month(month_start: datetime) -> datetime:
+    return (month_start + timedelta(days=32)).replace(day=1)
+
+
+def _is_postgresql(db: Session) -> bool:
+    return db.get_bind().dialect.name == "postgresql"
+
+
+def _partition_name(month_start: datetime) -> str:
+    return f"audit_events_p{month_start:%Y%m}"
+
+
+def retention_cutoff(now: datetime | None = None, *, retention_days: int | None = None) -> datetime:
+    """Start of the month holding ``now - AUDIT_RETENTION_DAYS``; only whole months before it are compacted."""
+    days = settings.audit_retention_days if retention_days is None else retention_days
+    return _month_start((now or utcnow()) - timedelta(days=days))
+
+
+def ensure_audit_partitions(db: Session, *, now: datetime | None = None) -> int:
+    """Create the current and next few monthly partitions on PostgreSQL; returns how many months were checked.
+
+    Rows for a month without a partition land in ``audit_events_default``, and
+    PostgreSQL refuses to create that month's partition while they are there,
+    so this should run well ahead of the month it creates.
+    """
+    if not _is_postgresql(db):
+        return 0
+    month = _month_start(now or utcnow())
+    for _ in range(_PARTITION_PREMAKE_MONTHS + 1):
+        end = _next_month(month)
+        _execute_partition_ddl(
+            db,
+            "CREATE TABLE IF NOT EXISTS %I PARTITION OF audit_events FOR VALUES FROM (%L) TO (%L)",
+            _partition_name(month),
+            month.isoformat(),
+            end.isoformat(),
+        )
+        month = end
+    db.commit()
+    return _PARTITION_PREMAKE_MONTHS + 1
+
+
+def _execute_partition_ddl(db: Session, template: str, *args: str) -> None:
+    """Run DDL built by PostgreSQL's ``format()``, so %I/%L quote exactly as the partitioning migration does."""
+    params = {f"arg{index}": value for index, value in enumerate(args)}
+    placeholders = "".join(f", :{name}" for name in params)
+    statement = db.scalar(text(f"SELECT format(:template{placeholders})"), {"template": template, **params})
+    db.connection().exec_driver_sql(statement)
+
+
+def count_compactable_events(db: Session, *, cutoff: datetime) -> int:
+    return sum(
+        db.scalar(select(func.count()).select_from(table).where(table.c.created_at < cutoff)) or 0
+        for table in (_HOT_TABLE, _ARCHIVE_TABLE)
+    )
+
+
+def compact_audit_events(
+    db: Session,
+    *,
+    cutoff: datetime,
+    storage_dir: Path,
+    codec: str,
+    log_fn: Callable[[str], Any] | None = None,
+) -> CompactionResult:
+    """Export every event older than ``cutoff`` to cold storage and remove it from the database, month by month."""
+    postgres = _is_postgresql(db)
+    if not postgres:
+        archived_columns = [_HOT_TABLE.c[field] for field in _FIELDS]
+        db.execute(
+            insert(_ARCHIVE_TABLE).from_select(
+                list(_FIELDS),
+                select(*archived_columns).where(_HOT_TABLE.c.created_at < cutoff),
+            )
+        )
+        db.execute(delete(_HOT_TABLE).where(_HOT_TABLE.c.created_at < cutoff))
+        db.commit()
+    source = _HOT_TABLE if postgres else _ARCHIVE_TABLE
+
+    months = files = events = 0
+    oldest = db.scalar(select(func.min(source.c.created_at)).where(source.c.created_at < cutoff))
+    month = _month_start(oldest) if oldest is not None else cutoff
+    while month < cutoff:
+        end = _next_month(month)
+        month_files, month_events = _export_month(db, source, month, end, storage_dir=storage_dir, codec=codec)
+        if postgres:
+            _execute_partition_ddl(db, "DROP TABLE IF EXISTS %I", _partition_name(month))
+        # Partitioned: only rows that fell into the default partition remain.
+        db.execute(delete(source).where(source.c.created_at >= month).where(source.c.created_at < end))
+        db.commit()
+        if month_events:
+            months += 1
+            files += month_files
+            events += month_events
+            if log_fn is not None:
+                log_fn(f"compact-audit-events month={month:%Y-%m} files={month_files} events={month_events}")
+        month = end
+    return CompactionResult(months=months, files=files, events=events)
+
+
+def _export_month(
+    db: Session,
+    source: Table,
+    month: datetime,
+    end: datetime,
+    *,
+    storage_dir: Path,
+    codec: str,
+) -> tuple[int, int]:
+    stmt = (
+        select(source)
+        .where(source.c.created_at >= month)
+        .where(source.c.created_at < end)
+        .order_by(source.c.user_id, source.c.created_at, source.c.id)
+        .execution_options(yield_per=_EXPORT_YIELD_PER)
+    )
+    files = events = 0
+    for user_id, rows in itertools.groupby(db.execute(stmt), key=lambda row: row.user_id):
+        records = [_encode_row(row) for row in rows]
+        _write_cold_file(storage_dir / user_id, month, records, codec=codec)
+        files += 1
+        events += len(records)
+    return files, events
+
+
+def _encode_row(row: Any) -> dict[str, Any]:
+    record = {field: getattr(row, field) for field in _FIELDS}
+    record["created_at"] = as_utc(record["created_at"]).isoformat()
+    return record
+
+
+def _zstandard():
+    try:
+        import zstandard
+    except ImportError as exc:
+        raise RuntimeError("zstandard is required for AUDIT_COLD_STORAGE_CODEC=zstd") from exc
+    return zstandard
+
+
+def _compress(data: bytes, codec: str) -> bytes:
+    if codec == "gzip":
+        return gzip.compress(data)
+    return _zstandard().ZstdCompressor().compress(data)
+
+
+def _iter_records(path: Path) -> Iterator[dict[str, Any]]:
+    """Stream-decompress ``path`` one JSON line at a time."""
+    with path.open("rb") as raw:
+        if path.name.endswith(".gz"):
+            binary = gzip.GzipFile(fileobj=raw)
+        else:
+            binary = _zstandard().ZstdDecompressor().stream_reader(raw)
+        with io.TextIOWrapper(binary, encoding="utf-8") as lines:
+            for line in lines:
+                if line.strip():
+                    yield json.loads(line)
+
+
+def _cold_files_by_month(directory: Path) -> dict[datetime, list[Path]]:
+    if not directory.is_dir():
+        return {}
+    files: dict[datetime, list[Path]] = {}
+    for path in directory.iterdir():
+        match = _COLD_FILE_RE.fullmatch(path.name)
+        if match is not None:
+            month = as_utc(datetime(int(match.group(1)), int(match.group(2)), 1))
+            files.setdefault(month, []).append(path)
+    return files
+
+
+def _read_records(paths: Iterable[Path]) -> list[dict[str, Any]]:
+    records: dict[str, dict[str, Any]] = {}
+    for path in paths:
+        for record in _iter_records(path):
+            records[record["id"]] = record
+    return list(records.values())
+
+
+def _write_cold_file(directory: Path, month: datetime, records: list[dict[str, Any]], *, codec: str) -> None:
+    directory.mkdir(parents=True, exist_ok=True)
+    existing = _cold_files_by_month(directory).get(month, [])
+    merged = {record["id"]: record for record in _read_records(existing)}
+    merged.update((record["id"], record) for record in records)
+    ordered = sorted(merged.values(), key=lambda record: (record["created_at"], record["id"]), reverse=True)
+    payload = "".join(json.dumps(record, separators=(",", ":")) + "\n" for record in ordered).encode("utf-8")
+
+    path = directory / f"{month:%Y-%m}{_SUFFIXES[codec]}"
+    tmp_path = path.with_name(f"{path.name}.tmp")
+    tmp_path.write_bytes(_compress(payload, codec))
+    os.replace(tmp_path, path)
+    for stale in existing:
+        if stale != path:
+            stale.unlink(missing_ok=True)
+
+
+def _sort_key(row: Any) -> tuple[datetime, str]:
+    return as_utc(row.created_at), row.id
+
+
+def _in_window(
+    key: tuple[datetime, str],
+    *,
+    from_: datetime | None,
+    to: datetime | None,
+    before: tuple[datetime, str] | None,
+) -> bool:
+    created_at, _ = key
+    if from_ is not None and created_at < from_:
+        return False
+    if to is not None and created_at > to:
+        return False
+    return before is None or key < before
+
+
+def _load_cold_events(
+    directory: Path,
+    *,
+    from_: datetime | None,
+    to: datetime | None,
+    before: tuple[datetime, str] | None,
+    limit: int,
+) -> list[ColdAuditEvent]:
+    upper = min((bound for bound in (to, before[0] if before else None) if bound is not None), default=None)
+    found: dict[str, ColdAuditEvent] = {}
+    for month, paths in sorted(_cold_files_by_month(directory).items(), reverse=True):
+        if upper is not None and month > upper:
+            continue
+        if from_ is not None and _next_month(month) <= from_:
+            break
+        for path in paths:
+            matched = 0
+            for record in _iter_records(path):
+                event = ColdAuditEvent(**{**record, "created_at": datetime.fromisoformat(record["created_at"])})
+                key = _sort_key(event)
+                if from_ is not None and key[0] < from_:
+                    break
+                if _in_window(key, from_=from_, to=to, before=before):
+                    found[event.id] = event
+                    matched += 1
+                    # Newest first: every later line sorts after the ones already taken.
+                    if matched >= limit:
+                        break
+        # Months do not overlap, so older files cannot displace what was already found.
+        if len(found) >= limit:
+            break
+    return sorted(found.values(), key=_sort_key, reverse=True)[:limit]
+
+
+def load_compacted_audit_events(
+    db: Session,
+    *,
+    user_id: str,
+    from_: datetime | None,
+    to: datetime | None,
+    before: tuple[datetime, str] | None,
+    limit: int,
+) -> list[Any]:
+    """Up to ``limit`` compacted events for ``user_id``, newest first, from the archive table and cold storage."""
+    from_ = as_utc(from_) if from_ is not None else None
+    to = as_utc(to) if to is not None else None
+    before = (as_utc(before[0]), before[1]) if before is not None else None
+
+    stmt = select(AuditEventArchive).where(AuditEventArchive.user_id == user_id)
+    if from_ is not None:
+        stmt = stmt.where(AuditEventArchive.created_at >= from_)
+    if to is not None:
+        stmt = stmt.where(AuditEventArchive.created_at <= to)
+    if before is not None:
+        created_at, event_id = before
+        stmt = stmt.where(
+            or_(
+                AuditEventArchive.created_at < created_at,
+                and_(AuditEventArchive.created_at == created_at, AuditEventArchive.id < event_id),
+            )
+        )
+    stmt = stmt.order_by(AuditEventArchive.created_at.desc(), AuditEventArchive.id.desc()).limit(limit)
+    archived = list(db.scalars(stmt))
+    cold = _load_cold_events(
+        Path(settings.audit_cold_storage_dir) / user_id,
+        from_=from_,
+        to=to,
+        before=before,
+        limit=limit,
+    )
+    return merge_audit_rows(archived, cold, limit=limit)
+
+
+def merge_audit_rows(*sources: Iterable[Any], limit: int) -> list[Any]:
+    """Combine event lists into one newest-first page, dropping ids that appear in more than one source."""
+    seen: set[str] = set()
+    merged: list[Any] = []
+    for row in sorted(itertools.chain(*sources), key=_sort_key, reverse=True):
+        if row.id not in seen:
+            seen.add(row.id)
+            merged.append(row)
+            if len(merged) == limit:
+                break
+    return merged
@@ -79,11 +79,14 @@ class Settings(BaseSettings):
     refresh_cookie_samesite: str | None = Field(default=None, alias="REFRESH_COOKIE_SAMESITE")
     refresh_cookie_domain: str | None = Field(default=None, alias="REFRESH_COOKIE_DOMAIN")
     transaction_import_max_items: int = Field(default=500, alias="TRANSACTION_IMPORT_MAX_ITEMS")
+    transaction_batch_max_operations: int = Field(default=500, alias="TRANSACTION_BATCH_MAX_OPERATIONS")
     auth_register_rate_limit_per_minute: int = Field(default=5, alias="AUTH_REGISTER_RATE_LIMIT_PER_MINUTE")
     auth_login_rate_limit_per_minute: int = Field(default=10, alias="AUTH_LOGIN_RATE_LIMIT_PER_MINUTE")
     auth_refresh_rate_limit_per_minute: int = Field(default=30, alias="AUTH_REFRESH_RATE_LIMIT_PER_MINUTE")
     transactions_import_rate_limit_per_minute: int = Field(default=20, alias="TRANSACTIONS_IMPORT_RATE_LIMIT_PER_MINUTE")
     transactions_export_rate_limit_per_minute: int = Field(default=30, alias="TRANSACTIONS_EXPORT_RATE_LIMIT_PER_MINUTE")
+    transactions_export_gzip_enabled: bool = Field(default=True, alias="TRANSACTIONS_EXPORT_GZIP_ENABLED")
+    transactions_export_yield_per: int = Field(default=1000, alias="TRANSACTIONS_EXPORT_YIELD_PER")
     transactions_import_async_per_user_limit: int = Field(default=3, alias="TRANSACTIONS_IMPORT_ASYNC_PER_USER_LIMIT")
     transactions_import_async_queue_limit: int = Field(default=1000, alias="TRANSACTIONS_IMPORT_ASYNC_QUEUE_LIMIT")
     transactions_import_async_worker_count: int = Field(default=2, alias="TRANSACTIONS_IMPORT_ASYNC_WORKER_COUNT")
@@ -99,10 +102,34 @@ class Settings(BaseSettings):
     transactions_import_async_shutdown_timeout_seconds: float = Field(
         default=5.0, alias="TRANSACTIONS_IMPORT_ASYNC_SHUTDOWN_TIMEOUT_SECONDS"
     )
+    transactions_import_async_backend: str = Field(default="memory", alias="TRANSACTIONS_IMPORT_ASYNC_BACKEND")
+    transactions_import_async_visibility_timeout_seconds: int = Field(
+        default=300, alias="TRANSACTIONS_IMPORT_ASYNC_VISIBILITY_TIMEOUT_SECONDS"
+    )
+    transactions_import_async_max_attempts: int = Field(default=3, alias="TRANSACTIONS_IMPORT_ASYNC_MAX_ATTEMPTS")
+    transactions_import_async_poll_interval_seconds: float = Field(
+        default=1.0, alias="TRANSACTIONS_IMPORT_ASYNC_POLL_INTERVAL_SECONDS"
+    )
+    transactions_import_async_chunk_size: int = Field(default=100, alias="TRANSACTIONS_IMPORT_ASYNC_CHUNK_SIZE")
+    transactions_import_events_max_seconds: int = Field(default=300, alias="TRANSACTIONS_IMPORT_EVENTS_MAX_SECONDS")
+    transactions_changes_settle_seconds: int = Field(default=10, alias="TRANSACTIONS_CHANGES_SETTLE_SECONDS")
     transactions_rate_limit_window_seconds: int = Field(default=60, alias="TRANSACTIONS_RATE_LIMIT_WINDOW_SECONDS")
     auth_rate_limit_window_seconds: int = Field(default=60, alias="AUTH_RATE_LIMIT_WINDOW_SECONDS")
     auth_rate_limit_lock_enabled: bool = Field(default=False, alias="AUTH_RATE_LIMIT_LOCK_ENABLED")
     auth_rate_limit_lock_seconds: int = Field(default=300, alias="AUTH_RATE_LIMIT_LOCK_SECONDS")
+    auth_user_cache_enabled: bool = Field(default=False, alias="AUTH_USER_CACHE_ENABLED")
+    auth_user_cache_ttl_seconds: int = Field(default=30, alias="AUTH_USER_CACHE_TTL_SECONDS")
+    auth_user_cache_max_entries: int = Field(default=10000, alias="AUTH_USER_CACHE_MAX_ENTRIES")
+    auth_token_cache_max_entries: int = Field(default=4096, alias="AUTH_TOKEN_CACHE_MAX_ENTRIES")
+    reference_cache_enabled: bool = Field(default=False, alias="REFERENCE_CACHE_ENABLED")
+    reference_cache_ttl_seconds: int = Field(default=30, alias="REFERENCE_CACHE_TTL_SECONDS")
+    reference_cache_max_entries: int = Field(default=10000, alias="REFERENCE_CACHE_MAX_ENTRIES")
+    audit_sink_mode: str = Field(default="direct", alias="AUDIT_SINK_MODE")
+    audit_same_transaction: bool = Field(default=True, alias="AUDIT_SAME_TRANSACTION")
+    audit_async_batch_size: int = Field(default=500, alias="AUDIT_ASYNC_BATCH_SIZE")
+    audit_retention_days: int = Field(default=365, alias="AUDIT_RETENTION_DAYS")
+    audit_cold_storage_dir: str = Field(default="var/audit-archive", alias="AUDIT_COLD_STORAGE_DIR")
+    audit_cold_storage_codec: str = Field(default="zstd", alias="AUDIT_COLD_STORAGE_CODEC")
     migrations_strict: bool | None = Field(default=None, alias="MIGRATIONS_STRICT")
     cors_origins: list[str] = Field(
         default_factory=lambda: list(_DEFAULT_CORS_ORIGINS),
@@ -112,6 +139,7 @@ class Settings(BaseSettings):
     auth_refresh_allowed_origins: list[str] | None = Field(default=None, alias="AUTH_REFRESH_ALLOWED_ORIGINS")
     auth_refresh_missing_origin_mode: str | None = Field(default=None, alias="AUTH_REFRESH_MISSING_ORIGIN_MODE")
     rate_limit_trusted_proxies: list[str] = Field(default_factory=list, alias="RATE_LIMIT_TRUSTED_PROXIES")
+    rate_limit_backend: str = Field(default="memory", alias="RATE_LIMIT_BACKEND")
     bootstrap_allow_prod: bool = Field(default=False, alias="BOOTSTRAP_ALLOW_PROD")
     bootstrap_create_demo_user: bool = Field(default=False, alias="BOOTSTRAP_CREATE_DEMO_USER")
     bootstrap_seed_minimal_data: bool = Field(default=True, alias="BOOTSTRAP_SEED_MINIMAL_DATA")
@@ -120,6 +148,16 @@ class Settings(BaseSettings):
     bootstrap_demo_currency_code: str = Field(default="USD", alias="BOOTSTRAP_DEMO_CURRENCY_CODE")
     db_pool_pre_ping: bool = Field(default=True, alias="DB_POOL_PRE_PING")
     db_pool_recycle_seconds: int = Field(default=240, alias="DB_POOL_RECYCLE_SECONDS")
+    db_pool_size: int = Field(default=5, alias="DB_POOL_SIZE")
+    db_max_overflow: int = Field(default=10, alias="DB_MAX_OVERFLOW")
+    db_pool_timeout_seconds: float = Field(default=30.0, alias="DB_POOL_TIMEOUT_SECONDS")
+    db_jobs_pool_size: int = Field(default=2, alias="DB_JOBS_POOL_SIZE")
+    db_jobs_max_overflow: int = Field(default=0, alias="DB_JOBS_MAX_OVERFLOW")
+    db_async_enabled: bool = Field(default=False, alias="DB_ASYNC_ENABLED")
+    metrics_enabled: bool = Field(default=False, alias="METRICS_ENABLED")
+    metrics_token: str = Field(default="", alias="METRICS_TOKEN")
+    metrics_multiproc_dir: str = Field(default="", alias="METRICS_MULTIPROC_DIR")
+    metrics_flush_interval_seconds: float = Field(default=5.0, alias="METRICS_FLUSH_INTERVAL_SECONDS")
     vapid_private_key: str = Field(default="", alias="VAPID_PRIVATE_KEY")
     vapid_public_key: str = Field(default="", alias="VAPID_PUBLIC_KEY")
     vapid_contact: str = Field(default="", alias="VAPID_CONTACT")
@@ -133,6 +171,12 @@ class Settings(BaseSettings):
         "bootstrap_create_demo_user",
         "bootstrap_seed_minimal_data",
         "db_pool_pre_ping",
+        "transactions_export_gzip_enabled",
+        "auth_user_cache_enabled",
+        "reference_cache_enabled",
+        "audit_same_transaction",
+        "db_async_enabled",
+        "metrics_enabled",
         mode="before",
     )
     @classmethod
@@ -145,6 +189,12 @@ class Settings(BaseSettings):
             "bootstrap_create_demo_user": False,
             "bootstrap_seed_minimal_data": True,
             "db_pool_pre_ping": True,
+            "transactions_export_gzip_enabled": True,
+            "auth_user_cache_enabled": False,
+            "reference_cache_enabled": False,
+            "audit_same_transaction": True,
+            "db_async_enabled": False,
+            "metrics_enabled": False,
         }
         return _parse_bool(value, defaults[info.field_name])
 
@@ -158,40 +208,68 @@ class Settings(BaseSettings):
 
     @field_validator(
         "transaction_import_max_items",
+        "transaction_batch_max_operations",
         "auth_register_rate_limit_per_minute",
         "auth_login_rate_limit_per_minute",
         "auth_refresh_rate_limit_per_minute",
         "transactions_import_rate_limit_per_minute",
         "transactions_export_rate_limit_per_minute",
+        "transactions_export_yield_per",
         "transactions_import_async_per_user_limit",
         "transactions_import_async_queue_limit",
         "transactions_import_async_worker_count",
         "transactions_import_async_terminal_ttl_seconds",
         "transactions_import_async_idempotency_ttl_seconds",
         "transactions_import_async_retained_terminal_cap",
+        "transactions_import_async_visibility_timeout_seconds",
+        "transactions_import_async_max_attempts",
+        "transactions_import_async_chunk_size",
+        "transactions_import_events_max_seconds",
         "transactions_rate_limit_window_seconds",
         "auth_rate_limit_window_seconds",
+        "auth_user_cache_ttl_seconds",
+        "auth_user_cache_max_entries",
+        "reference_cache_ttl_seconds",
+        "reference_cache_max_entries",
+        "audit_async_batch_size",
+        "audit_retention_days",
         "db_pool_recycle_seconds",
+        "db_pool_size",
+        "db_jobs_pool_size",
         mode="before",
     )
     @classmethod
     def _parse_positive_int_fields(cls, value: object, info: ValidationInfo) -> int:
         aliases = {
             "transaction_import_max_items": "TRANSACTION_IMPORT_MAX_ITEMS",
+            "transaction_batch_max_operations": "TRANSACTION_BATCH_MAX_OPERATIONS",
             "auth_register_rate_limit_per_minute": "AUTH_REGISTER_RATE_LIMIT_PER_MINUTE",
             "auth_login_rate_limit_per_minute": "AUTH_LOGIN_RATE_LIMIT_PER_MINUTE",
             "auth_refresh_rate_limit_per_minute": "AUTH_REFRESH_RATE_LIMIT_PER_MINUTE",
             "transactions_import_rate_limit_per_minute": "TRANSACTIONS_IMPORT_RATE_LIMIT_PER_MINUTE",
             "transactions_export_rate_limit_per_minute": "TRANSACTIONS_EXPORT_RATE_LIMIT_PER_MINUTE",
+            "transactions_export_yield_per": "TRANSACTIONS_EXPORT_YIELD_PER",
             "transactions_import_async_per_user_limit": "TRANSACTIONS_IMPORT_ASYNC_PER_USER_LIMIT",
             "transactions_import_async_queue_limit": "TRANSACTIONS_IMPORT_ASYNC_QUEUE_LIMIT",
             "transactions_import_async_worker_count": "TRANSACTIONS_IMPORT_ASYNC_WORKER_COUNT",
             "transactions_import_async_terminal_ttl_seconds": "TRANSACTIONS_IMPORT_ASYNC_TERMINAL_TTL_SECONDS",
             "transactions_import_async_idempotency_ttl_seconds": "TRANSACTIONS_IMPORT_ASYNC_IDEMPOTENCY_TTL_SECONDS",
             "transactions_import_async_retained_terminal_cap": "TRANSACTIONS_IMPORT_ASYNC_RETAINED_TERMINAL_CAP",
+            "transactions_import_async_visibility_timeout_seconds": "TRANSACTIONS_IMPORT_ASYNC_VISIBILITY_TIMEOUT_SECONDS",
+            "transactions_import_async_max_attempts": "TRANSACTIONS_IMPORT_ASYNC_MAX_ATTEMPTS",
+            "transactions_import_async_chunk_size": "TRANSACTIONS_IMPORT_ASYNC_CHUNK_SIZE",
+            "transactions_import_events_max_seconds": "TRANSACTIONS_IMPORT_EVENTS_MAX_SECONDS",
             "transactions_rate_limit_window_seconds": "TRANSACTIONS_RATE_LIMIT_WINDOW_SECONDS",
             "auth_rate_limit_window_seconds": "AUTH_RATE_LIMIT_WINDOW_SECONDS",
+            "auth_user_cache_ttl_seconds": "AUTH_USER_CACHE_TTL_SECONDS",
+            "auth_user_cache_max_entries": "AUTH_USER_CACHE_MAX_ENTRIES",
+            "reference_cache_ttl_seconds": "REFERENCE_CACHE_TTL_SECONDS",
+            "reference_cache_max_entries": "REFERENCE_CACHE_MAX_ENTRIES",
+            "audit_async_batch_size": "AUDIT_ASYNC_BATCH_SIZE",
+            "audit_retention_days": "AUDIT_RETENTION_DAYS",
             "db_pool_recycle_seconds": "DB_POOL_RECYCLE_SECONDS",
+            "db_pool_size": "DB_POOL_SIZE",
+            "db_jobs_pool_size": "DB_JOBS_POOL_SIZE",
         }
         return _parse_positive_int(value, aliases[info.field_name], minimum=1)
 
@@ -200,16 +278,52 @@ class Settings(BaseSettings):
     def _parse_auth_rate_limit_lock_seconds(cls, value: object) -> int:
         return _parse_positive_int(value, "AUTH_RATE_LIMIT_LOCK_SECONDS", minimum=0)
 
+    @field_validator("db_max_overflow", "db_jobs_max_overflow", mode="before")
+    @classmethod
+    def _parse_pool_overflow(cls, value: object, info: ValidationInfo) -> int:
+        aliases = {"db_max_overflow": "DB_MAX_OVERFLOW", "db_jobs_max_overflow": "DB_JOBS_MAX_OVERFLOW"}
+        return _parse_positive_int(value, aliases[info.field_name], minimum=0)
+
+    @field_validator("db_pool_timeout_seconds", mode="before")
+    @classmethod
+    def _parse_pool_timeout(cls, value: object) -> float:
+        return _parse_positive_float(value, "DB_POOL_TIMEOUT_SECONDS")
+
+    @field_validator("metrics_multiproc_dir", mode="before")
+    @classmethod
+    def _parse_metrics_multiproc_dir(cls, value: object) -> str:
+        return str(value or "").strip()
+
+    @field_validator("metrics_flush_interval_seconds", mode="before")
+    @classmethod
+    def _parse_metrics_flush_interval(cls, value: object) -> float:
+        return _parse_positive_float(value, "METRICS_FLUSH_INTERVAL_SECONDS")
+
+    @field_validator("auth_token_cache_max_entries", mode="before")
+    @classmethod
+    def _parse_auth_token_cache_max_entries(cls, value: object) -> int:
+        return _parse_positive_int(value, "AUTH_TOKEN_CACHE_MAX_ENTRIES", minimum=0)
+
     @field_validator("refresh_grace_period_seconds", mode="before")
     @classmethod
     def _parse_refresh_grace_period(cls, value: object) -> int:
         return _parse_bounded_int(value, "REFRESH_GRACE_PERIOD_SECONDS", minimum=0, maximum=120)
 
+    @field_validator("transactions_changes_settle_seconds", mode="before")
+    @classmethod
+    def _parse_changes_settle_seconds(cls, value: object) -> int:
+        return _parse_bounded_int(value, "TRANSACTIONS_CHANGES_SETTLE_SECONDS", minimum=0, maximum=300)
+
     @field_validator("transactions_import_async_shutdown_timeout_seconds", mode="before")
     @classmethod
     def _parse_import_shutdown_timeout(cls, value: object) -> float:
         return _parse_positive_float(value, "TRANSACTIONS_IMPORT_ASYNC_SHUTDOWN_TIMEOUT_SECONDS")
 
+    @field_validator("transactions_import_async_poll_interval_seconds", mode="before")
+    @classmethod
+    def _parse_import_poll_interval(cls, value: object) -> float:
+        return _parse_positive_float(value, "TRANSACTIONS_IMPORT_ASYNC_POLL_INTERVAL_SECONDS")
+
     @field_validator("access_token_expires_in", mode="before")
     @classmethod
     def _parse_access_token_ttl(cls, value: object) -> int:
@@ -301,6 +415,7 @@ class Settings(BaseSettings):
         self.vapid_public_key = self.vapid_public_key.strip()
         self.vapid_contact = self.vapid_contact.strip()
         self.push_test_token = self.push_test_token.strip()
+        self.metrics_token = self.metrics_token.strip()
 
         log_level_raw = self.log_level.strip().upper()
         allowed_log_levels = {"DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"}
@@ -308,6 +423,25 @@ class Settings(BaseSettings):
             raise ValueError("LOG_LEVEL must be one of DEBUG, INFO, WARNING, ERROR, CRITICAL")
         self.log_level = log_level_raw
 
+        self.transactions_import_async_backend = self.transactions_import_async_backend.strip().lower() or "memory"
+        if self.transactions_import_async_backend not in {"memory", "sql"}:
+            raise ValueError("TRANSACTIONS_IMPORT_ASYNC_BACKEND must be one of memory, sql")
+
+        self.audit_sink_mode = self.audit_sink_mode.strip().lower() or "direct"
+        if self.audit_sink_mode not in {"direct", "buffered"}:
+            raise ValueError("AUDIT_SINK_MODE must be one of direct, buffered")
+
+        self.audit_cold_storage_codec = self.audit_cold_storage_codec.strip().lower() or "zstd"
+        if self.audit_cold_storage_codec not in {"zstd", "gzip"}:
+            raise ValueError("AUDIT_COLD_STORAGE_CODEC must be one of zstd, gzip")
+        self.audit_cold_storage_dir = self.audit_cold_storage_dir.strip()
+        if not self.audit_cold_storage_dir:
+            raise ValueError("AUDIT_COLD_STORAGE_DIR must not be empty")
+
+        self.rate_limit_backend = self.rate_limit_backend.strip().lower() or "memory"
+        if self.rate_limit_backend not in {"memory", "striped", "sql"}:
+            raise ValueError("RATE_LIMIT_BACKEND must be one of memory, striped, sql")
+
         if self.refresh_cookie_samesite == "none" and not self.refresh_cookie_secure:
             raise ValueError("REFRESH_COOKIE_SECURE must be true when REFRESH_COOKIE_SAMESITE is 'none'")
 
@@ -348,15 +482,45 @@ class Settings(BaseSettings):
             "auth_refresh_allowed_origins_count": len(self.auth_refresh_allowed_origins),
             "auth_refresh_missing_origin_mode": self.auth_refresh_missing_origin_mode,
             "rate_limit_trusted_proxies_count": len(self.rate_limit_trusted_proxies),
+            "rate_limit_backend": self.rate_limit_backend,
             "bootstrap_allow_prod": self.bootstrap_allow_prod,
             "bootstrap_create_demo_user": self.bootstrap_create_demo_user,
             "bootstrap_seed_minimal_data": self.bootstrap_seed_minimal_data,
             "db_pool_pre_ping": self.db_pool_pre_ping,
             "db_pool_recycle_seconds": self.db_pool_recycle_seconds,
+            "db_pool_size": self.db_pool_size,
+            "db_max_overflow": self.db_max_overflow,
+            "db_pool_timeout_seconds": self.db_pool_timeout_seconds,
+            "db_jobs_pool_size": self.db_jobs_pool_size,
+            "db_jobs_max_overflow": self.db_jobs_max_overflow,
+            "db_async_enabled": self.db_async_enabled,
+            "metrics_enabled": self.metrics_enabled,
+            "metrics_token_configured": bool(self.metrics_token),
+            "metrics_multiproc_enabled": bool(self.metrics_multiproc_dir),
+            "metrics_flush_interval_seconds": self.metrics_flush_interval_seconds,
             "transactions_import_async_terminal_ttl_seconds": self.transactions_import_async_terminal_ttl_seconds,
             "transactions_import_async_idempotency_ttl_seconds": self.transactions_import_async_idempotency_ttl_seconds,
             "transactions_import_async_retained_terminal_cap": self.transactions_import_async_retained_terminal_cap,
             "transactions_import_async_shutdown_timeout_seconds": self.transactions_import_async_shutdown_timeout_seconds,
+            "transactions_import_async_backend": self.transactions_import_async_backend,
+            "transactions_import_async_visibility_timeout_seconds": self.transactions_import_async_visibility_timeout_seconds,
+            "transactions_import_async_max_attempts": self.transactions_import_async_max_attempts,
+            "transactions_import_async_chunk_size": self.transactions_import_async_chunk_size,
+            "transactions_import_events_max_seconds": self.transactions_import_events_max_seconds,
+            "transactions_changes_settle_seconds": self.transactions_changes_settle_seconds,
+            "transaction_batch_max_operations": self.transaction_batch_max_operations,
+            "transactions_export_gzip_enabled": self.transactions_export_gzip_enabled,
+            "auth_user_cache_enabled": self.auth_user_cache_enabled,
+            "auth_user_cache_ttl_seconds": self.auth_user_cache_ttl_seconds,
+            "auth_token_cache_max_entries": self.auth_token_cache_max_entries,
+            "reference_cache_enabled": self.reference_cache_enabled,
+            "reference_cache_ttl_seconds": self.reference_cache_ttl_seconds,
+            "audit_sink_mode": self.audit_sink_mode,
+            "audit_same_transaction": self.audit_same_transaction,
+            "audit_async_batch_size": self.audit_async_batch_size,
+            "audit_retention_days": self.audit_retention_days,
+            "audit_cold_storage_codec": self.audit_cold_storage_codec,
+            "transactions_export_yield_per": self.transactions_export_yield_per,
             "vapid_configured": bool(self.vapid_private_key and self.vapid_public_key and self.vapid_contact),
             "push_test_token_configured": bool(self.push_test_token),
         }
@@ -2,6 +2,8 @@ VENDOR_JSON = "application/vnd.bebudget.v1+json"
 SUPPORTED_VENDOR_MEDIA_TYPES = {VENDOR_JSON}
 PROBLEM_JSON = "application/problem+json"
 CSV_TEXT = "text/csv"
+NDJSON = "application/x-ndjson"
+EVENT_STREAM = "text/event-stream"
 API_PREFIX = "/api"
 BODY_METHODS = {"POST", "PATCH", "PUT"}
 
@@ -0,0 +1,450 @@
+"""In-process metrics registry rendered in the Prometheus text format.
+
+Counters, gauges and histograms are plain dicts guarded by one lock, so
+recording a sample is a dict update. Collectors are callbacks evaluated at
+render time for values that already live elsewhere (import queue depth, pool
+occupancy).
+
+With ``METRICS_MULTIPROC_DIR`` set, every worker process periodically writes
+its samples to ``<dir>/metrics-<pid>.json`` and ``/api/metrics`` merges all
+files: counters and histograms are summed across processes (including ones
+that have exited), gauges are summed (or maxed, for shared state) over live
+processes only. A live worker claims each exited worker's file, folds its
+counters and histograms into its own snapshot and deletes it, so the directory
+does not grow with every restart.
+"""
+
+import bisect
+import json
+import logging
+import math
+import os
+import tempfile
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from pathlib import Path
+from threading import Event, Lock, Thread
+
+_LOGGER = logging.getLogger("app.metrics")
+
+DEFAULT_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# Checkouts are normally sub-millisecond; the top bucket matches the default DB_POOL_TIMEOUT_SECONDS.
+DB_POOL_CHECKOUT_BUCKETS = (0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0)
+PROMETHEUS_TEXT = "text/plain; version=0.0.4; charset=utf-8"
+
+LabelValues = tuple[str, ...]
+Sample = tuple[str, dict[str, str], float]
+
+
+@dataclass(frozen=True)
+class _MetricFamily:
+    name: str
+    help: str
+    kind: str
+    labelnames: tuple[str, ...]
+    aggregate: str = "sum"
+
+
+class _Metric:
+    def __init__(self, registry: "MetricsRegistry", family: _MetricFamily) -> None:
+        self._registry = registry
+        self.family = family
+
+    def _key(self, labels: dict[str, str]) -> LabelValues:
+        return tuple(str(labels.get(name, "")) for name in self.family.labelnames)
+
+
+class Counter(_Metric):
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        with self._registry.lock:
+            values = self._registry.values[self.family.name]
+            values[key] = values.get(key, 0.0) + amount
+
+
+class Gauge(_Metric):
+    def set(self, value: float, **labels: str) -> None:
+        with self._registry.lock:
+            self._registry.values[self.family.name][self._key(labels)] = float(value)
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        with self._registry.lock:
+            values = self._registry.values[self.family.name]
+            values[key] = values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels: str) -> None:
+        self.inc(-amount, **labels)
+
+
+class Histogram(_Metric):
+    def __init__(self, registry: "MetricsRegistry", family: _MetricFamily, buckets: tuple[float, ...]) -> None:
+        super().__init__(registry, family)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._registry.lock:
+            values = self._registry.values[self.family.name]
+            state = values.get(key)
+            if state is None:
+                # Per-bucket (non-cumulative) counts, then +Inf, sum and count.
+                state = [0.0] * (len(self.buckets) + 3)
+                values[key] = state
+            state[index] += 1
+            state[-2] += value
+            state[-1] += 1
+
+
+class MetricsRegistry:
+    def __init__(self) -> None:
+        self.lock = Lock()
+        self.families: dict[str, _MetricFamily] = {}
+        self.values: dict[str, dict[LabelValues, object]] = {}
+        self.buckets: dict[str, tuple[float, ...]] = {}
+        self._collectors: list[tuple[_MetricFamily, Callable[[], Iterable[tuple[dict[str, str], float]]]]] = []
+
+    def _register(self, name: str, help: str, kind: str, labelnames: Iterable[str]) -> _MetricFamily:
+        family = _MetricFamily(name=name, help=help, kind=kind, labelnames=tuple(labelnames))
+        with self.lock:
+            existing = self.families.get(name)
+            if existing is not None:
+                if existing != family:
+                    raise ValueError(f"metric {name} already registered with a different shape")
+                return existing
+            self.families[name] = family
+            self.values[name] = {}
+        return family
+
+    def counter(self, name: str, help: str, labelnames: Iterable[str] = ()) -> Counter:
+        return Counter(self, self._register(name, help, "counter", labelnames))
+
+    def gauge(self, name: str, help: str, labelnames: Iterable[str] = ()) -> Gauge:
+        return Gauge(self, self._register(name, help, "gauge", labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        help: str,
+        labelnames: Iterable[str] = (),
+        *,
+        buckets: tuple[float, ...] = DEFAULT_LATENCY_BUCKETS,
+    ) -> Histogram:
+        metric = Histogram(self, self._register(name, help, "histogram", labelnames), buckets)
+        with self.lock:
+            self.buckets[name] = metric.buckets
+        return metric
+
+    def register_collector(
+        self,
+        name: str,
+        help: str,
+        labelnames: Iterable[str],
+        collect: Callable[[], Iterable[tuple[dict[str, str], float]]],
+        *,
+        aggregate: str = "sum",
+    ) -> None:
+        """Report a gauge whose samples are read from ``collect`` at render time.
+
+        ``aggregate="max"`` is for values every process reads from shared state
+        (a SQL-backed queue), which would be over-counted if summed.
+        """
+        family = _MetricFamily(name=name, help=help, kind="gauge", labelnames=tuple(labelnames), aggregate=aggregate)
+        with self.lock:
+            self._collectors = [(f, c) for f, c in self._collectors if f.name != name]
+            self._collectors.append((family, collect))
+
+    def snapshot(self) -> dict:
+        """JSON-serialisable copy of every family and its samples, collectors included."""
+        with self.lock:
+            families = dict(self.families)
+            values = {name: {key: _copy(value) for key, value in samples.items()} for name, samples in self.values.items()}
+            buckets = dict(self.buckets)
+            collectors = list(self._collectors)
+
+        for family, collect in collectors:
+            try:
+                samples = {
+                    tuple(str(labels.get(name, "")) for name in family.labelnames): float(value)
+                    for labels, value in collect()
+                }
+            except Exception:
+                _LOGGER.warning("event=metrics_collector_failed metric=%s", family.name, exc_info=True)
+                continue
+            families[family.name] = family
+            values[family.name] = samples
+
+        return {
+            "families": {
+                name: {
+                    "help": family.help,
+                    "kind": family.kind,
+                    "labelnames": list(family.labelnames),
+                    "aggregate": family.aggregate,
+                    "buckets": list(buckets.get(name, ())),
+                    "samples": [[list(key), value] for key, value in values.get(name, {}).items()],
+                }
+                for name, family in families.items()
+            }
+        }
+
+
+def _copy(value: object) -> object:
+    return list(value) if isinstance(value, list) else value
+
+
+def merge_snapshots(snapshots: Iterable[tuple[dict, bool]]) -> dict:
+    """Merge per-process snapshots; each item is ``(snapshot, process_alive)``."""
+    merged: dict[str, dict] = {}
+    for snapshot, alive in snapshots:
+        for name, family in snapshot.get("families", {}).items():
+            if family["kind"] == "gauge" and not alive:
+                continue
+            target = merged.setdefault(
+                name,
+                {
+                    "help": family["help"],
+                    "kind": family["kind"],
+                    "labelnames": family["labelnames"],
+                    "aggregate": family.get("aggregate", "sum"),
+                    "buckets": family["buckets"],
+                    "samples": {},
+                },
+            )
+            combine = max if target["aggregate"] == "max" else (lambda a, b: a + b)
+            for key, value in family["samples"]:
+                label_key = tuple(key)
+                current = target["samples"].get(label_key)
+                if current is None:
+                    target["samples"][label_key] = list(value) if isinstance(value, list) else value
+                elif isinstance(value, list):
+                    target["samples"][label_key] = [a + b for a, b in zip(current, value)]
+                else:
+                    target["samples"][label_key] = combine(current, value)
+    return {
+        "families": {
+            name: {**family, "samples": [[list(key), value] for key, value in family["samples"].items()]}
+            for name, family in merged.items()
+        }
+    }
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items()) + "}"
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def render_prometheus(snapshot: dict) -> str:
+    lines: list[str] = []
+    for name in sorted(snapshot.get("families", {})):
+        family = snapshot["families"][name]
+        lines.append(f"# HELP {name} {family['help']}")
+        lines.append(f"# TYPE {name} {family['kind']}")
+        labelnames = family["labelnames"]
+        for key, value in sorted(family["samples"], key=lambda sample: sample[0]):
+            labels = dict(zip(labelnames, key))
+            if family["kind"] != "histogram":
+                lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+                continue
+            cumulative = 0.0
+            bounds = [*family["buckets"], math.inf]
+            for bound, count in zip(bounds, value[: len(bounds)]):
+                cumulative += count
+                bucket_labels = {**labels, "le": _format_value(bound)}
+                lines.append(f"{name}_bucket{_format_labels(bucket_labels)} {_format_value(cumulative)}")
+            lines.append(f"{name}_sum{_format_labels(labels)} {_format_value(value[-2])}")
+            lines.append(f"{name}_count{_format_labels(labels)} {_format_value(value[-1])}")
+    return "\n".join(lines) + "\n"
+
+
+def _pid_alive(pid: int) -> bool:
+    if pid == os.getpid():
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class MultiprocessExporter:
+    """Writes this process's snapshot to a shared directory and merges all of them."""
+
+    def __init__(self, registry: MetricsRegistry, directory: str, *, flush_interval_seconds: float) -> None:
+        self._registry = registry
+        self._directory = Path(directory)
+        self._flush_interval_seconds = flush_interval_seconds
+        self._stopped = Event()
+        self._thread: Thread | None = None
+        self._lock = Lock()
+        self._inherited_lock = Lock()
+        self._inherited: dict = {"families": {}}
+
+    def _path_for(self, pid: int) -> Path:
+        return self._directory / f"metrics-{pid}.json"
+
+    def _snapshot(self) -> dict:
+        snapshot = self._registry.snapshot()
+        if not self._inherited["families"]:
+            return snapshot
+        return merge_snapshots(((snapshot, True), (self._inherited, True)))
+
+    def flush(self) -> None:
+        self._directory.mkdir(parents=True, exist_ok=True)
+        payload = json.dumps(self._snapshot(), separators=(",", ":"))
+        fd, tmp_path = tempfile.mkstemp(dir=self._directory, prefix=".metrics-", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as handle:
+                handle.write(payload)
+            os.replace(tmp_path, self._path_for(os.getpid()))
+        except Exception:
+            Path(tmp_path).unlink(missing_ok=True)
+            raise
+
+    def absorb_exited_workers(self) -> int:
+        """Fold exited workers' counters and histograms into this process's file and delete theirs.
+
+        Renaming a file claims it, so each one is absorbed by exactly one live
+        worker; the claimed copies are removed only after the flush that
+        carries their samples.
+        """
+        if not self._directory.is_dir():
+            return 0
+        claimed: list[Path] = []
+        with self._inherited_lock:
+            for path in sorted(self._directory.glob("metrics-*.json")):
+                try:
+                    pid = int(path.stem.removeprefix("metrics-"))
+                except ValueError:
+                    continue
+                if _pid_alive(pid):
+                    continue
+                claim = path.with_name(f".metrics-absorbed-{os.getpid()}-{pid}.json")
+                try:
+                    os.rename(path, claim)
+                except FileNotFoundError:
+                    continue
+                claimed.append(claim)
+                try:
+                    snapshot = json.loads(claim.read_text(encoding="utf-8"))
+                except (OSError, ValueError):
+                    _LOGGER.warning("event=metrics_snapshot_unreadable path=%s", path)
+                    continue
+                self._inherited = merge_snapshots(((self._inherited, True), (snapshot, False)))
+            if claimed:
+                self.flush()
+        for claim in claimed:
+            claim.unlink(missing_ok=True)
+        return len(claimed)
+
+    def collect(self) -> dict:
+        self.absorb_exited_workers()
+        self.flush()
+        snapshots: list[tuple[dict, bool]] = []
+        for path in sorted(self._directory.glob("metrics-*.json")):
+            try:
+                pid = int(path.stem.removeprefix("metrics-"))
+                snapshots.append((json.loads(path.read_text(encoding="utf-8")), _pid_alive(pid)))
+            except (OSError, ValueError):
+                _LOGGER.warning("event=metrics_snapshot_unreadable path=%s", path)
+        return merge_snapshots(snapshots)
+
+    def start(self) -> None:
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stopped.clear()
+            self._thread = Thread(target=self._run, name="metrics-flush", daemon=True)
+            self._thread.start()
+        try:
+            self.absorb_exited_workers()
+        except Exception:
+            _LOGGER.warning("event=metrics_absorb_failed", exc_info=True)
+
+    def stop(self) -> None:
+        self._stopped.set()
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            thread.join(timeout=1.0)
+        try:
+            self.flush()
+        except Exception:
+            _LOGGER.warning("event=metrics_final_flush_failed", exc_info=True)
+
+    def _run(self) -> None:
+        while not self._stopped.wait(self._flush_interval_seconds):
+            try:
+                self.flush()
+            except Exception:
+                _LOGGER.warning("event=metrics_flush_failed", exc_info=True)
+
+
+REGISTRY = MetricsRegistry()
+
+HTTP_REQUESTS_TOTAL = REGISTRY.counter(
+    "bebudget_http_requests_total",
+    "HTTP requests by method, route template and status class.",
+    ("method", "route", "status_class"),
+)
+HTTP_REQUEST_DURATION_SECONDS = REGISTRY.histogram(
+    "bebudget_http_request_duration_seconds",
+    "HTTP request latency by method and route template.",
+    ("method", "route"),
+)
+HTTP_REQUESTS_IN_FLIGHT = REGISTRY.gauge(
+    "bebudget_http_requests_in_flight",
+    "HTTP requests currently being served.",
+)
+RATE_LIMITED_TOTAL = REGISTRY.counter(
+    "bebudget_rate_limited_total",
+    "Requests rejected by a rate limiter, by endpoint.",
+    ("endpoint",),
+)
+DB_POOL_CHECKOUT_SECONDS = REGISTRY.histogram(
+    "bebudget_db_pool_checkout_seconds",
+    "Time spent checking a connection out of a database pool, timed-out attempts included.",
+    ("pool",),
+    buckets=DB_POOL_CHECKOUT_BUCKETS,
+)
+DB_POOL_CHECKOUT_WAITS_TOTAL = REGISTRY.counter(
+    "bebudget_db_pool_checkout_waits_total",
+    "Database pool checkouts that had to wait because the pool and its overflow were exhausted.",
+    ("pool",),
+)
+DB_POOL_CHECKOUT_TIMEOUTS_TOTAL = REGISTRY.counter(
+    "bebudget_db_pool_checkout_timeouts_total",
+    "Database pool checkouts that gave up after DB_POOL_TIMEOUT_SECONDS.",
+    ("pool",),
+)
+
+
+def status_class(status_code: int) -> str:
+    return f"{status_code // 100}xx"
+
+
+def build_exporter(directory: str, *, flush_interval_seconds: float) -> MultiprocessExporter | None:
+    if not directory:
+        return None
+    return MultiprocessExporter(REGISTRY, directory, flush_interval_seconds=flush_interval_seconds)
+
+
+def render_metrics(exporter: MultiprocessExporter | None) -> str:
+    snapshot = exporter.collect() if exporter is not None else REGISTRY.snapshot()
+    return render_prometheus(snapshot)
@@ -8,6 +8,9 @@ from typing import Protocol
 
 from fastapi import Request
 
+from app.core.config import settings
+from app.core.metrics import RATE_LIMITED_TOTAL
+
 _LOGGER = logging.getLogger("app.rate_limit")
 
 
@@ -93,6 +96,181 @@ class InMemoryRateLimiter(RateLimiter):
             return True, None
 
 
+def sliding_window_decision(
+    *,
+    previous_count: int,
+    current_count: int,
+    window_index: int,
+    window_seconds: int,
+    now: float,
+    limit: int,
+) -> tuple[bool, int | None]:
+    """Sliding-window-counter check: the previous window's count is weighted by its remaining overlap."""
+    window_start = window_index * window_seconds
+    elapsed_fraction = (now - window_start) / window_seconds
+    estimate = previous_count * (1 - elapsed_fraction) + current_count
+    if estimate < limit:
+        return True, None
+    if current_count >= limit or previous_count <= 0:
+        return False, max(1, math.ceil(window_start + window_seconds - now))
+    # Time until the decaying previous-window share leaves room for one more request.
+    clear_fraction = 1 - (limit - current_count) / previous_count
+    return False, max(1, math.ceil(window_start + clear_fraction * window_seconds - now))
+
+
+@dataclass
+class _SlidingState:
+    window_index: int
+    window_seconds: int
+    previous_count: int = 0
+    current_count: int = 0
+    lock_until: float | None = None
+    wheel_slot: int | None = None
+
+    def rotate(self, window_index: int, window_seconds: int) -> None:
+        if window_seconds != self.window_seconds:
+            self.window_seconds = window_seconds
+            self.previous_count = self.current_count = 0
+        elif window_index == self.window_index + 1:
+            self.previous_count, self.current_count = self.current_count, 0
+        elif window_index != self.window_index:
+            self.previous_count = self.current_count = 0
+        self.window_index = window_index
+
+    def expires_at(self) -> float:
+        window_expiry = (self.window_index + 2) * self.window_seconds
+        return max(window_expiry, self.lock_until or 0.0)
+
+
+class _Stripe:
+    """One lock, its buckets, and a hashed timing wheel of their expiry ticks."""
+
+    def __init__(self, wheel_slots: int) -> None:
+        self.lock = Lock()
+        self.buckets: dict[str, _SlidingState] = {}
+        self.wheel: list[set[str]] = [set() for _ in range(wheel_slots)]
+        self.last_tick: int | None = None
+
+
+class StripedSlidingWindowRateLimiter(RateLimiter):
+    """In-process sliding-window limiter with lock striping and timing-wheel expiry.
+
+    Keys hash to one of ``stripes`` independently locked shards, so checks for
+    different identities rarely contend. Each bucket is filed in its stripe's
+    wheel slot for the second it expires; the wheels are advanced at most once
+    per second and only visit slots whose time has passed, instead of scanning
+    every bucket.
+    """
+
+    def __init__(self, *, stripes: int = 64, wheel_slots: int = 512, now_fn=None):
+        self._now = now_fn or time.time
+        self._wheel_slots = max(1, wheel_slots)
+        self._stripes = [_Stripe(self._wheel_slots) for _ in range(max(1, stripes))]
+        self._swept_tick: int | None = None
+
+    def _stripe_for(self, key: str) -> _Stripe:
+        return self._stripes[hash(key) % len(self._stripes)]
+
+    def _schedule(self, stripe: _Stripe, key: str, state: _SlidingState) -> None:
+        slot = math.ceil(state.expires_at()) % self._wheel_slots
+        if state.wheel_slot == slot:
+            return
+        if state.wheel_slot is not None:
+            stripe.wheel[state.wheel_slot].discard(key)
+        stripe.wheel[slot].add(key)
+        state.wheel_slot = slot
+
+    def _advance(self, stripe: _Stripe, now: float) -> None:
+        tick = math.floor(now)
+        if stripe.last_tick is None:
+            stripe.last_tick = tick
+            return
+        # One revolution visits every slot, so longer idle gaps need no extra work.
+        steps = min(tick - stripe.last_tick, self._wheel_slots)
+        for offset in range(steps):
+            slot = stripe.wheel[(tick - offset) % self._wheel_slots]
+            if not slot:
+                continue
+            keys = list(slot)
+            slot.clear()
+            for key in keys:
+                state = stripe.buckets.get(key)
+                if state is None:
+                    continue
+                state.wheel_slot = None
+                if state.expires_at() <= now:
+                    del stripe.buckets[key]
+                else:
+                    # Filed a revolution early, or extended since it was filed.
+                    self._schedule(stripe, key, state)
+        stripe.last_tick = max(stripe.last_tick, tick)
+
+    def _sweep(self, now: float) -> None:
+        """Advance every stripe's wheel, at most once per second."""
+        tick = math.floor(now)
+        if self._swept_tick is not None and tick <= self._swept_tick:
+            return
+        self._swept_tick = tick
+        for stripe in self._stripes:
+            with stripe.lock:
+                self._advance(stripe, now)
+
+    def check(
+        self,
+        key: str,
+        *,
+        limit: int,
+        window_seconds: int,
+        lock_seconds: int = 0,
+    ) -> tuple[bool, int | None]:
+        now = self._now()
+        window_seconds = max(1, window_seconds)
+        window_index = math.floor(now / window_seconds)
+        self._sweep(now)
+        stripe = self._stripe_for(key)
+        with stripe.lock:
+            state = stripe.buckets.get(key)
+            if state is None:
+                state = _SlidingState(window_index=window_index, window_seconds=window_seconds)
+                stripe.buckets[key] = state
+                self._schedule(stripe, key, state)
+
+            if state.lock_until is not None:
+                if now < state.lock_until:
+                    return False, max(1, math.ceil(state.lock_until - now))
+                state.lock_until = None
+
+            state.rotate(window_index, window_seconds)
+            allowed, retry_after = sliding_window_decision(
+                previous_count=state.previous_count,
+                current_count=state.current_count,
+                window_index=window_index,
+                window_seconds=window_seconds,
+                now=now,
+                limit=limit,
+            )
+            if allowed:
+                state.current_count += 1
+            elif lock_seconds > 0:
+                state.lock_until = now + lock_seconds
+                retry_after = max(1, math.ceil(lock_seconds))
+            self._schedule(stripe, key, state)
+            return allowed, retry_after
+
+    def __len__(self) -> int:
+        return sum(len(stripe.buckets) for stripe in self._stripes)
+
+
+def build_rate_limiter() -> RateLimiter:
+    if settings.rate_limit_backend == "sql":
+        from app.core.rate_limit_sql import SQLSlidingWindowRateLimiter
+
+        return SQLSlidingWindowRateLimiter()
+    if settings.rate_limit_backend == "striped":
+        return StripedSlidingWindowRateLimiter()
+    return InMemoryRateLimiter()
+
+
 def _sanitize_key(key: str) -> str:
     digest = hashlib.sha256(key.encode("utf-8")).hexdigest()
     return digest[:16]
@@ -107,6 +285,7 @@ def log_rate_limited(
     limit: int,
     window_seconds: int,
 ) -> None:
+    RATE_LIMITED_TOTAL.inc(endpoint=endpoint)
     request_id = getattr(request.state, "request_id", "") or "-"
     _LOGGER.warning(
         "event=rate_limited request_id=%s method=%s path=%s endpoint=%s identity_key=%s limit=%s window_seconds=%s retry_after=%s",
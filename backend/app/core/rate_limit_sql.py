@@ -0,0 +1,184 @@
+"""Sliding-window rate limiter shared by every process through the database.
+
+Each check runs in one short transaction. An upsert rolls the bucket's
+windows forward and, because it writes the row, takes the row lock (Postgres)
+or the database write lock (SQLite) for the rest of the transaction, so the
+read-decide-increment that follows cannot interleave with another worker's.
+Bucket keys are stored as SHA-256 digests so identities (usernames, client
+IPs) never reach the table. Expired buckets are deleted by an indexed sweep
+every ``purge_every`` checks per process.
+
+If the database is unavailable the limiter fails open and logs, matching the
+rest of the service, which treats rate limiting as best-effort protection.
+"""
+
+import hashlib
+import logging
+import math
+import time
+from typing import Callable
+
+from sqlalchemy import case, delete, or_, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.core.rate_limit import RateLimiter, _SlidingState, sliding_window_decision
+from app.db import SessionLocal
+from app.models import RateLimitBucket
+
+_LOGGER = logging.getLogger("app.rate_limit")
+
+
+class SQLSlidingWindowRateLimiter(RateLimiter):
+    _PURGE_EVERY = 1000
+
+    def __init__(
+        self,
+        *,
+        session_factory: sessionmaker[Session] = SessionLocal,
+        now_fn: Callable[[], float] | None = None,
+    ) -> None:
+        self._session_factory = session_factory
+        self._now = now_fn or time.time
+        self._checks = 0
+
+    def _roll_windows(self, db: Session, bucket_key: str, *, window_index: int, window_seconds: int, now: float) -> None:
+        table = RateLimitBucket.__table__
+        dialect = db.get_bind().dialect.name
+        if dialect not in {"sqlite", "postgresql"}:
+            row = db.get(RateLimitBucket, bucket_key, with_for_update=True)
+            if row is None:
+                db.add(
+                    RateLimitBucket(
+                        key=bucket_key,
+                        window_index=window_index,
+                        window_seconds=window_seconds,
+                        previous_count=0,
+                        current_count=0,
+                        expires_at=(window_index + 2) * window_seconds,
+                    )
+                )
+                db.flush()
+                return
+            state = _SlidingState(
+                window_index=row.window_index,
+                window_seconds=row.window_seconds,
+                previous_count=row.previous_count,
+                current_count=row.current_count,
+            )
+            if window_index >= row.window_index:
+                state.rotate(window_index, window_seconds)
+            row.window_index = state.window_index
+            row.window_seconds = state.window_seconds
+            row.previous_count = state.previous_count
+            row.current_count = state.current_count
+            if row.lock_until is not None and row.lock_until <= now:
+                row.lock_until = None
+            db.flush()
+            return
+
+        insert_fn = sqlite.insert if dialect == "sqlite" else postgresql.insert
+        stmt = insert_fn(table).values(
+            key=bucket_key,
+            window_index=window_index,
+            window_seconds=window_seconds,
+            previous_count=0,
+            current_count=0,
+            lock_until=None,
+            expires_at=(window_index + 2) * window_seconds,
+        )
+        new = stmt.excluded
+        resized = table.c.window_seconds != new.window_seconds
+        # A worker whose clock lags a window boundary keeps the newer window.
+        same_window = new.window_index <= table.c.window_index
+        next_window = new.window_index == table.c.window_index + 1
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["key"],
+            set_={
+                "previous_count": case(
+                    (resized, 0),
+                    (same_window, table.c.previous_count),
+                    (next_window, table.c.current_count),
+                    else_=0,
+                ),
+                "current_count": case((resized, 0), (same_window, table.c.current_count), else_=0),
+                "window_index": case(
+                    (resized, new.window_index),
+                    (same_window, table.c.window_index),
+                    else_=new.window_index,
+                ),
+                "window_seconds": new.window_seconds,
+                "lock_until": case((table.c.lock_until <= now, None), else_=table.c.lock_until),
+            },
+        )
+        db.execute(stmt)
+
+    def check(
+        self,
+        key: str,
+        *,
+        limit: int,
+        window_seconds: int,
+        lock_seconds: int = 0,
+    ) -> tuple[bool, int | None]:
+        now = self._now()
+        window_seconds = max(1, window_seconds)
+        window_index = math.floor(now / window_seconds)
+        bucket_key = hashlib.sha256(key.encode("utf-8")).hexdigest()
+        try:
+            with self._session_factory() as db:
+                self._roll_windows(db, bucket_key, window_index=window_index, window_seconds=window_seconds, now=now)
+                row = db.execute(
+                    select(
+                        RateLimitBucket.window_index,
+                        RateLimitBucket.previous_count,
+                        RateLimitBucket.current_count,
+                        RateLimitBucket.lock_until,
+                    ).where(RateLimitBucket.key == bucket_key)
+                ).one()
+                if row.lock_until is not None and now < row.lock_until:
+                    db.commit()
+                    return False, max(1, math.ceil(row.lock_until - now))
+
+                allowed, retry_after = sliding_window_decision(
+                    previous_count=row.previous_count,
+                    current_count=row.current_count,
+                    window_index=row.window_index,
+                    window_seconds=window_seconds,
+                    now=now,
+                    limit=limit,
+                )
+                expires_at = (row.window_index + 2) * window_seconds
+                values: dict[str, object] = {"expires_at": expires_at}
+                if allowed:
+                    values["current_count"] = RateLimitBucket.current_count + 1
+                elif lock_seconds > 0:
+                    values["lock_until"] = now + lock_seconds
+                    values["expires_at"] = max(expires_at, now + lock_seconds)
+                    retry_after = max(1, math.ceil(lock_seconds))
+                db.execute(update(RateLimitBucket).where(RateLimitBucket.key == bucket_key).values(**values))
+                db.commit()
+        except SQLAlchemyError:
+            _LOGGER.warning("event=rate_limit_store_unavailable identity_key=%s", bucket_key[:16], exc_info=True)
+            return True, None
+
+        self._checks += 1
+        if self._checks % self._PURGE_EVERY == 0:
+            self.purge_expired(now=now)
+        return allowed, retry_after
+
+    def purge_expired(self, *, now: float | None = None) -> int:
+        now = self._now() if now is None else now
+        try:
+            with self._session_factory() as db:
+                result = db.execute(
+                    delete(RateLimitBucket)
+                    .where(RateLimitBucket.expires_at <= now)
+                    .where(or_(RateLimitBucket.lock_until.is_(None), RateLimitBucket.lock_until <= now))
+                )
+                db.commit()
+                return result.rowcount or 0
+        except SQLAlchemyError:
+            _LOGGER.warning("event=rate_limit_purge_failed", exc_info=True)
+            return 0
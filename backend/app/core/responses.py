@@ -1,7 +1,45 @@
+from collections.abc import Callable
+
+from fastapi import Request, Response
 from fastapi.responses import JSONResponse
 
 from app.core.constants import VENDOR_JSON
 
+_CACHE_CONTROL = "private, no-cache"
+
 
 def vendor_response(content: dict | list, status_code: int = 200) -> JSONResponse:
     return JSONResponse(status_code=status_code, content=content, media_type=VENDOR_JSON)
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Weak comparison, as RFC 9110 requires for If-None-Match."""
+    if not if_none_match:
+        return False
+    opaque = etag.removeprefix("W/")
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == opaque:
+            return True
+    return False
+
+
+def is_not_modified(request: Request, etag: str) -> bool:
+    return etag_matches(request.headers.get("if-none-match"), etag)
+
+
+def not_modified_response(etag: str) -> Response:
+    return Response(status_code=304, headers={"ETag": etag, "Cache-Control": _CACHE_CONTROL})
+
+
+def with_etag(response: Response, etag: str) -> Response:
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = _CACHE_CONTROL
+    return response
+
+
+def conditional_vendor_response(request: Request, etag: str, build: Callable[[], dict | list]) -> Response:
+    """Answer 304 when the client already holds ``etag``; otherwise build and serve the payload."""
+    if is_not_modified(request, etag):
+        return not_modified_response(etag)
+    return with_etag(vendor_response(build()), etag)
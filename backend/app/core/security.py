@@ -1,6 +1,8 @@
 import hashlib
 import secrets
 import time
+from collections import OrderedDict
+from threading import Lock
 
 import jwt
 from fastapi.responses import Response
@@ -38,7 +40,66 @@ def create_access_token(user_id: str) -> str:
     return jwt.encode(payload, settings.jwt_secret, algorithm="HS256")
 
 
+class _VerifiedTokenCache:
+    """LRU of already-verified access tokens, keyed by a digest of secret and token.
+
+    Entries are dropped once the token's ``exp`` passes, so a hit never extends a
+    token's lifetime; including the secret in the key means a rotated secret
+    cannot be bypassed by a cached verification.
+    """
+
+    def __init__(self, max_entries: int) -> None:
+        self.max_entries = max_entries
+        self._lock = Lock()
+        self._entries: OrderedDict[bytes, dict] = OrderedDict()
+
+    @staticmethod
+    def key(token: str) -> bytes:
+        return hashlib.sha256(f"{settings.jwt_secret}\0{token}".encode("utf-8")).digest()
+
+    def get(self, key: bytes, now: float) -> dict | None:
+        with self._lock:
+            payload = self._entries.get(key)
+            if payload is None:
+                return None
+            if now >= payload["exp"] or now < payload["nbf"] or now < payload["iat"]:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return dict(payload)
+
+    def put(self, key: bytes, payload: dict) -> None:
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = dict(payload)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+_VERIFIED_TOKENS = _VerifiedTokenCache(settings.auth_token_cache_max_entries)
+
+
 def decode_access_token(token: str) -> dict:
+    cache_key = None
+    if _VERIFIED_TOKENS.max_entries > 0:
+        cache_key = _VERIFIED_TOKENS.key(token)
+        cached = _VERIFIED_TOKENS.get(cache_key, time.time())
+        if cached is not None:
+            return cached
+
+    payload = _verify_access_token(token)
+    if cache_key is not None:
+        _VERIFIED_TOKENS.put(cache_key, payload)
+    return payload
+
+
+def _verify_access_token(token: str) -> dict:
     try:
         payload = jwt.decode(
             token,
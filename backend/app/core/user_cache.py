@@ -0,0 +1,142 @@
+"""Short-lived cache of authenticated users keyed by the access token ``sub``.
+
+``get_current_user`` consults the cache before loading the user row, so most
+authenticated requests skip that query. Entries hold only the columns request
+handlers read (never the password hash) and expire after a short TTL. User
+row updates and deletes flushed through the ORM invalidate the entry
+immediately; other writers should call ``invalidate_cached_user``.
+
+The in-process backend is the default; a shared backend (e.g. Redis) can be
+installed with ``configure_user_cache`` so invalidations reach every worker.
+"""
+
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from threading import Lock
+from typing import Callable, Protocol
+
+from sqlalchemy import event
+
+from app.core.config import settings
+from app.models import User
+
+_LOGGER = logging.getLogger("app.user_cache")
+
+
+@dataclass(frozen=True)
+class CachedUser:
+    id: str
+    username: str
+    currency_code: str
+    created_at: datetime
+
+    @classmethod
+    def from_row(cls, user: User) -> "CachedUser":
+        return cls(id=user.id, username=user.username, currency_code=user.currency_code, created_at=user.created_at)
+
+    def to_user(self) -> User:
+        """Rebuild a detached ``User``; it is never added to a session."""
+        return User(id=self.id, username=self.username, currency_code=self.currency_code, created_at=self.created_at)
+
+
+class UserCacheBackend(Protocol):
+    def get(self, user_id: str) -> CachedUser | None: ...
+
+    def set(self, user: CachedUser, *, ttl_seconds: int) -> None: ...
+
+    def delete(self, user_id: str) -> None: ...
+
+
+class InMemoryUserCacheBackend(UserCacheBackend):
+    def __init__(self, *, max_entries: int, now_fn: Callable[[], float] | None = None) -> None:
+        self._max_entries = max(1, max_entries)
+        self._now = now_fn or time.monotonic
+        self._lock = Lock()
+        self._entries: OrderedDict[str, tuple[float, CachedUser]] = OrderedDict()
+
+    def get(self, user_id: str) -> CachedUser | None:
+        now = self._now()
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None
+            expires_at, user = entry
+            if now >= expires_at:
+                del self._entries[user_id]
+                return None
+            self._entries.move_to_end(user_id)
+            return user
+
+    def set(self, user: CachedUser, *, ttl_seconds: int) -> None:
+        expires_at = self._now() + ttl_seconds
+        with self._lock:
+            self._entries[user.id] = (expires_at, user)
+            self._entries.move_to_end(user.id)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, user_id: str) -> None:
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+
+_BACKEND: UserCacheBackend | None = None
+
+
+def configure_user_cache(backend: UserCacheBackend | None) -> None:
+    """Install a cache backend; ``None`` disables caching."""
+    global _BACKEND
+    _BACKEND = backend
+
+
+def get_user_cache() -> UserCacheBackend | None:
+    return _BACKEND
+
+
+def load_cached_user(user_id: str) -> User | None:
+    backend = _BACKEND
+    if backend is None:
+        return None
+    try:
+        cached = backend.get(user_id)
+    except Exception:
+        _LOGGER.warning("event=user_cache_get_failed user_id=%s", user_id, exc_info=True)
+        return None
+    return cached.to_user() if cached is not None else None
+
+
+def store_cached_user(user: User) -> None:
+    backend = _BACKEND
+    if backend is None:
+        return
+    try:
+        backend.set(CachedUser.from_row(user), ttl_seconds=settings.auth_user_cache_ttl_seconds)
+    except Exception:
+        _LOGGER.warning("event=user_cache_set_failed user_id=%s", user.id, exc_info=True)
+
+
+def invalidate_cached_user(user_id: str) -> None:
+    backend = _BACKEND
+    if backend is None:
+        return
+    try:
+        backend.delete(user_id)
+    except Exception:
+        _LOGGER.warning("event=user_cache_delete_failed user_id=%s", user_id, exc_info=True)
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_on_user_write(_mapper, _connection, target: User) -> None:
+    invalidate_cached_user(target.id)
+
+
+if settings.auth_user_cache_enabled:
+    configure_user_cache(InMemoryUserCacheBackend(max_entries=settings.auth_user_cache_max_entries))
@@ -0,0 +1,72 @@
+"""Per-user version stamps for conditional GET.
+
+A read endpoint declares which tables its payload is built from. Before
+running its query it asks for a stamp of those tables for the current user:
+``max(timestamp)`` and ``count(*)`` of the user's rows in each, fetched as
+scalar subqueries in one round trip. Every write path bumps ``updated_at``
+(or inserts/deletes a row, which moves the count), so the stamp changes
+whenever the payload could. The ETag hashes the stamp with the user, path and
+query string, so a matching ``If-None-Match`` is answered with 304 without
+building the payload.
+"""
+
+import hashlib
+from collections.abc import Iterable
+from typing import Any
+
+from fastapi import Request
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.models import (
+    Account,
+    AccountBalance,
+    Bill,
+    BillPayment,
+    Budget,
+    Category,
+    IncomeSource,
+    SavingsContribution,
+    SavingsGoal,
+    Transaction,
+)
+
+# Tables without ``updated_at`` are insert/delete only, so their creation time plus count is enough.
+_STAMP_COLUMNS: dict[Any, Any] = {
+    Account: Account.updated_at,
+    AccountBalance: AccountBalance.updated_at,
+    Bill: Bill.updated_at,
+    BillPayment: BillPayment.paid_at,
+    Budget: Budget.updated_at,
+    Category: Category.updated_at,
+    IncomeSource: IncomeSource.updated_at,
+    SavingsContribution: SavingsContribution.contributed_at,
+    SavingsGoal: SavingsGoal.updated_at,
+    Transaction: Transaction.updated_at,
+}
+
+ANALYTICS_SOURCES = (Transaction, Budget, Category, IncomeSource)
+BILL_STATUS_SOURCES = (Bill, BillPayment)
+SAVINGS_SOURCES = (SavingsGoal, SavingsContribution)
+
+
+def version_stamp(db: Session, *, user_id: str, sources: Iterable[Any]) -> tuple[object, ...]:
+    columns = []
+    for model in sources:
+        columns.append(select(func.max(_STAMP_COLUMNS[model])).where(model.user_id == user_id).scalar_subquery())
+        columns.append(select(func.count()).select_from(model).where(model.user_id == user_id).scalar_subquery())
+    return tuple(db.execute(select(*columns)).one())
+
+
+def version_etag(
+    db: Session,
+    request: Request,
+    *,
+    user_id: str,
+    sources: Iterable[Any],
+    extra: Iterable[object] = (),
+) -> str:
+    """Weak ETag for ``request`` as served to ``user_id`` from the current state of ``sources``."""
+    stamp = version_stamp(db, user_id=user_id, sources=sources)
+    key = "|".join(str(part) for part in (user_id, request.url.path, request.url.query, *stamp, *extra))
+    return f'W/"{hashlib.sha256(key.encode()).hexdigest()[:32]}"'
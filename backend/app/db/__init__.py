@@ -1,3 +1,28 @@
-from app.db.session import Base, SessionLocal, engine, get_db, get_migration_revision_state, is_database_ready
+from app.db.async_session import dispose_async_engine, get_async_db
+from app.db.pool_metrics import pool_metrics_snapshot
+from app.db.session import (
+    Base,
+    JobsSessionLocal,
+    build_dedicated_session_factory,
+    SessionLocal,
+    engine,
+    get_db,
+    get_migration_revision_state,
+    is_database_ready,
+    jobs_engine,
+)
 
-__all__ = ["Base", "SessionLocal", "engine", "get_db", "is_database_ready", "get_migration_revision_state"]
+__all__ = [
+    "Base",
+    "SessionLocal",
+    "JobsSessionLocal",
+    "engine",
+    "jobs_engine",
+    "build_dedicated_session_factory",
+    "get_db",
+    "get_async_db",
+    "dispose_async_engine",
+    "is_database_ready",
+    "get_migration_revision_state",
+    "pool_metrics_snapshot",
+]
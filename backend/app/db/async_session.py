@@ -0,0 +1,77 @@
+"""Opt-in asyncio engine for the hot read routes.
+
+With ``DB_ASYNC_ENABLED`` set, the transaction list, analytics and bills
+monthly-status routes are served by ``async def`` handlers on an
+``AsyncSession`` instead of sync handlers on the anyio thread pool, so one
+worker can hold many more concurrent I/O-bound requests. The async URL is
+derived from ``DATABASE_URL`` (``postgresql+psycopg`` in async mode,
+``sqlite+aiosqlite`` for SQLite) and the engine is built on first use.
+"""
+
+from collections.abc import AsyncGenerator
+from threading import Lock
+
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+
+from app.core.config import settings
+
+_SYNC_TO_ASYNC_DRIVERS = {
+    "postgres": "postgresql+psycopg",
+    "postgresql": "postgresql+psycopg",
+    "postgresql+psycopg2": "postgresql+psycopg",
+    "sqlite": "sqlite+aiosqlite",
+    "sqlite+pysqlite": "sqlite+aiosqlite",
+}
+
+_ENGINE_LOCK = Lock()
+_ASYNC_ENGINE: AsyncEngine | None = None
+_ASYNC_SESSION_FACTORY: async_sessionmaker[AsyncSession] | None = None
+
+
+def async_database_url(url: str) -> str:
+    scheme, separator, rest = url.partition("://")
+    if not separator:
+        return url
+    return f"{_SYNC_TO_ASYNC_DRIVERS.get(scheme, scheme)}://{rest}"
+
+
+def _build_async_engine() -> AsyncEngine:
+    url = async_database_url(settings.database_url)
+    engine_kwargs: dict[str, object] = {"pool_logging_name": "async"}
+    if not url.startswith("sqlite"):
+        engine_kwargs.update(
+            pool_size=settings.db_pool_size,
+            max_overflow=settings.db_max_overflow,
+            pool_timeout=settings.db_pool_timeout_seconds,
+            pool_pre_ping=settings.db_pool_pre_ping,
+            pool_recycle=settings.db_pool_recycle_seconds,
+        )
+    return create_async_engine(url, **engine_kwargs)
+
+
+def get_async_session_factory() -> async_sessionmaker[AsyncSession]:
+    global _ASYNC_ENGINE, _ASYNC_SESSION_FACTORY
+    if _ASYNC_SESSION_FACTORY is not None:
+        return _ASYNC_SESSION_FACTORY
+    with _ENGINE_LOCK:
+        if _ASYNC_SESSION_FACTORY is None:
+            _ASYNC_ENGINE = _build_async_engine()
+            _ASYNC_SESSION_FACTORY = async_sessionmaker(
+                bind=_ASYNC_ENGINE,
+                autoflush=False,
+                expire_on_commit=False,
+            )
+    return _ASYNC_SESSION_FACTORY
+
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    async with get_async_session_factory()() as db:
+        yield db
+
+
+async def dispose_async_engine() -> None:
+    global _ASYNC_ENGINE, _ASYNC_SESSION_FACTORY
+    with _ENGINE_LOCK:
+        engine, _ASYNC_ENGINE, _ASYNC_SESSION_FACTORY = _ASYNC_ENGINE, None, None
+    if engine is not None:
+        await engine.dispose()
@@ -0,0 +1,95 @@
+"""Connection pool checkout instrumentation.
+
+``InstrumentedQueuePool`` times every checkout and counts the ones that had to
+wait for a connection (pool and overflow exhausted) or timed out. Counters are
+kept per pool name (the engine's ``pool_logging_name``) so they survive
+``Pool.recreate()`` and can be reported by ``pool_metrics_snapshot()``. Every
+checkout is also recorded in the Prometheus registry as the
+``bebudget_db_pool_checkout_seconds`` histogram and the
+``bebudget_db_pool_checkout_{waits,timeouts}_total`` counters.
+"""
+
+from dataclasses import asdict, dataclass
+from threading import Lock
+from time import perf_counter
+
+from sqlalchemy import exc as sa_exc
+from sqlalchemy.pool import Pool, QueuePool
+
+from app.core import metrics
+
+
+@dataclass
+class PoolCheckoutStats:
+    checkouts: int = 0
+    waits: int = 0
+    timeouts: int = 0
+    checkout_seconds_total: float = 0.0
+    checkout_seconds_max: float = 0.0
+
+
+_STATS_LOCK = Lock()
+_STATS: dict[str, PoolCheckoutStats] = {}
+_POOLS: dict[str, Pool] = {}
+
+
+def _record(name: str, elapsed: float, *, waited: bool, timed_out: bool) -> None:
+    with _STATS_LOCK:
+        stats = _STATS.setdefault(name, PoolCheckoutStats())
+        stats.checkouts += 0 if timed_out else 1
+        stats.waits += 1 if waited else 0
+        stats.timeouts += 1 if timed_out else 0
+        stats.checkout_seconds_total += elapsed
+        stats.checkout_seconds_max = max(stats.checkout_seconds_max, elapsed)
+    metrics.DB_POOL_CHECKOUT_SECONDS.observe(elapsed, pool=name)
+    if waited:
+        metrics.DB_POOL_CHECKOUT_WAITS_TOTAL.inc(pool=name)
+    if timed_out:
+        metrics.DB_POOL_CHECKOUT_TIMEOUTS_TOTAL.inc(pool=name)
+
+
+class InstrumentedQueuePool(QueuePool):
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        name = self._orig_logging_name or "default"
+        with _STATS_LOCK:
+            _STATS.setdefault(name, PoolCheckoutStats())
+            _POOLS[name] = self
+
+    @property
+    def metrics_name(self) -> str:
+        return self._orig_logging_name or "default"
+
+    def _do_get(self):
+        waited = self._max_overflow > -1 and self._overflow >= self._max_overflow and self._pool.empty()
+        started = perf_counter()
+        try:
+            connection = super()._do_get()
+        except sa_exc.TimeoutError:
+            _record(self.metrics_name, perf_counter() - started, waited=True, timed_out=True)
+            raise
+        _record(self.metrics_name, perf_counter() - started, waited=waited, timed_out=False)
+        return connection
+
+
+def pool_metrics_snapshot() -> dict[str, dict[str, float | int]]:
+    with _STATS_LOCK:
+        snapshot: dict[str, dict[str, float | int]] = {}
+        for name, stats in _STATS.items():
+            entry: dict[str, float | int] = asdict(stats)
+            pool = _POOLS.get(name)
+            if isinstance(pool, QueuePool):
+                entry.update(
+                    size=pool.size(),
+                    checked_out=pool.checkedout(),
+                    checked_in=pool.checkedin(),
+                    overflow=max(0, pool.overflow()),
+                )
+            snapshot[name] = entry
+        return snapshot
+
+
+def reset_pool_metrics() -> None:
+    with _STATS_LOCK:
+        for name in _STATS:
+            _STATS[name] = PoolCheckoutStats()
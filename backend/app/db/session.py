@@ -8,19 +8,30 @@ from sqlalchemy import create_engine, text
 from sqlalchemy.orm import DeclarativeBase, Session, sessionmaker
 
 from app.core.config import settings
+from app.db.pool_metrics import InstrumentedQueuePool
 
 
 class Base(DeclarativeBase):
     pass
 
 
-def _build_engine():
+def _is_memory_sqlite(url: str) -> bool:
+    return url.startswith("sqlite") and (":memory:" in url or url.rstrip("/") in {"sqlite:", "sqlite+pysqlite:"})
+
+
+def _build_engine(*, pool_name: str = "primary", pool_size: int | None = None, max_overflow: int | None = None):
     is_sqlite = settings.database_url.startswith("sqlite")
     connect_args = {"check_same_thread": False} if is_sqlite else {}
     engine_kwargs: dict[str, object] = {
         "future": True,
         "connect_args": connect_args,
     }
+    if not _is_memory_sqlite(settings.database_url):
+        engine_kwargs["poolclass"] = InstrumentedQueuePool
+        engine_kwargs["pool_logging_name"] = pool_name
+        engine_kwargs["pool_size"] = settings.db_pool_size if pool_size is None else pool_size
+        engine_kwargs["max_overflow"] = settings.db_max_overflow if max_overflow is None else max_overflow
+        engine_kwargs["pool_timeout"] = settings.db_pool_timeout_seconds
     if not is_sqlite:
         engine_kwargs["pool_pre_ping"] = settings.db_pool_pre_ping
         engine_kwargs["pool_recycle"] = settings.db_pool_recycle_seconds
@@ -30,6 +41,30 @@ def _build_engine():
 engine = _build_engine()
 SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False, expire_on_commit=False)
 
+# Background import workers get their own pool so a burst of jobs cannot starve
+# request handlers of connections. SQLite has a single writer, so it shares the
+# primary engine instead.
+if settings.database_url.startswith("sqlite"):
+    jobs_engine = engine
+else:
+    jobs_engine = _build_engine(
+        pool_name="jobs",
+        pool_size=settings.db_jobs_pool_size,
+        max_overflow=settings.db_jobs_max_overflow,
+    )
+JobsSessionLocal = sessionmaker(bind=jobs_engine, autoflush=False, autocommit=False, expire_on_commit=False)
+
+
+def build_dedicated_session_factory(pool_name: str, *, pool_size: int, max_overflow: int = 0) -> sessionmaker:
+    """Session factory on a pool of its own, for background writers that must not queue behind import jobs.
+
+    SQLite shares the primary engine for the same single-writer reason as ``jobs_engine``.
+    """
+    if settings.database_url.startswith("sqlite"):
+        return SessionLocal
+    dedicated = _build_engine(pool_name=pool_name, pool_size=pool_size, max_overflow=max_overflow)
+    return sessionmaker(bind=dedicated, autoflush=False, autocommit=False, expire_on_commit=False)
+
 
 def get_db() -> Generator[Session, None, None]:
     db = SessionLocal()
@@ -1,15 +1,29 @@
+import re
 from typing import Iterator
 
 from fastapi import Depends, Header, Request
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.core.constants import API_PREFIX, BODY_METHODS, CSV_TEXT, PROBLEM_JSON, SUPPORTED_VENDOR_MEDIA_TYPES
+from app.core.constants import (
+    API_PREFIX,
+    BODY_METHODS,
+    CSV_TEXT,
+    EVENT_STREAM,
+    NDJSON,
+    PROBLEM_JSON,
+    SUPPORTED_VENDOR_MEDIA_TYPES,
+)
 from app.core.errors import APIError
 from app.core.security import decode_access_token
-from app.db import get_db
+from app.core.user_cache import load_cached_user, store_cached_user
+from app.db import get_async_db, get_db
 from app.errors import not_acceptable_error, unauthorized_error
 from app.models import User
-from app.repositories import SQLAlchemyUserRepository
+from app.repositories import AsyncSQLAlchemyUserRepository, SQLAlchemyUserRepository
+
+_IMPORT_STREAM_PATH = re.compile(rf"^{API_PREFIX}/transactions/import/jobs/[0-9A-Fa-f-]{{36}}/stream$")
+_IMPORT_EVENTS_PATH = re.compile(rf"^{API_PREFIX}/transactions/import/jobs/[0-9A-Fa-f-]{{36}}/events$")
 
 
 def _parse_media_type(value: str) -> str:
@@ -64,6 +78,7 @@ def enforce_accept_header(request: Request) -> None:
         f"{API_PREFIX}/health",
         f"{API_PREFIX}/healthz",
         f"{API_PREFIX}/readyz",
+        f"{API_PREFIX}/metrics",
         f"{API_PREFIX}/openapi.json",
     }:
         return
@@ -72,6 +87,8 @@ def enforce_accept_header(request: Request) -> None:
     supported = {*SUPPORTED_VENDOR_MEDIA_TYPES, PROBLEM_JSON}
     if request.url.path == f"{API_PREFIX}/transactions/export":
         supported = {CSV_TEXT, PROBLEM_JSON}
+    elif _IMPORT_EVENTS_PATH.match(request.url.path):
+        supported = {EVENT_STREAM, PROBLEM_JSON}
     if not _accepts_media_types(accept, supported=supported):
         raise not_acceptable_error("Unsupported Accept header")
 
@@ -88,15 +105,14 @@ def enforce_content_type(request: Request) -> None:
         return
 
     content_type = _parse_media_type(request.headers.get("content-type", ""))
-    if content_type not in SUPPORTED_VENDOR_MEDIA_TYPES:
+    supported = SUPPORTED_VENDOR_MEDIA_TYPES
+    if _IMPORT_STREAM_PATH.match(request.url.path):
+        supported = {CSV_TEXT, NDJSON}
+    if content_type not in supported:
         raise APIError(status=400, title="Invalid request", detail="Unsupported Content-Type")
 
 
-def get_current_user(
-    request: Request,
-    authorization: str = Header(default=""),
-    db: Session = Depends(get_db),
-) -> User:
+def _access_token_subject(authorization: str) -> str:
     if not authorization.startswith("Bearer "):
         raise unauthorized_error("Access token is invalid or expired")
 
@@ -111,10 +127,36 @@ def get_current_user(
     user_id = payload.get("sub")
     if not isinstance(user_id, str) or not user_id.strip():
         raise unauthorized_error("Access token is invalid or expired")
-    user_id = user_id.strip()
+    return user_id.strip()
 
-    user = SQLAlchemyUserRepository(db).get_by_id(user_id)
-    if not user:
-        raise unauthorized_error("Access token is invalid or expired")
+
+def get_current_user(
+    request: Request,
+    authorization: str = Header(default=""),
+    db: Session = Depends(get_db),
+) -> User:
+    user_id = _access_token_subject(authorization)
+    user = load_cached_user(user_id)
+    if user is None:
+        user = SQLAlchemyUserRepository(db).get_by_id(user_id)
+        if not user:
+            raise unauthorized_error("Access token is invalid or expired")
+        store_cached_user(user)
+    request.state.user_id = user.id
+    return user
+
+
+async def get_current_user_async(
+    request: Request,
+    authorization: str = Header(default=""),
+    db: AsyncSession = Depends(get_async_db),
+) -> User:
+    user_id = _access_token_subject(authorization)
+    user = load_cached_user(user_id)
+    if user is None:
+        user = await AsyncSQLAlchemyUserRepository(db).get_by_id(user_id)
+        if not user:
+            raise unauthorized_error("Access token is invalid or expired")
+        store_cached_user(user)
     request.state.user_id = user.id
     return user
@@ -1,4 +1,5 @@
 from pathlib import Path
+import hmac
 import logging
 import time
 import uuid
@@ -8,14 +9,17 @@ from threading import Lock
 import yaml
 from fastapi import APIRouter, FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 
+from app.core import metrics
+from app.core.audit import shutdown_audit_sink
 from app.core.constants import API_PREFIX, PROBLEM_JSON, VENDOR_JSON
 from app.core.config import settings
 from app.core.errors import APIError, ProblemDetails, register_exception_handlers
 from app.core.http_security import apply_security_headers
-from app.db import get_migration_revision_state, is_database_ready
+from app.db import dispose_async_engine, get_migration_revision_state, is_database_ready, pool_metrics_snapshot
 from app.dependencies import enforce_accept_header, enforce_content_type
+from app.errors import not_found_error, unauthorized_error
 from app.routers.accounts import router as accounts_router
 from app.routers.analytics import router as analytics_router
 from app.routers.audit import router as audit_router
@@ -24,6 +28,7 @@ from app.routers.auth import session_router as auth_session_router
 from app.routers.budgets import router as budgets_router
 from app.routers.bills import router as bills_router
 from app.routers.categories import router as categories_router
+from app.routers.dashboard import router as dashboard_router
 from app.routers.income_sources import router as income_sources_router
 from app.routers.push import router as push_router
 from app.routers.rollover import router as rollover_router
@@ -56,10 +61,16 @@ async def lifespan(_app: FastAPI):
         safe["migrations_strict"],
     )
     start_import_job_workers()
+    if _METRICS_EXPORTER is not None:
+        _METRICS_EXPORTER.start()
     try:
         yield
     finally:
         shutdown_import_job_workers(timeout_seconds=settings.transactions_import_async_shutdown_timeout_seconds)
+        shutdown_audit_sink()
+        await dispose_async_engine()
+        if _METRICS_EXPORTER is not None:
+            _METRICS_EXPORTER.stop()
 
 
 app = FastAPI(docs_url=None, redoc_url=None, openapi_url=None, lifespan=lifespan)
@@ -68,14 +79,33 @@ app.add_middleware(
     allow_origins=settings.cors_origins,
     allow_credentials=True,
     allow_methods=["GET", "POST", "PATCH", "DELETE", "OPTIONS"],
-    allow_headers=["Authorization", "Content-Type", "Accept", "X-Request-Id", "Idempotency-Key"],
-    expose_headers=["X-Request-Id", "Retry-After"],
+    allow_headers=["Authorization", "Content-Type", "Accept", "X-Request-Id", "Idempotency-Key", "If-None-Match"],
+    expose_headers=["X-Request-Id", "Retry-After", "ETag"],
 )
 
 SPEC_PATH = Path(__file__).resolve().parent.parent / "openapi.yaml"
 REQUEST_ID_HEADER = "X-Request-Id"
 _OPENAPI_SPEC_CACHE: dict | None = None
 _OPENAPI_SPEC_LOCK = Lock()
+_METRICS_EXPORTER = metrics.build_exporter(
+    settings.metrics_multiproc_dir,
+    flush_interval_seconds=settings.metrics_flush_interval_seconds,
+)
+
+
+def _collect_db_pool_connections():
+    for name, stats in pool_metrics_snapshot().items():
+        for state in ("checked_out", "checked_in", "overflow"):
+            if state in stats:
+                yield {"pool": name, "state": state}, stats[state]
+
+
+metrics.REGISTRY.register_collector(
+    "bebudget_db_pool_connections",
+    "Database pool connections by pool and state.",
+    ("pool", "state"),
+    _collect_db_pool_connections,
+)
 
 
 def load_spec():
@@ -101,9 +131,20 @@ async def contract_guards(request: Request, call_next):
     incoming_request_id = request.headers.get(REQUEST_ID_HEADER, "").strip()
     request_id = incoming_request_id or str(uuid.uuid4())
     request.state.request_id = request_id
+    metrics.HTTP_REQUESTS_IN_FLIGHT.inc()
 
     def _log_access(status_code: int) -> None:
-        duration_ms = int((time.perf_counter() - started_at) * 1000)
+        elapsed = time.perf_counter() - started_at
+        duration_ms = int(elapsed * 1000)
+        route = request.scope.get("route")
+        route_template = getattr(route, "path", None) or "unmatched"
+        metrics.HTTP_REQUESTS_IN_FLIGHT.dec()
+        metrics.HTTP_REQUESTS_TOTAL.inc(
+            method=request.method,
+            route=route_template,
+            status_class=metrics.status_class(status_code),
+        )
+        metrics.HTTP_REQUEST_DURATION_SECONDS.observe(elapsed, method=request.method, route=route_template)
         user_id = getattr(request.state, "user_id", None)
         access_logger.info(
             "request_id=%s method=%s path=%s status_code=%s duration_ms=%s user_id=%s",
@@ -163,6 +204,7 @@ api_router.include_router(bills_router)
 api_router.include_router(savings_router)
 api_router.include_router(audit_router)
 api_router.include_router(analytics_router)
+api_router.include_router(dashboard_router)
 app.include_router(api_router, prefix=API_PREFIX)
 
 
@@ -216,6 +258,22 @@ def readyz():
     )
 
 
+def _metrics_access_or_error(request: Request) -> None:
+    """``/api/metrics`` is off unless ``METRICS_ENABLED``; ``METRICS_TOKEN`` adds a bearer check."""
+    if not settings.metrics_enabled:
+        raise not_found_error()
+    if settings.metrics_token:
+        scheme, _, token = request.headers.get("authorization", "").partition(" ")
+        if scheme.lower() != "bearer" or not hmac.compare_digest(token.strip(), settings.metrics_token):
+            raise unauthorized_error("Metrics token is missing or invalid")
+
+
+@app.get(f"{API_PREFIX}/metrics", include_in_schema=False)
+def prometheus_metrics(request: Request):
+    _metrics_access_or_error(request)
+    return Response(content=metrics.render_metrics(_METRICS_EXPORTER), media_type=metrics.PROMETHEUS_TEXT)
+
+
 @app.get(f"{API_PREFIX}/openapi.json", include_in_schema=False)
 def openapi_json():
     return JSONResponse(get_openapi_spec_cached())
@@ -1,30 +1,37 @@
-from .audit import AuditEvent
+from .audit import AuditEvent, AuditEventArchive
 from .bills import Bill, BillPayment
 from .budgets import Budget
 from .enums import AccountType, CategoryType, IncomeFrequency, SavingsGoalStatus, TransactionMood, TransactionType
+from .jobs import ImportJob
+from .rate_limits import RateLimitBucket
 from .savings import SavingsContribution, SavingsGoal
-from .transactions import Account, Category, IncomeSource, MonthlyRollover, Transaction
+from .transactions import Account, AccountBalance, Category, IncomeSource, MonthlyRollover, Transaction, TransactionMonthlyRollup
 from .user import PushSubscription, RefreshToken, User
 
 __all__ = [
     "Account",
+    "AccountBalance",
     "AccountType",
     "AuditEvent",
+    "AuditEventArchive",
     "Bill",
     "BillPayment",
     "Budget",
     "Category",
     "CategoryType",
+    "ImportJob",
     "IncomeSource",
     "IncomeFrequency",
     "MonthlyRollover",
     "PushSubscription",
+    "RateLimitBucket",
     "RefreshToken",
     "SavingsGoalStatus",
     "SavingsContribution",
     "SavingsGoal",
     "TransactionMood",
     "Transaction",
+    "TransactionMonthlyRollup",
     "TransactionType",
     "User",
 ]
@@ -1,7 +1,7 @@
 import uuid
 from datetime import UTC, date, datetime
 
-from sqlalchemy import Date, DateTime, Enum as SAEnum, ForeignKey, Index, Integer, String, Text, UniqueConstraint, text
+from sqlalchemy import BigInteger, Date, DateTime, Enum as SAEnum, ForeignKey, Index, Integer, PrimaryKeyConstraint, String, Text, UniqueConstraint, text
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.db import Base
@@ -69,6 +69,7 @@ class Transaction(Base):
     __table_args__ = (
         Index("idx_transactions_user_date_created", "user_id", "date", "created_at"),
         Index("idx_transactions_user_category_date", "user_id", "category_id", "date"),
+        Index("idx_transactions_user_updated_id", "user_id", "updated_at", "id"),
     )
 
     id: Mapped[str] = mapped_column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
@@ -146,3 +147,35 @@ class MonthlyRollover(Base):
     transaction_id: Mapped[str] = mapped_column(String(36), ForeignKey("transactions.id", ondelete="CASCADE"), nullable=False)
     amount_cents: Mapped[int] = mapped_column(Integer, nullable=False)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=lambda: datetime.now(tz=UTC), nullable=False)
+
+
+class TransactionMonthlyRollup(Base):
+    __tablename__ = "transaction_monthly_rollups"
+    __table_args__ = (
+        PrimaryKeyConstraint("user_id", "month", "category_id", "income_source_key", name="pk_transaction_monthly_rollups"),
+    )
+
+    user_id: Mapped[str] = mapped_column(String(36), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    month: Mapped[str] = mapped_column(String(7), nullable=False)
+    category_id: Mapped[str] = mapped_column(String(36), ForeignKey("categories.id", ondelete="CASCADE"), nullable=False)
+    # Empty string marks rows without income source so the key stays non-null.
+    income_source_key: Mapped[str] = mapped_column(String(36), nullable=False, default="")
+    income_total_cents: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    expense_total_cents: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    transaction_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    impulse_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    intentional_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    untagged_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=lambda: datetime.now(tz=UTC), nullable=False)
+
+
+class AccountBalance(Base):
+    __tablename__ = "account_balances"
+    __table_args__ = (Index("idx_account_balances_user", "user_id"),)
+
+    account_id: Mapped[str] = mapped_column(String(36), ForeignKey("accounts.id", ondelete="CASCADE"), primary_key=True)
+    user_id: Mapped[str] = mapped_column(String(36), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    # Income minus expense over the account's non-archived transactions, opening balance included.
+    balance_cents: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    transaction_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=lambda: datetime.now(tz=UTC), nullable=False)
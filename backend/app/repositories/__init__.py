@@ -1,3 +1,4 @@
+from app.repositories.async_sqlalchemy import AsyncSQLAlchemyTransactionRepository, AsyncSQLAlchemyUserRepository
 from app.repositories.sqlalchemy import (
     SQLAlchemyAccountRepository,
     SQLAlchemyAuditEventRepository,
@@ -18,4 +19,6 @@ __all__ = [
     "SQLAlchemyCategoryRepository",
     "SQLAlchemyIncomeSourceRepository",
     "SQLAlchemyTransactionRepository",
+    "AsyncSQLAlchemyUserRepository",
+    "AsyncSQLAlchemyTransactionRepository",
 ]
@@ -0,0 +1,21 @@
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import Transaction, User
+
+
+class AsyncSQLAlchemyUserRepository:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def get_by_id(self, user_id: str) -> User | None:
+        return await self.db.scalar(select(User).where(User.id == user_id))
+
+
+class AsyncSQLAlchemyTransactionRepository:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def list_page(self, stmt) -> list[Transaction]:
+        """Run an already filtered, ordered and limited transaction select."""
+        return list(await self.db.scalars(stmt))
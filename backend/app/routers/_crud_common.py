@@ -1,3 +1,4 @@
+from datetime import datetime
 from typing import Any
 
 from sqlalchemy import and_, or_
@@ -9,13 +10,17 @@ from app.core.pagination import decode_cursor, encode_cursor, parse_datetime
 from app.errors import invalid_cursor_error
 
 
-def apply_created_cursor(stmt: Any, cursor: str, model: Any) -> Any:
+def decode_created_cursor(cursor: str) -> tuple[datetime, str]:
     data = decode_cursor(cursor)
     c_created_raw = data.get("created_at")
     c_id = data.get("id")
     if not isinstance(c_created_raw, str) or not isinstance(c_id, str):
         raise invalid_cursor_error()
-    c_created = parse_datetime(c_created_raw)
+    return parse_datetime(c_created_raw), c_id
+
+
+def apply_created_cursor(stmt: Any, cursor: str, model: Any) -> Any:
+    c_created, c_id = decode_created_cursor(cursor)
     created_at_col = getattr(model, "created_at")
     id_col = getattr(model, "id")
     return stmt.where(or_(created_at_col < c_created, and_(created_at_col == c_created, id_col < c_id)))
@@ -1,3 +1,4 @@
+from datetime import date
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, Query, Request, Response
@@ -6,18 +7,33 @@ from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from app.core.audit import emit_audit_event
-from app.core.responses import vendor_response
+from app.core.responses import conditional_vendor_response, vendor_response
 from app.db import get_db
 from app.core.utils import utcnow
+from app.core.versions import version_etag
 from app.dependencies import get_current_user
 from app.core.errors import APIError
-from app.errors import forbidden_error
-from app.models import Account, Category, Transaction, User
+from app.errors import forbidden_error, invalid_date_range_error
+from app.models import Account, AccountBalance, Category, Transaction, User
 from app.repositories import SQLAlchemyAccountRepository
 from app.routers._crud_common import apply_created_cursor, build_created_cursor_page, commit_or_conflict
-from app.schemas import AccountCreate, AccountOut, AccountUpdate
+from app.schemas import (
+    AccountBalanceHistoryOut,
+    AccountBalancesOut,
+    AccountCreate,
+    AccountOut,
+    AccountUpdate,
+)
+from app.transactions.balances import (
+    HistoryGranularity,
+    history_bucket_count,
+    load_account_balances,
+    load_balance_history,
+)
+from app.transactions.rollups import record_transaction_created
 
 router = APIRouter(prefix="/accounts", tags=["accounts"])
+_MAX_BALANCE_HISTORY_BUCKETS = 1000
 
 _OPENING_CATEGORY_NAME_BY_TYPE = {
     "income": "Opening Balance Income",
@@ -73,6 +89,7 @@ def _create_opening_balance_transaction(
     )
     db.add(row)
     db.flush()
+    record_transaction_created(db, row)
     return row
 
 
@@ -85,6 +102,7 @@ def _owned_account_or_403(db: Session, user_id: str, account_id: str) -> Account
 
 @router.get("")
 def list_accounts(
+    request: Request,
     include_archived: bool = Query(default=False),
     cursor: str | None = None,
     limit: int = Query(default=20, ge=1, le=100),
@@ -98,15 +116,16 @@ def list_accounts(
     if cursor:
         stmt = apply_created_cursor(stmt, cursor, Account)
 
-    stmt = stmt.order_by(Account.created_at.desc(), Account.id.desc()).limit(limit + 1)
-    rows = list(db.scalars(stmt))
-    items, next_cursor = build_created_cursor_page(rows, limit)
+    def build() -> dict:
+        rows = list(db.scalars(stmt.order_by(Account.created_at.desc(), Account.id.desc()).limit(limit + 1)))
+        items, next_cursor = build_created_cursor_page(rows, limit)
+        return {
+            "items": [AccountOut.model_validate(item).model_dump(mode="json") for item in items],
+            "next_cursor": next_cursor,
+        }
 
-    payload = {
-        "items": [AccountOut.model_validate(item).model_dump(mode="json") for item in items],
-        "next_cursor": next_cursor,
-    }
-    return vendor_response(payload)
+    etag = version_etag(db, request, user_id=current_user.id, sources=(Account,))
+    return conditional_vendor_response(request, etag, build)
 
 
 @router.post("")
@@ -154,12 +173,70 @@ def create_account(
     return vendor_response(AccountOut.model_validate(row).model_dump(mode="json"), status_code=201)
 
 
+@router.get("/balances")
+def list_account_balances(
+    request: Request,
+    include_archived: bool = Query(default=False),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    def build() -> dict:
+        items = load_account_balances(db, user_id=current_user.id, include_archived=include_archived)
+        payload = AccountBalancesOut(
+            items=items,
+            total_balance_cents=sum(item["balance_cents"] for item in items if item["archived_at"] is None),
+        )
+        return payload.model_dump(mode="json")
+
+    etag = version_etag(db, request, user_id=current_user.id, sources=(Account, AccountBalance))
+    return conditional_vendor_response(request, etag, build)
+
+
 @router.get("/{account_id}")
 def get_account(account_id: UUID, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
     account = _owned_account_or_403(db, current_user.id, str(account_id))
     return vendor_response(AccountOut.model_validate(account).model_dump(mode="json"))
 
 
+@router.get("/{account_id}/balance-history")
+def get_account_balance_history(
+    account_id: UUID,
+    request: Request,
+    from_: date = Query(alias="from"),
+    to: date = Query(),
+    granularity: HistoryGranularity = Query(default="day"),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    if from_ > to:
+        raise invalid_date_range_error("from must be less than or equal to to")
+    if history_bucket_count(from_, to, granularity) > _MAX_BALANCE_HISTORY_BUCKETS:
+        raise invalid_date_range_error(
+            f"range exceeds {_MAX_BALANCE_HISTORY_BUCKETS} {granularity} buckets; use a coarser granularity"
+        )
+    account = _owned_account_or_403(db, current_user.id, str(account_id))
+
+    def build() -> dict:
+        dates, balances = load_balance_history(
+            db,
+            user_id=current_user.id,
+            account_id=account.id,
+            from_=from_,
+            to=to,
+            granularity=granularity,
+        )
+        payload = AccountBalanceHistoryOut(
+            account_id=account.id,
+            granularity=granularity,
+            dates=dates,
+            balance_cents=balances,
+        )
+        return payload.model_dump(mode="json")
+
+    etag = version_etag(db, request, user_id=current_user.id, sources=(Transaction, AccountBalance))
+    return conditional_vendor_response(request, etag, build)
+
+
 @router.patch("/{account_id}")
 def patch_account(
     account_id: UUID,
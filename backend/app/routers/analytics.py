@@ -1,56 +1,75 @@
+from collections.abc import Callable
 from datetime import date
 
-from fastapi import APIRouter, Depends, Query
-from sqlalchemy import case, func, select
+from fastapi import APIRouter, Depends, Query, Request
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.core.responses import vendor_response
+from app.core.config import settings
+from app.core.responses import (
+    conditional_vendor_response,
+    is_not_modified,
+    not_modified_response,
+    vendor_response,
+    with_etag,
+)
 from app.core.money import validate_user_currency_for_money
 from app.core.utils import previous_month_yyyy_mm
-from app.db import get_db
-from app.dependencies import get_current_user
+from app.core.versions import ANALYTICS_SOURCES, version_etag
+from app.db import get_async_db, get_db
+from app.dependencies import get_current_user, get_current_user_async
 from app.errors import invalid_date_range_error
 from app.models import Budget, Category, IncomeSource, Transaction, User
+from app.transactions.rollups import MonthlyTotals, load_monthly_totals
 
 router = APIRouter(prefix="/analytics", tags=["analytics"])
+_Payload = Callable[[Session, str, date, date], dict]
 
 
-def _month_expr(db: Session):
-    bind = db.get_bind()
-    dialect = bind.dialect.name if bind is not None else ""
-    if dialect == "sqlite":
-        return func.strftime("%Y-%m", Transaction.date)
-    return func.to_char(Transaction.date, "YYYY-MM")
-
-
-@router.get("/by-month")
-def analytics_by_month(
-    from_: date = Query(alias="from"),
-    to: date = Query(),
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
-):
+def _validate_range(from_: date, to: date, current_user: User) -> None:
     if from_ > to:
         raise invalid_date_range_error("from must be less than or equal to to")
     validate_user_currency_for_money(current_user.currency_code)
-    month_expr = _month_expr(db)
-    income_expr = func.coalesce(func.sum(case((Transaction.type == "income", Transaction.amount_cents), else_=0)), 0)
-    expense_expr = func.coalesce(func.sum(case((Transaction.type == "expense", Transaction.amount_cents), else_=0)), 0)
+
+
+def _conditional_payload(request: Request, db: Session, user_id: str, build: _Payload, from_: date, to: date):
+    etag = version_etag(db, request, user_id=user_id, sources=ANALYTICS_SOURCES)
+    return conditional_vendor_response(request, etag, lambda: build(db, user_id, from_, to))
+
+
+async def _conditional_payload_async(
+    request: Request,
+    db: AsyncSession,
+    user_id: str,
+    build: _Payload,
+    from_: date,
+    to: date,
+):
+    etag = await db.run_sync(version_etag, request, user_id=user_id, sources=ANALYTICS_SOURCES)
+    if is_not_modified(request, etag):
+        return not_modified_response(etag)
+    return with_etag(vendor_response(await db.run_sync(build, user_id, from_, to)), etag)
+
+
+def prior_month_start(from_: date) -> date:
+    return date(from_.year - 1, 12, 1) if from_.month == 1 else date(from_.year, from_.month - 1, 1)
+
+
+def _by_month_payload(db: Session, user_id: str, from_: date, to: date) -> dict:
+    totals = load_monthly_totals(db, user_id=user_id, from_=prior_month_start(from_), to=to)
+    return by_month_from_totals(db, user_id, from_, to, totals)
+
+
+def by_month_from_totals(db: Session, user_id: str, from_: date, to: date, totals: list[MonthlyTotals]) -> dict:
+    """``totals`` must cover the month before ``from_`` through ``to`` (rollover input)."""
     from_month = f"{from_.year:04d}-{from_.month:02d}"
     to_month = f"{to.year:04d}-{to.month:02d}"
-    prior_month_start = date(from_.year - 1, 12, 1) if from_.month == 1 else date(from_.year, from_.month - 1, 1)
-    monthly_stmt = (
-        select(
-            month_expr.label("month"),
-            income_expr.label("income_total_cents"),
-            expense_expr.label("expense_total_cents"),
-        )
-        .where(Transaction.user_id == current_user.id)
-        .where(Transaction.archived_at.is_(None))
-        .where(Transaction.date >= prior_month_start)
-        .where(Transaction.date <= to)
-        .group_by(month_expr)
-    )
+    totals_by_month: dict[str, list[int]] = {}
+    for row in totals:
+        bucket = totals_by_month.setdefault(row.month, [0, 0])
+        bucket[0] += row.income_total_cents
+        bucket[1] += row.expense_total_cents
 
     budget_stmt = (
         select(
@@ -58,7 +77,7 @@ def analytics_by_month(
             func.coalesce(func.sum(Budget.limit_cents), 0).label("budget_limit_cents"),
         )
         .join(Category, Category.id == Budget.category_id)
-        .where(Budget.user_id == current_user.id)
+        .where(Budget.user_id == user_id)
         .where(Budget.archived_at.is_(None))
         .where(Category.type == "expense")
         .where(Budget.month >= from_month)
@@ -66,66 +85,79 @@ def analytics_by_month(
         .group_by(Budget.month)
     )
 
-    monthly_rows = list(db.execute(monthly_stmt))
     budget_by_month = {row.month: int(row.budget_limit_cents) for row in db.execute(budget_stmt)}
-    active_sources = _active_income_sources_for_user(db, current_user.id)
+    active_sources = _active_income_sources_for_user(db, user_id)
     expected_totals_by_month = _expected_income_totals_by_month(
-        [row.month for row in monthly_rows if from_month <= row.month <= to_month],
+        [month for month in totals_by_month if from_month <= month <= to_month],
         active_sources,
     )
-    net_by_month = {
-        row.month: max(0, int(row.income_total_cents) - int(row.expense_total_cents))
-        for row in monthly_rows
-    }
+    net_by_month = {month: max(0, income - expense) for month, (income, expense) in totals_by_month.items()}
 
     items = [
         {
-            "month": row.month,
-            "income_total_cents": int(row.income_total_cents),
-            "expense_total_cents": int(row.expense_total_cents),
-            "expected_income_cents": int(expected_totals_by_month.get(row.month, 0)),
-            "actual_income_cents": int(row.income_total_cents),
-            "rollover_in_cents": int(net_by_month.get(previous_month_yyyy_mm(row.month), 0)),
-            "budget_spent_cents": int(row.expense_total_cents),
-            "budget_limit_cents": int(budget_by_month.get(row.month, 0)),
+            "month": month,
+            "income_total_cents": income,
+            "expense_total_cents": expense,
+            "expected_income_cents": int(expected_totals_by_month.get(month, 0)),
+            "actual_income_cents": income,
+            "rollover_in_cents": int(net_by_month.get(previous_month_yyyy_mm(month), 0)),
+            "budget_spent_cents": expense,
+            "budget_limit_cents": int(budget_by_month.get(month, 0)),
         }
-        for row in sorted(monthly_rows, key=lambda current: current.month)
-        if from_month <= row.month <= to_month
+        for month, (income, expense) in sorted(totals_by_month.items())
+        if from_month <= month <= to_month
     ]
-    return vendor_response({"items": items})
+    return {"items": items}
 
 
-@router.get("/by-category")
-def analytics_by_category(
+def analytics_by_month(
+    request: Request,
     from_: date = Query(alias="from"),
     to: date = Query(),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
-    if from_ > to:
-        raise invalid_date_range_error("from must be less than or equal to to")
-    validate_user_currency_for_money(current_user.currency_code)
-    income_expr = func.coalesce(func.sum(case((Transaction.type == "income", Transaction.amount_cents), else_=0)), 0)
-    expense_expr = func.coalesce(func.sum(case((Transaction.type == "expense", Transaction.amount_cents), else_=0)), 0)
+    _validate_range(from_, to, current_user)
+    return _conditional_payload(request, db, current_user.id, _by_month_payload, from_, to)
+
+
+async def analytics_by_month_async(
+    request: Request,
+    from_: date = Query(alias="from"),
+    to: date = Query(),
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db),
+):
+    _validate_range(from_, to, current_user)
+    return await _conditional_payload_async(request, db, current_user.id, _by_month_payload, from_, to)
+
+
+router.get("/by-month")(analytics_by_month_async if settings.db_async_enabled else analytics_by_month)
+
+
+def _by_category_payload(db: Session, user_id: str, from_: date, to: date) -> dict:
+    return by_category_from_totals(db, user_id, from_, to, load_monthly_totals(db, user_id=user_id, from_=from_, to=to))
+
+
+def by_category_from_totals(db: Session, user_id: str, from_: date, to: date, totals: list[MonthlyTotals]) -> dict:
     from_month = f"{from_.year:04d}-{from_.month:02d}"
     to_month = f"{to.year:04d}-{to.month:02d}"
 
-    tx_stmt = (
-        select(
-            Category.id.label("category_id"),
-            Category.name.label("category_name"),
-            Category.type.label("category_type"),
-            income_expr.label("income_total_cents"),
-            expense_expr.label("expense_total_cents"),
+    totals_by_category: dict[str, list[int]] = {}
+    for row in totals:
+        bucket = totals_by_category.setdefault(row.category_id, [0, 0])
+        bucket[0] += row.income_total_cents
+        bucket[1] += row.expense_total_cents
+    if not totals_by_category:
+        return {"items": []}
+
+    categories = list(
+        db.execute(
+            select(Category.id, Category.name, Category.type)
+            .where(Category.user_id == user_id)
+            .where(Category.id.in_(list(totals_by_category)))
         )
-        .join(Category, Category.id == Transaction.category_id)
-        .where(Transaction.user_id == current_user.id)
-        .where(Transaction.archived_at.is_(None))
-        .where(Transaction.date >= from_)
-        .where(Transaction.date <= to)
-        .group_by(Category.id, Category.name, Category.type)
     )
-    tx_subq = tx_stmt.subquery()
 
     budget_stmt = (
         select(
@@ -133,41 +165,53 @@ def analytics_by_category(
             func.coalesce(func.sum(Budget.limit_cents), 0).label("budget_limit_cents"),
         )
         .join(Category, Category.id == Budget.category_id)
-        .where(Budget.user_id == current_user.id)
+        .where(Budget.user_id == user_id)
         .where(Budget.archived_at.is_(None))
         .where(Budget.month >= from_month)
         .where(Budget.month <= to_month)
+        .where(Budget.category_id.in_(list(totals_by_category)))
         .group_by(Budget.category_id)
     )
-    budget_subq = budget_stmt.subquery()
-
-    stmt = (
-        select(
-            tx_subq.c.category_id,
-            tx_subq.c.category_name,
-            tx_subq.c.category_type,
-            tx_subq.c.income_total_cents,
-            tx_subq.c.expense_total_cents,
-            func.coalesce(budget_subq.c.budget_limit_cents, 0).label("budget_limit_cents"),
-        )
-        .select_from(tx_subq)
-        .outerjoin(budget_subq, budget_subq.c.category_id == tx_subq.c.category_id)
-        .order_by(tx_subq.c.category_name)
-    )
+    budget_by_category = {row.category_id: int(row.budget_limit_cents) for row in db.execute(budget_stmt)}
 
     items = [
         {
-            "category_id": row.category_id,
-            "category_name": row.category_name,
-            "category_type": row.category_type,
-            "income_total_cents": int(row.income_total_cents),
-            "expense_total_cents": int(row.expense_total_cents),
-            "budget_spent_cents": int(row.expense_total_cents) if row.category_type == "expense" else 0,
-            "budget_limit_cents": int(row.budget_limit_cents),
+            "category_id": row.id,
+            "category_name": row.name,
+            "category_type": row.type,
+            "income_total_cents": totals_by_category[row.id][0],
+            "expense_total_cents": totals_by_category[row.id][1],
+            "budget_spent_cents": totals_by_category[row.id][1] if row.type == "expense" else 0,
+            "budget_limit_cents": budget_by_category.get(row.id, 0),
         }
-        for row in db.execute(stmt)
+        for row in sorted(categories, key=lambda current: current.name)
     ]
-    return vendor_response({"items": items})
+    return {"items": items}
+
+
+def analytics_by_category(
+    request: Request,
+    from_: date = Query(alias="from"),
+    to: date = Query(),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    _validate_range(from_, to, current_user)
+    return _conditional_payload(request, db, current_user.id, _by_category_payload, from_, to)
+
+
+async def analytics_by_category_async(
+    request: Request,
+    from_: date = Query(alias="from"),
+    to: date = Query(),
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db),
+):
+    _validate_range(from_, to, current_user)
+    return await _conditional_payload_async(request, db, current_user.id, _by_category_payload, from_, to)
+
+
+router.get("/by-category")(analytics_by_category_async if settings.db_async_enabled else analytics_by_category)
 
 
 def _iter_months(from_: date, to: date) -> list[str]:
@@ -200,40 +244,18 @@ def _expected_income_totals_by_month(months: list[str], active_sources: list[Inc
     return {month: expected_total for month in months}
 
 
-@router.get("/income")
-def analytics_income(
-    from_: date = Query(alias="from"),
-    to: date = Query(),
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
-):
-    if from_ > to:
-        raise invalid_date_range_error("from must be less than or equal to to")
-    validate_user_currency_for_money(current_user.currency_code)
-
+def _income_payload(db: Session, user_id: str, from_: date, to: date) -> dict:
     months = _iter_months(from_, to)
-    active_sources = _active_income_sources_for_user(db, current_user.id)
+    active_sources = _active_income_sources_for_user(db, user_id)
     active_source_ids = {source.id for source in active_sources}
     expected_totals_by_month = _expected_income_totals_by_month(months, active_sources)
 
-    month_expr = _month_expr(db)
-    actual_stmt = (
-        select(
-            month_expr.label("month"),
-            Transaction.income_source_id.label("income_source_id"),
-            func.coalesce(func.sum(Transaction.amount_cents), 0).label("actual_income_cents"),
-        )
-        .where(Transaction.user_id == current_user.id)
-        .where(Transaction.archived_at.is_(None))
-        .where(Transaction.type == "income")
-        .where(Transaction.date >= from_)
-        .where(Transaction.date <= to)
-        .group_by(month_expr, Transaction.income_source_id)
-    )
-    actual_rows = list(db.execute(actual_stmt))
-    actual_by_month_source: dict[tuple[str, str | None], int] = {
-        (row.month, row.income_source_id): int(row.actual_income_cents) for row in actual_rows
-    }
+    actual_by_month_source: dict[tuple[str, str | None], int] = {}
+    for row in load_monthly_totals(db, user_id=user_id, from_=from_, to=to):
+        if row.income_total_cents == 0:
+            continue
+        key = (row.month, row.income_source_id)
+        actual_by_month_source[key] = actual_by_month_source.get(key, 0) + row.income_total_cents
 
     items: list[dict] = []
     for month in months:
@@ -280,31 +302,40 @@ def analytics_income(
             }
         )
 
-    return vendor_response({"items": items})
+    return {"items": items}
 
 
-@router.get("/impulse-summary")
-def analytics_impulse_summary(
+def analytics_income(
+    request: Request,
     from_: date = Query(alias="from"),
     to: date = Query(),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
-    if from_ > to:
-        raise invalid_date_range_error("from must be less than or equal to to")
-    validate_user_currency_for_money(current_user.currency_code)
+    _validate_range(from_, to, current_user)
+    return _conditional_payload(request, db, current_user.id, _income_payload, from_, to)
+
+
+async def analytics_income_async(
+    request: Request,
+    from_: date = Query(alias="from"),
+    to: date = Query(),
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db),
+):
+    _validate_range(from_, to, current_user)
+    return await _conditional_payload_async(request, db, current_user.id, _income_payload, from_, to)
 
-    counts_stmt = select(
-        func.coalesce(func.sum(case((Transaction.is_impulse.is_(True), 1), else_=0)), 0).label("impulse_count"),
-        func.coalesce(func.sum(case((Transaction.is_impulse.is_(False), 1), else_=0)), 0).label("intentional_count"),
-        func.coalesce(func.sum(case((Transaction.is_impulse.is_(None), 1), else_=0)), 0).label("untagged_count"),
-    ).where(
-        Transaction.user_id == current_user.id,
-        Transaction.archived_at.is_(None),
-        Transaction.date >= from_,
-        Transaction.date <= to,
-    )
-    counts = db.execute(counts_stmt).one()
+
+router.get("/income")(analytics_income_async if settings.db_async_enabled else analytics_income)
+
+
+def _impulse_summary_payload(db: Session, user_id: str, from_: date, to: date) -> dict:
+    impulse_count = intentional_count = untagged_count = 0
+    for row in load_monthly_totals(db, user_id=user_id, from_=from_, to=to):
+        impulse_count += row.impulse_count
+        intentional_count += row.intentional_count
+        untagged_count += row.untagged_count
 
     top_stmt = (
         select(
@@ -313,7 +344,7 @@ def analytics_impulse_summary(
             func.count(Transaction.id).label("count"),
         )
         .join(Category, Category.id == Transaction.category_id)
-        .where(Transaction.user_id == current_user.id)
+        .where(Transaction.user_id == user_id)
         .where(Transaction.archived_at.is_(None))
         .where(Transaction.date >= from_)
         .where(Transaction.date <= to)
@@ -324,18 +355,41 @@ def analytics_impulse_summary(
         .limit(5)
     )
 
-    return vendor_response(
-        {
-            "impulse_count": int(counts.impulse_count),
-            "intentional_count": int(counts.intentional_count),
-            "untagged_count": int(counts.untagged_count),
-            "top_impulse_categories": [
-                {
-                    "category_id": row.category_id,
-                    "category_name": row.category_name,
-                    "count": int(row.count),
-                }
-                for row in db.execute(top_stmt)
-            ],
-        }
-    )
+    return {
+        "impulse_count": impulse_count,
+        "intentional_count": intentional_count,
+        "untagged_count": untagged_count,
+        "top_impulse_categories": [
+            {
+                "category_id": row.category_id,
+                "category_name": row.category_name,
+                "count": int(row.count),
+            }
+            for row in db.execute(top_stmt)
+        ],
+    }
+
+
+def analytics_impulse_summary(
+    request: Request,
+    from_: date = Query(alias="from"),
+    to: date = Query(),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    _validate_range(from_, to, current_user)
+    return _conditional_payload(request, db, current_user.id, _impulse_summary_payload, from_, to)
+
+
+async def analytics_impulse_summary_async(
+    request: Request,
+    from_: date = Query(alias="from"),
+    to: date = Query(),
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db),
+):
+    _validate_range(from_, to, current_user)
+    return await _conditional_payload_async(request, db, current_user.id, _impulse_summary_payload, from_, to)
+
+
+router.get("/impulse-summary")(analytics_impulse_summary_async if settings.db_async_enabled else analytics_impulse_summary)
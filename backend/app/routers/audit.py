@@ -4,12 +4,13 @@ from fastapi import APIRouter, Depends, Query
 from sqlalchemy import select
 from sqlalchemy.orm import Session
 
+from app.core.audit_archive import load_compacted_audit_events, merge_audit_rows
 from app.core.responses import vendor_response
 from app.db import get_db
 from app.dependencies import get_current_user
 from app.errors import invalid_date_range_error
 from app.models import AuditEvent, User
-from app.routers._crud_common import apply_created_cursor, build_created_cursor_page
+from app.routers._crud_common import apply_created_cursor, build_created_cursor_page, decode_created_cursor
 from app.schemas import AuditEventOut, AuditListResponse
 
 router = APIRouter(prefix="/audit", tags=["audit"])
@@ -21,6 +22,7 @@ def list_audit_events(
     to: datetime | None = Query(default=None),
     cursor: str | None = None,
     limit: int = Query(default=20, ge=1, le=100),
+    include_compacted: bool = Query(default=False),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
@@ -37,6 +39,17 @@ def list_audit_events(
 
     stmt = stmt.order_by(AuditEvent.created_at.desc(), AuditEvent.id.desc()).limit(limit + 1)
     rows = list(db.scalars(stmt))
+    if include_compacted:
+        # Events past the retention horizon are read back from the archive table and cold storage.
+        compacted = load_compacted_audit_events(
+            db,
+            user_id=current_user.id,
+            from_=from_,
+            to=to,
+            before=decode_created_cursor(cursor) if cursor else None,
+            limit=limit + 1,
+        )
+        rows = merge_audit_rows(rows, compacted, limit=limit + 1)
     items, next_cursor = build_created_cursor_page(rows, limit)
 
     payload = AuditListResponse(
@@ -14,7 +14,7 @@ from app.core.audit import emit_audit_event
 from app.core.config import settings
 from app.core.errors import APIError
 from app.core.network import resolve_rate_limit_client_ip
-from app.core.rate_limit import InMemoryRateLimiter, RateLimiter, log_rate_limited
+from app.core.rate_limit import RateLimiter, build_rate_limiter, log_rate_limited
 from app.core.responses import vendor_response
 from app.core.utils import as_utc, utcnow
 from app.core.security import (
@@ -40,7 +40,7 @@ from app.schemas import AuthSessionResponse, LoginRequest, RegisterRequest, User
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 session_router = APIRouter(tags=["auth"])
-_AUTH_RATE_LIMITER: RateLimiter = InMemoryRateLimiter()
+_AUTH_RATE_LIMITER: RateLimiter = build_rate_limiter()
 _LOGGER = logging.getLogger("app.auth")
 
 
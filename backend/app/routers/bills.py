@@ -3,16 +3,25 @@ import re
 from datetime import date
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, Path, Query, Response
+from fastapi import APIRouter, Depends, Path, Query, Request, Response
 from sqlalchemy import select
 from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
+from app.core.config import settings
 from app.core.errors import APIError
-from app.core.responses import vendor_response
-from app.db import get_db
+from app.core.responses import (
+    conditional_vendor_response,
+    is_not_modified,
+    not_modified_response,
+    vendor_response,
+    with_etag,
+)
+from app.db import get_async_db, get_db
 from app.core.utils import utcnow
-from app.dependencies import get_current_user
+from app.core.versions import BILL_STATUS_SOURCES, version_etag
+from app.dependencies import get_current_user, get_current_user_async
 from app.errors import (
     account_archived_error,
     bill_already_paid_error,
@@ -34,6 +43,7 @@ from app.schemas import (
     BillPaymentOut,
     BillUpdate,
 )
+from app.transactions.rollups import record_transaction_created, record_transaction_removed
 
 router = APIRouter(prefix="/bills", tags=["bills"])
 
@@ -110,6 +120,7 @@ def create_bill(payload: BillCreate, current_user: User = Depends(get_current_us
 
 @router.get("")
 def list_bills(
+    request: Request,
     include_archived: bool = Query(default=False),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
@@ -117,24 +128,24 @@ def list_bills(
     stmt = select(Bill).where(Bill.user_id == current_user.id)
     if not include_archived:
         stmt = stmt.where(Bill.archived_at.is_(None))
-    rows = list(db.scalars(stmt.order_by(Bill.due_day.asc(), Bill.created_at.asc())))
-    return vendor_response(BillListOut(items=[BillOut.model_validate(row) for row in rows]).model_dump(mode="json"))
+    stmt = stmt.order_by(Bill.due_day.asc(), Bill.created_at.asc())
 
+    def build() -> dict:
+        rows = list(db.scalars(stmt))
+        return BillListOut(items=[BillOut.model_validate(row) for row in rows]).model_dump(mode="json")
 
-@router.get("/monthly-status")
-def get_monthly_status(
-    month: str = Query(pattern=r"^\d{4}-(0[1-9]|1[0-2])$"),
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
-):
-    month = _validate_month_or_422(month)
+    etag = version_etag(db, request, user_id=current_user.id, sources=(Bill,))
+    return conditional_vendor_response(request, etag, build)
+
+
+def monthly_status_payload(db: Session, user_id: str, month: str) -> dict:
     today = utcnow().date()
     current_month = today.strftime("%Y-%m")
 
     bills = list(
         db.scalars(
             select(Bill)
-            .where(Bill.user_id == current_user.id)
+            .where(Bill.user_id == user_id)
             .where(Bill.archived_at.is_(None))
             .where(Bill.is_active.is_(True))
             .order_by(Bill.due_day.asc(), Bill.created_at.asc())
@@ -147,7 +158,7 @@ def get_monthly_status(
         payments = list(
             db.scalars(
                 select(BillPayment)
-                .where(BillPayment.user_id == current_user.id)
+                .where(BillPayment.user_id == user_id)
                 .where(BillPayment.month == month)
                 .where(BillPayment.bill_id.in_(bill_ids))
             )
@@ -194,7 +205,7 @@ def get_monthly_status(
         )
 
     pending_count = len(items) - paid_count
-    payload = BillMonthlyStatusOut(
+    return BillMonthlyStatusOut(
         month=month,
         summary=BillMonthlyStatusSummary(
             total_budget_cents=total_budget_cents,
@@ -205,7 +216,40 @@ def get_monthly_status(
         ),
         items=items,
     ).model_dump(mode="json")
-    return vendor_response(payload)
+
+
+def get_monthly_status(
+    request: Request,
+    month: str = Query(pattern=r"^\d{4}-(0[1-9]|1[0-2])$"),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    month = _validate_month_or_422(month)
+    etag = version_etag(db, request, user_id=current_user.id, sources=BILL_STATUS_SOURCES, extra=(utcnow().date(),))
+    return conditional_vendor_response(request, etag, lambda: monthly_status_payload(db, current_user.id, month))
+
+
+async def get_monthly_status_async(
+    request: Request,
+    month: str = Query(pattern=r"^\d{4}-(0[1-9]|1[0-2])$"),
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db),
+):
+    month = _validate_month_or_422(month)
+    etag = await db.run_sync(
+        version_etag,
+        request,
+        user_id=current_user.id,
+        sources=BILL_STATUS_SOURCES,
+        # Pending bills turn overdue as days pass, without any write.
+        extra=(utcnow().date(),),
+    )
+    if is_not_modified(request, etag):
+        return not_modified_response(etag)
+    return with_etag(vendor_response(await db.run_sync(monthly_status_payload, current_user.id, month)), etag)
+
+
+router.get("/monthly-status")(get_monthly_status_async if settings.db_async_enabled else get_monthly_status)
 
 
 @router.get("/{bill_id}")
@@ -289,6 +333,7 @@ def mark_bill_paid(
     )
     db.add(transaction)
     db.flush()
+    record_transaction_created(db, transaction)
 
     payment = BillPayment(
         bill_id=bill.id,
@@ -335,6 +380,7 @@ def unmark_bill_paid(
     )
     db.delete(payment)
     if transaction:
+        record_transaction_removed(db, transaction)
         db.delete(transaction)
     db.commit()
     return Response(status_code=204)
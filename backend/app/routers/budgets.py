@@ -1,14 +1,15 @@
 import re
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, Query, Response
+from fastapi import APIRouter, Depends, Query, Request, Response
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
 from app.core.money import validate_limit_cents, validate_user_currency_for_money
-from app.core.responses import vendor_response
+from app.core.responses import conditional_vendor_response, vendor_response
 from app.db import get_db
 from app.core.utils import utcnow
+from app.core.versions import version_etag
 from app.dependencies import get_current_user
 from app.errors import (
     budget_duplicate_error,
@@ -48,8 +49,14 @@ def _owned_active_category_or_409(db: Session, user_id: str, category_id: str):
     return category
 
 
+def budgets_payload(db: Session, user_id: str, from_month: str, to_month: str) -> dict:
+    rows = SQLAlchemyBudgetRepository(db).list_for_user_month_range(user_id, from_month, to_month)
+    return BudgetListResponse(items=[BudgetOut.model_validate(row) for row in rows]).model_dump(mode="json")
+
+
 @router.get("")
 def list_budgets(
+    request: Request,
     from_: str = Query(alias="from"),
     to: str = Query(),
     current_user: User = Depends(get_current_user),
@@ -59,9 +66,12 @@ def list_budgets(
     to_month = _validate_month_or_400(to)
     if from_month > to_month:
         raise budget_month_invalid_error("from must be less than or equal to to")
-    rows = SQLAlchemyBudgetRepository(db).list_for_user_month_range(current_user.id, from_month, to_month)
-    payload = BudgetListResponse(items=[BudgetOut.model_validate(row) for row in rows]).model_dump(mode="json")
-    return vendor_response(payload)
+    etag = version_etag(db, request, user_id=current_user.id, sources=(Budget,))
+    return conditional_vendor_response(
+        request,
+        etag,
+        lambda: budgets_payload(db, current_user.id, from_month, to_month),
+    )
 
 
 @router.post("")
@@ -7,9 +7,10 @@ from sqlalchemy.orm import Session
 
 from app.core.audit import emit_audit_event
 from app.core.errors import APIError
-from app.core.responses import vendor_response
+from app.core.responses import conditional_vendor_response, vendor_response
 from app.db import get_db
 from app.core.utils import utcnow
+from app.core.versions import version_etag
 from app.dependencies import get_current_user
 from app.errors import forbidden_error
 from app.models import Category, User
@@ -30,6 +31,7 @@ def _owned_category_or_403(db: Session, user_id: str, category_id: str) -> Categ
 
 @router.get("")
 def list_categories(
+    request: Request,
     include_archived: bool = Query(default=False),
     type: CategoryType | None = Query(default=None),
     cursor: str | None = None,
@@ -45,15 +47,16 @@ def list_categories(
     if cursor:
         stmt = apply_created_cursor(stmt, cursor, Category)
 
-    stmt = stmt.order_by(Category.created_at.desc(), Category.id.desc()).limit(limit + 1)
-    rows = list(db.scalars(stmt))
-    items, next_cursor = build_created_cursor_page(rows, limit)
+    def build() -> dict:
+        rows = list(db.scalars(stmt.order_by(Category.created_at.desc(), Category.id.desc()).limit(limit + 1)))
+        items, next_cursor = build_created_cursor_page(rows, limit)
+        return {
+            "items": [CategoryOut.model_validate(item).model_dump(mode="json") for item in items],
+            "next_cursor": next_cursor,
+        }
 
-    payload = {
-        "items": [CategoryOut.model_validate(item).model_dump(mode="json") for item in items],
-        "next_cursor": next_cursor,
-    }
-    return vendor_response(payload)
+    etag = version_etag(db, request, user_id=current_user.id, sources=(Category,))
+    return conditional_vendor_response(request, etag, build)
 
 
 @router.post("")
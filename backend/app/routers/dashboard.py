@@ -0,0 +1,62 @@
+import calendar
+from datetime import date
+
+from fastapi import APIRouter, Depends, Query, Request
+from sqlalchemy.orm import Session
+
+from app.core.money import validate_user_currency_for_money
+from app.core.responses import conditional_vendor_response
+from app.core.utils import utcnow
+from app.core.versions import ANALYTICS_SOURCES, BILL_STATUS_SOURCES, SAVINGS_SOURCES, version_etag
+from app.db import get_db
+from app.dependencies import get_current_user
+from app.models import User
+from app.routers.analytics import by_category_from_totals, by_month_from_totals, prior_month_start
+from app.routers.bills import monthly_status_payload
+from app.routers.budgets import budgets_payload
+from app.routers.savings import savings_summary_payload
+from app.transactions.rollups import load_monthly_totals, month_key
+
+router = APIRouter(prefix="/dashboard", tags=["dashboard"])
+
+
+@router.get("")
+def get_dashboard(
+    request: Request,
+    month: str = Query(pattern=r"^\d{4}-(0[1-9]|1[0-2])$"),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """Everything the home screen loads, from one session.
+
+    The month's rollup totals are read once (with the prior month, which the
+    by-month rollover needs) and shared by the by-month and by-category views.
+    A matching ``If-None-Match`` is answered from the version stamp of the
+    tables involved, before any of it is built.
+    """
+    validate_user_currency_for_money(current_user.currency_code)
+    year, month_number = int(month[:4]), int(month[5:])
+    from_ = date(year, month_number, 1)
+    to = date(year, month_number, calendar.monthrange(year, month_number)[1])
+
+    def build() -> dict:
+        totals = load_monthly_totals(db, user_id=current_user.id, from_=prior_month_start(from_), to=to)
+        month_totals = [row for row in totals if row.month == month_key(from_)]
+        return {
+            "month": month,
+            "by_month": by_month_from_totals(db, current_user.id, from_, to, totals),
+            "by_category": by_category_from_totals(db, current_user.id, from_, to, month_totals),
+            "bills_monthly_status": monthly_status_payload(db, current_user.id, month),
+            "savings_summary": savings_summary_payload(db, current_user.id),
+            "budgets": budgets_payload(db, current_user.id, month, month),
+        }
+
+    etag = version_etag(
+        db,
+        request,
+        user_id=current_user.id,
+        sources=(*ANALYTICS_SOURCES, *BILL_STATUS_SOURCES, *SAVINGS_SOURCES),
+        # Bill status turns overdue as days pass, without any write.
+        extra=(utcnow().date(),),
+    )
+    return conditional_vendor_response(request, etag, build)
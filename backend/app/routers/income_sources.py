@@ -8,9 +8,10 @@ from sqlalchemy.orm import Session
 from app.core.audit import emit_audit_event
 from app.core.errors import APIError
 from app.core.money import validate_limit_cents, validate_user_currency_for_money
-from app.core.responses import vendor_response
+from app.core.responses import conditional_vendor_response, vendor_response
 from app.db import get_db
 from app.core.utils import utcnow
+from app.core.versions import version_etag
 from app.dependencies import get_current_user
 from app.errors import forbidden_error
 from app.models import IncomeSource, User
@@ -31,6 +32,7 @@ def _owned_income_source_or_403(db: Session, user_id: str, income_source_id: str
 
 @router.get("")
 def list_income_sources(
+    request: Request,
     include_archived: bool = Query(default=False),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
@@ -46,9 +48,13 @@ def list_income_sources(
     if not include_archived:
         stmt = stmt.where(IncomeSource.archived_at.is_(None))
     stmt = stmt.order_by(IncomeSource.created_at.desc(), IncomeSource.id.desc())
-    rows = list(db.scalars(stmt))
-    payload = IncomeSourceListOut(items=[IncomeSourceOut.model_validate(row) for row in rows]).model_dump(mode="json")
-    return vendor_response(payload)
+
+    def build() -> dict:
+        rows = list(db.scalars(stmt))
+        return IncomeSourceListOut(items=[IncomeSourceOut.model_validate(row) for row in rows]).model_dump(mode="json")
+
+    etag = version_etag(db, request, user_id=current_user.id, sources=(IncomeSource,))
+    return conditional_vendor_response(request, etag, build)
 
 
 @router.post("")
@@ -20,6 +20,7 @@ from app.errors import (
 )
 from app.models import Account, Category, IncomeSource, MonthlyRollover, Transaction, User
 from app.schemas import RolloverApplyOut, RolloverApplyRequest, RolloverPreviewOut
+from app.transactions.rollups import record_transaction_created
 
 router = APIRouter(prefix="/rollover", tags=["rollover"])
 _MONTH_RE = re.compile(r"^\d{4}-\d{2}$")
@@ -196,6 +197,7 @@ def rollover_apply(
     )
     db.add(row)
     db.flush()
+    record_transaction_created(db, row)
 
     applied = MonthlyRollover(
         user_id=current_user.id,
@@ -1,13 +1,14 @@
 from datetime import date
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, Query, Response
+from fastapi import APIRouter, Depends, Query, Request, Response
 from sqlalchemy import func, select
 from sqlalchemy.orm import Session
 
-from app.core.responses import vendor_response
+from app.core.responses import conditional_vendor_response, vendor_response
 from app.db import get_db
 from app.core.utils import utcnow
+from app.core.versions import SAVINGS_SOURCES, version_etag
 from app.dependencies import get_current_user
 from app.errors import (
     account_archived_error,
@@ -32,6 +33,7 @@ from app.schemas import (
     SavingsGoalUpdate,
     SavingsSummaryOut,
 )
+from app.transactions.rollups import record_transaction_created, record_transaction_removed
 
 router = APIRouter(prefix="/savings-goals", tags=["savings-goals"])
 
@@ -133,6 +135,7 @@ def create_savings_goal(payload: SavingsGoalCreate, current_user: User = Depends
 
 @router.get("")
 def list_savings_goals(
+    request: Request,
     status: str = Query(default="active", pattern=r"^(active|completed|cancelled|all)$"),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
@@ -140,24 +143,27 @@ def list_savings_goals(
     stmt = select(SavingsGoal).where(SavingsGoal.user_id == current_user.id).where(SavingsGoal.archived_at.is_(None))
     if status != "all":
         stmt = stmt.where(SavingsGoal.status == status)
-    goals = list(db.scalars(stmt.order_by(SavingsGoal.created_at.desc())))
-    goal_ids = [goal.id for goal in goals]
-    saved_by_goal = _saved_by_goal_ids(db, current_user.id, goal_ids)
-    items = [_goal_out(goal, saved_by_goal.get(goal.id, 0)) for goal in goals]
-    return vendor_response(SavingsGoalListOut(items=items).model_dump(mode="json"))
 
+    def build() -> dict:
+        goals = list(db.scalars(stmt.order_by(SavingsGoal.created_at.desc())))
+        saved_by_goal = _saved_by_goal_ids(db, current_user.id, [goal.id for goal in goals])
+        items = [_goal_out(goal, saved_by_goal.get(goal.id, 0)) for goal in goals]
+        return SavingsGoalListOut(items=items).model_dump(mode="json")
 
-@router.get("/summary")
-def savings_summary(current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+    etag = version_etag(db, request, user_id=current_user.id, sources=SAVINGS_SOURCES)
+    return conditional_vendor_response(request, etag, build)
+
+
+def savings_summary_payload(db: Session, user_id: str) -> dict:
     goals = list(
         db.scalars(
             select(SavingsGoal)
-            .where(SavingsGoal.user_id == current_user.id)
+            .where(SavingsGoal.user_id == user_id)
             .where(SavingsGoal.archived_at.is_(None))
         )
     )
     goal_ids = [goal.id for goal in goals]
-    saved_by_goal = _saved_by_goal_ids(db, current_user.id, goal_ids)
+    saved_by_goal = _saved_by_goal_ids(db, user_id, goal_ids)
 
     active_count = sum(1 for goal in goals if goal.status == "active")
     completed_count = sum(1 for goal in goals if goal.status == "completed")
@@ -174,7 +180,13 @@ def savings_summary(current_user: User = Depends(get_current_user), db: Session
         total_remaining_cents=total_remaining_cents,
         overall_progress_pct=overall_progress_pct,
     )
-    return vendor_response(out.model_dump(mode="json"))
+    return out.model_dump(mode="json")
+
+
+@router.get("/summary")
+def savings_summary(request: Request, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+    etag = version_etag(db, request, user_id=current_user.id, sources=SAVINGS_SOURCES)
+    return conditional_vendor_response(request, etag, lambda: savings_summary_payload(db, current_user.id))
 
 
 @router.get("/{goal_id}")
@@ -302,6 +314,7 @@ def create_savings_contribution(
     )
     db.add(transaction)
     db.flush()
+    record_transaction_created(db, transaction)
 
     contribution = SavingsContribution(
         goal_id=goal.id,
@@ -351,6 +364,7 @@ def delete_savings_contribution(
 
     db.delete(contribution)
     if transaction:
+        record_transaction_removed(db, transaction)
         db.delete(transaction)
     db.flush()
 
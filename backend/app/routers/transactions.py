@@ -4,54 +4,78 @@ from uuid import UUID
 from fastapi import APIRouter, Depends, Header, Query, Request, Response
 from fastapi.responses import StreamingResponse
 from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 
 from app.core.audit import emit_audit_event
 from app.core.config import settings
-from app.core.constants import CSV_TEXT
+from app.core.constants import CSV_TEXT, EVENT_STREAM, NDJSON
+from app.core.metrics import REGISTRY as METRICS_REGISTRY
 from app.core.network import resolve_rate_limit_client_ip
-from app.core.rate_limit import InMemoryRateLimiter, RateLimiter, log_rate_limited
+from app.core.rate_limit import RateLimiter, build_rate_limiter, log_rate_limited
 from app.core.responses import vendor_response
 from app.core.utils import utcnow
-from app.db import get_db
-from app.dependencies import get_current_user
+from app.db import get_async_db, get_db
+from app.dependencies import get_current_user, get_current_user_async
 from app.errors import forbidden_error, invalid_date_range_error, rate_limited_error
 from app.models import Account, Category, Transaction, User
 from app.models.enums import TransactionType
-from app.repositories import SQLAlchemyTransactionRepository
+from app.repositories import AsyncSQLAlchemyTransactionRepository, SQLAlchemyTransactionRepository
 from app.schemas import (
+    TransactionBatchRequest,
     TransactionCreate,
     TransactionImportJobAccepted,
     TransactionImportRequest,
     TransactionOut,
+    TransactionRecategorizeRequest,
+    TransactionRecategorizeResult,
     TransactionUpdate,
 )
-from app.transactions.csv_export import csv_stream
+from app.transactions.batch import execute_batch
+from app.transactions.csv_export import accepts_gzip, csv_stream, gzip_stream
 from app.transactions.import_jobs import (
     IMPORT_JOB_MANAGER,
+    ImportJobManager,
     _ImportJobManager,
     serialize_import_job,
 )
+from app.transactions.import_events import job_event_stream, wait_for_job_change
+from app.transactions.import_stream import run_import_stream
 from app.transactions.import_sync import execute_import_payload
-from app.transactions.pagination import apply_cursor, apply_list_filters, build_page
+from app.transactions.pagination import (
+    apply_changes_cursor,
+    apply_changes_horizon,
+    apply_cursor,
+    apply_list_filters,
+    build_changes_page,
+    build_page,
+)
+from app.transactions.projection import build_projected_page, parse_fields, projected_select
+from app.transactions.recategorize import recategorize_transactions
+from app.transactions.rollups import (
+    apply_transaction_rollups,
+    record_transaction_created,
+    snapshot_transaction,
+)
 from app.transactions.validation import (
-    owned_active_income_source_or_conflict,
-    owned_category_or_conflict,
     owned_transaction_or_403,
+    validate_batch_operations_or_400,
     validate_batch_size_or_400,
     validate_business_rules,
+    validate_existing_references,
     validate_money_rules,
     validate_transaction_mood,
 )
 
 router = APIRouter(prefix="/transactions", tags=["transactions"])
-_TRANSACTION_RATE_LIMITER: RateLimiter = InMemoryRateLimiter()
-_IMPORT_JOB_MANAGER: _ImportJobManager = IMPORT_JOB_MANAGER
+_TRANSACTION_RATE_LIMITER: RateLimiter = build_rate_limiter()
+_IMPORT_JOB_MANAGER: ImportJobManager = IMPORT_JOB_MANAGER
 
 
 def _transactions_rate_limit_or_429(request: Request, *, endpoint: str, identity: str) -> None:
     window_seconds = max(1, settings.transactions_rate_limit_window_seconds)
-    if endpoint == "transactions_import":
+    if endpoint in {"transactions_import", "transactions_batch", "transactions_recategorize"}:
         limit = max(1, settings.transactions_import_rate_limit_per_minute)
     else:
         limit = max(1, settings.transactions_export_rate_limit_per_minute)
@@ -87,12 +111,65 @@ def shutdown_import_job_workers(*, timeout_seconds: float | None = None) -> None
     )
 
 
-def _get_import_job_manager() -> _ImportJobManager:
+def _collect_import_job_stats():
+    queued, running = _IMPORT_JOB_MANAGER.stats()
+    return [({"state": "queued"}, queued), ({"state": "running"}, running)]
+
+
+METRICS_REGISTRY.register_collector(
+    "bebudget_import_jobs",
+    "Async import jobs by state.",
+    ("state",),
+    _collect_import_job_stats,
+    aggregate="max" if settings.transactions_import_async_backend == "sql" else "sum",
+)
+
+
+def _get_import_job_manager() -> ImportJobManager:
     start_import_job_workers()
     return _IMPORT_JOB_MANAGER
 
 
-@router.get("")
+def _list_transactions_stmt(
+    user_id: str,
+    *,
+    include_archived: bool,
+    type: TransactionType | None,
+    account_id: UUID | None,
+    category_id: UUID | None,
+    from_: date | None,
+    to: date | None,
+    cursor: str | None,
+    limit: int,
+):
+    if from_ and to and from_ > to:
+        raise invalid_date_range_error("from must be less than or equal to to")
+
+    stmt = select(Transaction).where(Transaction.user_id == user_id)
+    stmt = apply_list_filters(
+        stmt,
+        include_archived=include_archived,
+        type=type,
+        account_id=account_id,
+        category_id=category_id,
+        from_=from_,
+        to=to,
+    )
+
+    if cursor:
+        stmt = apply_cursor(stmt, cursor)
+
+    return stmt.order_by(Transaction.date.desc(), Transaction.created_at.desc(), Transaction.id.desc()).limit(limit + 1)
+
+
+def _list_transactions_payload(rows: list[Transaction], limit: int) -> dict:
+    items, next_cursor = build_page(rows, limit)
+    return {
+        "items": [TransactionOut.model_validate(item).model_dump(mode="json") for item in items],
+        "next_cursor": next_cursor,
+    }
+
+
 def list_transactions(
     include_archived: bool = Query(default=False),
     type: TransactionType | None = Query(default=None),
@@ -104,11 +181,71 @@ def list_transactions(
     limit: int = Query(default=20, ge=1, le=100),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
+):
+    stmt = _list_transactions_stmt(
+        current_user.id,
+        include_archived=include_archived,
+        type=type,
+        account_id=account_id,
+        category_id=category_id,
+        from_=from_,
+        to=to,
+        cursor=cursor,
+        limit=limit,
+    )
+    rows = list(db.scalars(stmt))
+    return vendor_response(_list_transactions_payload(rows, limit))
+
+
+async def list_transactions_async(
+    include_archived: bool = Query(default=False),
+    type: TransactionType | None = Query(default=None),
+    account_id: UUID | None = Query(default=None),
+    category_id: UUID | None = Query(default=None),
+    from_: date | None = Query(default=None, alias="from"),
+    to: date | None = Query(default=None),
+    cursor: str | None = None,
+    limit: int = Query(default=20, ge=1, le=100),
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db),
+):
+    stmt = _list_transactions_stmt(
+        current_user.id,
+        include_archived=include_archived,
+        type=type,
+        account_id=account_id,
+        category_id=category_id,
+        from_=from_,
+        to=to,
+        cursor=cursor,
+        limit=limit,
+    )
+    rows = await AsyncSQLAlchemyTransactionRepository(db).list_page(stmt)
+    return vendor_response(_list_transactions_payload(rows, limit))
+
+
+router.get("")(list_transactions_async if settings.db_async_enabled else list_transactions)
+
+
+@router.get("/bulk")
+def bulk_list_transactions(
+    fields: str | None = Query(default=None),
+    include_archived: bool = Query(default=False),
+    type: TransactionType | None = Query(default=None),
+    account_id: UUID | None = Query(default=None),
+    category_id: UUID | None = Query(default=None),
+    from_: date | None = Query(default=None, alias="from"),
+    to: date | None = Query(default=None),
+    cursor: str | None = None,
+    limit: int = Query(default=1000, ge=1, le=5000),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
 ):
     if from_ and to and from_ > to:
         raise invalid_date_range_error("from must be less than or equal to to")
+    selected = parse_fields(fields)
 
-    stmt = select(Transaction).where(Transaction.user_id == current_user.id)
+    stmt = projected_select(selected).where(Transaction.user_id == current_user.id)
     stmt = apply_list_filters(
         stmt,
         include_archived=include_archived,
@@ -123,12 +260,35 @@ def list_transactions(
         stmt = apply_cursor(stmt, cursor)
 
     stmt = stmt.order_by(Transaction.date.desc(), Transaction.created_at.desc(), Transaction.id.desc()).limit(limit + 1)
+    rows = db.execute(stmt).all()
+    items, next_cursor = build_projected_page(rows, selected, limit)
+    return vendor_response({"fields": list(selected), "items": items, "next_cursor": next_cursor})
+
+
+@router.get("/changes")
+def list_transaction_changes(
+    since: str | None = None,
+    limit: int = Query(default=100, ge=1, le=1000),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """Created, updated and archived transactions in ``(updated_at, id)`` order.
+
+    ``next_since`` is always returned; passing it back resumes the feed after the
+    last change seen, and an empty page echoes the token so clients can poll with it.
+    Changes younger than the settle window are served on a later poll.
+    """
+    stmt = apply_changes_horizon(select(Transaction).where(Transaction.user_id == current_user.id))
+    if since:
+        stmt = apply_changes_cursor(stmt, since)
+    stmt = stmt.order_by(Transaction.updated_at.asc(), Transaction.id.asc()).limit(limit + 1)
     rows = list(db.scalars(stmt))
-    items, next_cursor = build_page(rows, limit)
+    items, next_since, has_more = build_changes_page(rows, limit, since)
 
     payload = {
         "items": [TransactionOut.model_validate(item).model_dump(mode="json") for item in items],
-        "next_cursor": next_cursor,
+        "next_since": next_since,
+        "has_more": has_more,
     }
     return vendor_response(payload)
 
@@ -148,6 +308,7 @@ def create_transaction(
     row = Transaction(user_id=current_user.id, **data)
     repo.add(row)
     db.flush()
+    record_transaction_created(db, row)
     emit_audit_event(
         db,
         request=request,
@@ -183,6 +344,39 @@ def import_transactions(
     return vendor_response(result.model_dump(mode="json"))
 
 
+@router.post("/batch")
+def batch_transactions(
+    payload: TransactionBatchRequest,
+    request: Request,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    _transactions_rate_limit_or_429(
+        request,
+        endpoint="transactions_batch",
+        identity=f"{current_user.id}:{resolve_rate_limit_client_ip(request)}",
+    )
+    validate_batch_operations_or_400(len(payload.operations))
+    result = execute_batch(payload=payload, current_user=current_user, db=db, request=request)
+    return vendor_response(result.model_dump(mode="json"))
+
+
+@router.post("/recategorize")
+def recategorize(
+    payload: TransactionRecategorizeRequest,
+    request: Request,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    _transactions_rate_limit_or_429(
+        request,
+        endpoint="transactions_recategorize",
+        identity=f"{current_user.id}:{resolve_rate_limit_client_ip(request)}",
+    )
+    updated_count = recategorize_transactions(db, payload=payload, current_user=current_user, request=request)
+    return vendor_response(TransactionRecategorizeResult(updated_count=updated_count).model_dump(mode="json"))
+
+
 @router.post("/import/jobs")
 def submit_import_job(
     payload: TransactionImportRequest,
@@ -212,12 +406,74 @@ def submit_import_job(
 
 
 @router.get("/import/jobs/{job_id}")
-def get_import_job_status(
+async def get_import_job_status(
     job_id: UUID,
+    wait: int = Query(default=0, ge=0, le=60),
     current_user: User = Depends(get_current_user),
 ):
     manager = _get_import_job_manager()
-    job = manager.get_for_user(user_id=current_user.id, job_id=str(job_id))
+    if wait:
+        job = await wait_for_job_change(
+            manager,
+            user_id=current_user.id,
+            job_id=str(job_id),
+            timeout_seconds=wait,
+            poll_seconds=settings.transactions_import_async_poll_interval_seconds,
+        )
+    else:
+        job = await run_in_threadpool(manager.get_for_user, user_id=current_user.id, job_id=str(job_id))
+    if job is None:
+        raise forbidden_error("Not allowed")
+    return vendor_response(serialize_import_job(job))
+
+
+@router.get("/import/jobs/{job_id}/events")
+async def stream_import_job_events(
+    job_id: UUID,
+    current_user: User = Depends(get_current_user),
+):
+    manager = _get_import_job_manager()
+    job = await run_in_threadpool(manager.get_for_user, user_id=current_user.id, job_id=str(job_id))
+    if job is None:
+        raise forbidden_error("Not allowed")
+    events = job_event_stream(
+        manager,
+        user_id=current_user.id,
+        job_id=str(job_id),
+        poll_seconds=settings.transactions_import_async_poll_interval_seconds,
+        max_seconds=settings.transactions_import_events_max_seconds,
+    )
+    headers = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    return StreamingResponse(events, media_type=EVENT_STREAM, headers=headers)
+
+
+@router.post("/import/jobs/{job_id}/stream")
+async def stream_import_job(
+    job_id: UUID,
+    request: Request,
+    chunk_size: int = Query(default=500, ge=1, le=5000),
+    current_user: User = Depends(get_current_user),
+):
+    _transactions_rate_limit_or_429(
+        request,
+        endpoint="transactions_import",
+        identity=f"{current_user.id}:{resolve_rate_limit_client_ip(request)}",
+    )
+    content_type = request.headers.get("content-type", "").split(";", 1)[0].strip().lower()
+    fmt = "ndjson" if content_type == NDJSON else "csv"
+
+    manager = _get_import_job_manager()
+    await run_in_threadpool(manager.register_stream_job, user_id=current_user.id, job_id=str(job_id))
+    await run_import_stream(
+        body=request.stream(),
+        fmt=fmt,
+        chunk_size=chunk_size,
+        user_id=current_user.id,
+        job_id=str(job_id),
+        manager=manager,
+        request=request,
+    )
+    job = await run_in_threadpool(manager.get_for_user, user_id=current_user.id, job_id=str(job_id))
     if job is None:
         raise forbidden_error("Not allowed")
     return vendor_response(serialize_import_job(job))
@@ -258,13 +514,17 @@ def export_transactions(
         to=to,
     )
     stmt = stmt.order_by(Transaction.date.desc(), Transaction.created_at.desc(), Transaction.id.desc())
-    rows = db.execute(stmt)
+    # yield_per implies stream_results: Postgres uses a server-side cursor instead of buffering every row.
+    rows = db.execute(stmt.execution_options(yield_per=settings.transactions_export_yield_per))
 
-    return StreamingResponse(
-        csv_stream(rows),
-        media_type=CSV_TEXT,
-        headers={"Content-Disposition": "attachment; filename=transactions.csv"},
-    )
+    headers = {"Content-Disposition": "attachment; filename=transactions.csv"}
+    body = csv_stream(rows)
+    if settings.transactions_export_gzip_enabled:
+        headers["Vary"] = "Accept-Encoding"
+        if accepts_gzip(request.headers.get("accept-encoding", "")):
+            headers["Content-Encoding"] = "gzip"
+            body = gzip_stream(body)
+    return StreamingResponse(body, media_type=CSV_TEXT, headers=headers)
 
 
 @router.get("/{transaction_id}")
@@ -283,6 +543,7 @@ def patch_transaction(
 ):
     row = owned_transaction_or_403(db, current_user.id, str(transaction_id))
     previous_archived_at = row.archived_at
+    before = snapshot_transaction(row)
     data = payload.model_dump(exclude_unset=True)
     validate_transaction_mood(data)
     merged_type: TransactionType = data.get("type", row.type)
@@ -298,13 +559,17 @@ def patch_transaction(
         }
         validate_business_rules(db, current_user.id, merged)
     else:
-        owned_category_or_conflict(db, current_user.id, row.category_id)
-        if row.income_source_id is not None:
-            owned_active_income_source_or_conflict(db, current_user.id, row.income_source_id)
+        validate_existing_references(
+            db,
+            current_user.id,
+            category_id=row.category_id,
+            income_source_id=row.income_source_id,
+        )
 
     for key, value in data.items():
         setattr(row, key, value)
     row.updated_at = utcnow()
+    apply_transaction_rollups(db, [(before, snapshot_transaction(row))])
     action = "transaction.restore" if previous_archived_at is not None and row.archived_at is None else "transaction.update"
     emit_audit_event(
         db,
@@ -327,9 +592,11 @@ def delete_transaction(
     db: Session = Depends(get_db),
 ):
     row = owned_transaction_or_403(db, current_user.id, str(transaction_id))
+    before = snapshot_transaction(row)
     now = utcnow()
     row.archived_at = now
     row.updated_at = now
+    apply_transaction_rollups(db, [(before, None)])
     emit_audit_event(
         db,
         request=request,
@@ -1,4 +1,4 @@
-from app.schemas.accounts import AccountCreate, AccountOut, AccountUpdate
+from app.schemas.accounts import AccountBalanceHistoryOut, AccountBalanceOut, AccountBalancesOut, AccountCreate, AccountOut, AccountUpdate
 from app.schemas.analytics import (
     AnalyticsByCategoryItem,
     AnalyticsByCategoryResponse,
@@ -46,18 +46,32 @@ from app.schemas.savings import (
     SavingsSummaryOut,
 )
 from app.schemas.transactions import (
+    TransactionBatchArchiveOp,
+    TransactionBatchCreateOp,
+    TransactionBatchOperation,
+    TransactionBatchOpResult,
+    TransactionBatchPatchOp,
+    TransactionBatchRequest,
+    TransactionBatchResult,
     TransactionCreate,
     TransactionImportFailure,
     TransactionImportItem,
     TransactionImportJobAccepted,
     TransactionImportJobOut,
+    TransactionImportJobProgress,
     TransactionImportRequest,
     TransactionImportResult,
     TransactionOut,
+    TransactionRecategorizeFilter,
+    TransactionRecategorizeRequest,
+    TransactionRecategorizeResult,
     TransactionUpdate,
 )
 
 __all__ = [
+    "AccountBalanceHistoryOut",
+    "AccountBalanceOut",
+    "AccountBalancesOut",
     "AccountCreate",
     "AccountOut",
     "AccountUpdate",
@@ -115,14 +129,25 @@ __all__ = [
     "SavingsGoalOut",
     "SavingsGoalUpdate",
     "SavingsSummaryOut",
+    "TransactionBatchArchiveOp",
+    "TransactionBatchCreateOp",
+    "TransactionBatchOperation",
+    "TransactionBatchOpResult",
+    "TransactionBatchPatchOp",
+    "TransactionBatchRequest",
+    "TransactionBatchResult",
     "TransactionCreate",
     "TransactionImportFailure",
     "TransactionImportItem",
     "TransactionImportJobAccepted",
     "TransactionImportJobOut",
+    "TransactionImportJobProgress",
     "TransactionImportRequest",
     "TransactionImportResult",
     "TransactionOut",
+    "TransactionRecategorizeFilter",
+    "TransactionRecategorizeRequest",
+    "TransactionRecategorizeResult",
     "TransactionUpdate",
     "UserOut",
     "VapidPublicKeyResponse",
@@ -1,4 +1,5 @@
-from datetime import datetime
+from datetime import date, datetime
+from typing import Literal
 
 from pydantic import BaseModel, ConfigDict, Field
 
@@ -29,3 +30,24 @@ class AccountOut(AccountBase):
 
     id: str
     archived_at: datetime | None
+
+
+class AccountBalanceOut(BaseModel):
+    account_id: str
+    name: str
+    archived_at: datetime | None
+    balance_cents: int
+    transaction_count: int
+
+
+class AccountBalancesOut(BaseModel):
+    items: list[AccountBalanceOut]
+    total_balance_cents: int
+
+
+class AccountBalanceHistoryOut(BaseModel):
+    account_id: str
+    granularity: Literal["day", "week", "month"]
+    # Parallel arrays: balance_cents[i] is the closing balance of the bucket starting dates[i].
+    dates: list[date]
+    balance_cents: list[int]
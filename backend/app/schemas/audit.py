@@ -13,6 +13,7 @@ class AuditEventOut(BaseModel):
     resource_id: str | None
     action: str
     created_at: datetime
+    details: dict | None = None
 
 
 class AuditListResponse(BaseModel):
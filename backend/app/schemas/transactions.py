@@ -1,5 +1,6 @@
 from datetime import date as DateType, datetime
-from typing import Literal
+from typing import Annotated, Literal
+from uuid import UUID
 
 from pydantic import BaseModel, ConfigDict, Field, StrictInt
 
@@ -68,12 +69,84 @@ class TransactionImportResult(BaseModel):
     failures: list[TransactionImportFailure]
 
 
+class TransactionBatchCreateOp(BaseModel):
+    op: Literal["create"]
+    item: TransactionCreate
+
+
+class TransactionBatchPatchOp(BaseModel):
+    op: Literal["patch"]
+    id: str
+    changes: TransactionUpdate
+
+
+class TransactionBatchArchiveOp(BaseModel):
+    op: Literal["archive"]
+    id: str
+
+
+TransactionBatchOperation = Annotated[
+    TransactionBatchCreateOp | TransactionBatchPatchOp | TransactionBatchArchiveOp,
+    Field(discriminator="op"),
+]
+
+
+class TransactionBatchRequest(BaseModel):
+    mode: Literal["all_or_nothing", "partial"] = "partial"
+    operations: list[TransactionBatchOperation] = Field(min_length=1)
+
+
+class TransactionBatchOpResult(BaseModel):
+    index: int = Field(ge=0)
+    op: Literal["create", "patch", "archive"]
+    id: str | None = None
+    status: Literal["applied", "failed", "skipped"]
+    message: str | None = None
+    problem: ProblemDetails | None = None
+
+
+class TransactionBatchResult(BaseModel):
+    applied_count: int = Field(ge=0)
+    failed_count: int = Field(ge=0)
+    results: list[TransactionBatchOpResult]
+
+
+class TransactionRecategorizeFilter(BaseModel):
+    """The ``GET /transactions`` filters, plus an optional merchant match."""
+
+    model_config = ConfigDict(populate_by_name=True)
+
+    include_archived: bool = False
+    type: TransactionType | None = None
+    account_id: UUID | None = None
+    category_id: UUID | None = None
+    from_: DateType | None = Field(default=None, alias="from")
+    to: DateType | None = None
+    merchant: str | None = Field(default=None, min_length=1, max_length=160)
+    merchant_match: Literal["exact", "contains"] = "exact"
+
+
+class TransactionRecategorizeRequest(BaseModel):
+    category_id: str
+    filter: TransactionRecategorizeFilter = Field(default_factory=TransactionRecategorizeFilter)
+
+
+class TransactionRecategorizeResult(BaseModel):
+    updated_count: int = Field(ge=0)
+
+
 class TransactionImportJobAccepted(BaseModel):
     job_id: str
     status: Literal["queued", "running", "completed", "failed"]
     idempotency_reused: bool
 
 
+class TransactionImportJobProgress(BaseModel):
+    processed_rows: int = Field(default=0, ge=0)
+    created_count: int = Field(default=0, ge=0)
+    failed_count: int = Field(default=0, ge=0)
+
+
 class TransactionImportJobOut(BaseModel):
     job_id: str
     status: Literal["queued", "running", "completed", "failed"]
@@ -82,3 +155,4 @@ class TransactionImportJobOut(BaseModel):
     completed_at: datetime | None = None
     result: TransactionImportResult | None = None
     error_message: str | None = None
+    progress: TransactionImportJobProgress | None = None
@@ -0,0 +1,247 @@
+"""Maintained per-account running balances.
+
+``apply_transaction_rollups`` folds every transaction write into this table
+alongside the monthly rollups, in the caller's transaction, so
+``GET /accounts/balances`` reads one row per account instead of summing the
+account's history. ``python -m app.cli.reconcile_balances`` recomputes the
+table from the transactions and reports any drift it corrected.
+"""
+
+from datetime import date, timedelta
+from typing import Any, Literal
+
+from sqlalchemy import case, delete, func, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.core.utils import utcnow
+from app.models import Account, AccountBalance, Transaction
+
+_BalanceKey = tuple[str, str]
+HistoryGranularity = Literal["day", "week", "month"]
+
+
+def apply_balance_deltas(db: Session, deltas: dict[_BalanceKey, list[int]]) -> None:
+    """Add ``(user_id, account_id) -> [balance_cents, transaction_count]`` deltas."""
+    now = utcnow()
+    params = [
+        {
+            "account_id": account_id,
+            "user_id": user_id,
+            "balance_cents": balance,
+            "transaction_count": count,
+            "updated_at": now,
+        }
+        # Sorted for the same lock-ordering reason as the rollup upsert.
+        for (user_id, account_id), (balance, count) in sorted(deltas.items())
+        if balance or count
+    ]
+    if not params:
+        return
+
+    table = AccountBalance.__table__
+    dialect = db.get_bind().dialect.name
+    if dialect in {"sqlite", "postgresql"}:
+        insert_fn = sqlite.insert if dialect == "sqlite" else postgresql.insert
+        stmt = insert_fn(table)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["account_id"],
+            set_={
+                "balance_cents": table.c.balance_cents + stmt.excluded.balance_cents,
+                "transaction_count": table.c.transaction_count + stmt.excluded.transaction_count,
+                "updated_at": stmt.excluded.updated_at,
+            },
+        )
+        db.execute(stmt, params)
+        return
+
+    for item in params:
+        row = db.get(AccountBalance, item["account_id"])
+        if row is None:
+            db.add(AccountBalance(**item))
+            continue
+        row.balance_cents += item["balance_cents"]
+        row.transaction_count += item["transaction_count"]
+        row.updated_at = now
+    db.flush()
+
+
+def load_account_balances(db: Session, *, user_id: str, include_archived: bool = False) -> list[dict[str, Any]]:
+    stmt = (
+        select(
+            Account.id,
+            Account.name,
+            Account.archived_at,
+            func.coalesce(AccountBalance.balance_cents, 0).label("balance_cents"),
+            func.coalesce(AccountBalance.transaction_count, 0).label("transaction_count"),
+        )
+        .outerjoin(AccountBalance, AccountBalance.account_id == Account.id)
+        .where(Account.user_id == user_id)
+        .order_by(Account.name.asc(), Account.id.asc())
+    )
+    if not include_archived:
+        stmt = stmt.where(Account.archived_at.is_(None))
+    return [
+        {
+            "account_id": row.id,
+            "name": row.name,
+            "archived_at": row.archived_at,
+            "balance_cents": int(row.balance_cents),
+            "transaction_count": int(row.transaction_count),
+        }
+        for row in db.execute(stmt)
+    ]
+
+
+def bucket_start(value: date, granularity: HistoryGranularity) -> date:
+    if granularity == "week":
+        return value - timedelta(days=value.weekday())
+    if granularity == "month":
+        return value.replace(day=1)
+    return value
+
+
+def _next_bucket(value: date, granularity: HistoryGranularity) -> date:
+    if granularity == "week":
+        return value + timedelta(days=7)
+    if granularity == "month":
+        return date(value.year + 1, 1, 1) if value.month == 12 else date(value.year, value.month + 1, 1)
+    return value + timedelta(days=1)
+
+
+def history_bucket_count(from_: date, to: date, granularity: HistoryGranularity) -> int:
+    """``len(history_buckets(from_, to, granularity))`` without building the list."""
+    start = bucket_start(from_, granularity)
+    if start > to:
+        return 0
+    if granularity == "month":
+        return (to.year - start.year) * 12 + to.month - start.month + 1
+    step = 7 if granularity == "week" else 1
+    return (to - start).days // step + 1
+
+
+def history_buckets(from_: date, to: date, granularity: HistoryGranularity) -> list[date]:
+    buckets: list[date] = []
+    current = bucket_start(from_, granularity)
+    while current <= to:
+        buckets.append(current)
+        current = _next_bucket(current, granularity)
+    return buckets
+
+
+def load_balance_history(
+    db: Session,
+    *,
+    user_id: str,
+    account_id: str,
+    from_: date,
+    to: date,
+    granularity: HistoryGranularity,
+) -> tuple[list[date], list[int]]:
+    """Closing balance of every bucket in [from_, to], as parallel date and cents lists.
+
+    The opening balance is the maintained total minus everything dated on or
+    after ``from_``, so only the account's recent days are aggregated (through
+    the user/date index), one row per day with activity.
+    """
+    signed = case((Transaction.type == "income", Transaction.amount_cents), else_=-Transaction.amount_cents)
+    daily = db.execute(
+        select(Transaction.date, func.sum(signed).label("net_cents"))
+        .where(Transaction.user_id == user_id)
+        .where(Transaction.account_id == account_id)
+        .where(Transaction.archived_at.is_(None))
+        .where(Transaction.date >= from_)
+        .group_by(Transaction.date)
+        .order_by(Transaction.date.asc())
+    ).all()
+    total = db.scalar(select(AccountBalance.balance_cents).where(AccountBalance.account_id == account_id)) or 0
+    balance = int(total) - sum(int(row.net_cents) for row in daily)
+
+    buckets = history_buckets(from_, to, granularity)
+    closing: list[int] = []
+    position = 0
+    for index in range(len(buckets)):
+        end = buckets[index + 1] if index + 1 < len(buckets) else to + timedelta(days=1)
+        while position < len(daily) and daily[position].date < end:
+            balance += int(daily[position].net_cents)
+            position += 1
+        closing.append(balance)
+    return buckets, closing
+
+
+def _scan_balances(db: Session, *, user_id: str | None) -> dict[str, dict[str, Any]]:
+    stmt = (
+        select(
+            Transaction.account_id,
+            Transaction.user_id,
+            func.coalesce(
+                func.sum(case((Transaction.type == "income", Transaction.amount_cents), else_=-Transaction.amount_cents)),
+                0,
+            ).label("balance_cents"),
+            func.count(Transaction.id).label("transaction_count"),
+        )
+        .where(Transaction.archived_at.is_(None))
+        .group_by(Transaction.account_id, Transaction.user_id)
+    )
+    if user_id is not None:
+        stmt = stmt.where(Transaction.user_id == user_id)
+    return {
+        row.account_id: {
+            "user_id": row.user_id,
+            "balance_cents": int(row.balance_cents),
+            "transaction_count": int(row.transaction_count),
+        }
+        for row in db.execute(stmt)
+    }
+
+
+def find_balance_drift(db: Session, *, user_id: str | None = None) -> list[dict[str, Any]]:
+    """Compare stored balances against a live scan and return every mismatching account."""
+    expected = _scan_balances(db, user_id=user_id)
+    stored_stmt = select(AccountBalance)
+    if user_id is not None:
+        stored_stmt = stored_stmt.where(AccountBalance.user_id == user_id)
+    stored = {
+        row.account_id: {
+            "user_id": row.user_id,
+            "balance_cents": int(row.balance_cents),
+            "transaction_count": int(row.transaction_count),
+        }
+        for row in db.scalars(stored_stmt)
+    }
+
+    drift: list[dict[str, Any]] = []
+    for account_id in sorted(set(expected) | set(stored)):
+        want = expected.get(account_id)
+        have = stored.get(account_id)
+        want_values = (want["balance_cents"], want["transaction_count"]) if want else (0, 0)
+        have_values = (have["balance_cents"], have["transaction_count"]) if have else (0, 0)
+        if want_values != have_values:
+            drift.append(
+                {
+                    "user_id": (want or have)["user_id"],
+                    "account_id": account_id,
+                    "expected_cents": want_values[0],
+                    "stored_cents": have_values[0],
+                    "expected_count": want_values[1],
+                    "stored_count": have_values[1],
+                }
+            )
+    return drift
+
+
+def rebuild_balances(db: Session, *, user_id: str | None = None) -> int:
+    """Recompute balances from the transactions table; caller must commit."""
+    delete_stmt = delete(AccountBalance)
+    if user_id is not None:
+        delete_stmt = delete_stmt.where(AccountBalance.user_id == user_id)
+    db.execute(delete_stmt)
+
+    rows = _scan_balances(db, user_id=user_id)
+    if rows:
+        now = utcnow()
+        db.execute(
+            AccountBalance.__table__.insert(),
+            [{"account_id": account_id, **values, "updated_at": now} for account_id, values in rows.items()],
+        )
+    return len(rows)
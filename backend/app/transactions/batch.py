@@ -0,0 +1,213 @@
+"""Mixed create, patch and archive operations on transactions in one request.
+
+``POST /transactions/batch`` validates every operation against one reference
+set and one locked read of the rows it targets, then writes set-based: one
+executemany INSERT for the creates, one UPDATE per distinct change set for the
+patches (so moving a merchant's history to another category is a single
+statement) and one UPDATE for the archives. Rollups, balances and audit events
+are written in bulk and the batch commits once.
+"""
+
+import uuid
+from dataclasses import dataclass
+from typing import Any
+
+from fastapi import Request
+from sqlalchemy import insert, select, update
+from sqlalchemy.orm import Session
+
+from app.core.audit import emit_audit_events
+from app.core.errors import APIError
+from app.core.utils import utcnow
+from app.errors import forbidden_error
+from app.models import Transaction, User
+from app.schemas import TransactionBatchOpResult, TransactionBatchRequest, TransactionBatchResult
+from app.transactions.import_sync import build_import_failure
+from app.transactions.reference_cache import ReferenceSet, load_user_references
+from app.transactions.rollups import TransactionSnapshot, apply_transaction_rollups, snapshot_transaction, snapshot_values
+from app.transactions.validation import (
+    validate_business_rules_with_references,
+    validate_existing_references_with_references,
+    validate_money_rules,
+    validate_transaction_mood,
+)
+
+_REFERENCE_FIELDS = ("type", "account_id", "category_id", "income_source_id")
+
+
+@dataclass(frozen=True)
+class _PlannedPatch:
+    transaction_id: str
+    changes: dict[str, Any]
+    before: TransactionSnapshot | None
+    after: TransactionSnapshot | None
+    action: str
+
+
+def _duplicate_target_error() -> APIError:
+    return APIError(status=409, title="Conflict", detail="Transaction is targeted by more than one operation")
+
+
+def _load_targets(db: Session, user_id: str, transaction_ids: list[str]) -> dict[str, Any]:
+    if not transaction_ids:
+        return {}
+    stmt = (
+        select(Transaction.__table__)
+        .where(Transaction.user_id == user_id)
+        .where(Transaction.id.in_(transaction_ids))
+        .with_for_update()
+    )
+    return {row.id: row for row in db.execute(stmt)}
+
+
+def _plan_create(current_user: User, refs: ReferenceSet, data: dict[str, Any]) -> dict[str, Any]:
+    validate_transaction_mood(data)
+    data["amount_cents"] = validate_money_rules(current_user, data["type"], data["amount_cents"])
+    validate_business_rules_with_references(refs, data)
+    return {"id": str(uuid.uuid4()), "user_id": current_user.id, **data}
+
+
+def _plan_patch(current_user: User, refs: ReferenceSet, row: Any, changes: dict[str, Any]) -> _PlannedPatch:
+    """Validate ``changes`` exactly as ``PATCH /transactions/{id}`` does."""
+    validate_transaction_mood(changes)
+    merged = {**row._mapping, **changes}
+    validate_money_rules(current_user, merged["type"], merged["amount_cents"])
+    if any(key in changes for key in _REFERENCE_FIELDS):
+        validate_business_rules_with_references(refs, merged)
+    else:
+        validate_existing_references_with_references(
+            refs,
+            category_id=row.category_id,
+            income_source_id=row.income_source_id,
+        )
+    after = snapshot_values(current_user.id, merged) if merged["archived_at"] is None else None
+    restored = row.archived_at is not None and merged["archived_at"] is None
+    return _PlannedPatch(
+        transaction_id=row.id,
+        changes=changes,
+        before=snapshot_transaction(row),
+        after=after,
+        action="transaction.restore" if restored else "transaction.update",
+    )
+
+
+def execute_batch(
+    *,
+    payload: TransactionBatchRequest,
+    current_user: User,
+    db: Session,
+    request: Request | None,
+) -> TransactionBatchResult:
+    refs = load_user_references(db, current_user.id)
+    targets = _load_targets(db, current_user.id, [op.id for op in payload.operations if op.op != "create"])
+
+    results: list[TransactionBatchOpResult] = []
+    creates: list[dict[str, Any]] = []
+    patches: list[_PlannedPatch] = []
+    archives: list[Any] = []
+    seen: set[str] = set()
+    for index, operation in enumerate(payload.operations):
+        transaction_id = getattr(operation, "id", None)
+        try:
+            if operation.op == "create":
+                created = _plan_create(current_user, refs, operation.item.model_dump())
+                creates.append(created)
+                transaction_id = created["id"]
+            else:
+                if transaction_id in seen:
+                    raise _duplicate_target_error()
+                seen.add(transaction_id)
+                row = targets.get(transaction_id)
+                if row is None:
+                    raise forbidden_error("Not allowed")
+                if operation.op == "patch":
+                    patches.append(_plan_patch(current_user, refs, row, operation.changes.model_dump(exclude_unset=True)))
+                else:
+                    archives.append(row)
+            results.append(TransactionBatchOpResult(index=index, op=operation.op, id=transaction_id, status="applied"))
+        except Exception as exc:
+            failure = build_import_failure(index, exc)
+            results.append(
+                TransactionBatchOpResult(
+                    index=index,
+                    op=operation.op,
+                    id=transaction_id,
+                    status="failed",
+                    message=failure.message,
+                    problem=failure.problem,
+                )
+            )
+
+    failed_count = sum(1 for result in results if result.status == "failed")
+    if payload.mode == "all_or_nothing" and failed_count:
+        for result in results:
+            if result.status == "applied":
+                result.status = "skipped"
+                if result.op == "create":
+                    result.id = None
+        return TransactionBatchResult(applied_count=0, failed_count=failed_count, results=results)
+
+    _write_batch(db, current_user=current_user, request=request, creates=creates, patches=patches, archives=archives)
+    return TransactionBatchResult(
+        applied_count=len(results) - failed_count,
+        failed_count=failed_count,
+        results=results,
+    )
+
+
+def _write_batch(
+    db: Session,
+    *,
+    current_user: User,
+    request: Request | None,
+    creates: list[dict[str, Any]],
+    patches: list[_PlannedPatch],
+    archives: list[Any],
+) -> None:
+    now = utcnow()
+    if creates:
+        db.execute(insert(Transaction), creates)
+
+    patch_groups: dict[tuple[tuple[str, Any], ...], list[str]] = {}
+    for patch in patches:
+        patch_groups.setdefault(tuple(sorted(patch.changes.items())), []).append(patch.transaction_id)
+    for changes, transaction_ids in patch_groups.items():
+        _update_owned(db, current_user.id, transaction_ids, {**dict(changes), "updated_at": now})
+    if archives:
+        _update_owned(db, current_user.id, [row.id for row in archives], {"archived_at": now, "updated_at": now})
+
+    apply_transaction_rollups(
+        db,
+        [
+            *((None, snapshot_values(current_user.id, row)) for row in creates),
+            *((patch.before, patch.after) for patch in patches),
+            *((snapshot_transaction(row), None) for row in archives),
+        ],
+    )
+
+    audit_ids: dict[str, list[str]] = {
+        "transaction.create": [row["id"] for row in creates],
+        "transaction.update": [patch.transaction_id for patch in patches if patch.action == "transaction.update"],
+        "transaction.restore": [patch.transaction_id for patch in patches if patch.action == "transaction.restore"],
+        "transaction.archive": [row.id for row in archives],
+    }
+    for action, resource_ids in audit_ids.items():
+        emit_audit_events(
+            db,
+            request=request,
+            user_id=current_user.id,
+            resource_type="transaction",
+            resource_ids=resource_ids,
+            action=action,
+        )
+    db.commit()
+
+
+def _update_owned(db: Session, user_id: str, transaction_ids: list[str], values: dict[str, Any]) -> None:
+    db.execute(
+        update(Transaction)
+        .where(Transaction.user_id == user_id)
+        .where(Transaction.id.in_(transaction_ids))
+        .values(**values)
+        .execution_options(synchronize_session=False)
+    )
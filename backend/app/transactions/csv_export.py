@@ -1,13 +1,20 @@
 import csv
 import io
-from typing import Iterator
+import zlib
+from collections.abc import Iterable, Iterator
 
-
-def _csv_line(cells: list[object]) -> str:
-    out = io.StringIO()
-    writer = csv.writer(out, lineterminator="\n")
-    writer.writerow(cells)
-    return out.getvalue()
+CSV_EXPORT_COLUMNS = (
+    "date",
+    "type",
+    "account",
+    "category",
+    "amount_cents",
+    "merchant",
+    "note",
+    "mood",
+    "is_impulse",
+)
+CSV_CHUNK_CHARS = 64 * 1024
 
 
 def _sanitize_csv_text_cell(value: str) -> str:
@@ -16,35 +23,68 @@ def _sanitize_csv_text_cell(value: str) -> str:
     return value
 
 
-def csv_stream(rows) -> Iterator[str]:
-    header = [
-        "date",
-        "type",
-        "account",
-        "category",
-        "amount_cents",
-        "merchant",
-        "note",
-        "mood",
-        "is_impulse",
-    ]
-    yield _csv_line(header)
+def csv_stream(rows, *, chunk_chars: int = CSV_CHUNK_CHARS) -> Iterator[str]:
+    """Yield the header on its own, then rows in chunks of roughly ``chunk_chars`` characters.
+
+    One buffer and writer are reused for the whole export; the early header
+    lets clients start the download before the first batch is fetched.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    writer.writerow(CSV_EXPORT_COLUMNS)
+    yield buffer.getvalue()
+    buffer.seek(0)
+    buffer.truncate()
+
     for tx, account_name, category_name in rows:
-        account = _sanitize_csv_text_cell(account_name or "")
-        category = _sanitize_csv_text_cell(category_name or "")
-        merchant = _sanitize_csv_text_cell(tx.merchant or "")
-        note = _sanitize_csv_text_cell(tx.note or "")
-        yield _csv_line(
-            [
+        writer.writerow(
+            (
                 tx.date.isoformat(),
                 tx.type,
-                account,
-                category,
+                _sanitize_csv_text_cell(account_name or ""),
+                _sanitize_csv_text_cell(category_name or ""),
                 tx.amount_cents,
-                merchant,
-                note,
+                _sanitize_csv_text_cell(tx.merchant or ""),
+                _sanitize_csv_text_cell(tx.note or ""),
                 tx.mood or "",
                 "" if tx.is_impulse is None else str(tx.is_impulse).lower(),
-            ]
+            )
         )
+        if buffer.tell() >= chunk_chars:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def _coding_quality(params: str) -> float:
+    for param in params.split(";"):
+        name, _, value = param.partition("=")
+        if name.strip().lower() == "q":
+            try:
+                return float(value.strip())
+            except ValueError:
+                return 0.0
+    return 1.0
+
+
+def accepts_gzip(accept_encoding: str) -> bool:
+    """An explicit ``gzip`` entry decides; ``*`` only applies when gzip is not listed."""
+    qualities: dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        coding, _, params = part.partition(";")
+        coding = coding.strip().lower()
+        if coding in {"gzip", "*"}:
+            qualities[coding] = _coding_quality(params)
+    quality = qualities.get("gzip", qualities.get("*", 0.0))
+    return quality > 0
+
 
+def gzip_stream(chunks: Iterable[str], *, level: int = 6) -> Iterator[bytes]:
+    # Sync-flush per chunk so every CSV chunk reaches the client as soon as it is written.
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        yield compressor.compress(chunk.encode("utf-8")) + compressor.flush(zlib.Z_SYNC_FLUSH)
+    yield compressor.flush()
@@ -0,0 +1,145 @@
+"""Push-style views of import job status: long-poll and Server-Sent Events.
+
+``GET /transactions/import/jobs/{job_id}?wait=N`` holds the request until the
+job's status or progress changes (or ``N`` seconds pass), and
+``GET /transactions/import/jobs/{job_id}/events`` streams every change as an
+SSE ``status`` event until the job finishes. Both park on an ``asyncio.Event``
+that the job manager sets through ``subscribe`` when it changes the job, so a
+waiting client costs no threads and no database reads while nothing happens.
+
+The in-memory backend notifies for every change, so waiters sleep until woken
+or the deadline passes. The SQL backend only notifies for changes made in this
+process; a job run by another worker is picked up by re-reading it every
+``TRANSACTIONS_IMPORT_ASYNC_POLL_INTERVAL_SECONDS``.
+"""
+
+import asyncio
+import json
+import math
+from collections.abc import AsyncIterator
+
+from starlette.concurrency import run_in_threadpool
+
+from app.transactions.import_jobs import ImportJobManager, _ImportJobRecord, serialize_import_job
+
+SSE_HEARTBEAT_SECONDS = 15.0
+_TERMINAL_STATUSES = {"completed", "failed"}
+
+
+def job_fingerprint(job: _ImportJobRecord) -> tuple[object, ...]:
+    progress = job.progress.model_dump_json() if job.progress is not None else None
+    return job.status, progress, job.completed_at
+
+
+class _JobWatch:
+    def __init__(self, manager: ImportJobManager, job_id: str) -> None:
+        self._loop = asyncio.get_running_loop()
+        self._event = asyncio.Event()
+        self._unsubscribe = manager.subscribe(job_id, self._wake)
+
+    def _wake(self) -> None:
+        # Runs on the manager's thread; only hand off to the event loop.
+        if not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._event.set)
+
+    def clear(self) -> None:
+        self._event.clear()
+
+    async def wait(self, timeout_seconds: float) -> None:
+        try:
+            await asyncio.wait_for(self._event.wait(), timeout=max(0.0, timeout_seconds))
+        except asyncio.TimeoutError:
+            pass
+
+    def __enter__(self) -> "_JobWatch":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self._unsubscribe()
+
+
+def _reread_interval(manager: ImportJobManager, poll_seconds: float) -> float:
+    return math.inf if manager.notifies_all_changes else poll_seconds
+
+
+async def _load_job(manager: ImportJobManager, *, user_id: str, job_id: str) -> _ImportJobRecord | None:
+    return await run_in_threadpool(manager.get_for_user, user_id=user_id, job_id=job_id)
+
+
+async def wait_for_job_change(
+    manager: ImportJobManager,
+    *,
+    user_id: str,
+    job_id: str,
+    timeout_seconds: float,
+    poll_seconds: float,
+) -> _ImportJobRecord | None:
+    """Return the job once it changes or is terminal, or as it stands at the deadline."""
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout_seconds
+    reread_seconds = _reread_interval(manager, poll_seconds)
+    baseline: tuple[object, ...] | None = None
+    with _JobWatch(manager, job_id) as watch:
+        while True:
+            # Clear before reading so a change landing mid-read still wakes the next wait.
+            watch.clear()
+            job = await _load_job(manager, user_id=user_id, job_id=job_id)
+            if job is None or job.status in _TERMINAL_STATUSES:
+                return job
+            fingerprint = job_fingerprint(job)
+            if baseline is None:
+                baseline = fingerprint
+            elif fingerprint != baseline:
+                return job
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                return job
+            await watch.wait(min(remaining, reread_seconds))
+
+
+def format_sse(*, event: str, event_id: int, data: dict) -> str:
+    return f"event: {event}\nid: {event_id}\ndata: {json.dumps(data, separators=(',', ':'))}\n\n"
+
+
+async def job_event_stream(
+    manager: ImportJobManager,
+    *,
+    user_id: str,
+    job_id: str,
+    poll_seconds: float,
+    max_seconds: float,
+    heartbeat_seconds: float = SSE_HEARTBEAT_SECONDS,
+) -> AsyncIterator[str]:
+    """Yield one ``status`` event per observed change, ending after the terminal one.
+
+    Comment-only heartbeats keep idle proxies from closing the connection; the
+    stream also ends after ``max_seconds`` so clients reconnect periodically.
+    """
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + max_seconds
+    reread_seconds = _reread_interval(manager, poll_seconds)
+    last_sent = loop.time()
+    last_fingerprint: tuple[object, ...] | None = None
+    event_id = 0
+    with _JobWatch(manager, job_id) as watch:
+        while True:
+            watch.clear()
+            job = await _load_job(manager, user_id=user_id, job_id=job_id)
+            if job is None:
+                return
+            now = loop.time()
+            fingerprint = job_fingerprint(job)
+            if fingerprint != last_fingerprint:
+                last_fingerprint = fingerprint
+                event_id += 1
+                last_sent = now
+                yield format_sse(event="status", event_id=event_id, data=serialize_import_job(job))
+                if job.status in _TERMINAL_STATUSES:
+                    return
+            elif now - last_sent >= heartbeat_seconds:
+                last_sent = now
+                yield ": keep-alive\n\n"
+            remaining = deadline - now
+            if remaining <= 0:
+                return
+            await watch.wait(min(remaining, reread_seconds, heartbeat_seconds - (now - last_sent)))
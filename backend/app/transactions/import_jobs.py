@@ -1,43 +1,50 @@
 import hashlib
 import json
+import heapq
 import logging
 from collections import deque
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 from threading import Condition, Lock, Thread
 from time import monotonic
-from typing import Callable, Literal
+from typing import Callable, Literal, Protocol, TypeVar
 from uuid import uuid4
 
-from sqlalchemy.orm import Session
-
 from app.core.config import settings
 from app.core.errors import APIError, sanitize_problem_detail
 from app.core.utils import utcnow
-from app.db import SessionLocal
+from app.db import JobsSessionLocal
 from app.errors import rate_limited_error
+from app.models import User
 from app.repositories import SQLAlchemyUserRepository
 from app.schemas import (
     TransactionImportJobOut,
+    TransactionImportJobProgress,
     TransactionImportRequest,
     TransactionImportResult,
 )
-from app.transactions.import_sync import execute_import_payload
+from app.transactions.import_sync import (
+    build_import_failure,
+    execute_import_payload,
+    execute_import_rows,
+)
 
 _IMPORT_LOGGER = logging.getLogger("app.import_jobs")
+_ChunkResult = TypeVar("_ChunkResult")
 
 
 @dataclass
 class _ImportJobRecord:
     job_id: str
     user_id: str
-    payload: TransactionImportRequest
+    payload: TransactionImportRequest | None
     status: Literal["queued", "running", "completed", "failed"]
     created_at: datetime
     started_at: datetime | None = None
     completed_at: datetime | None = None
     result: TransactionImportResult | None = None
     error_message: str | None = None
+    progress: TransactionImportJobProgress | None = None
 
 
 @dataclass
@@ -47,7 +54,89 @@ class _IdempotencyRecord:
     created_at: datetime
 
 
+class ImportJobManager(Protocol):
+    # True when ``subscribe`` callbacks fire for every change a reader could see,
+    # so waiters need no interval re-reads.
+    notifies_all_changes: bool
+
+    def start_workers(self) -> None: ...
+
+    def shutdown(self, *, timeout_seconds: float = 5.0) -> None: ...
+
+    def submit(
+        self,
+        *,
+        user_id: str,
+        payload: TransactionImportRequest,
+        idempotency_key: str | None,
+    ) -> tuple[_ImportJobRecord, bool]: ...
+
+    def get_for_user(self, *, user_id: str, job_id: str) -> _ImportJobRecord | None: ...
+
+    def stats(self) -> tuple[int, int]: ...
+
+    def subscribe(self, job_id: str, callback: Callable[[], None]) -> Callable[[], None]: ...
+
+    def register_stream_job(self, *, user_id: str, job_id: str) -> _ImportJobRecord: ...
+
+    def report_progress(self, job_id: str, progress: TransactionImportJobProgress) -> None: ...
+
+    def complete_stream_job(
+        self,
+        job_id: str,
+        *,
+        result: TransactionImportResult | None = None,
+        error_message: str | None = None,
+    ) -> None: ...
+
+
+class JobChangeSubscribers:
+    """Callbacks to run when a job's state changes in this process.
+
+    Callbacks run on whichever thread made the change (often while a manager
+    lock is held), so they must only hand off, e.g. ``loop.call_soon_threadsafe``.
+    """
+
+    def __init__(self) -> None:
+        self._lock = Lock()
+        self._callbacks: dict[str, set[Callable[[], None]]] = {}
+
+    def subscribe(self, job_id: str, callback: Callable[[], None]) -> Callable[[], None]:
+        with self._lock:
+            self._callbacks.setdefault(job_id, set()).add(callback)
+
+        def _unsubscribe() -> None:
+            with self._lock:
+                callbacks = self._callbacks.get(job_id)
+                if callbacks is not None:
+                    callbacks.discard(callback)
+                    if not callbacks:
+                        self._callbacks.pop(job_id, None)
+
+        return _unsubscribe
+
+    def notify(self, job_id: str) -> None:
+        with self._lock:
+            callbacks = list(self._callbacks.get(job_id, ()))
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception:
+                _IMPORT_LOGGER.warning("event=import_job_subscriber_failed job_id=%s", job_id, exc_info=True)
+
+
+def duplicate_job_id_error() -> APIError:
+    return APIError(status=409, title="Conflict", detail="Import job id already exists")
+
+
+def payload_digest(payload: TransactionImportRequest) -> str:
+    raw = json.dumps(payload.model_dump(mode="json"), sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
 class _ImportJobManager:
+    notifies_all_changes = True
+
     def __init__(
         self,
         *,
@@ -57,6 +146,7 @@ class _ImportJobManager:
         terminal_ttl_seconds: int,
         idempotency_ttl_seconds: int,
         retained_terminal_cap: int,
+        chunk_size: int = 100,
         now_fn: Callable[[], datetime] = utcnow,
     ) -> None:
         self._per_user_limit = max(1, per_user_limit)
@@ -65,14 +155,20 @@ class _ImportJobManager:
         self._terminal_ttl_seconds = max(1, terminal_ttl_seconds)
         self._idempotency_ttl_seconds = max(1, idempotency_ttl_seconds)
         self._retained_terminal_cap = max(1, retained_terminal_cap)
+        self._chunk_size = max(1, chunk_size)
         self._now = now_fn
         self._lock = Lock()
         self._condition = Condition(self._lock)
         self._jobs: dict[str, _ImportJobRecord] = {}
         self._queue: deque[str] = deque()
+        self._chunk_tasks: deque[Callable[[], None]] = deque()
         self._active_per_user: dict[str, int] = {}
         self._idempotency: dict[tuple[str, str], _IdempotencyRecord] = {}
         self._idempotency_by_job: dict[str, set[tuple[str, str]]] = {}
+        self._idempotency_heap: list[tuple[datetime, tuple[str, str], str]] = []
+        self._terminal_ids: set[str] = set()
+        self._terminal_heap: list[tuple[datetime, datetime, str]] = []
+        self._subscribers = JobChangeSubscribers()
         self._running = 0
         self._workers_started = False
         self._workers: list[Thread] = []
@@ -120,8 +216,7 @@ class _ImportJobManager:
         )
 
     def _payload_digest(self, payload: TransactionImportRequest) -> str:
-        raw = json.dumps(payload.model_dump(mode="json"), sort_keys=True, separators=(",", ":"))
-        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+        return payload_digest(payload)
 
     def _is_terminal(self, job: _ImportJobRecord) -> bool:
         return job.status in {"completed", "failed"} and job.completed_at is not None
@@ -141,6 +236,7 @@ class _ImportJobManager:
         removed_job = self._jobs.pop(job_id, None)
         if removed_job is None:
             return False, 0
+        self._terminal_ids.discard(job_id)
         idempotency_keys = self._idempotency_by_job.pop(job_id, set())
         removed_idempotency = 0
         for key in idempotency_keys:
@@ -149,54 +245,45 @@ class _ImportJobManager:
                 removed_idempotency += 1
         return True, removed_idempotency
 
+    def _track_terminal_locked(self, job: _ImportJobRecord) -> None:
+        if job.job_id in self._terminal_ids or not self._is_terminal(job):
+            return
+        self._terminal_ids.add(job.job_id)
+        heapq.heappush(self._terminal_heap, (job.completed_at, job.created_at, job.job_id))
+
     def _cleanup_locked(self, *, now: datetime | None = None) -> None:
+        """Evict expired/overflowing terminal jobs and expired idempotency keys.
+
+        Both are kept in expiry-ordered heaps, so a call that has nothing to
+        evict only peeks at two heap heads and eviction is O(log n) per item.
+        """
         current = now or self._now()
         terminal_cutoff = current - timedelta(seconds=self._terminal_ttl_seconds)
         idempotency_cutoff = current - timedelta(seconds=self._idempotency_ttl_seconds)
 
-        if self._queue:
-            self._queue = deque(
-                job_id
-                for job_id in self._queue
-                if (job := self._jobs.get(job_id)) is not None and job.status == "queued"
-            )
-
         jobs_evicted = 0
         idempotency_evicted = 0
 
-        expired_job_ids = [
-            job_id
-            for job_id, job in self._jobs.items()
-            if self._is_terminal(job) and job.completed_at is not None and job.completed_at <= terminal_cutoff
-        ]
-        for job_id in expired_job_ids:
+        while self._terminal_heap:
+            completed_at, _, job_id = self._terminal_heap[0]
+            job = self._jobs.get(job_id)
+            if job_id not in self._terminal_ids or job is None or job.completed_at != completed_at:
+                # Entry left behind by a job that was already removed.
+                heapq.heappop(self._terminal_heap)
+                continue
+            if completed_at > terminal_cutoff and len(self._terminal_ids) <= self._retained_terminal_cap:
+                break
+            heapq.heappop(self._terminal_heap)
             removed, removed_refs = self._remove_job_locked(job_id)
             if removed:
                 jobs_evicted += 1
             idempotency_evicted += removed_refs
 
-        terminal_jobs = [job for job in self._jobs.values() if self._is_terminal(job)]
-        overflow = len(terminal_jobs) - self._retained_terminal_cap
-        if overflow > 0:
-            terminal_jobs.sort(
-                key=lambda job: (
-                    job.completed_at or job.created_at,
-                    job.created_at,
-                    job.job_id,
-                )
-            )
-            for job in terminal_jobs[:overflow]:
-                removed, removed_refs = self._remove_job_locked(job.job_id)
-                if removed:
-                    jobs_evicted += 1
-                idempotency_evicted += removed_refs
-
-        stale_idempotency_keys = [
-            key
-            for key, ref in self._idempotency.items()
-            if ref.created_at <= idempotency_cutoff or ref.job_id not in self._jobs
-        ]
-        for key in stale_idempotency_keys:
+        while self._idempotency_heap and self._idempotency_heap[0][0] <= idempotency_cutoff:
+            created_at, key, job_id = heapq.heappop(self._idempotency_heap)
+            ref = self._idempotency.get(key)
+            if ref is None or ref.job_id != job_id or ref.created_at != created_at:
+                continue
             if self._remove_idempotency_ref_locked(key):
                 idempotency_evicted += 1
 
@@ -278,6 +365,7 @@ class _ImportJobManager:
                     created_at=now,
                 )
                 self._idempotency_by_job.setdefault(job.job_id, set()).add(idempotency_key_ref)
+                heapq.heappush(self._idempotency_heap, (now, idempotency_key_ref, job.job_id))
             self._condition.notify()
 
             _IMPORT_LOGGER.info(
@@ -298,26 +386,213 @@ class _ImportJobManager:
                 return None
             return job
 
+    def stats(self) -> tuple[int, int]:
+        """Return ``(queued, running)`` for this process."""
+        with self._condition:
+            return len(self._queue), self._running
+
+    def subscribe(self, job_id: str, callback: Callable[[], None]) -> Callable[[], None]:
+        return self._subscribers.subscribe(job_id, callback)
+
+    def register_stream_job(self, *, user_id: str, job_id: str) -> _ImportJobRecord:
+        """Track a streamed import that the request handler runs itself."""
+        with self._condition:
+            now = self._now()
+            self._cleanup_locked(now=now)
+            if job_id in self._jobs:
+                raise duplicate_job_id_error()
+            if self._active_per_user.get(user_id, 0) >= self._per_user_limit:
+                _IMPORT_LOGGER.warning(
+                    "event=import_job_rejected reason=per_user_limit user_id=%s queue_depth=%s running=%s",
+                    user_id,
+                    len(self._queue),
+                    self._running,
+                )
+                raise rate_limited_error("Too many active import jobs for this user", retry_after=1)
+
+            job = _ImportJobRecord(
+                job_id=job_id,
+                user_id=user_id,
+                payload=None,
+                status="running",
+                created_at=now,
+                started_at=now,
+                progress=TransactionImportJobProgress(),
+            )
+            self._jobs[job_id] = job
+            self._running += 1
+            self._active_per_user[user_id] = self._active_per_user.get(user_id, 0) + 1
+            _IMPORT_LOGGER.info(
+                "event=import_stream_started job_id=%s user_id=%s running=%s active_user=%s",
+                job_id,
+                user_id,
+                self._running,
+                self._active_per_user[user_id],
+            )
+            return job
+
+    def report_progress(self, job_id: str, progress: TransactionImportJobProgress) -> None:
+        with self._condition:
+            job = self._jobs.get(job_id)
+            if job is not None and job.status == "running":
+                job.progress = progress
+                self._condition.notify_all()
+                self._subscribers.notify(job_id)
+
+    def complete_stream_job(
+        self,
+        job_id: str,
+        *,
+        result: TransactionImportResult | None = None,
+        error_message: str | None = None,
+    ) -> None:
+        with self._condition:
+            job = self._jobs.get(job_id)
+            if job is None or job.status != "running":
+                return
+            job.status = "failed" if error_message is not None else "completed"
+            job.completed_at = self._now()
+            job.result = result
+            job.error_message = error_message
+            self._release_locked(job)
+
+    def _release_locked(self, job: _ImportJobRecord) -> None:
+        active = self._active_per_user.get(job.user_id, 0)
+        if active <= 1:
+            self._active_per_user.pop(job.user_id, None)
+        else:
+            self._active_per_user[job.user_id] = active - 1
+        _IMPORT_LOGGER.info(
+            "event=import_job_finished job_id=%s user_id=%s status=%s queue_depth=%s running=%s",
+            job.job_id,
+            job.user_id,
+            job.status,
+            len(self._queue),
+            max(0, self._running - 1),
+        )
+        self._running = max(0, self._running - 1)
+        self._track_terminal_locked(job)
+        self._cleanup_locked()
+        self._condition.notify_all()
+        self._subscribers.notify(job.job_id)
+
     def _worker_loop(self) -> None:
         while True:
             with self._condition:
                 self._cleanup_locked()
-                while not self._queue and not self._stop_requested:
+                while not self._queue and not self._chunk_tasks and not self._stop_requested:
                     self._condition.wait()
                     self._cleanup_locked()
-                if self._stop_requested and not self._queue:
-                    return
-                if not self._queue:
-                    continue
-                job_id = self._queue.popleft()
-                job = self._jobs.get(job_id)
-                if job is None:
-                    continue
-                job.status = "running"
-                job.started_at = self._now()
-                self._running += 1
+                # Chunks of a job that is already running go ahead of new jobs.
+                chunk_task = self._chunk_tasks.popleft() if self._chunk_tasks else None
+                if chunk_task is None:
+                    if self._stop_requested and not self._queue:
+                        return
+                    if not self._queue:
+                        continue
+                    job_id = self._queue.popleft()
+                    job = self._jobs.get(job_id)
+                    if job is None:
+                        continue
+                    job.status = "running"
+                    job.started_at = self._now()
+                    self._running += 1
+                    self._subscribers.notify(job_id)
+            if chunk_task is not None:
+                chunk_task()
+                continue
             self._process_job(job_id)
 
+    def _map_chunks(
+        self,
+        fn: Callable[[list[tuple[int, dict]]], _ChunkResult],
+        chunks: list[list[tuple[int, dict]]],
+    ) -> list[_ChunkResult]:
+        """Run ``fn`` over ``chunks`` on idle workers; results come back in chunk order.
+
+        The calling worker drains the chunk queue too, so a job still finishes
+        when every other worker is busy or the pool has a single thread.
+        """
+        results: list[_ChunkResult | None] = [None] * len(chunks)
+        errors: list[BaseException] = []
+        pending = [len(chunks)]
+
+        def _task(position: int, chunk: list[tuple[int, dict]]) -> Callable[[], None]:
+            def _run() -> None:
+                try:
+                    results[position] = fn(chunk)
+                except BaseException as exc:
+                    errors.append(exc)
+                finally:
+                    with self._condition:
+                        pending[0] -= 1
+                        self._condition.notify_all()
+
+            return _run
+
+        with self._condition:
+            self._chunk_tasks.extend(_task(position, chunk) for position, chunk in enumerate(chunks))
+            self._condition.notify_all()
+        while True:
+            with self._condition:
+                if pending[0] == 0:
+                    break
+                if not self._chunk_tasks:
+                    self._condition.wait()
+                    continue
+                task = self._chunk_tasks.popleft()
+            task()
+        if errors:
+            raise errors[0]
+        return results  # type: ignore[return-value]
+
+    def _execute_chunked(
+        self,
+        job_id: str,
+        payload: TransactionImportRequest,
+        user: User,
+    ) -> TransactionImportResult:
+        """Import a partial-mode job chunk by chunk, each chunk in its own jobs-pool session."""
+        rows = [(index, item.model_dump()) for index, item in enumerate(payload.items)]
+        chunks = [rows[start : start + self._chunk_size] for start in range(0, len(rows), self._chunk_size)]
+        progress_lock = Lock()
+        totals = TransactionImportJobProgress(processed_rows=0, created_count=0, failed_count=0)
+
+        def _import_chunk(chunk: list[tuple[int, dict]]) -> TransactionImportResult:
+            try:
+                with JobsSessionLocal() as chunk_db:
+                    result = execute_import_rows(
+                        rows=chunk,
+                        mode="partial",
+                        current_user=user,
+                        db=chunk_db,
+                        request=None,
+                    )
+            except Exception as exc:
+                # Other chunks may already be committed, so fail this chunk's rows rather than the job.
+                _IMPORT_LOGGER.warning(
+                    "event=import_job_chunk_failed job_id=%s first_index=%s",
+                    job_id,
+                    chunk[0][0],
+                    exc_info=True,
+                )
+                failures = [build_import_failure(index, exc) for index, _ in chunk]
+                result = TransactionImportResult(created_count=0, failed_count=len(failures), failures=failures)
+            with progress_lock:
+                totals.processed_rows += len(chunk)
+                totals.created_count += result.created_count
+                totals.failed_count += result.failed_count
+                self.report_progress(job_id, totals.model_copy())
+            return result
+
+        results = self._map_chunks(_import_chunk, chunks)
+        failures = [failure for result in results for failure in result.failures]
+        return TransactionImportResult(
+            created_count=sum(result.created_count for result in results),
+            failed_count=len(failures),
+            failures=failures,
+        )
+
     def _process_job(self, job_id: str) -> None:
         try:
             with self._condition:
@@ -327,11 +602,20 @@ class _ImportJobManager:
                 user_id = job.user_id
                 payload = job.payload.model_copy(deep=True)
 
-            with SessionLocal() as db:
+            # all_or_nothing jobs need one transaction, so only partial jobs are chunked.
+            chunked = (
+                payload.mode == "partial" and self._worker_count > 1 and len(payload.items) > self._chunk_size
+            )
+            with JobsSessionLocal() as db:
                 user = SQLAlchemyUserRepository(db).get_by_id(user_id)
                 if user is None:
                     raise APIError(status=403, title="Forbidden", detail="User no longer exists")
-                result = execute_import_payload(payload=payload, current_user=user, db=db, request=None)
+                if not chunked:
+                    result = execute_import_payload(payload=payload, current_user=user, db=db, request=None)
+            if chunked:
+                # The owner session is closed first: chunks take their own jobs-pool
+                # connections, and holding one here would starve them.
+                result = self._execute_chunked(job_id, payload, user)
 
             with self._condition:
                 current = self._jobs.get(job_id)
@@ -355,22 +639,11 @@ class _ImportJobManager:
             with self._condition:
                 current = self._jobs.get(job_id)
                 if current is not None:
-                    active = self._active_per_user.get(current.user_id, 0)
-                    if active <= 1:
-                        self._active_per_user.pop(current.user_id, None)
-                    else:
-                        self._active_per_user[current.user_id] = active - 1
-                    _IMPORT_LOGGER.info(
-                        "event=import_job_finished job_id=%s user_id=%s status=%s queue_depth=%s running=%s",
-                        current.job_id,
-                        current.user_id,
-                        current.status,
-                        len(self._queue),
-                        max(0, self._running - 1),
-                    )
-                self._running = max(0, self._running - 1)
-                self._cleanup_locked()
-                self._condition.notify_all()
+                    self._release_locked(current)
+                else:
+                    self._running = max(0, self._running - 1)
+                    self._cleanup_locked()
+                    self._condition.notify_all()
 
 
 def serialize_import_job(job: _ImportJobRecord) -> dict:
@@ -382,15 +655,37 @@ def serialize_import_job(job: _ImportJobRecord) -> dict:
         completed_at=job.completed_at,
         result=job.result,
         error_message=job.error_message,
+        progress=job.progress,
     ).model_dump(mode="json")
 
 
-IMPORT_JOB_MANAGER = _ImportJobManager(
-    per_user_limit=settings.transactions_import_async_per_user_limit,
-    queue_limit=settings.transactions_import_async_queue_limit,
-    worker_count=settings.transactions_import_async_worker_count,
-    terminal_ttl_seconds=settings.transactions_import_async_terminal_ttl_seconds,
-    idempotency_ttl_seconds=settings.transactions_import_async_idempotency_ttl_seconds,
-    retained_terminal_cap=settings.transactions_import_async_retained_terminal_cap,
-)
+def build_import_job_manager() -> ImportJobManager:
+    if settings.transactions_import_async_backend == "sql":
+        from app.transactions.import_jobs_sql import _SQLImportJobManager
+
+        return _SQLImportJobManager(
+            per_user_limit=settings.transactions_import_async_per_user_limit,
+            queue_limit=settings.transactions_import_async_queue_limit,
+            worker_count=settings.transactions_import_async_worker_count,
+            terminal_ttl_seconds=settings.transactions_import_async_terminal_ttl_seconds,
+            idempotency_ttl_seconds=settings.transactions_import_async_idempotency_ttl_seconds,
+            retained_terminal_cap=settings.transactions_import_async_retained_terminal_cap,
+            visibility_timeout_seconds=settings.transactions_import_async_visibility_timeout_seconds,
+            max_attempts=settings.transactions_import_async_max_attempts,
+            poll_interval_seconds=settings.transactions_import_async_poll_interval_seconds,
+        )
+    # The SQL backend runs each job in a single session; TRANSACTIONS_IMPORT_ASYNC_CHUNK_SIZE
+    # only applies to the in-memory backend.
+    return _ImportJobManager(
+        per_user_limit=settings.transactions_import_async_per_user_limit,
+        queue_limit=settings.transactions_import_async_queue_limit,
+        worker_count=settings.transactions_import_async_worker_count,
+        terminal_ttl_seconds=settings.transactions_import_async_terminal_ttl_seconds,
+        idempotency_ttl_seconds=settings.transactions_import_async_idempotency_ttl_seconds,
+        retained_terminal_cap=settings.transactions_import_async_retained_terminal_cap,
+        chunk_size=settings.transactions_import_async_chunk_size,
+    )
+
+
+IMPORT_JOB_MANAGER: ImportJobManager = build_import_job_manager()
 
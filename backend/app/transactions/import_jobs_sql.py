@@ -0,0 +1,626 @@
+"""Durable import job queue stored in the ``import_jobs`` table.
+
+Any API process can accept or report on a job and any worker process can run
+it. Workers claim jobs with a lease (visibility timeout) that a heartbeat keeps
+extending while the import runs; when a worker dies its lease expires and
+another worker retries the job, up to ``max_attempts`` claims. Postgres claims
+use ``SELECT ... FOR UPDATE SKIP LOCKED``; other dialects fall back to a
+compare-and-set UPDATE on (status, attempts) so two workers can never both win
+the same claim.
+
+Streamed imports (``source='stream'``) are run by the request that uploads
+them; their row only carries status and progress. An expired stream lease
+means the uploading process went away, so such rows fail instead of retrying.
+"""
+
+import logging
+import os
+import socket
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from threading import Event, Lock, Thread
+from time import monotonic
+from typing import Callable
+from uuid import uuid4
+
+from sqlalchemy import and_, case, delete, func, or_, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.core.errors import APIError, sanitize_problem_detail
+from app.core.utils import as_utc, utcnow
+from app.db import JobsSessionLocal, SessionLocal
+from app.errors import rate_limited_error
+from app.models import ImportJob
+from app.repositories import SQLAlchemyUserRepository
+from app.schemas import TransactionImportJobProgress, TransactionImportRequest, TransactionImportResult
+from app.transactions.import_jobs import JobChangeSubscribers, _ImportJobRecord, duplicate_job_id_error, payload_digest
+from app.transactions.import_sync import execute_import_payload
+
+_IMPORT_LOGGER = logging.getLogger("app.import_jobs")
+_ACTIVE_STATUSES = ("queued", "running")
+_TERMINAL_STATUSES = ("completed", "failed")
+
+
+@dataclass(frozen=True)
+class _ClaimedJob:
+    job_id: str
+    user_id: str
+    payload: str
+    attempts: int
+
+
+def _as_utc_or_none(value: datetime | None) -> datetime | None:
+    return as_utc(value) if value is not None else None
+
+
+def _to_record(row: ImportJob) -> _ImportJobRecord:
+    return _ImportJobRecord(
+        job_id=row.id,
+        user_id=row.user_id,
+        payload=None,
+        status=row.status,
+        created_at=as_utc(row.created_at),
+        started_at=_as_utc_or_none(row.started_at),
+        completed_at=_as_utc_or_none(row.completed_at),
+        result=TransactionImportResult.model_validate_json(row.result) if row.result else None,
+        error_message=row.error_message,
+        progress=TransactionImportJobProgress.model_validate_json(row.progress) if row.progress else None,
+    )
+
+
+class _LeaseHeartbeat:
+    """Extends a claimed job's lease until stopped."""
+
+    def __init__(self, manager: "_SQLImportJobManager", job_id: str) -> None:
+        self._manager = manager
+        self._job_id = job_id
+        self._stopped = Event()
+        self._thread = Thread(target=self._run, name=f"import-job-lease-{job_id[:8]}", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+        self._thread.join(timeout=1.0)
+
+    def _run(self) -> None:
+        interval = max(1.0, self._manager._visibility_timeout_seconds / 3)
+        while not self._stopped.wait(interval):
+            try:
+                if not self._manager._renew_lease(self._job_id):
+                    return
+            except Exception:
+                _IMPORT_LOGGER.exception("event=import_job_lease_renew_failed job_id=%s", self._job_id)
+
+
+class _SQLImportJobManager:
+    # Jobs run by other processes change without notifying this one.
+    notifies_all_changes = False
+
+    def __init__(
+        self,
+        *,
+        per_user_limit: int,
+        queue_limit: int,
+        worker_count: int,
+        terminal_ttl_seconds: int,
+        idempotency_ttl_seconds: int,
+        retained_terminal_cap: int,
+        visibility_timeout_seconds: int,
+        max_attempts: int,
+        poll_interval_seconds: float,
+        cleanup_interval_seconds: float = 30.0,
+        session_factory: sessionmaker[Session] = SessionLocal,
+        worker_session_factory: sessionmaker[Session] = JobsSessionLocal,
+        now_fn: Callable[[], datetime] = utcnow,
+    ) -> None:
+        self._per_user_limit = max(1, per_user_limit)
+        self._queue_limit = max(1, queue_limit)
+        self._worker_count = max(0, worker_count)
+        self._terminal_ttl_seconds = max(1, terminal_ttl_seconds)
+        self._idempotency_ttl_seconds = max(1, idempotency_ttl_seconds)
+        self._retained_terminal_cap = max(1, retained_terminal_cap)
+        self._visibility_timeout_seconds = max(1, visibility_timeout_seconds)
+        self._max_attempts = max(1, max_attempts)
+        self._poll_interval_seconds = max(0.01, poll_interval_seconds)
+        self._cleanup_interval_seconds = max(0.0, cleanup_interval_seconds)
+        self._session_factory = session_factory
+        self._worker_session_factory = worker_session_factory
+        self._now = now_fn
+        self._owner = f"{socket.gethostname()[:40]}:{os.getpid()}:{uuid4().hex[:8]}"
+        self._lock = Lock()
+        self._wake = Event()
+        self._subscribers = JobChangeSubscribers()
+        self._stop_requested = False
+        self._workers_started = False
+        self._workers: list[Thread] = []
+        self._last_cleanup = float("-inf")
+
+    def start_workers(self) -> None:
+        with self._lock:
+            self._workers = [worker for worker in self._workers if worker.is_alive()]
+            if self._workers_started and self._workers:
+                return
+            self._stop_requested = False
+            self._workers_started = True
+            for index in range(self._worker_count):
+                thread = Thread(target=self._worker_loop, name=f"import-job-worker-{index + 1}", daemon=False)
+                thread.start()
+                self._workers.append(thread)
+
+    def shutdown(self, *, timeout_seconds: float = 5.0) -> None:
+        timeout = max(0.0, float(timeout_seconds))
+        with self._lock:
+            if not self._workers_started and not self._workers:
+                return
+            self._stop_requested = True
+            workers = list(self._workers)
+        self._wake.set()
+
+        deadline = monotonic() + timeout
+        for worker in workers:
+            worker.join(timeout=max(0.0, deadline - monotonic()))
+
+        still_alive = [worker.name for worker in workers if worker.is_alive()]
+        with self._lock:
+            self._workers = [worker for worker in workers if worker.is_alive()]
+            self._workers_started = bool(self._workers)
+            if not self._workers:
+                self._stop_requested = False
+
+        _IMPORT_LOGGER.info(
+            "event=import_job_workers_shutdown requested=%s joined=%s alive=%s timeout_seconds=%s",
+            len(workers),
+            len(workers) - len(still_alive),
+            len(still_alive),
+            timeout,
+        )
+
+    def _find_idempotent(self, db: Session, *, user_id: str, key: str, now: datetime) -> ImportJob | None:
+        row = db.scalar(
+            select(ImportJob).where(ImportJob.user_id == user_id).where(ImportJob.idempotency_key == key)
+        )
+        if row is None:
+            return None
+        if as_utc(row.created_at) <= now - timedelta(seconds=self._idempotency_ttl_seconds):
+            row.idempotency_key = None
+            db.commit()
+            return None
+        return row
+
+    def _reuse_or_conflict(self, row: ImportJob, digest: str) -> tuple[_ImportJobRecord, bool]:
+        if row.payload_digest != digest:
+            raise APIError(
+                status=409,
+                title="Conflict",
+                detail="Idempotency-Key was reused with a different payload",
+            )
+        return _to_record(row), True
+
+    def _active_counts(self, db: Session, user_id: str) -> tuple[int, int, int]:
+        rows = db.execute(
+            select(
+                ImportJob.status,
+                func.count(ImportJob.id),
+                func.coalesce(func.sum(case((ImportJob.user_id == user_id, 1), else_=0)), 0),
+            )
+            .where(ImportJob.status.in_(_ACTIVE_STATUSES))
+            .group_by(ImportJob.status)
+        )
+        queued = running = active_user = 0
+        for status, count, user_count in rows:
+            if status == "queued":
+                queued = int(count)
+            else:
+                running = int(count)
+            active_user += int(user_count)
+        return queued, running, active_user
+
+    def submit(
+        self,
+        *,
+        user_id: str,
+        payload: TransactionImportRequest,
+        idempotency_key: str | None,
+    ) -> tuple[_ImportJobRecord, bool]:
+        normalized_key = (idempotency_key or "").strip() or None
+        digest = payload_digest(payload)
+        payload_json = payload.model_dump_json()
+
+        if self._stop_requested:
+            raise rate_limited_error("Import workers are shutting down, retry later", retry_after=1)
+
+        with self._session_factory() as db:
+            now = self._now()
+            if normalized_key:
+                existing = self._find_idempotent(db, user_id=user_id, key=normalized_key, now=now)
+                if existing is not None:
+                    return self._reuse_or_conflict(existing, digest)
+
+            queued, running, active_user = self._active_counts(db, user_id)
+            if active_user >= self._per_user_limit:
+                _IMPORT_LOGGER.warning(
+                    "event=import_job_rejected reason=per_user_limit user_id=%s queue_depth=%s running=%s",
+                    user_id,
+                    queued,
+                    running,
+                )
+                raise rate_limited_error("Too many active import jobs for this user", retry_after=1)
+            if queued + running >= self._queue_limit:
+                _IMPORT_LOGGER.warning(
+                    "event=import_job_rejected reason=queue_limit user_id=%s queue_depth=%s running=%s",
+                    user_id,
+                    queued,
+                    running,
+                )
+                raise rate_limited_error("Import queue is full, retry later", retry_after=1)
+
+            row = ImportJob(
+                id=str(uuid4()),
+                user_id=user_id,
+                status="queued",
+                payload=payload_json,
+                payload_digest=digest,
+                idempotency_key=normalized_key,
+                attempts=0,
+                created_at=now,
+            )
+            db.add(row)
+            try:
+                db.commit()
+            except IntegrityError:
+                db.rollback()
+                existing = (
+                    self._find_idempotent(db, user_id=user_id, key=normalized_key, now=now)
+                    if normalized_key
+                    else None
+                )
+                if existing is None:
+                    raise
+                return self._reuse_or_conflict(existing, digest)
+
+            record = _to_record(row)
+
+        self._wake.set()
+        _IMPORT_LOGGER.info(
+            "event=import_job_accepted job_id=%s user_id=%s queue_depth=%s running=%s active_user=%s",
+            record.job_id,
+            user_id,
+            queued + 1,
+            running,
+            active_user + 1,
+        )
+        return record, False
+
+    def get_for_user(self, *, user_id: str, job_id: str) -> _ImportJobRecord | None:
+        with self._session_factory() as db:
+            row = db.scalar(select(ImportJob).where(ImportJob.id == job_id).where(ImportJob.user_id == user_id))
+            return _to_record(row) if row is not None else None
+
+    def subscribe(self, job_id: str, callback: Callable[[], None]) -> Callable[[], None]:
+        """Only changes made by this process notify; readers poll for the rest."""
+        return self._subscribers.subscribe(job_id, callback)
+
+    def stats(self) -> tuple[int, int]:
+        """Return ``(queued, running)`` across every worker sharing the table."""
+        with self._worker_session_factory() as db:
+            queued, running, _ = self._active_counts(db, "")
+            return queued, running
+
+    def register_stream_job(self, *, user_id: str, job_id: str) -> _ImportJobRecord:
+        """Insert a running row for a streamed import that the calling request executes."""
+        with self._session_factory() as db:
+            now = self._now()
+            if db.get(ImportJob, job_id) is not None:
+                raise duplicate_job_id_error()
+            queued, running, active_user = self._active_counts(db, user_id)
+            if active_user >= self._per_user_limit:
+                _IMPORT_LOGGER.warning(
+                    "event=import_job_rejected reason=per_user_limit user_id=%s queue_depth=%s running=%s",
+                    user_id,
+                    queued,
+                    running,
+                )
+                raise rate_limited_error("Too many active import jobs for this user", retry_after=1)
+
+            row = ImportJob(
+                id=job_id,
+                user_id=user_id,
+                status="running",
+                source="stream",
+                payload="",
+                payload_digest="",
+                attempts=1,
+                lease_owner=self._owner,
+                lease_expires_at=now + timedelta(seconds=self._visibility_timeout_seconds),
+                progress=TransactionImportJobProgress().model_dump_json(),
+                created_at=now,
+                started_at=now,
+            )
+            db.add(row)
+            try:
+                db.commit()
+            except IntegrityError:
+                db.rollback()
+                raise duplicate_job_id_error() from None
+            record = _to_record(row)
+
+        _IMPORT_LOGGER.info(
+            "event=import_stream_started job_id=%s user_id=%s running=%s active_user=%s",
+            job_id,
+            user_id,
+            running + 1,
+            active_user + 1,
+        )
+        return record
+
+    def report_progress(self, job_id: str, progress: TransactionImportJobProgress) -> None:
+        """Publish stream progress; doubles as the stream's lease heartbeat."""
+        now = self._now()
+        with self._session_factory() as db:
+            db.execute(
+                update(ImportJob)
+                .where(ImportJob.id == job_id)
+                .where(ImportJob.lease_owner == self._owner)
+                .where(ImportJob.status == "running")
+                .values(
+                    progress=progress.model_dump_json(),
+                    lease_expires_at=now + timedelta(seconds=self._visibility_timeout_seconds),
+                )
+            )
+            db.commit()
+        self._subscribers.notify(job_id)
+
+    def complete_stream_job(
+        self,
+        job_id: str,
+        *,
+        result: TransactionImportResult | None = None,
+        error_message: str | None = None,
+    ) -> None:
+        status = "failed" if error_message is not None else "completed"
+        with self._session_factory() as db:
+            finished = self._finish(db, job_id, status=status, result=result, error_message=error_message)
+            db.commit()
+        self._subscribers.notify(job_id)
+        _IMPORT_LOGGER.info(
+            "event=import_job_finished job_id=%s status=%s",
+            job_id,
+            status if finished else "lease_lost",
+        )
+
+    def _claimable(self, now: datetime):
+        return or_(
+            ImportJob.status == "queued",
+            and_(ImportJob.status == "running", ImportJob.lease_expires_at < now),
+        )
+
+    def _claim_next(self) -> _ClaimedJob | None:
+        now = self._now()
+        with self._worker_session_factory() as db:
+            stmt = (
+                select(
+                    ImportJob.id,
+                    ImportJob.user_id,
+                    ImportJob.status,
+                    ImportJob.source,
+                    ImportJob.attempts,
+                    ImportJob.payload,
+                )
+                .where(self._claimable(now))
+                .order_by(ImportJob.created_at, ImportJob.id)
+            )
+            if db.get_bind().dialect.name == "postgresql":
+                candidates = list(db.execute(stmt.limit(1).with_for_update(skip_locked=True)))
+            else:
+                candidates = list(db.execute(stmt.limit(max(1, self._worker_count) * 2)))
+
+            for row in candidates:
+                guard = (
+                    (ImportJob.id == row.id)
+                    & (ImportJob.status == row.status)
+                    & (ImportJob.attempts == row.attempts)
+                )
+                interrupted_stream = row.source == "stream"
+                if row.status == "running" and (interrupted_stream or row.attempts >= self._max_attempts):
+                    exhausted = db.execute(
+                        update(ImportJob)
+                        .where(guard)
+                        .values(
+                            status="failed",
+                            completed_at=now,
+                            error_message=(
+                                "Import stream was interrupted"
+                                if interrupted_stream
+                                else "Import job exceeded retry attempts"
+                            ),
+                            lease_owner=None,
+                            lease_expires_at=None,
+                        )
+                    )
+                    db.commit()
+                    if exhausted.rowcount == 1:
+                        _IMPORT_LOGGER.warning(
+                            "event=import_job_abandoned job_id=%s user_id=%s attempts=%s",
+                            row.id,
+                            row.user_id,
+                            row.attempts,
+                        )
+                    continue
+
+                claimed = db.execute(
+                    update(ImportJob)
+                    .where(guard)
+                    .values(
+                        status="running",
+                        attempts=row.attempts + 1,
+                        lease_owner=self._owner,
+                        lease_expires_at=now + timedelta(seconds=self._visibility_timeout_seconds),
+                        started_at=func.coalesce(ImportJob.started_at, now),
+                    )
+                )
+                if claimed.rowcount == 1:
+                    db.commit()
+                    if row.status == "running":
+                        _IMPORT_LOGGER.warning(
+                            "event=import_job_retried job_id=%s user_id=%s attempt=%s",
+                            row.id,
+                            row.user_id,
+                            row.attempts + 1,
+                        )
+                    return _ClaimedJob(
+                        job_id=row.id,
+                        user_id=row.user_id,
+                        payload=row.payload,
+                        attempts=row.attempts + 1,
+                    )
+                db.rollback()
+            db.commit()
+        return None
+
+    def _renew_lease(self, job_id: str) -> bool:
+        now = self._now()
+        with self._worker_session_factory() as db:
+            renewed = db.execute(
+                update(ImportJob)
+                .where(ImportJob.id == job_id)
+                .where(ImportJob.lease_owner == self._owner)
+                .where(ImportJob.status == "running")
+                .values(lease_expires_at=now + timedelta(seconds=self._visibility_timeout_seconds))
+            )
+            db.commit()
+            return renewed.rowcount == 1
+
+    def _finish(
+        self,
+        db: Session,
+        job_id: str,
+        *,
+        status: str,
+        result: TransactionImportResult | None,
+        error_message: str | None,
+    ) -> bool:
+        finished = db.execute(
+            update(ImportJob)
+            .where(ImportJob.id == job_id)
+            .where(ImportJob.lease_owner == self._owner)
+            .where(ImportJob.status == "running")
+            .values(
+                status=status,
+                completed_at=self._now(),
+                result=result.model_dump_json() if result is not None else None,
+                error_message=error_message,
+                lease_owner=None,
+                lease_expires_at=None,
+            )
+        )
+        return finished.rowcount == 1
+
+    def _process_claim(self, claim: _ClaimedJob) -> None:
+        heartbeat = _LeaseHeartbeat(self, claim.job_id)
+        heartbeat.start()
+        status = "failed"
+        try:
+            payload = TransactionImportRequest.model_validate_json(claim.payload)
+            with self._worker_session_factory() as db:
+                user = SQLAlchemyUserRepository(db).get_by_id(claim.user_id)
+                if user is None:
+                    raise APIError(status=403, title="Forbidden", detail="User no longer exists")
+                result = execute_import_payload(payload=payload, current_user=user, db=db, request=None, commit=False)
+                # The job row flips to completed in the same transaction as the imported rows,
+                # so a lease lost mid-import cannot produce a duplicate batch on retry.
+                if self._finish(db, claim.job_id, status="completed", result=result, error_message=None):
+                    db.commit()
+                    status = "completed"
+                else:
+                    db.rollback()
+                    status = "lease_lost"
+        except Exception as exc:
+            if isinstance(exc, APIError):
+                message = sanitize_problem_detail(exc.detail) or exc.title
+            else:
+                message = "Import job failed"
+            with self._worker_session_factory() as db:
+                if self._finish(db, claim.job_id, status="failed", result=None, error_message=message):
+                    db.commit()
+                else:
+                    status = "lease_lost"
+        finally:
+            heartbeat.stop()
+            self._subscribers.notify(claim.job_id)
+            _IMPORT_LOGGER.info(
+                "event=import_job_finished job_id=%s user_id=%s status=%s attempt=%s",
+                claim.job_id,
+                claim.user_id,
+                status,
+                claim.attempts,
+            )
+
+    def run_once(self) -> bool:
+        """Claim and process at most one job; returns whether a job was claimed."""
+        claim = self._claim_next()
+        if claim is None:
+            return False
+        self._subscribers.notify(claim.job_id)
+        self._process_claim(claim)
+        return True
+
+    def cleanup(self) -> None:
+        now = self._now()
+        terminal_cutoff = now - timedelta(seconds=self._terminal_ttl_seconds)
+        idempotency_cutoff = now - timedelta(seconds=self._idempotency_ttl_seconds)
+        with self._worker_session_factory() as db:
+            terminal = ImportJob.status.in_(_TERMINAL_STATUSES)
+            jobs_evicted = db.execute(
+                delete(ImportJob).where(terminal).where(ImportJob.completed_at <= terminal_cutoff)
+            ).rowcount
+
+            retained = db.scalar(select(func.count(ImportJob.id)).where(terminal)) or 0
+            overflow = retained - self._retained_terminal_cap
+            if overflow > 0:
+                overflow_ids = list(
+                    db.scalars(
+                        select(ImportJob.id)
+                        .where(terminal)
+                        .order_by(ImportJob.completed_at, ImportJob.created_at, ImportJob.id)
+                        .limit(overflow)
+                    )
+                )
+                jobs_evicted += db.execute(delete(ImportJob).where(ImportJob.id.in_(overflow_ids))).rowcount
+
+            idempotency_evicted = db.execute(
+                update(ImportJob)
+                .where(ImportJob.idempotency_key.is_not(None))
+                .where(ImportJob.created_at <= idempotency_cutoff)
+                .values(idempotency_key=None)
+            ).rowcount
+            db.commit()
+
+        if jobs_evicted or idempotency_evicted:
+            _IMPORT_LOGGER.info(
+                "event=import_job_cleanup jobs_evicted=%s idempotency_evicted=%s",
+                jobs_evicted,
+                idempotency_evicted,
+            )
+
+    def _maybe_cleanup(self) -> None:
+        current = monotonic()
+        with self._lock:
+            if current - self._last_cleanup < self._cleanup_interval_seconds:
+                return
+            self._last_cleanup = current
+        self.cleanup()
+
+    def _worker_loop(self) -> None:
+        while not self._stop_requested:
+            processed = False
+            try:
+                self._maybe_cleanup()
+                processed = self.run_once()
+            except Exception:
+                _IMPORT_LOGGER.exception("event=import_job_worker_error owner=%s", self._owner)
+            if not processed and not self._stop_requested:
+                self._wake.wait(self._poll_interval_seconds)
+                self._wake.clear()
@@ -0,0 +1,273 @@
+"""Streaming CSV / NDJSON transaction imports.
+
+The request body is consumed incrementally: records are parsed as bytes
+arrive, grouped into chunks of ``chunk_size`` rows and imported chunk by
+chunk, each chunk in its own database transaction (partial mode only, so the
+whole upload never has to be held in memory). After every chunk the running
+totals are published to the import job manager, which is what
+``GET /transactions/import/jobs/{job_id}`` reports as ``progress``.
+
+CSV uploads use the columns written by ``GET /transactions/export`` with one
+row per transaction; accounts and categories are referenced by name.
+"""
+
+import codecs
+import csv
+import json
+from collections.abc import AsyncIterator
+from typing import Any, Literal
+
+from fastapi import Request
+from pydantic import ValidationError
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from app.core.errors import APIError, sanitize_problem_detail
+from app.db import SessionLocal
+from app.models import Account, Category
+from app.repositories import SQLAlchemyUserRepository
+from app.schemas import (
+    TransactionImportFailure,
+    TransactionImportItem,
+    TransactionImportJobProgress,
+    TransactionImportResult,
+)
+from app.transactions.csv_export import CSV_EXPORT_COLUMNS
+from app.transactions.import_jobs import ImportJobManager
+from app.transactions.import_sync import build_import_failure, execute_import_rows
+
+ImportStreamFormat = Literal["csv", "ndjson"]
+
+MAX_STORED_FAILURES = 1000
+MAX_RECORD_CHARS = 64 * 1024
+_OPTIONAL_CSV_COLUMNS = ("income_source_id",)
+_FORMULA_PREFIXES = ("=", "+", "-", "@")
+
+
+def _invalid_stream_error(detail: str) -> APIError:
+    return APIError(status=400, title="Invalid request", detail=detail)
+
+
+def _record_too_long_error() -> APIError:
+    return _invalid_stream_error(f"Import stream records must not exceed {MAX_RECORD_CHARS} characters")
+
+
+async def iter_text_lines(body: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    pending = ""
+    try:
+        async for chunk in body:
+            pending += decoder.decode(chunk)
+            if "\n" in pending:
+                *lines, pending = pending.split("\n")
+                for line in lines:
+                    if len(line) > MAX_RECORD_CHARS:
+                        raise _record_too_long_error()
+                    yield line.removesuffix("\r")
+            # Reject an overlong line as soon as the carry-over passes the cap instead of buffering the rest of it.
+            if len(pending) > MAX_RECORD_CHARS:
+                raise _record_too_long_error()
+        pending += decoder.decode(b"", final=True)
+    except UnicodeDecodeError as exc:
+        raise _invalid_stream_error("Import stream must be UTF-8 encoded") from exc
+    if len(pending) > MAX_RECORD_CHARS:
+        raise _record_too_long_error()
+    if pending:
+        yield pending.removesuffix("\r")
+
+
+async def _iter_csv_records(lines: AsyncIterator[str]) -> AsyncIterator[str]:
+    # A record is complete once its quotes balance; quoted notes may span lines.
+    record: list[str] = []
+    quotes = 0
+    size = 0
+    async for line in lines:
+        record.append(line)
+        quotes += line.count('"')
+        size += len(line) + 1
+        if quotes % 2 == 0:
+            text = "\n".join(record)
+            record, quotes, size = [], 0, 0
+            if text.strip():
+                yield text
+        elif size > MAX_RECORD_CHARS:
+            raise _record_too_long_error()
+    if record:
+        yield "\n".join(record)
+
+
+async def _iter_ndjson_records(lines: AsyncIterator[str]) -> AsyncIterator[str]:
+    async for line in lines:
+        if line.strip():
+            yield line
+
+
+def _parse_csv_header(record: str) -> tuple[str, ...]:
+    header = tuple(cell.strip() for cell in next(csv.reader([record])))
+    missing = [column for column in CSV_EXPORT_COLUMNS if column not in header]
+    unknown = [column for column in header if column not in CSV_EXPORT_COLUMNS + _OPTIONAL_CSV_COLUMNS]
+    if missing or unknown or len(set(header)) != len(header):
+        raise _invalid_stream_error("CSV header must match the transactions export columns")
+    return header
+
+
+def _csv_text(value: str) -> str | None:
+    if value.startswith("'") and value[1:].lstrip().startswith(_FORMULA_PREFIXES):
+        value = value[1:]
+    return value if value != "" else None
+
+
+def _csv_row_to_raw(header: tuple[str, ...], record: str) -> dict[str, Any]:
+    cells = next(csv.reader([record]))
+    if len(cells) != len(header):
+        raise ValueError("CSV row has the wrong number of columns")
+    values = {column: _csv_text(cell) for column, cell in zip(header, cells)}
+    raw: dict[str, Any] = dict(values)
+    amount = values["amount_cents"]
+    raw["amount_cents"] = int(amount) if amount is not None else None
+    impulse = (values["is_impulse"] or "").lower()
+    raw["is_impulse"] = {"true": True, "false": False, "": None}.get(impulse, impulse)
+    return raw
+
+
+def _resolve_csv_names(db: Session, user_id: str, rows: list[tuple[int, dict[str, Any]]]) -> None:
+    account_names = {raw["account"] for _, raw in rows if raw.get("account")}
+    category_names = {raw["category"] for _, raw in rows if raw.get("category")}
+    accounts = (
+        {
+            name: account_id
+            for name, account_id in db.execute(
+                select(Account.name, Account.id).where(
+                    Account.user_id == user_id,
+                    Account.name.in_(account_names),
+                )
+            )
+        }
+        if account_names
+        else {}
+    )
+    categories = (
+        {
+            (name, str(type_)): category_id
+            for name, type_, category_id in db.execute(
+                select(Category.name, Category.type, Category.id).where(
+                    Category.user_id == user_id,
+                    Category.name.in_(category_names),
+                )
+            )
+        }
+        if category_names
+        else {}
+    )
+    for _, raw in rows:
+        # Unknown names resolve to an empty id so the business rules reject the row
+        # exactly as they would an unknown account_id / category_id.
+        raw["account_id"] = accounts.get(raw.pop("account", None), "")
+        raw["category_id"] = categories.get((raw.pop("category", None), raw.get("type")), "")
+
+
+def _import_chunk(
+    *,
+    fmt: ImportStreamFormat,
+    header: tuple[str, ...],
+    chunk: list[tuple[int, str]],
+    user_id: str,
+    request: Request | None,
+) -> TransactionImportResult:
+    with SessionLocal() as db:
+        user = SQLAlchemyUserRepository(db).get_by_id(user_id)
+        if user is None:
+            raise APIError(status=403, title="Forbidden", detail="User no longer exists")
+
+        failures: list[TransactionImportFailure] = []
+        decoded: list[tuple[int, dict[str, Any]]] = []
+        for index, record in chunk:
+            try:
+                raw = _csv_row_to_raw(header, record) if fmt == "csv" else json.loads(record)
+                if not isinstance(raw, dict):
+                    raise ValueError("Import row must be an object")
+                decoded.append((index, raw))
+            except (ValueError, csv.Error) as exc:
+                failures.append(build_import_failure(index, exc))
+        if fmt == "csv":
+            _resolve_csv_names(db, user_id, decoded)
+
+        rows: list[tuple[int, dict]] = []
+        for index, raw in decoded:
+            try:
+                rows.append((index, TransactionImportItem.model_validate(raw).model_dump()))
+            except ValidationError as exc:
+                failures.append(build_import_failure(index, exc))
+
+        result = execute_import_rows(rows=rows, mode="partial", current_user=user, db=db, request=request)
+    failures.extend(result.failures)
+    failures.sort(key=lambda failure: failure.index)
+    return TransactionImportResult(
+        created_count=result.created_count,
+        failed_count=len(failures),
+        failures=failures,
+    )
+
+
+async def run_import_stream(
+    *,
+    body: AsyncIterator[bytes],
+    fmt: ImportStreamFormat,
+    chunk_size: int,
+    user_id: str,
+    job_id: str,
+    manager: ImportJobManager,
+    request: Request | None,
+) -> TransactionImportResult:
+    """Import a streamed body chunk by chunk; the job is completed or failed on return."""
+    progress = TransactionImportJobProgress()
+    failures: list[TransactionImportFailure] = []
+    header: tuple[str, ...] = ()
+
+    async def flush(chunk: list[tuple[int, str]]) -> None:
+        nonlocal progress
+        result = await run_in_threadpool(
+            _import_chunk, fmt=fmt, header=header, chunk=chunk, user_id=user_id, request=request
+        )
+        failures.extend(result.failures[: max(0, MAX_STORED_FAILURES - len(failures))])
+        progress = TransactionImportJobProgress(
+            processed_rows=progress.processed_rows + len(chunk),
+            created_count=progress.created_count + result.created_count,
+            failed_count=progress.failed_count + result.failed_count,
+        )
+        await run_in_threadpool(manager.report_progress, job_id, progress)
+
+    try:
+        lines = iter_text_lines(body)
+        records = _iter_csv_records(lines) if fmt == "csv" else _iter_ndjson_records(lines)
+        chunk: list[tuple[int, str]] = []
+        index = 0
+        async for record in records:
+            if fmt == "csv" and not header:
+                header = _parse_csv_header(record)
+                continue
+            chunk.append((index, record))
+            index += 1
+            if len(chunk) >= chunk_size:
+                await flush(chunk)
+                chunk = []
+        if chunk:
+            await flush(chunk)
+        if fmt == "csv" and not header:
+            raise _invalid_stream_error("CSV header must match the transactions export columns")
+    except Exception as exc:
+        if isinstance(exc, APIError):
+            message = sanitize_problem_detail(exc.detail) or exc.title
+        else:
+            message = "Import stream failed"
+        await run_in_threadpool(manager.complete_stream_job, job_id, error_message=message)
+        raise
+
+    result = TransactionImportResult(
+        created_count=progress.created_count,
+        failed_count=progress.failed_count,
+        failures=failures,
+    )
+    await run_in_threadpool(manager.complete_stream_job, job_id, result=result)
+    return result
@@ -1,7 +1,11 @@
+import uuid
+from collections.abc import Sequence
+
 from fastapi import Request
+from sqlalchemy import insert
 from sqlalchemy.orm import Session
 
-from app.core.audit import emit_audit_event
+from app.core.audit import emit_audit_events
 from app.core.errors import APIError, sanitize_problem_detail
 from app.models import Transaction, User
 from app.schemas import (
@@ -9,8 +13,11 @@ from app.schemas import (
     TransactionImportRequest,
     TransactionImportResult,
 )
+from app.transactions.reference_cache import load_user_references
+from app.transactions.rollups import apply_transaction_rollups, snapshot_values
 from app.transactions.validation import (
-    validate_business_rules,
+    ReferenceSet,
+    validate_business_rules_with_references,
     validate_money_rules,
     validate_transaction_mood,
 )
@@ -32,42 +39,85 @@ def execute_import_payload(
     current_user: User,
     db: Session,
     request: Request | None,
+    commit: bool = True,
 ) -> TransactionImportResult:
-    mode = payload.mode
-    failures: list[TransactionImportFailure] = []
-    rows_to_insert: list[Transaction] = []
+    """Validate and insert an import batch; with commit=False the caller owns the commit."""
+    return execute_import_rows(
+        rows=[(index, item.model_dump()) for index, item in enumerate(payload.items)],
+        mode=payload.mode,
+        current_user=current_user,
+        db=db,
+        request=request,
+        commit=commit,
+    )
 
-    for index, item in enumerate(payload.items):
-        try:
-            data = item.model_dump()
-            validate_transaction_mood(data)
-            data["amount_cents"] = validate_money_rules(current_user, data["type"], data["amount_cents"])
-            validate_business_rules(db, current_user.id, data)
-            rows_to_insert.append(Transaction(user_id=current_user.id, **data))
-        except Exception as exc:
-            failures.append(build_import_failure(index, exc))
+
+def execute_import_rows(
+    *,
+    rows: Sequence[tuple[int, dict]],
+    mode: str,
+    current_user: User,
+    db: Session,
+    request: Request | None,
+    commit: bool = True,
+) -> TransactionImportResult:
+    """Import already-parsed items; each row carries the index reported back on failure."""
+    refs = load_user_references(db, current_user.id)
+    rows_to_insert, failures = validate_import_rows(rows=rows, current_user=current_user, refs=refs)
 
     if mode == "all_or_nothing" and failures:
         return TransactionImportResult(created_count=0, failed_count=len(failures), failures=failures)
 
-    for row in rows_to_insert:
-        db.add(row)
-    if rows_to_insert:
-        db.flush()
-        for row in rows_to_insert:
-            emit_audit_event(
-                db,
-                request=request,
-                user_id=current_user.id,
-                resource_type="transaction",
-                resource_id=row.id,
-                action="transaction.create",
-            )
-        db.commit()
-
+    insert_import_rows(rows_to_insert=rows_to_insert, current_user=current_user, db=db, request=request, commit=commit)
     return TransactionImportResult(
         created_count=len(rows_to_insert),
         failed_count=len(failures),
         failures=failures,
     )
 
+
+def validate_import_rows(
+    *,
+    rows: Sequence[tuple[int, dict]],
+    current_user: User,
+    refs: ReferenceSet,
+) -> tuple[list[dict], list[TransactionImportFailure]]:
+    """Check rows against prefetched references without touching the session."""
+    failures: list[TransactionImportFailure] = []
+    rows_to_insert: list[dict] = []
+    for index, data in rows:
+        try:
+            validate_transaction_mood(data)
+            data["amount_cents"] = validate_money_rules(current_user, data["type"], data["amount_cents"])
+            validate_business_rules_with_references(refs, data)
+            rows_to_insert.append({"id": str(uuid.uuid4()), "user_id": current_user.id, **data})
+        except Exception as exc:
+            failures.append(build_import_failure(index, exc))
+    return rows_to_insert, failures
+
+
+def insert_import_rows(
+    *,
+    rows_to_insert: list[dict],
+    current_user: User,
+    db: Session,
+    request: Request | None,
+    commit: bool = True,
+) -> None:
+    if not rows_to_insert:
+        return
+    db.execute(insert(Transaction), rows_to_insert)
+    apply_transaction_rollups(
+        db,
+        [(None, snapshot_values(current_user.id, row)) for row in rows_to_insert],
+    )
+    emit_audit_events(
+        db,
+        request=request,
+        user_id=current_user.id,
+        resource_type="transaction",
+        resource_ids=[row["id"] for row in rows_to_insert],
+        action="transaction.create",
+    )
+    if commit:
+        db.commit()
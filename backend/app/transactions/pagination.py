@@ -1,9 +1,11 @@
-from datetime import date
+from datetime import date, datetime, timedelta
 from uuid import UUID
 
 from sqlalchemy import and_, or_
 
+from app.core.config import settings
 from app.core.pagination import decode_cursor, encode_cursor, parse_date, parse_datetime
+from app.core.utils import utcnow
 from app.errors import invalid_cursor_error
 from app.models import Transaction
 from app.models.enums import TransactionType
@@ -65,11 +67,52 @@ def apply_cursor(stmt, cursor: str):
     return stmt.where(or_(Transaction.date < c_date, and_(Transaction.date == c_date, Transaction.id < c_id)))
 
 
+def encode_keyset_cursor(row_date: date, created_at: datetime, row_id: str) -> str:
+    return encode_cursor({"date": row_date.isoformat(), "created_at": created_at.isoformat(), "id": row_id})
+
+
 def build_page(rows: list[Transaction], limit: int) -> tuple[list[Transaction], str | None]:
     items = rows[:limit]
     if len(rows) <= limit:
         return items, None
     last = items[-1]
-    next_cursor = encode_cursor({"date": last.date.isoformat(), "created_at": last.created_at.isoformat(), "id": last.id})
-    return items, next_cursor
+    return items, encode_keyset_cursor(last.date, last.created_at, last.id)
+
+
+def apply_changes_horizon(stmt):
+    """Hold back rows changed within the last ``TRANSACTIONS_CHANGES_SETTLE_SECONDS``.
 
+    ``updated_at`` is stamped by the application before commit, so a write can
+    become visible after a later-stamped one has already been served. Tokens
+    never move past ``now - settle``; any write that commits within that window
+    of being stamped is still ahead of every token handed out.
+    """
+    horizon = utcnow() - timedelta(seconds=settings.transactions_changes_settle_seconds)
+    return stmt.where(Transaction.updated_at <= horizon)
+
+
+def apply_changes_cursor(stmt, since: str):
+    """Keep rows strictly after the ``(updated_at, id)`` position encoded in a change-feed token."""
+    data = decode_cursor(since)
+    c_updated_at_raw = data.get("updated_at")
+    c_id = data.get("id")
+    if not isinstance(c_updated_at_raw, str) or not isinstance(c_id, str):
+        raise invalid_cursor_error()
+    c_updated_at = parse_datetime(c_updated_at_raw)
+    return stmt.where(
+        or_(
+            Transaction.updated_at > c_updated_at,
+            and_(Transaction.updated_at == c_updated_at, Transaction.id > c_id),
+        )
+    )
+
+
+def build_changes_page(
+    rows: list[Transaction], limit: int, since: str | None
+) -> tuple[list[Transaction], str | None, bool]:
+    items = rows[:limit]
+    if not items:
+        return items, since, False
+    last = items[-1]
+    token = encode_cursor({"updated_at": last.updated_at.isoformat(), "id": last.id})
+    return items, token, len(rows) > limit
@@ -0,0 +1,145 @@
+"""Move every transaction matching a filter to another category.
+
+``POST /transactions/recategorize`` takes the ``GET /transactions`` filters
+plus an optional merchant match, and at least one of them must narrow the
+match. One grouped SELECT (by month, account, category and the other rollup
+keys) gives the type check and the rollup and balance deltas, then a single
+UPDATE with the same predicate moves the rows. If the UPDATE touches a
+different number of rows than the SELECT counted, a concurrent write got in
+between; the transaction is rolled back and the request fails with ``409``.
+One audit event records the target category, the filter and the count.
+"""
+
+from dataclasses import replace
+from datetime import date
+
+from fastapi import Request
+from sqlalchemy import func, select, update
+from sqlalchemy.orm import Session
+
+from app.core.audit import emit_audit_event
+from app.core.errors import APIError
+from app.core.utils import utcnow
+from app.errors import category_type_mismatch_error, invalid_date_range_error
+from app.models import Transaction, User
+from app.schemas import TransactionRecategorizeFilter, TransactionRecategorizeRequest
+from app.transactions.pagination import apply_list_filters
+from app.transactions.reference_cache import load_user_references
+from app.transactions.rollups import TransactionSnapshot, apply_grouped_transaction_rollups, month_expr
+from app.transactions.validation import validate_existing_references_with_references
+
+_NARROWING_FIELDS = ("type", "account_id", "category_id", "from_", "to", "merchant")
+
+
+def _escape_like(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def _apply_recategorize_filter(stmt, filter_: TransactionRecategorizeFilter):
+    stmt = apply_list_filters(
+        stmt,
+        include_archived=filter_.include_archived,
+        type=filter_.type,
+        account_id=filter_.account_id,
+        category_id=filter_.category_id,
+        from_=filter_.from_,
+        to=filter_.to,
+    )
+    if filter_.merchant is None:
+        return stmt
+    merchant = func.lower(Transaction.merchant)
+    value = filter_.merchant.strip().lower()
+    if filter_.merchant_match == "contains":
+        return stmt.where(merchant.like(f"%{_escape_like(value)}%", escape="\\"))
+    return stmt.where(merchant == value)
+
+
+def recategorize_transactions(
+    db: Session,
+    *,
+    payload: TransactionRecategorizeRequest,
+    current_user: User,
+    request: Request | None,
+) -> int:
+    """Move the matching transactions to ``payload.category_id`` and commit; returns how many moved."""
+    filter_ = payload.filter
+    if all(getattr(filter_, field) is None for field in _NARROWING_FIELDS):
+        raise APIError(
+            status=400,
+            title="Invalid request",
+            detail="filter must set at least one of type, account_id, category_id, from, to or merchant",
+        )
+    if filter_.from_ and filter_.to and filter_.from_ > filter_.to:
+        raise invalid_date_range_error("from must be less than or equal to to")
+    refs = load_user_references(db, current_user.id)
+    validate_existing_references_with_references(refs, category_id=payload.category_id, income_source_id=None)
+    category = refs.categories[payload.category_id]
+
+    group_columns = (
+        month_expr(db).label("month"),
+        Transaction.archived_at.is_(None).label("active"),
+        Transaction.account_id,
+        Transaction.category_id,
+        Transaction.income_source_id,
+        Transaction.type,
+        Transaction.is_impulse,
+    )
+    grouped = (
+        select(*group_columns, func.sum(Transaction.amount_cents).label("amount_cents"), func.count().label("count"))
+        .where(Transaction.user_id == current_user.id)
+        .where(Transaction.category_id != payload.category_id)
+    )
+    groups = db.execute(_apply_recategorize_filter(grouped, filter_).group_by(*group_columns)).all()
+    if not groups:
+        return 0
+    if any(group.type != category.type for group in groups):
+        raise category_type_mismatch_error()
+
+    moved = (
+        update(Transaction)
+        .where(Transaction.user_id == current_user.id)
+        .where(Transaction.category_id != payload.category_id)
+        .values(category_id=payload.category_id, updated_at=utcnow())
+        .execution_options(synchronize_session=False)
+    )
+    updated_count = db.execute(_apply_recategorize_filter(moved, filter_)).rowcount
+    if updated_count != sum(group.count for group in groups):
+        db.rollback()
+        raise APIError(
+            status=409,
+            title="Conflict",
+            detail="Matching transactions changed while they were being moved; retry the request",
+        )
+
+    changes = []
+    # Archived rows move too, but rollups and balances only count active ones.
+    for group in groups:
+        if not group.active:
+            continue
+        before = TransactionSnapshot(
+            user_id=current_user.id,
+            account_id=group.account_id,
+            category_id=group.category_id,
+            income_source_id=group.income_source_id,
+            type=str(group.type),
+            amount_cents=int(group.amount_cents),
+            date=date(int(group.month[:4]), int(group.month[5:7]), 1),
+            is_impulse=group.is_impulse,
+        )
+        changes.append((before, replace(before, category_id=payload.category_id), group.count))
+    apply_grouped_transaction_rollups(db, changes)
+    emit_audit_event(
+        db,
+        request=request,
+        user_id=current_user.id,
+        resource_type="transaction",
+        resource_id=None,
+        action="transaction.recategorize",
+        details={
+            "category_id": payload.category_id,
+            "filter": filter_.model_dump(mode="json", by_alias=True, exclude_none=True),
+            "updated_count": updated_count,
+        },
+    )
+    db.commit()
+    return updated_count
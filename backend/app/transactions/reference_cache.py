@@ -0,0 +1,167 @@
+"""Per-user reference data (accounts, categories, income sources) for validation.
+
+Transaction create, patch and import validation checks ownership, archive
+state and category type against a ``ReferenceSet`` holding every account,
+category and income source the user owns, loaded with one query per table.
+The set is memoised on the session, so a request reads it at most once, and
+with ``REFERENCE_CACHE_ENABLED`` it is also kept in process for
+``REFERENCE_CACHE_TTL_SECONDS``.
+
+Inserts, updates and deletes of those rows flushed through the ORM (which is
+how their routers write) drop the user's entry at flush and again after
+commit, so a concurrent reload cannot cache the pre-commit state. The
+in-process cache is not shared between workers; another worker may validate
+against state up to one TTL old.
+"""
+
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from threading import Lock
+from typing import Any, Callable
+
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session, object_session
+
+from app.core.config import settings
+from app.models import Account, Category, IncomeSource
+
+_LOGGER = logging.getLogger("app.reference_cache")
+_SESSION_KEY = "reference_sets"
+_DIRTY_KEY = "reference_sets_dirty"
+
+
+@dataclass
+class ReferenceSet:
+    """Accounts, categories and income sources owned by one user, keyed by id."""
+
+    accounts: dict[str, Any] = field(default_factory=dict)
+    categories: dict[str, Any] = field(default_factory=dict)
+    income_sources: dict[str, Any] = field(default_factory=dict)
+
+
+class InMemoryReferenceCache:
+    def __init__(self, *, ttl_seconds: int, max_entries: int, now_fn: Callable[[], float] | None = None) -> None:
+        self._ttl_seconds = max(1, ttl_seconds)
+        self._max_entries = max(1, max_entries)
+        self._now = now_fn or time.monotonic
+        self._lock = Lock()
+        self._entries: OrderedDict[str, tuple[float, ReferenceSet]] = OrderedDict()
+
+    def get(self, user_id: str) -> ReferenceSet | None:
+        now = self._now()
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None
+            expires_at, refs = entry
+            if now >= expires_at:
+                del self._entries[user_id]
+                return None
+            self._entries.move_to_end(user_id)
+            return refs
+
+    def set(self, user_id: str, refs: ReferenceSet) -> None:
+        expires_at = self._now() + self._ttl_seconds
+        with self._lock:
+            self._entries[user_id] = (expires_at, refs)
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, user_id: str) -> None:
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+
+_CACHE: InMemoryReferenceCache | None = None
+
+
+def configure_reference_cache(cache: InMemoryReferenceCache | None) -> None:
+    """Install the cross-request cache; ``None`` keeps only the per-session memo."""
+    global _CACHE
+    _CACHE = cache
+
+
+def _query_user_references(db: Session, user_id: str) -> ReferenceSet:
+    return ReferenceSet(
+        accounts={
+            row.id: row
+            for row in db.execute(select(Account.id, Account.archived_at).where(Account.user_id == user_id))
+        },
+        categories={
+            row.id: row
+            for row in db.execute(
+                select(Category.id, Category.type, Category.archived_at).where(Category.user_id == user_id)
+            )
+        },
+        income_sources={
+            row.id: row
+            for row in db.execute(
+                select(IncomeSource.id, IncomeSource.archived_at).where(IncomeSource.user_id == user_id)
+            )
+        },
+    )
+
+
+def load_user_references(db: Session, user_id: str) -> ReferenceSet:
+    memo: dict[str, ReferenceSet] = db.info.setdefault(_SESSION_KEY, {})
+    refs = memo.get(user_id)
+    if refs is not None:
+        return refs
+    cache = _CACHE
+    refs = cache.get(user_id) if cache is not None else None
+    if refs is None:
+        refs = _query_user_references(db, user_id)
+        if cache is not None:
+            cache.set(user_id, refs)
+    memo[user_id] = refs
+    return refs
+
+
+def invalidate_user_references(user_id: str) -> None:
+    cache = _CACHE
+    if cache is not None:
+        cache.delete(user_id)
+
+
+def _forget(session: Session | None, user_id: str) -> None:
+    invalidate_user_references(user_id)
+    if session is None:
+        return
+    session.info.get(_SESSION_KEY, {}).pop(user_id, None)
+    session.info.setdefault(_DIRTY_KEY, set()).add(user_id)
+
+
+@event.listens_for(Account, "after_insert")
+@event.listens_for(Account, "after_update")
+@event.listens_for(Account, "after_delete")
+@event.listens_for(Category, "after_insert")
+@event.listens_for(Category, "after_update")
+@event.listens_for(Category, "after_delete")
+@event.listens_for(IncomeSource, "after_insert")
+@event.listens_for(IncomeSource, "after_update")
+@event.listens_for(IncomeSource, "after_delete")
+def _invalidate_on_reference_write(_mapper, _connection, target: Any) -> None:
+    _forget(object_session(target), target.user_id)
+
+
+@event.listens_for(Session, "after_commit")
+@event.listens_for(Session, "after_soft_rollback")
+def _invalidate_after_transaction(session: Session, *_args: object) -> None:
+    for user_id in session.info.pop(_DIRTY_KEY, ()):
+        invalidate_user_references(user_id)
+
+
+if settings.reference_cache_enabled:
+    configure_reference_cache(
+        InMemoryReferenceCache(
+            ttl_seconds=settings.reference_cache_ttl_seconds,
+            max_entries=settings.reference_cache_max_entries,
+        )
+    )
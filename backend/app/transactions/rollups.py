@@ -0,0 +1,360 @@
+"""Maintained per-user monthly transaction aggregates.
+
+Every write path that creates, changes, archives or deletes a transaction
+reports the before/after snapshot here, so analytics can read a handful of
+rollup rows per month instead of scanning the transactions table. The same
+snapshots keep the per-account running balances in ``balances`` current.
+"""
+
+import calendar
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Any
+
+from sqlalchemy import case, delete, func, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.core.utils import utcnow
+from app.models import Transaction, TransactionMonthlyRollup
+from app.transactions.balances import apply_balance_deltas
+
+_COUNTER_FIELDS = (
+    "income_total_cents",
+    "expense_total_cents",
+    "transaction_count",
+    "impulse_count",
+    "intentional_count",
+    "untagged_count",
+)
+_RollupKey = tuple[str, str, str, str]
+
+
+@dataclass(frozen=True)
+class TransactionSnapshot:
+    user_id: str
+    account_id: str
+    category_id: str
+    income_source_id: str | None
+    type: str
+    amount_cents: int
+    date: date
+    is_impulse: bool | None
+
+
+@dataclass(frozen=True)
+class MonthlyTotals:
+    month: str
+    category_id: str
+    income_source_id: str | None
+    income_total_cents: int
+    expense_total_cents: int
+    transaction_count: int
+    impulse_count: int
+    intentional_count: int
+    untagged_count: int
+
+
+def month_key(value: date) -> str:
+    return f"{value.year:04d}-{value.month:02d}"
+
+
+def month_expr(db: Session):
+    bind = db.get_bind()
+    dialect = bind.dialect.name if bind is not None else ""
+    if dialect == "sqlite":
+        return func.strftime("%Y-%m", Transaction.date)
+    return func.to_char(Transaction.date, "YYYY-MM")
+
+
+def snapshot_transaction(row: Any) -> TransactionSnapshot | None:
+    """Capture the rollup-relevant state of a transaction; archived rows count as absent."""
+    if row is None or row.archived_at is not None:
+        return None
+    return TransactionSnapshot(
+        user_id=row.user_id,
+        account_id=row.account_id,
+        category_id=row.category_id,
+        income_source_id=row.income_source_id,
+        type=str(row.type),
+        amount_cents=int(row.amount_cents),
+        date=row.date,
+        is_impulse=row.is_impulse,
+    )
+
+
+def snapshot_values(user_id: str, values: dict[str, Any]) -> TransactionSnapshot:
+    """Snapshot a not-yet-persisted transaction from its insert parameters."""
+    return TransactionSnapshot(
+        user_id=user_id,
+        account_id=values["account_id"],
+        category_id=values["category_id"],
+        income_source_id=values.get("income_source_id"),
+        type=str(values["type"]),
+        amount_cents=int(values["amount_cents"]),
+        date=values["date"],
+        is_impulse=values.get("is_impulse"),
+    )
+
+
+def _accumulate(deltas: dict[_RollupKey, list[int]], snapshot: TransactionSnapshot, sign: int, count: int) -> None:
+    key = (snapshot.user_id, month_key(snapshot.date), snapshot.category_id, snapshot.income_source_id or "")
+    counters = deltas.setdefault(key, [0] * len(_COUNTER_FIELDS))
+    if snapshot.type == "income":
+        counters[0] += sign * snapshot.amount_cents
+    else:
+        counters[1] += sign * snapshot.amount_cents
+    counters[2] += sign * count
+    if snapshot.is_impulse is True:
+        counters[3] += sign * count
+    elif snapshot.is_impulse is False:
+        counters[4] += sign * count
+    else:
+        counters[5] += sign * count
+
+
+def _accumulate_balance(
+    deltas: dict[tuple[str, str], list[int]], snapshot: TransactionSnapshot, sign: int, count: int
+) -> None:
+    counters = deltas.setdefault((snapshot.user_id, snapshot.account_id), [0, 0])
+    counters[0] += sign * (snapshot.amount_cents if snapshot.type == "income" else -snapshot.amount_cents)
+    counters[1] += sign * count
+
+
+def apply_transaction_rollups(
+    db: Session,
+    changes: Iterable[tuple[TransactionSnapshot | None, TransactionSnapshot | None]],
+) -> None:
+    """Fold (before, after) snapshot pairs into the rollup and balance tables within the caller's transaction."""
+    apply_grouped_transaction_rollups(db, ((before, after, 1) for before, after in changes))
+
+
+def apply_grouped_transaction_rollups(
+    db: Session,
+    changes: Iterable[tuple[TransactionSnapshot | None, TransactionSnapshot | None, int]],
+) -> None:
+    """Like ``apply_transaction_rollups``, but each snapshot stands for ``count`` rows and carries their summed amount."""
+    deltas: dict[_RollupKey, list[int]] = {}
+    balance_deltas: dict[tuple[str, str], list[int]] = {}
+    for before, after, count in changes:
+        if before == after:
+            continue
+        if before is not None:
+            _accumulate(deltas, before, -1, count)
+            _accumulate_balance(balance_deltas, before, -1, count)
+        if after is not None:
+            _accumulate(deltas, after, 1, count)
+            _accumulate_balance(balance_deltas, after, 1, count)
+    apply_balance_deltas(db, balance_deltas)
+
+    params = [
+        {
+            "user_id": key[0],
+            "month": key[1],
+            "category_id": key[2],
+            "income_source_key": key[3],
+            **dict(zip(_COUNTER_FIELDS, counters)),
+        }
+        # Key order fixes the row-lock order, so concurrent import chunks cannot deadlock.
+        for key, counters in sorted(deltas.items())
+        if any(counters)
+    ]
+    if params:
+        _upsert_deltas(db, params)
+
+
+def record_transaction_created(db: Session, row: Transaction) -> None:
+    apply_transaction_rollups(db, [(None, snapshot_transaction(row))])
+
+
+def record_transaction_removed(db: Session, row: Transaction) -> None:
+    apply_transaction_rollups(db, [(snapshot_transaction(row), None)])
+
+
+def _upsert_deltas(db: Session, params: list[dict[str, Any]]) -> None:
+    now = utcnow()
+    for item in params:
+        item["updated_at"] = now
+
+    table = TransactionMonthlyRollup.__table__
+    dialect = db.get_bind().dialect.name
+    if dialect in {"sqlite", "postgresql"}:
+        insert_fn = sqlite.insert if dialect == "sqlite" else postgresql.insert
+        stmt = insert_fn(table)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["user_id", "month", "category_id", "income_source_key"],
+            set_={
+                **{field: table.c[field] + stmt.excluded[field] for field in _COUNTER_FIELDS},
+                "updated_at": stmt.excluded.updated_at,
+            },
+        )
+        db.execute(stmt, params)
+        return
+
+    for item in params:
+        row = db.get(
+            TransactionMonthlyRollup,
+            (item["user_id"], item["month"], item["category_id"], item["income_source_key"]),
+        )
+        if row is None:
+            db.add(TransactionMonthlyRollup(**item))
+            continue
+        for field in _COUNTER_FIELDS:
+            setattr(row, field, getattr(row, field) + item[field])
+        row.updated_at = now
+    db.flush()
+
+
+def _month_bounds(value: date) -> tuple[date, date]:
+    last_day = calendar.monthrange(value.year, value.month)[1]
+    return value.replace(day=1), value.replace(day=last_day)
+
+
+def _scan_grouped(
+    db: Session,
+    *,
+    user_id: str | None,
+    from_: date | None = None,
+    to: date | None = None,
+) -> list[dict[str, Any]]:
+    month = month_expr(db)
+    stmt = (
+        select(
+            Transaction.user_id,
+            month.label("month"),
+            Transaction.category_id,
+            Transaction.income_source_id,
+            func.coalesce(func.sum(case((Transaction.type == "income", Transaction.amount_cents), else_=0)), 0).label(
+                "income_total_cents"
+            ),
+            func.coalesce(func.sum(case((Transaction.type == "expense", Transaction.amount_cents), else_=0)), 0).label(
+                "expense_total_cents"
+            ),
+            func.count(Transaction.id).label("transaction_count"),
+            func.coalesce(func.sum(case((Transaction.is_impulse.is_(True), 1), else_=0)), 0).label("impulse_count"),
+            func.coalesce(func.sum(case((Transaction.is_impulse.is_(False), 1), else_=0)), 0).label("intentional_count"),
+            func.coalesce(func.sum(case((Transaction.is_impulse.is_(None), 1), else_=0)), 0).label("untagged_count"),
+        )
+        .where(Transaction.archived_at.is_(None))
+        .group_by(Transaction.user_id, month, Transaction.category_id, Transaction.income_source_id)
+    )
+    if user_id is not None:
+        stmt = stmt.where(Transaction.user_id == user_id)
+    if from_ is not None:
+        stmt = stmt.where(Transaction.date >= from_)
+    if to is not None:
+        stmt = stmt.where(Transaction.date <= to)
+    return [
+        {
+            "user_id": row.user_id,
+            "month": row.month,
+            "category_id": row.category_id,
+            "income_source_key": row.income_source_id or "",
+            **{field: int(getattr(row, field)) for field in _COUNTER_FIELDS},
+        }
+        for row in db.execute(stmt)
+    ]
+
+
+def _scan_totals(db: Session, *, user_id: str, from_: date, to: date) -> list[MonthlyTotals]:
+    return [
+        MonthlyTotals(
+            month=row["month"],
+            category_id=row["category_id"],
+            income_source_id=row["income_source_key"] or None,
+            **{field: row[field] for field in _COUNTER_FIELDS},
+        )
+        for row in _scan_grouped(db, user_id=user_id, from_=from_, to=to)
+    ]
+
+
+def load_monthly_totals(db: Session, *, user_id: str, from_: date, to: date) -> list[MonthlyTotals]:
+    """Return per (month, category, income source) totals for non-archived transactions in [from_, to].
+
+    Whole months are served from the rollup table; partial months at either edge
+    of the range fall back to a bounded scan of the transactions table.
+    """
+    first_start, _ = _month_bounds(from_)
+    _, last_end = _month_bounds(to)
+    full_from = first_start if from_ == first_start else _month_bounds(from_)[1] + timedelta(days=1)
+    full_to = last_end if to == last_end else to.replace(day=1) - timedelta(days=1)
+
+    if full_from > full_to:
+        return _scan_totals(db, user_id=user_id, from_=from_, to=to)
+
+    totals: list[MonthlyTotals] = []
+    if from_ < full_from:
+        totals.extend(_scan_totals(db, user_id=user_id, from_=from_, to=full_from - timedelta(days=1)))
+    rollup_stmt = (
+        select(TransactionMonthlyRollup)
+        .where(TransactionMonthlyRollup.user_id == user_id)
+        .where(TransactionMonthlyRollup.month >= month_key(full_from))
+        .where(TransactionMonthlyRollup.month <= month_key(full_to))
+        .where(TransactionMonthlyRollup.transaction_count > 0)
+    )
+    totals.extend(
+        MonthlyTotals(
+            month=row.month,
+            category_id=row.category_id,
+            income_source_id=row.income_source_key or None,
+            **{field: int(getattr(row, field)) for field in _COUNTER_FIELDS},
+        )
+        for row in db.scalars(rollup_stmt)
+    )
+    if full_to < to:
+        totals.extend(_scan_totals(db, user_id=user_id, from_=full_to + timedelta(days=1), to=to))
+    return totals
+
+
+def rebuild_rollups(db: Session, *, user_id: str | None = None) -> int:
+    """Recompute rollups from the transactions table; caller must commit."""
+    delete_stmt = delete(TransactionMonthlyRollup)
+    if user_id is not None:
+        delete_stmt = delete_stmt.where(TransactionMonthlyRollup.user_id == user_id)
+    db.execute(delete_stmt)
+
+    rows = _scan_grouped(db, user_id=user_id)
+    if rows:
+        now = utcnow()
+        db.execute(
+            TransactionMonthlyRollup.__table__.insert(),
+            [{**row, "updated_at": now} for row in rows],
+        )
+    return len(rows)
+
+
+def find_rollup_drift(db: Session, *, user_id: str | None = None) -> list[dict[str, Any]]:
+    """Compare stored rollups against a live scan and return every mismatching key."""
+    expected = {_row_key(row): row for row in _scan_grouped(db, user_id=user_id)}
+    stored_stmt = select(TransactionMonthlyRollup)
+    if user_id is not None:
+        stored_stmt = stored_stmt.where(TransactionMonthlyRollup.user_id == user_id)
+    stored = {
+        (row.user_id, row.month, row.category_id, row.income_source_key): {
+            field: int(getattr(row, field)) for field in _COUNTER_FIELDS
+        }
+        for row in db.scalars(stored_stmt)
+    }
+
+    zero = {field: 0 for field in _COUNTER_FIELDS}
+    drift: list[dict[str, Any]] = []
+    for key in sorted(set(expected) | set(stored)):
+        expected_counters = {field: expected[key][field] for field in _COUNTER_FIELDS} if key in expected else zero
+        stored_counters = stored.get(key, zero)
+        if expected_counters != stored_counters:
+            drift.append(
+                {
+                    "user_id": key[0],
+                    "month": key[1],
+                    "category_id": key[2],
+                    "income_source_id": key[3] or None,
+                    "expected": expected_counters,
+                    "stored": stored_counters,
+                }
+            )
+    return drift
+
+
+def _row_key(row: dict[str, Any]) -> _RollupKey:
+    return (row["user_id"], row["month"], row["category_id"], row["income_source_key"])
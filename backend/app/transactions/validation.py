@@ -11,14 +11,10 @@ from app.errors import (
     import_batch_limit_exceeded_error,
     transaction_mood_invalid_error,
 )
-from app.models import Account, Category, Transaction, User
+from app.models import Transaction, User
 from app.models.enums import TransactionMood, TransactionType
-from app.repositories import (
-    SQLAlchemyAccountRepository,
-    SQLAlchemyCategoryRepository,
-    SQLAlchemyIncomeSourceRepository,
-    SQLAlchemyTransactionRepository,
-)
+from app.repositories import SQLAlchemyTransactionRepository
+from app.transactions.reference_cache import ReferenceSet, load_user_references
 
 _VALID_TRANSACTION_MOODS = {mood.value for mood in TransactionMood}
 
@@ -27,6 +23,14 @@ def _business_rule_conflict() -> APIError:
     return APIError(status=409, title="Conflict", detail="Business rule conflict")
 
 
+def _income_source_not_allowed_error() -> APIError:
+    return APIError(
+        status=400,
+        title="Invalid request",
+        detail="income_source_id is only allowed for income transactions",
+    )
+
+
 def owned_transaction_or_403(db: Session, user_id: str, transaction_id: str) -> Transaction:
     row = SQLAlchemyTransactionRepository(db).get_owned(user_id, transaction_id)
     if not row:
@@ -34,55 +38,62 @@ def owned_transaction_or_403(db: Session, user_id: str, transaction_id: str) ->
     return row
 
 
-def owned_account_or_conflict(db: Session, user_id: str, account_id: str) -> Account:
-    account = SQLAlchemyAccountRepository(db).get_owned(user_id, account_id)
-    if not account:
-        raise _business_rule_conflict()
-    if account.archived_at is not None:
-        raise account_archived_error()
-    return account
+def validate_business_rules(db: Session, user_id: str, payload: dict) -> None:
+    validate_business_rules_with_references(load_user_references(db, user_id), payload)
+
 
+def validate_existing_references(db: Session, user_id: str, *, category_id: str, income_source_id: str | None) -> None:
+    """Re-check the references an update leaves in place; they may have been archived since."""
+    validate_existing_references_with_references(
+        load_user_references(db, user_id),
+        category_id=category_id,
+        income_source_id=income_source_id,
+    )
 
-def owned_category_or_conflict(db: Session, user_id: str, category_id: str) -> Category:
-    category = SQLAlchemyCategoryRepository(db).get_owned(user_id, category_id)
-    if not category:
+
+def validate_existing_references_with_references(
+    refs: ReferenceSet,
+    *,
+    category_id: str,
+    income_source_id: str | None,
+) -> None:
+    category = refs.categories.get(category_id)
+    if category is None:
         raise _business_rule_conflict()
     if category.archived_at is not None:
         raise category_archived_error()
-    return category
+    if income_source_id is None:
+        return
+    income_source = refs.income_sources.get(income_source_id)
+    if income_source is None or income_source.archived_at is not None:
+        raise _business_rule_conflict()
 
 
-def owned_active_income_source_or_conflict(db: Session, user_id: str, income_source_id: str):
-    income_source = SQLAlchemyIncomeSourceRepository(db).get_owned(user_id, income_source_id)
-    if not income_source:
+def validate_business_rules_with_references(refs: ReferenceSet, payload: dict) -> None:
+    """Check ownership, archive state and category type with dict lookups only."""
+    account = refs.accounts.get(payload["account_id"])
+    if account is None:
         raise _business_rule_conflict()
-    if income_source.archived_at is not None:
+    if account.archived_at is not None:
+        raise account_archived_error()
+    category = refs.categories.get(payload["category_id"])
+    if category is None:
         raise _business_rule_conflict()
-    return income_source
-
+    if category.archived_at is not None:
+        raise category_archived_error()
+    if payload["type"] != category.type:
+        raise category_type_mismatch_error()
 
-def validate_income_source_rule(db: Session, user_id: str, payload: dict) -> None:
     income_source_id = payload.get("income_source_id")
     if payload["type"] == "expense":
         if income_source_id is not None:
-            raise APIError(
-                status=400,
-                title="Invalid request",
-                detail="income_source_id is only allowed for income transactions",
-            )
+            raise _income_source_not_allowed_error()
         return
     if income_source_id is None:
         return
-    owned_active_income_source_or_conflict(db, user_id, income_source_id)
-
-
-def validate_business_rules(db: Session, user_id: str, payload: dict):
-    account = owned_account_or_conflict(db, user_id, payload["account_id"])
-    category = owned_category_or_conflict(db, user_id, payload["category_id"])
-    if payload["type"] != category.type:
-        raise category_type_mismatch_error()
-    validate_income_source_rule(db, user_id, payload)
-    return account, category
+    income_source = refs.income_sources.get(income_source_id)
+    if income_source is None or income_source.archived_at is not None:
+        raise _business_rule_conflict()
 
 
 def validate_transaction_mood(payload: dict) -> None:
@@ -104,3 +115,11 @@ def validate_batch_size_or_400(item_count: int) -> None:
             f"items exceeds maximum batch size ({settings.transaction_import_max_items})"
         )
 
+
+def validate_batch_operations_or_400(operation_count: int) -> None:
+    if operation_count > settings.transaction_batch_max_operations:
+        raise APIError(
+            status=400,
+            title="Invalid request",
+            detail=f"operations exceeds maximum batch size ({settings.transaction_batch_max_operations})",
+        )
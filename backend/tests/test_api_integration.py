@@ -1,10 +1,12 @@
 import base64
 import csv
+import gzip
 import hashlib
 import hmac
 import json
 import logging
 import os
+import re
 import time
 import uuid
 from datetime import date, datetime, timedelta, timezone
@@ -13,21 +15,31 @@ from threading import Barrier, BrokenBarrierError, Event, Lock, Thread
 
 from fastapi.testclient import TestClient
 import pytest
-from sqlalchemy import select
+from sqlalchemy import event as sa_event, select
 from sqlalchemy.exc import OperationalError
 
+import app.cli.compact_audit_events as compact_audit_events_cli
+import app.cli.rebuild_rollups as rebuild_rollups_cli
+import app.cli.reconcile_balances as reconcile_balances_cli
 import app.routers.auth as auth_router
+import app.transactions.import_jobs_sql as import_jobs_sql
 import app.routers.analytics as analytics_router
 import app.routers.accounts as accounts_router
 import app.routers.savings as savings_router
+import app.transactions.pagination as pagination_module
 import app.main as app_main
 import app.core.utils as core_utils
+from app.core.config import settings
 from app.core.rate_limit import InMemoryRateLimiter
 from app.main import app
+from app.core.errors import APIError
 from app.core.security import hash_refresh_token
-from app.db import SessionLocal
+from app.db import SessionLocal, engine as db_engine
 from app.core.utils import as_utc, utcnow
-from app.models import Account, MonthlyRollover, RefreshToken, Transaction, User
+from app.models import Account, AccountBalance, AuditEvent, AuditEventArchive, MonthlyRollover, RefreshToken, Transaction, TransactionMonthlyRollup, User
+from app.schemas import TransactionImportRequest
+from app.transactions.import_stream import MAX_RECORD_CHARS
+from app.transactions.rollups import find_rollup_drift
 
 VENDOR = "application/vnd.bebudget.v1+json"
 PROBLEM = "application/problem+json"
@@ -1544,6 +1556,7 @@ def _configure_async_import_jobs_for_test(
     terminal_ttl_seconds: int = 3600,
     idempotency_ttl_seconds: int = 3600,
     retained_terminal_cap: int = 5000,
+    chunk_size: int | None = None,
     now_fn=None,
 ):
     import app.routers.transactions as transactions_router
@@ -1555,6 +1568,7 @@ def _configure_async_import_jobs_for_test(
         terminal_ttl_seconds=terminal_ttl_seconds,
         idempotency_ttl_seconds=idempotency_ttl_seconds,
         retained_terminal_cap=retained_terminal_cap,
+        chunk_size=settings.transactions_import_async_chunk_size if chunk_size is None else chunk_size,
         now_fn=now_fn or utcnow,
     )
     monkeypatch.setattr(transactions_router, "_IMPORT_JOB_MANAGER", manager)
@@ -2412,6 +2426,368 @@ def test_analytics_excludes_archived_transactions_and_restores_on_unarchive():
         assert by_category_after_restore.json()["items"][0]["expense_total_cents"] == 7000
 
 
+def test_monthly_rollups_track_transaction_writes_and_match_live_scan():
+    with TestClient(app) as client:
+        user = _register_user(client)
+        auth_headers = _auth_headers(user["access"])
+        me = client.get("/api/me", headers=auth_headers)
+        user_id = me.json()["id"]
+        account_id = _create_account(client, auth_headers, "rollup-account")
+        expense_category_id = _create_category(client, auth_headers, "rollup-expense", "expense")
+        other_expense_category_id = _create_category(client, auth_headers, "rollup-expense-2", "expense")
+        income_category_id = _create_category(client, auth_headers, "rollup-income", "income")
+
+        created_ids: list[str] = []
+        for tx_date in ["2026-01-10", "2026-02-05", "2026-02-20", "2026-03-15"]:
+            status, body = _create_transaction(
+                client,
+                auth_headers,
+                type_="expense",
+                account_id=account_id,
+                category_id=expense_category_id,
+                note="rollup-seed",
+                date=tx_date,
+            )
+            assert status == 201
+            created_ids.append(body["id"])
+        status, _ = _create_transaction(
+            client,
+            auth_headers,
+            type_="income",
+            account_id=account_id,
+            category_id=income_category_id,
+            note="rollup-income",
+            date="2026-02-01",
+        )
+        assert status == 201
+
+        moved = client.patch(
+            f"/api/transactions/{created_ids[1]}",
+            json={"category_id": other_expense_category_id, "date": "2026-03-01", "is_impulse": True},
+            headers=auth_headers,
+        )
+        assert moved.status_code == 200
+        _archive_transaction_and_assert(client, user["access"], created_ids[0])
+
+        imported = client.post(
+            "/api/transactions/import",
+            json={
+                "mode": "partial",
+                "items": [
+                    {
+                        "type": "expense",
+                        "account_id": account_id,
+                        "category_id": expense_category_id,
+                        "amount_cents": 1500,
+                        "date": "2026-02-28",
+                    }
+                ],
+            },
+            headers=auth_headers,
+        )
+        assert imported.status_code == 200
+        assert imported.json()["created_count"] == 1
+
+        with SessionLocal() as db:
+            assert find_rollup_drift(db, user_id=user_id) == []
+            rollups = list(db.scalars(select(TransactionMonthlyRollup).where(TransactionMonthlyRollup.user_id == user_id)))
+        by_month_rows = {(row.month, row.category_id): row for row in rollups if row.transaction_count > 0}
+        assert by_month_rows[("2026-03", other_expense_category_id)].impulse_count == 1
+        assert ("2026-01", expense_category_id) not in by_month_rows
+
+        full_months = client.get("/api/analytics/by-month?from=2026-01-01&to=2026-03-31", headers=auth_headers)
+        assert full_months.status_code == 200
+        assert [
+            (item["month"], item["income_total_cents"], item["expense_total_cents"])
+            for item in full_months.json()["items"]
+        ] == [("2026-02", 7000, 8500), ("2026-03", 0, 14000)]
+
+        partial_edges = client.get("/api/analytics/by-month?from=2026-02-15&to=2026-03-10", headers=auth_headers)
+        assert partial_edges.status_code == 200
+        assert [
+            (item["month"], item["income_total_cents"], item["expense_total_cents"])
+            for item in partial_edges.json()["items"]
+        ] == [("2026-02", 7000, 8500), ("2026-03", 0, 7000)]
+
+        by_category = client.get("/api/analytics/by-category?from=2026-02-10&to=2026-03-31", headers=auth_headers)
+        assert by_category.status_code == 200
+        assert {
+            item["category_id"]: item["expense_total_cents"] for item in by_category.json()["items"]
+        } == {expense_category_id: 15500, other_expense_category_id: 7000}
+
+        impulse = client.get("/api/analytics/impulse-summary?from=2026-01-01&to=2026-03-31", headers=auth_headers)
+        assert impulse.status_code == 200
+        assert impulse.json()["impulse_count"] == 1
+        assert impulse.json()["untagged_count"] == 4
+
+
+def test_rebuild_rollups_cli_reports_and_repairs_drift():
+    with TestClient(app) as client:
+        user = _register_user(client)
+        auth_headers = _auth_headers(user["access"])
+        user_id = client.get("/api/me", headers=auth_headers).json()["id"]
+        account_id = _create_account(client, auth_headers, "rollup-cli-account")
+        category_id = _create_category(client, auth_headers, "rollup-cli-category", "expense")
+        status, _ = _create_transaction(
+            client,
+            auth_headers,
+            type_="expense",
+            account_id=account_id,
+            category_id=category_id,
+            note="rollup-cli-seed",
+            date="2026-04-10",
+        )
+        assert status == 201
+
+    with SessionLocal() as db:
+        row = db.scalar(select(TransactionMonthlyRollup).where(TransactionMonthlyRollup.user_id == user_id))
+        row.expense_total_cents += 99
+        db.commit()
+
+    logs: list[str] = []
+    assert rebuild_rollups_cli.run(check_only=True, user_id=user_id, log_fn=logs.append) == 1
+    assert any("drift" in line and "month=2026-04" in line for line in logs)
+    assert rebuild_rollups_cli.run(user_id=user_id, log_fn=logs.append) == 0
+    assert rebuild_rollups_cli.run(check_only=True, user_id=user_id, log_fn=logs.append) == 0
+    assert logs[-1] == "rebuild-rollups status=checked drift_count=0"
+
+
+def test_account_balances_track_transaction_writes_and_reconcile_cli_repairs_drift():
+    with TestClient(app) as client:
+        user = _register_user(client)
+        auth_headers = _auth_headers(user["access"])
+        user_id = client.get("/api/me", headers=auth_headers).json()["id"]
+        response = client.post(
+            "/api/accounts",
+            json={"name": "balance-checking", "type": "bank", "initial_balance_cents": 10000, "note": "acct"},
+            headers=auth_headers,
+        )
+        assert response.status_code == 201
+        checking_id = response.json()["id"]
+        cash_id = _create_account(client, auth_headers, "balance-cash")
+        expense_id = _create_category(client, auth_headers, "balance-expense", "expense")
+        income_id = _create_category(client, auth_headers, "balance-income", "income")
+
+        status, expense = _create_transaction(
+            client, auth_headers, type_="expense", account_id=checking_id, category_id=expense_id, note="rent"
+        )
+        assert status == 201
+        status, income = _create_transaction(
+            client, auth_headers, type_="income", account_id=cash_id, category_id=income_id, note="gift"
+        )
+        assert status == 201
+        patched = client.patch(
+            f"/api/transactions/{expense['id']}",
+            json={"amount_cents": 2500, "account_id": cash_id},
+            headers=auth_headers,
+        )
+        assert patched.status_code == 200
+        assert client.delete(f"/api/transactions/{income['id']}", headers=auth_headers).status_code == 204
+        imported = client.post(
+            "/api/transactions/import",
+            json={
+                "mode": "partial",
+                "items": [
+                    {"type": "income", "account_id": checking_id, "category_id": income_id, "amount_cents": 400, "date": "2026-02-03"}
+                ],
+            },
+            headers=auth_headers,
+        )
+        assert imported.status_code == 200
+
+        balances = client.get("/api/accounts/balances", headers=auth_headers)
+        assert balances.status_code == 200
+        assert balances.headers["content-type"].startswith(VENDOR)
+        by_name = {item["name"]: item for item in balances.json()["items"]}
+        assert by_name["balance-checking"]["balance_cents"] == 10400
+        assert by_name["balance-checking"]["transaction_count"] == 2
+        assert by_name["balance-cash"]["balance_cents"] == -2500
+        assert balances.json()["total_balance_cents"] == 7900
+
+    with SessionLocal() as db:
+        row = db.get(AccountBalance, checking_id)
+        row.balance_cents += 99
+        db.commit()
+
+    logs: list[str] = []
+    assert reconcile_balances_cli.run(check_only=True, user_id=user_id, log_fn=logs.append) == 1
+    assert any(f"account={checking_id} expected_cents=10400 stored_cents=10499" in line for line in logs)
+    assert reconcile_balances_cli.run(user_id=user_id, log_fn=logs.append) == 0
+    assert reconcile_balances_cli.run(check_only=True, user_id=user_id, log_fn=logs.append) == 0
+    assert logs[-1] == "reconcile-balances status=checked drift_count=0"
+
+
+def test_account_balance_history_returns_columnar_bucket_closings():
+    with TestClient(app) as client:
+        user = _register_user(client)
+        auth_headers = _auth_headers(user["access"])
+        account_id = _create_account(client, auth_headers, "history-account")
+        income_id = _create_category(client, auth_headers, "history-income", "income")
+        expense_id = _create_category(client, auth_headers, "history-expense", "expense")
+        for type_, category_id, day in (
+            ("income", income_id, "2026-01-20"),
+            ("expense", expense_id, "2026-02-03"),
+            ("income", income_id, "2026-02-10"),
+            ("income", income_id, "2026-02-10"),
+            ("expense", expense_id, "2026-03-02"),
+        ):
+            status, _ = _create_transaction(
+                client, auth_headers, type_=type_, account_id=account_id, category_id=category_id, note="history", date=day
+            )
+            assert status == 201
+
+        weekly = client.get(
+            f"/api/accounts/{account_id}/balance-history?from=2026-02-01&to=2026-02-16&granularity=week",
+            headers=auth_headers,
+        )
+        assert weekly.status_code == 200
+        assert weekly.json() == {
+            "account_id": account_id,
+            "granularity": "week",
+            "dates": ["2026-01-26", "2026-02-02", "2026-02-09", "2026-02-16"],
+            "balance_cents": [7000, 0, 14000, 14000],
+        }
+
+        monthly = client.get(
+            f"/api/accounts/{account_id}/balance-history?from=2026-01-01&to=2026-03-31&granularity=month",
+            headers=auth_headers,
+        ).json()
+        assert monthly["dates"] == ["2026-01-01", "2026-02-01", "2026-03-01"]
+        assert monthly["balance_cents"] == [7000, 14000, 7000]
+
+        inverted = client.get(f"/api/accounts/{account_id}/balance-history?from=2026-03-01&to=2026-02-01", headers=auth_headers)
+        assert inverted.status_code == 400
+        too_many = client.get(f"/api/accounts/{account_id}/balance-history?from=2020-01-01&to=2026-01-01", headers=auth_headers)
+        assert too_many.status_code == 400
+        huge = client.get(f"/api/accounts/{account_id}/balance-history?from=0001-01-01&to=2026-01-01", headers=auth_headers)
+        assert huge.status_code == 400
+
+        other = _register_user(client)
+        forbidden = client.get(
+            f"/api/accounts/{account_id}/balance-history?from=2026-02-01&to=2026-02-28",
+            headers=_auth_headers(other["access"]),
+        )
+        assert forbidden.status_code == 403
+
+
+def test_dashboard_combines_home_screen_reads_and_honours_etag():
+    with TestClient(app) as client:
+        user = _register_user(client)
+        auth_headers = _auth_headers(user["access"])
+        account_id = _create_account(client, auth_headers, "dashboard-account")
+        category_id = _create_category(client, auth_headers, "dashboard-expense", "expense")
+        for day in ("2026-01-15", "2026-02-03"):
+            status, _ = _create_transaction(
+                client, auth_headers, type_="expense", account_id=account_id, category_id=category_id, note="dash", date=day
+            )
+            assert status == 201
+        assert _create_budget(client, auth_headers, month="2026-02", category_id=category_id, limit_cents=50000)[0] == 201
+        assert _create_bill(client, auth_headers, category_id=category_id, account_id=account_id)[0] == 201
+        assert _create_savings_goal(client, auth_headers, account_id=account_id, category_id=category_id)[0] == 201
+
+        response = client.get("/api/dashboard?month=2026-02", headers=auth_headers)
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith(VENDOR)
+        etag = response.headers["etag"]
+        assert etag.startswith('W/"')
+        body = response.json()
+        assert body["month"] == "2026-02"
+
+        def _get(url: str) -> dict:
+            result = client.get(url, headers=auth_headers)
+            assert result.status_code == 200
+            return result.json()
+
+        assert body["by_month"] == _get("/api/analytics/by-month?from=2026-02-01&to=2026-02-28")
+        assert body["by_category"] == _get("/api/analytics/by-category?from=2026-02-01&to=2026-02-28")
+        assert body["bills_monthly_status"] == _get("/api/bills/monthly-status?month=2026-02")
+        assert body["savings_summary"] == _get("/api/savings-goals/summary")
+        assert body["budgets"] == _get("/api/budgets?from=2026-02&to=2026-02")
+
+        unchanged = client.get("/api/dashboard?month=2026-02", headers={**auth_headers, "if-none-match": etag})
+        assert unchanged.status_code == 304
+        assert unchanged.content == b""
+        assert unchanged.headers["etag"] == etag
+
+        status, _ = _create_transaction(
+            client, auth_headers, type_="expense", account_id=account_id, category_id=category_id, note="dash", date="2026-02-04"
+        )
+        assert status == 201
+        changed = client.get("/api/dashboard?month=2026-02", headers={**auth_headers, "if-none-match": etag})
+        assert changed.status_code == 200
+        assert changed.headers["etag"] != etag
+
+        invalid = client.get("/api/dashboard?month=2026-13", headers=auth_headers)
+        assert invalid.status_code in {400, 422}
+
+
+def test_read_endpoints_answer_304_from_version_stamps_until_a_write():
+    with TestClient(app) as client:
+        user = _register_user(client)
+        auth_headers = _auth_headers(user["access"])
+        account_id = _create_account(client, auth_headers, "etag-account")
+        category_id = _create_category(client, auth_headers, "etag-expense", "expense")
+        status, _ = _create_transaction(
+            client, auth_headers, type_="expense", account_id=account_id, category_id=category_id, note="etag"
+        )
+        assert status == 201
+        assert _create_budget(client, auth_headers, month="2026-02", category_id=category_id, limit_cents=50000)[0] == 201
+        assert _create_bill(client, auth_headers, name="etag-bill", category_id=category_id, account_id=account_id)[0] == 201
+        assert _create_savings_goal(client, auth_headers, name="etag-goal", account_id=account_id, category_id=category_id)[0] == 201
+        assert _create_income_source(client, auth_headers, name="etag-income")[0] == 201
+
+        urls = [
+            "/api/budgets?from=2026-02&to=2026-02",
+            "/api/bills",
+            "/api/bills/monthly-status?month=2026-02",
+            "/api/categories",
+            "/api/accounts",
+            "/api/accounts/balances",
+            f"/api/accounts/{account_id}/balance-history?from=2026-02-01&to=2026-02-28",
+            "/api/income-sources",
+            "/api/savings-goals",
+            "/api/savings-goals/summary",
+            "/api/analytics/by-month?from=2026-02-01&to=2026-02-28",
+            "/api/analytics/by-category?from=2026-02-01&to=2026-02-28",
+            "/api/analytics/income?from=2026-02-01&to=2026-02-28",
+            "/api/analytics/impulse-summary?from=2026-02-01&to=2026-02-28",
+        ]
+        etags: dict[str, str] = {}
+        for url in urls:
+            response = client.get(url, headers=auth_headers)
+            assert response.status_code == 200, url
+            assert response.headers["etag"].startswith('W/"'), url
+            assert response.headers["cache-control"] == "private, no-cache"
+            etags[url] = response.headers["etag"]
+            cached = client.get(url, headers={**auth_headers, "if-none-match": etags[url]})
+            assert cached.status_code == 304, url
+            assert cached.content == b""
+        assert len(set(etags.values())) == len(urls)
+
+        by_month = urls[10]
+        statements: list[str] = []
+
+        def _record(_conn, _cursor, statement, *_args):
+            statements.append(statement)
+
+        sa_event.listen(db_engine, "before_cursor_execute", _record)
+        try:
+            assert client.get(by_month, headers={**auth_headers, "if-none-match": etags[by_month]}).status_code == 304
+        finally:
+            sa_event.remove(db_engine, "before_cursor_execute", _record)
+        assert not any("transaction_monthly_rollups" in statement for statement in statements)
+
+        renamed = client.patch(f"/api/categories/{category_id}", json={"name": "etag-renamed"}, headers=auth_headers)
+        assert renamed.status_code == 200
+        for url in urls:
+            response = client.get(url, headers={**auth_headers, "if-none-match": etags[url]})
+            touched = url.startswith(("/api/categories", "/api/analytics"))
+            assert response.status_code == (200 if touched else 304), url
+
+        other = _auth_headers(_register_user(client)["access"])
+        assert client.get("/api/categories", headers={**other, "if-none-match": etags["/api/categories"]}).status_code == 200
+
+
 def test_persistence_survives_app_restart_for_user_data():
     user_payload: dict[str, str] = {}
     account_id: str | None = None
@@ -4515,102 +4891,409 @@ def test_transactions_import_partial_mixed_rows_reports_deterministic_failures()
         assert len(listed.json()["items"]) == 1
 
 
-def test_transactions_import_all_or_nothing_rolls_back_batch():
+def test_transactions_batch_applies_mixed_operations_set_based_with_per_op_results():
     with TestClient(app) as client:
         user = _register_user(client)
         headers = _auth_headers(user["access"])
-        account_id = _create_account(client, headers, "import-aon-account")
-        income_category_id = _create_category(client, headers, "import-aon-income", "income")
-        expense_category_id = _create_category(client, headers, "import-aon-expense", "expense")
+        user_id = client.get("/api/me", headers=headers).json()["id"]
+        account_id = _create_account(client, headers, "batch-account")
+        groceries_id = _create_category(client, headers, "batch-groceries", "expense")
+        dining_id = _create_category(client, headers, "batch-dining", "expense")
+        income_id = _create_category(client, headers, "batch-income", "income")
+        ids = []
+        for note in ("one", "two", "three"):
+            status, body = _create_transaction(
+                client, headers, type_="expense", account_id=account_id, category_id=groceries_id, note=note
+            )
+            assert status == 201
+            ids.append(body["id"])
+
+        operations = [
+            {"op": "patch", "id": ids[0], "changes": {"category_id": dining_id}},
+            {"op": "patch", "id": ids[1], "changes": {"category_id": dining_id}},
+            {"op": "archive", "id": ids[2]},
+            {
+                "op": "create",
+                "item": {
+                    "type": "expense",
+                    "account_id": account_id,
+                    "category_id": dining_id,
+                    "amount_cents": 1500,
+                    "date": "2026-02-02",
+                    "merchant": "Acme",
+                },
+            },
+            {"op": "patch", "id": str(uuid.uuid4()), "changes": {"note": "missing"}},
+            {"op": "patch", "id": ids[0], "changes": {"note": "again"}},
+            {"op": "patch", "id": ids[1], "changes": {"category_id": income_id}},
+        ]
+        statements: list[str] = []
 
-        response = client.post(
-            "/api/transactions/import",
+        def _record(_conn, _cursor, statement, *_args):
+            statements.append(statement)
+
+        sa_event.listen(db_engine, "before_cursor_execute", _record)
+        try:
+            response = client.post("/api/transactions/batch", json={"operations": operations}, headers=headers)
+        finally:
+            sa_event.remove(db_engine, "before_cursor_execute", _record)
+
+        assert response.status_code == 200
+        body = response.json()
+        assert body["applied_count"] == 4
+        assert body["failed_count"] == 3
+        assert [item["status"] for item in body["results"]] == [
+            "applied",
+            "applied",
+            "applied",
+            "applied",
+            "failed",
+            "failed",
+            "failed",
+        ]
+        assert body["results"][4]["problem"]["status"] == 403
+        assert body["results"][5]["problem"]["status"] == 409
+        created_id = body["results"][3]["id"]
+        transaction_updates = [
+            statement for statement in statements if statement.lstrip().upper().startswith("UPDATE TRANSACTIONS")
+        ]
+        assert len(transaction_updates) == 2
+
+        assert client.get(f"/api/transactions/{ids[0]}", headers=headers).json()["category_id"] == dining_id
+        assert client.get(f"/api/transactions/{ids[1]}", headers=headers).json()["category_id"] == dining_id
+        assert client.get(f"/api/transactions/{ids[2]}", headers=headers).json()["archived_at"] is not None
+        assert client.get(f"/api/transactions/{created_id}", headers=headers).status_code == 200
+
+        with SessionLocal() as db:
+            assert find_rollup_drift(db, user_id=user_id) == []
+            actions = list(
+                db.scalars(
+                    select(AuditEvent.action)
+                    .where(AuditEvent.user_id == user_id)
+                    .where(AuditEvent.resource_id.in_([*ids, created_id]))
+                )
+            )
+        assert sorted(actions) == sorted(
+            ["transaction.create"] * 4 + ["transaction.update"] * 2 + ["transaction.archive"]
+        )
+        assert reconcile_balances_cli.run(check_only=True, user_id=user_id, log_fn=lambda _line: None) == 0
+
+        atomic = client.post(
+            "/api/transactions/batch",
             json={
                 "mode": "all_or_nothing",
-                "items": [
-                    {
-                        "type": "income",
-                        "account_id": account_id,
-                        "category_id": income_category_id,
-                        "amount_cents": 5000,
-                        "date": "2026-08-01",
-                        "merchant": "Acme",
-                        "note": "ok-row",
-                    },
-                    {
-                        "type": "income",
-                        "account_id": account_id,
-                        "category_id": expense_category_id,
-                        "amount_cents": 5000,
-                        "date": "2026-08-02",
-                        "merchant": "Acme",
-                        "note": "invalid-row",
-                    },
+                "operations": [
+                    {"op": "archive", "id": ids[0]},
+                    {"op": "patch", "id": ids[1], "changes": {"amount_cents": 0}},
                 ],
             },
             headers=headers,
         )
-        assert response.status_code == 200
-        assert response.headers["content-type"].startswith(VENDOR)
-        body = response.json()
-        assert body["created_count"] == 0
-        assert body["failed_count"] == 1
-        assert body["failures"][0]["index"] == 1
-
-        listed = client.get(
-            "/api/transactions?from=2026-08-01&to=2026-08-02",
-            headers={"accept": VENDOR, "authorization": f"Bearer {user['access']}"},
-        )
-        assert listed.status_code == 200
-        assert listed.headers["content-type"].startswith(VENDOR)
-        assert listed.json()["items"] == []
+        assert atomic.status_code == 200
+        assert atomic.json()["applied_count"] == 0
+        assert [item["status"] for item in atomic.json()["results"]] == ["skipped", "failed"]
+        assert client.get(f"/api/transactions/{ids[0]}", headers=headers).json()["archived_at"] is None
 
 
-def test_transactions_import_batch_limit_returns_canonical_400(monkeypatch):
+def test_transactions_batch_rejects_oversized_and_malformed_requests(monkeypatch):
+    monkeypatch.setattr(app_main.settings, "transaction_batch_max_operations", 2)
     with TestClient(app) as client:
         user = _register_user(client)
         headers = _auth_headers(user["access"])
-        account_id = _create_account(client, headers, "import-limit-account")
-        income_category_id = _create_category(client, headers, "import-limit-income", "income")
+        archive = {"op": "archive", "id": str(uuid.uuid4())}
 
-        monkeypatch.setattr("app.routers.transactions.settings.transaction_import_max_items", 1)
+        oversized = client.post("/api/transactions/batch", json={"operations": [archive] * 3}, headers=headers)
+        assert oversized.status_code == 400
+        assert "maximum batch size (2)" in oversized.json()["detail"]
 
-        response = client.post(
-            "/api/transactions/import",
-            json={
-                "mode": "partial",
-                "items": [
-                    {
-                        "type": "income",
-                        "account_id": account_id,
-                        "category_id": income_category_id,
-                        "amount_cents": 1000,
-                        "date": "2026-09-01",
-                    },
-                    {
-                        "type": "income",
-                        "account_id": account_id,
-                        "category_id": income_category_id,
-                        "amount_cents": 2000,
-                        "date": "2026-09-02",
-                    },
-                ],
-            },
+        unknown_op = client.post(
+            "/api/transactions/batch",
+            json={"operations": [{"op": "delete", "id": str(uuid.uuid4())}]},
             headers=headers,
         )
-        _assert_money_problem(response, IMPORT_BATCH_LIMIT_EXCEEDED_TYPE, IMPORT_BATCH_LIMIT_EXCEEDED_TITLE)
+        assert unknown_op.status_code in {400, 422}
+        assert client.post("/api/transactions/batch", json={"operations": []}, headers=headers).status_code in {400, 422}
 
 
-def test_transactions_import_jobs_lifecycle_and_status_polling(monkeypatch):
-    _configure_async_import_jobs_for_test(monkeypatch, per_user_limit=4, queue_limit=10, worker_count=1)
-
+def test_transactions_recategorize_moves_matching_rows_with_one_update():
     with TestClient(app) as client:
         user = _register_user(client)
         headers = _auth_headers(user["access"])
-        account_id = _create_account(client, headers, "job-account")
-        category_id = _create_category(client, headers, "job-income", "income")
+        user_id = client.get("/api/me", headers=headers).json()["id"]
+        account_id = _create_account(client, headers, "recategorize-account")
+        groceries_id = _create_category(client, headers, "recategorize-groceries", "expense")
+        dining_id = _create_category(client, headers, "recategorize-dining", "expense")
+        income_id = _create_category(client, headers, "recategorize-income", "income")
+        acme_ids = []
+        for merchant, date in (("Acme", "2026-02-01"), ("ACME", "2026-02-10"), ("Acme", "2026-03-05")):
+            status, body = _create_transaction(
+                client,
+                headers,
+                type_="expense",
+                account_id=account_id,
+                category_id=groceries_id,
+                note="acme",
+                merchant=merchant,
+                date=date,
+            )
+            assert status == 201
+            acme_ids.append(body["id"])
+        status, other = _create_transaction(
+            client, headers, type_="expense", account_id=account_id, category_id=groceries_id, note="other", merchant="Acme Hardware"
+        )
+        assert status == 201
 
-        submit = client.post(
+        statements: list[str] = []
+
+        def _record(_conn, _cursor, statement, *_args):
+            statements.append(statement)
+
+        sa_event.listen(db_engine, "before_cursor_execute", _record)
+        try:
+            response = client.post(
+                "/api/transactions/recategorize",
+                json={"category_id": dining_id, "filter": {"merchant": "acme", "to": "2026-02-28"}},
+                headers=headers,
+            )
+        finally:
+            sa_event.remove(db_engine, "before_cursor_execute", _record)
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith(VENDOR)
+        assert response.json() == {"updated_count": 2}
+        assert len([item for item in statements if item.lstrip().upper().startswith("UPDATE TRANSACTIONS")]) == 1
+        categories = {
+            transaction_id: client.get(f"/api/transactions/{transaction_id}", headers=headers).json()["category_id"]
+            for transaction_id in [*acme_ids, other["id"]]
+        }
+        assert categories == {
+            acme_ids[0]: dining_id,
+            acme_ids[1]: dining_id,
+            acme_ids[2]: groceries_id,
+            other["id"]: groceries_id,
+        }
+
+        contains = client.post(
+            "/api/transactions/recategorize",
+            json={"category_id": dining_id, "filter": {"merchant": "hard", "merchant_match": "contains"}},
+            headers=headers,
+        )
+        assert contains.json() == {"updated_count": 1}
+
+        with SessionLocal() as db:
+            assert find_rollup_drift(db, user_id=user_id) == []
+            audited = list(
+                db.scalars(
+                    select(AuditEvent.details)
+                    .where(AuditEvent.user_id == user_id)
+                    .where(AuditEvent.action == "transaction.recategorize")
+                )
+            )
+        assert sorted(audited, key=lambda details: details["updated_count"]) == [
+            {
+                "category_id": dining_id,
+                "filter": {"include_archived": False, "merchant": "hard", "merchant_match": "contains"},
+                "updated_count": 1,
+            },
+            {
+                "category_id": dining_id,
+                "filter": {"include_archived": False, "to": "2026-02-28", "merchant": "acme", "merchant_match": "exact"},
+                "updated_count": 2,
+            },
+        ]
+
+        for unfiltered in ({"category_id": dining_id, "filter": {}}, {"category_id": dining_id}):
+            response = client.post("/api/transactions/recategorize", json=unfiltered, headers=headers)
+            assert response.status_code == 400
+
+        mismatch = client.post(
+            "/api/transactions/recategorize",
+            json={"category_id": income_id, "filter": {"category_id": groceries_id}},
+            headers=headers,
+        )
+        assert mismatch.status_code == 409
+        assert client.get(f"/api/transactions/{acme_ids[2]}", headers=headers).json()["category_id"] == groceries_id
+
+        assert client.delete(f"/api/categories/{groceries_id}", headers=headers).status_code == 204
+        archived = client.post(
+            "/api/transactions/recategorize",
+            json={"category_id": groceries_id, "filter": {"account_id": account_id}},
+            headers=headers,
+        )
+        assert archived.status_code == 409
+
+        invalid_range = client.post(
+            "/api/transactions/recategorize",
+            json={"category_id": dining_id, "filter": {"from": "2026-03-01", "to": "2026-02-01"}},
+            headers=headers,
+        )
+        assert invalid_range.status_code == 400
+
+
+def test_transactions_import_prefetches_references_and_bulk_writes_rows():
+    with TestClient(app) as client:
+        user = _register_user(client)
+        headers = _auth_headers(user["access"])
+        user_id = client.get("/api/me", headers=headers).json()["id"]
+        account_id = _create_account(client, headers, "import-bulk-account")
+        income_category_id = _create_category(client, headers, "import-bulk-income", "income")
+        expense_category_id = _create_category(client, headers, "import-bulk-expense", "expense")
+
+        items = [
+            {
+                "type": "expense",
+                "account_id": account_id,
+                "category_id": expense_category_id,
+                "amount_cents": 100 + index,
+                "date": "2026-09-01",
+                "note": f"bulk-{index}",
+            }
+            for index in range(60)
+        ]
+        items[10] = {**items[10], "account_id": str(uuid.uuid4())}
+        items[20] = {**items[20], "category_id": income_category_id}
+        items[30] = {**items[30], "income_source_id": str(uuid.uuid4())}
+
+        statements: list[str] = []
+
+        def _record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        sa_event.listen(db_engine, "before_cursor_execute", _record)
+        try:
+            response = client.post(
+                "/api/transactions/import",
+                json={"mode": "partial", "items": items},
+                headers=headers,
+            )
+        finally:
+            sa_event.remove(db_engine, "before_cursor_execute", _record)
+
+        assert response.status_code == 200
+        body = response.json()
+        assert body["created_count"] == 57
+        assert [failure["index"] for failure in body["failures"]] == [10, 20, 30]
+        assert body["failures"][0]["problem"]["status"] == 409
+        assert body["failures"][1]["problem"]["type"] == MISMATCH_TYPE
+        assert body["failures"][2]["problem"]["status"] == 400
+        reference_selects = [
+            statement
+            for statement in statements
+            if statement.lstrip().upper().startswith("SELECT")
+            and ("FROM accounts" in statement or "FROM categories" in statement or "FROM income_sources" in statement)
+        ]
+        assert len(reference_selects) <= 3
+        assert len(statements) < 20
+
+        with SessionLocal() as db:
+            created = list(db.scalars(select(Transaction.id).where(Transaction.user_id == user_id)))
+            audited = set(
+                db.scalars(
+                    select(AuditEvent.resource_id)
+                    .where(AuditEvent.user_id == user_id)
+                    .where(AuditEvent.action == "transaction.create")
+                )
+            )
+        assert len(created) == 57
+        assert set(created) == audited
+
+
+def test_transactions_import_all_or_nothing_rolls_back_batch():
+    with TestClient(app) as client:
+        user = _register_user(client)
+        headers = _auth_headers(user["access"])
+        account_id = _create_account(client, headers, "import-aon-account")
+        income_category_id = _create_category(client, headers, "import-aon-income", "income")
+        expense_category_id = _create_category(client, headers, "import-aon-expense", "expense")
+
+        response = client.post(
+            "/api/transactions/import",
+            json={
+                "mode": "all_or_nothing",
+                "items": [
+                    {
+                        "type": "income",
+                        "account_id": account_id,
+                        "category_id": income_category_id,
+                        "amount_cents": 5000,
+                        "date": "2026-08-01",
+                        "merchant": "Acme",
+                        "note": "ok-row",
+                    },
+                    {
+                        "type": "income",
+                        "account_id": account_id,
+                        "category_id": expense_category_id,
+                        "amount_cents": 5000,
+                        "date": "2026-08-02",
+                        "merchant": "Acme",
+                        "note": "invalid-row",
+                    },
+                ],
+            },
+            headers=headers,
+        )
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith(VENDOR)
+        body = response.json()
+        assert body["created_count"] == 0
+        assert body["failed_count"] == 1
+        assert body["failures"][0]["index"] == 1
+
+        listed = client.get(
+            "/api/transactions?from=2026-08-01&to=2026-08-02",
+            headers={"accept": VENDOR, "authorization": f"Bearer {user['access']}"},
+        )
+        assert listed.status_code == 200
+        assert listed.headers["content-type"].startswith(VENDOR)
+        assert listed.json()["items"] == []
+
+
+def test_transactions_import_batch_limit_returns_canonical_400(monkeypatch):
+    with TestClient(app) as client:
+        user = _register_user(client)
+        headers = _auth_headers(user["access"])
+        account_id = _create_account(client, headers, "import-limit-account")
+        income_category_id = _create_category(client, headers, "import-limit-income", "income")
+
+        monkeypatch.setattr("app.routers.transactions.settings.transaction_import_max_items", 1)
+
+        response = client.post(
+            "/api/transactions/import",
+            json={
+                "mode": "partial",
+                "items": [
+                    {
+                        "type": "income",
+                        "account_id": account_id,
+                        "category_id": income_category_id,
+                        "amount_cents": 1000,
+                        "date": "2026-09-01",
+                    },
+                    {
+                        "type": "income",
+                        "account_id": account_id,
+                        "category_id": income_category_id,
+                        "amount_cents": 2000,
+                        "date": "2026-09-02",
+                    },
+                ],
+            },
+            headers=headers,
+        )
+        _assert_money_problem(response, IMPORT_BATCH_LIMIT_EXCEEDED_TYPE, IMPORT_BATCH_LIMIT_EXCEEDED_TITLE)
+
+
+def test_transactions_import_jobs_lifecycle_and_status_polling(monkeypatch):
+    _configure_async_import_jobs_for_test(monkeypatch, per_user_limit=4, queue_limit=10, worker_count=1)
+
+    with TestClient(app) as client:
+        user = _register_user(client)
+        headers = _auth_headers(user["access"])
+        account_id = _create_account(client, headers, "job-account")
+        category_id = _create_category(client, headers, "job-income", "income")
+
+        submit = client.post(
             "/api/transactions/import/jobs",
             json={
                 "mode": "partial",
@@ -4649,6 +5332,612 @@ def test_transactions_import_jobs_lifecycle_and_status_polling(monkeypatch):
         assert terminal["result"]["failed_count"] == 0
 
 
+def test_transactions_import_jobs_split_large_payloads_across_workers(monkeypatch):
+    _configure_async_import_jobs_for_test(monkeypatch, per_user_limit=4, queue_limit=10, worker_count=3, chunk_size=2)
+
+    with TestClient(app) as client:
+        user = _register_user(client)
+        headers = _auth_headers(user["access"])
+        account_id = _create_account(client, headers, "chunked-job-account")
+        category_id = _create_category(client, headers, "chunked-job-income", "income")
+        item = {"type": "income", "account_id": account_id, "category_id": category_id, "amount_cents": 100}
+        items = [{**item, "date": f"2026-11-{day:02d}"} for day in range(1, 8)]
+        items[1]["account_id"] = str(uuid.uuid4())
+        items[5]["category_id"] = str(uuid.uuid4())
+
+        def run(mode: str, job_items: list[dict]) -> dict:
+            submit = client.post("/api/transactions/import/jobs", json={"mode": mode, "items": job_items}, headers=headers)
+            assert submit.status_code == 202
+            status = client.get(f"/api/transactions/import/jobs/{submit.json()['job_id']}?wait=10", headers=headers)
+            while status.json()["status"] not in {"completed", "failed"}:
+                status = client.get(f"/api/transactions/import/jobs/{submit.json()['job_id']}?wait=10", headers=headers)
+            return status.json()
+
+        rejected = run("all_or_nothing", items)
+        assert rejected["status"] == "completed"
+        assert rejected["result"]["created_count"] == 0
+        assert [failure["index"] for failure in rejected["result"]["failures"]] == [1, 5]
+
+        partial = run("partial", items)
+        assert partial["status"] == "completed"
+        assert partial["result"]["created_count"] == 5
+        assert [failure["index"] for failure in partial["result"]["failures"]] == [1, 5]
+        assert partial["progress"] == {"processed_rows": 7, "created_count": 5, "failed_count": 2}
+
+        valid = [entry for index, entry in enumerate(items) if index not in {1, 5}]
+        committed = run("all_or_nothing", valid)
+        assert committed["result"]["created_count"] == 5
+
+        listed = client.get("/api/transactions?limit=50", headers=headers)
+        assert listed.status_code == 200
+        assert len(listed.json()["items"]) == 10
+
+
+def test_transactions_import_jobs_chunk_max_size_payloads_with_default_settings(monkeypatch):
+    import app.transactions.import_jobs as import_jobs_module
+
+    _configure_async_import_jobs_for_test(
+        monkeypatch,
+        per_user_limit=4,
+        queue_limit=10,
+        worker_count=settings.transactions_import_async_worker_count,
+    )
+    chunked_calls: list[str] = []
+    execute_chunked = import_jobs_module._ImportJobManager._execute_chunked
+
+    def _spy(self, job_id, payload, user):
+        chunked_calls.append(job_id)
+        return execute_chunked(self, job_id, payload, user)
+
+    monkeypatch.setattr(import_jobs_module._ImportJobManager, "_execute_chunked", _spy)
+
+    with TestClient(app) as client:
+        user = _register_user(client)
+        headers = _auth_headers(user["access"])
+        account_id = _create_account(client, headers, "default-chunk-account")
+        category_id = _create_category(client, headers, "default-chunk-income", "income")
+        item = {"type": "income", "account_id": account_id, "category_id": category_id, "amount_cents": 100}
+        items = [{**item, "date": "2026-11-01"}] * settings.transaction_import_max_items
+
+        submit = client.post("/api/transactions/import/jobs", json={"mode": "partial", "items": items}, headers=headers)
+        assert submit.status_code == 202
+        job_id = submit.json()["job_id"]
+        status = client.get(f"/api/transactions/import/jobs/{job_id}?wait=10", headers=headers)
+        while status.json()["status"] not in {"completed", "failed"}:
+            status = client.get(f"/api/transactions/import/jobs/{job_id}?wait=10", headers=headers)
+
+        assert chunked_calls == [job_id]
+        assert status.json()["status"] == "completed"
+        assert status.json()["result"]["created_count"] == settings.transaction_import_max_items
+        assert status.json()["progress"]["processed_rows"] == settings.transaction_import_max_items
+
+
+def _sql_import_job_manager(*, worker_count: int = 0, now_fn=None, **overrides):
+    options = {
+        "per_user_limit": 4,
+        "queue_limit": 10,
+        "worker_count": worker_count,
+        "terminal_ttl_seconds": 3600,
+        "idempotency_ttl_seconds": 3600,
+        "retained_terminal_cap": 5000,
+        "visibility_timeout_seconds": 60,
+        "max_attempts": 3,
+        "poll_interval_seconds": 0.01,
+        "now_fn": now_fn or utcnow,
+    }
+    options.update(overrides)
+    return import_jobs_sql._SQLImportJobManager(**options)
+
+
+def _single_income_import_payload(account_id: str, category_id: str, *, date: str = "2026-11-01") -> dict:
+    return {
+        "mode": "partial",
+        "items": [
+            {
+                "type": "income",
+                "account_id": account_id,
+                "category_id": category_id,
+                "amount_cents": 5000,
+                "date": date,
+            }
+        ],
+    }
+
+
+def test_sql_import_jobs_survive_process_boundaries_and_share_idempotency(monkeypatch):
+    import app.routers.transactions as transactions_router
+
+    api_process = _sql_import_job_manager()
+    worker_process = _sql_import_job_manager()
+    monkeypatch.setattr(transactions_router, "_IMPORT_JOB_MANAGER", api_process)
+
+    with TestClient(app) as client:
+        user = _register_user(client)
+        headers = _auth_headers(user["access"])
+        user_id = client.get("/api/me", headers=headers).json()["id"]
+        account_id = _create_account(client, headers, "sql-job-account")
+        category_id = _create_category(client, headers, "sql-job-income", "income")
+        payload = _single_income_import_payload(account_id, category_id)
+
+        submit = client.post(
+            "/api/transactions/import/jobs",
+            json=payload,
+            headers={**headers, "Idempotency-Key": "sql-import-1"},
+        )
+        assert submit.status_code == 202
+        job_id = submit.json()["job_id"]
+        assert submit.json()["status"] == "queued"
+
+        reused, was_reused = worker_process.submit(
+            user_id=user_id,
+            payload=TransactionImportRequest.model_validate(payload),
+            idempotency_key="sql-import-1",
+        )
+        assert was_reused is True
+        assert reused.job_id == job_id
+        with pytest.raises(APIError) as conflict:
+            worker_process.submit(
+                user_id=user_id,
+                payload=TransactionImportRequest.model_validate(
+                    _single_income_import_payload(account_id, category_id, date="2026-11-02")
+                ),
+                idempotency_key="sql-import-1",
+            )
+        assert conflict.value.status == 409
+
+        assert worker_process.run_once() is True
+        assert worker_process.run_once() is False
+
+        status = client.get(
+            f"/api/transactions/import/jobs/{job_id}",
+            headers={"accept": VENDOR, "authorization": f"Bearer {user['access']}"},
+        )
+        assert status.status_code == 200
+        body = status.json()
+        assert body["status"] == "completed"
+        assert body["result"]["created_count"] == 1
+        assert body["started_at"] is not None
+
+        other = _register_user(client)
+        forbidden = client.get(
+            f"/api/transactions/import/jobs/{job_id}",
+            headers={"accept": VENDOR, "authorization": f"Bearer {other['access']}"},
+        )
+        assert forbidden.status_code == 403
+
+
+def test_sql_import_jobs_retry_expired_leases_and_fence_stale_workers():
+    clock = {"now": datetime(2026, 11, 1, 12, 0, tzinfo=timezone.utc)}
+
+    def now_fn():
+        return clock["now"]
+
+    crashed = _sql_import_job_manager(now_fn=now_fn, max_attempts=2)
+    survivor = _sql_import_job_manager(now_fn=now_fn, max_attempts=2)
+
+    with TestClient(app) as client:
+        user = _register_user(client)
+        headers = _auth_headers(user["access"])
+        user_id = client.get("/api/me", headers=headers).json()["id"]
+        account_id = _create_account(client, headers, "sql-retry-account")
+        category_id = _create_category(client, headers, "sql-retry-income", "income")
+
+    job, _ = crashed.submit(
+        user_id=user_id,
+        payload=TransactionImportRequest.model_validate(_single_income_import_payload(account_id, category_id)),
+        idempotency_key=None,
+    )
+    first_claim = crashed._claim_next()
+    assert first_claim is not None and first_claim.attempts == 1
+    assert survivor._claim_next() is None
+
+    clock["now"] += timedelta(seconds=61)
+    retry_claim = survivor._claim_next()
+    assert retry_claim is not None
+    assert retry_claim.job_id == job.job_id
+    assert retry_claim.attempts == 2
+
+    crashed._process_claim(first_claim)
+    survivor._process_claim(retry_claim)
+    record = survivor.get_for_user(user_id=user_id, job_id=job.job_id)
+    assert record is not None and record.status == "completed"
+    with SessionLocal() as db:
+        imported = db.scalars(
+            select(Transaction.id).where(Transaction.user_id == user_id).where(Transaction.date == date(2026, 11, 1))
+        ).all()
+    assert len(imported) == 1
+
+    abandoned, _ = crashed.submit(
+        user_id=user_id,
+        payload=TransactionImportRequest.model_validate(
+            _single_income_import_payload(account_id, category_id, date="2026-11-03")
+        ),
+        idempotency_key=None,
+    )
+    assert crashed._claim_next() is not None
+    clock["now"] += timedelta(seconds=61)
+    assert survivor._claim_next() is not None
+    clock["now"] += timedelta(seconds=61)
+    assert survivor._claim_next() is None
+    record = survivor.get_for_user(user_id=user_id, job_id=abandoned.job_id)
+    assert record is not None
+    assert record.status == "failed"
+    assert record.error_message == "Import job exceeded retry attempts"
+
+
+def test_prometheus_metrics_endpoint_is_off_by_default_and_honours_token(monkeypatch):
+    with TestClient(app) as client:
+        assert client.get("/api/metrics/db-pool", headers={"accept": VENDOR}).status_code == 404
+        disabled = client.get("/api/metrics", headers={"accept": "text/plain"})
+        assert disabled.status_code == 404
+        assert "bebudget_http_requests_total" not in disabled.text
+
+        monkeypatch.setattr(app_main.settings, "metrics_enabled", True)
+        monkeypatch.setattr(app_main.settings, "metrics_token", "scrape-secret")
+        assert client.get("/api/metrics", headers={"accept": "text/plain"}).status_code == 401
+        wrong = client.get("/api/metrics", headers={"accept": "text/plain", "authorization": "Bearer nope"})
+        assert wrong.status_code == 401
+        scraped = client.get("/api/metrics", headers={"accept": "text/plain", "authorization": "Bearer scrape-secret"})
+        assert scraped.status_code == 200
+
+
+def test_prometheus_metrics_report_primary_pool_checkouts(monkeypatch):
+    monkeypatch.setattr(app_main.settings, "metrics_enabled", True)
+    with TestClient(app) as client:
+        _register_user(client)
+        text = client.get("/api/metrics", headers={"accept": "text/plain"}).text
+        assert "# TYPE bebudget_db_pool_checkout_seconds histogram" in text
+        checkouts = re.search(r'^bebudget_db_pool_checkout_seconds_count\{pool="primary"\} (\S+)$', text, re.M)
+        assert checkouts is not None and float(checkouts.group(1)) >= 1
+        assert 'bebudget_db_pool_checkout_seconds_bucket{pool="primary",le="+Inf"}' in text
+        assert "# TYPE bebudget_db_pool_checkout_waits_total counter" in text
+        assert "# TYPE bebudget_db_pool_checkout_timeouts_total counter" in text
+        assert "bebudget_db_pool_checkouts" not in text
+        assert 'bebudget_db_pool_connections{pool="primary",state="checked_out"}' in text
+
+
+def test_prometheus_metrics_endpoint_reports_routes_rate_limits_and_import_queue(monkeypatch):
+    monkeypatch.setattr(auth_router.settings, "auth_login_rate_limit_per_minute", 1)
+    monkeypatch.setattr(app_main.settings, "metrics_enabled", True)
+    with TestClient(app) as client:
+        user = _register_user(client)
+        headers = _auth_headers(user["access"])
+        assert client.get("/api/me", headers=headers).status_code == 200
+        for _ in range(2):
+            client.post(
+                "/api/auth/login",
+                json={"username": user["username"], "password": user["password"]},
+                headers={"accept": VENDOR, "content-type": VENDOR},
+            )
+
+        response = client.get("/api/metrics", headers={"accept": "text/plain"})
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+        text = response.text
+        assert 'bebudget_http_requests_total{method="GET",route="/api/me",status_class="2xx"}' in text
+        assert 'bebudget_http_request_duration_seconds_bucket{method="GET",route="/api/me",le="+Inf"}' in text
+        assert 'bebudget_rate_limited_total{endpoint="login"}' in text
+        assert 'bebudget_import_jobs{state="queued"} 0' in text
+        assert "bebudget_http_requests_in_flight 1" in text
+
+
+def test_get_current_user_serves_cached_users_and_invalidates_on_update(monkeypatch):
+    import app.core.user_cache as user_cache
+
+    cache = user_cache.InMemoryUserCacheBackend(max_entries=16)
+    monkeypatch.setattr(user_cache, "_BACKEND", cache)
+    user_queries: list[str] = []
+
+    def _count_user_selects(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT") and "FROM users" in statement:
+            user_queries.append(statement)
+
+    with TestClient(app) as client:
+        user = _register_user(client)
+        headers = _auth_headers(user["access"])
+        me = client.get("/api/me", headers=headers).json()
+
+        sa_event.listen(db_engine, "before_cursor_execute", _count_user_selects)
+        try:
+            assert client.get("/api/me", headers=headers).json() == me
+            assert client.get("/api/accounts", headers=headers).status_code == 200
+        finally:
+            sa_event.remove(db_engine, "before_cursor_execute", _count_user_selects)
+        assert user_queries == []
+        assert cache.get(me["id"]) is not None
+
+        with SessionLocal() as db:
+            row = db.get(User, me["id"])
+            row.currency_code = "EUR"
+            db.commit()
+        assert cache.get(me["id"]) is None
+        assert client.get("/api/me", headers=headers).json()["currency_code"] == "EUR"
+
+
+def test_transaction_validation_uses_reference_cache_and_invalidates_on_archive(monkeypatch):
+    import app.transactions.reference_cache as reference_cache
+
+    cache = reference_cache.InMemoryReferenceCache(ttl_seconds=60, max_entries=16)
+    monkeypatch.setattr(reference_cache, "_CACHE", cache)
+    reference_queries: list[str] = []
+
+    def _count_reference_selects(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT") and any(
+            f"FROM {table}" in statement for table in ("accounts", "categories", "income_sources")
+        ):
+            reference_queries.append(statement)
+
+    with TestClient(app) as client:
+        user = _register_user(client)
+        headers = _auth_headers(user["access"])
+        user_id = client.get("/api/me", headers=headers).json()["id"]
+        account_id = _create_account(client, headers, "ref-cache-account")
+        category_id = _create_category(client, headers, "ref-cache-expense", "expense")
+        status, created = _create_transaction(client, headers, type_="expense", account_id=account_id, category_id=category_id, note="ref")
+        assert status == 201
+        assert set(cache.get(user_id).categories) == {category_id}
+
+        sa_event.listen(db_engine, "before_cursor_execute", _count_reference_selects)
+        try:
+            status, _ = _create_transaction(client, headers, type_="expense", account_id=account_id, category_id=category_id, note="ref")
+            assert status == 201
+            patched = client.patch(f"/api/transactions/{created['id']}", json={"note": "cached"}, headers=headers)
+            assert patched.status_code == 200
+        finally:
+            sa_event.remove(db_engine, "before_cursor_execute", _count_reference_selects)
+        assert reference_queries == []
+
+        assert client.delete(f"/api/categories/{category_id}", headers=headers).status_code == 204
+        assert cache.get(user_id) is None
+        status, body = _create_transaction(client, headers, type_="expense", account_id=account_id, category_id=category_id, note="ref")
+        assert status == 409
+        assert body["type"].endswith("category-archived")
+        rejected = client.patch(f"/api/transactions/{created['id']}", json={"note": "archived"}, headers=headers)
+        assert rejected.status_code == 409
+
+
+def test_transactions_bulk_projection_pages_match_list_endpoint():
+    with TestClient(app) as client:
+        user = _register_user(client)
+        headers = _auth_headers(user["access"])
+        account_id = _create_account(client, headers, "bulk-account")
+        category_id = _create_category(client, headers, "bulk-expense", "expense")
+        for day in ("2026-03-01", "2026-03-02", "2026-03-02", "2026-03-04", "2026-03-05"):
+            status, _ = _create_transaction(
+                client, headers, type_="expense", account_id=account_id, category_id=category_id, note="bulk", date=day
+            )
+            assert status == 201
+
+        expected = client.get("/api/transactions?limit=100", headers=headers).json()["items"]
+        fields = ["id", "date", "amount_cents", "type", "is_impulse", "created_at"]
+
+        rows: list[list] = []
+        cursor = None
+        pages = 0
+        while True:
+            url = f"/api/transactions/bulk?fields={','.join(fields)}&limit=2"
+            if cursor:
+                url = f"{url}&cursor={cursor}"
+            response = client.get(url, headers=headers)
+            assert response.status_code == 200
+            body = response.json()
+            assert body["fields"] == fields
+            rows.extend(body["items"])
+            pages += 1
+            cursor = body["next_cursor"]
+            if cursor is None:
+                break
+
+        assert pages == 3
+        assert rows == [[item[field] for field in fields] for item in expected]
+
+        full = client.get("/api/transactions/bulk", headers=headers).json()
+        assert len(full["fields"]) == len(full["items"][0])
+        assert len(full["items"]) == 5
+
+        invalid = client.get("/api/transactions/bulk?fields=id,password_hash", headers=headers)
+        assert invalid.status_code == 400
+
+
+def test_transactions_changes_feed_resumes_from_token_and_reports_edits_and_archives(monkeypatch):
+    monkeypatch.setattr(app_main.settings, "transactions_changes_settle_seconds", 0)
+    with TestClient(app) as client:
+        user = _register_user(client)
+        headers = _auth_headers(user["access"])
+        account_id = _create_account(client, headers, "changes-account")
+        category_id = _create_category(client, headers, "changes-expense", "expense")
+        created = []
+        for day in ("2026-04-01", "2026-04-02", "2026-04-03"):
+            status, body = _create_transaction(
+                client, headers, type_="expense", account_id=account_id, category_id=category_id, note="v1", date=day
+            )
+            assert status == 201
+            created.append(body["id"])
+
+        first = client.get("/api/transactions/changes?limit=2", headers=headers).json()
+        assert [item["id"] for item in first["items"]] == created[:2]
+        assert first["has_more"] is True
+        second = client.get(f"/api/transactions/changes?limit=2&since={first['next_since']}", headers=headers).json()
+        assert [item["id"] for item in second["items"]] == created[2:]
+        assert second["has_more"] is False
+        token = second["next_since"]
+
+        idle = client.get(f"/api/transactions/changes?since={token}", headers=headers).json()
+        assert idle == {"items": [], "next_since": token, "has_more": False}
+
+        patched = client.patch(f"/api/transactions/{created[1]}", json={"note": "v2"}, headers=headers)
+        assert patched.status_code == 200
+        deleted = client.delete(f"/api/transactions/{created[0]}", headers=headers)
+        assert deleted.status_code == 204
+
+        delta = client.get(f"/api/transactions/changes?since={token}", headers=headers).json()
+        assert [item["id"] for item in delta["items"]] == [created[1], created[0]]
+        assert delta["items"][0]["note"] == "v2"
+        assert delta["items"][1]["archived_at"] is not None
+
+        other = _register_user(client)
+        assert client.get("/api/transactions/changes", headers=_auth_headers(other["access"])).json()["items"] == []
+        invalid = client.get("/api/transactions/changes?since=not-a-token", headers=headers)
+        assert invalid.status_code == 400
+
+
+def test_transactions_changes_feed_holds_back_writes_that_may_commit_out_of_order(monkeypatch):
+    monkeypatch.setattr(app_main.settings, "transactions_changes_settle_seconds", 30)
+    now = utcnow()
+    clock = {"now": now}
+    monkeypatch.setattr(pagination_module, "utcnow", lambda: clock["now"])
+
+    def _stamp(transaction_id: str, updated_at: datetime) -> None:
+        with SessionLocal() as db:
+            db.get(Transaction, transaction_id).updated_at = updated_at
+            db.commit()
+
+    with TestClient(app) as client:
+        user = _register_user(client)
+        headers = _auth_headers(user["access"])
+        account_id = _create_account(client, headers, "changes-order-account")
+        category_id = _create_category(client, headers, "changes-order-expense", "expense")
+        status, early = _create_transaction(
+            client, headers, type_="expense", account_id=account_id, category_id=category_id, note="early"
+        )
+        assert status == 201
+        _stamp(early["id"], now - timedelta(minutes=5))
+        baseline = client.get("/api/transactions/changes", headers=headers).json()
+        assert [item["id"] for item in baseline["items"]] == [early["id"]]
+
+        # B is stamped and committed; A was stamped earlier but has not committed yet.
+        status, later = _create_transaction(
+            client, headers, type_="expense", account_id=account_id, category_id=category_id, note="B"
+        )
+        assert status == 201
+        _stamp(later["id"], now - timedelta(seconds=10))
+        pending = client.get(f"/api/transactions/changes?since={baseline['next_since']}", headers=headers).json()
+        assert pending == {"items": [], "next_since": baseline["next_since"], "has_more": False}
+
+        status, slow = _create_transaction(
+            client, headers, type_="expense", account_id=account_id, category_id=category_id, note="A"
+        )
+        assert status == 201
+        _stamp(slow["id"], now - timedelta(seconds=20))
+
+        clock["now"] = now + timedelta(seconds=40)
+        settled = client.get(f"/api/transactions/changes?since={pending['next_since']}", headers=headers).json()
+        assert [item["id"] for item in settled["items"]] == [slow["id"], later["id"]]
+
+
+def test_transactions_import_stream_csv_reports_progress_and_rejects_duplicate_job_id(monkeypatch):
+    _configure_async_import_jobs_for_test(monkeypatch, per_user_limit=2, queue_limit=5, worker_count=0)
+
+    with TestClient(app) as client:
+        user = _register_user(client)
+        headers = _auth_headers(user["access"])
+        _create_account(client, headers, "stream-csv-account")
+        _create_category(client, headers, "stream-csv-expense", "expense")
+        body = (
+            "date,type,account,category,amount_cents,merchant,note,mood,is_impulse\n"
+            "2026-11-05,expense,stream-csv-account,stream-csv-expense,1200,'=Shop,,happy,true\n"
+            '2026-11-06,expense,stream-csv-account,stream-csv-expense,800,,"line one\nline two",,\n'
+            "2026-11-07,expense,missing-account,stream-csv-expense,500,,,,false\n"
+        )
+        job_id = str(uuid.uuid4())
+        stream_headers = {**headers, "content-type": "text/csv"}
+
+        response = client.post(
+            f"/api/transactions/import/jobs/{job_id}/stream?chunk_size=2",
+            content=body.encode("utf-8"),
+            headers=stream_headers,
+        )
+        assert response.status_code == 200
+        job = response.json()
+        assert job["job_id"] == job_id
+        assert job["status"] == "completed"
+        assert job["progress"] == {"processed_rows": 3, "created_count": 2, "failed_count": 1}
+        assert job["result"]["created_count"] == 2
+        assert [failure["index"] for failure in job["result"]["failures"]] == [2]
+
+        status = client.get(f"/api/transactions/import/jobs/{job_id}", headers=headers)
+        assert status.status_code == 200
+        assert status.json()["progress"]["processed_rows"] == 3
+
+        listed = client.get("/api/transactions?from=2026-11-05&to=2026-11-07", headers=headers)
+        items = {item["date"]: item for item in listed.json()["items"]}
+        assert items["2026-11-05"]["merchant"] == "=Shop"
+        assert items["2026-11-05"]["is_impulse"] is True
+        assert items["2026-11-06"]["note"] == "line one\nline two"
+
+        duplicate = client.post(
+            f"/api/transactions/import/jobs/{job_id}/stream",
+            content=body.encode("utf-8"),
+            headers=stream_headers,
+        )
+        assert duplicate.status_code == 409
+
+        bad_header = client.post(
+            f"/api/transactions/import/jobs/{uuid.uuid4()}/stream",
+            content=b"date,amount\n2026-11-05,1\n",
+            headers=stream_headers,
+        )
+        assert bad_header.status_code == 400
+
+        header_line = body.split("\n", 1)[0]
+        for oversized in (
+            f"{header_line}\n2026-11-08,expense,{'x' * (MAX_RECORD_CHARS + 1)}",
+            f'{header_line}\n2026-11-08,expense,stream-csv-account,stream-csv-expense,1,,"' + "note\n" * MAX_RECORD_CHARS,
+        ):
+            too_long = client.post(
+                f"/api/transactions/import/jobs/{uuid.uuid4()}/stream",
+                content=oversized.encode("utf-8"),
+                headers=stream_headers,
+            )
+            assert too_long.status_code == 400
+            assert str(MAX_RECORD_CHARS) in too_long.json()["detail"]
+
+
+def test_sql_import_stream_ndjson_persists_progress_and_fails_interrupted_streams(monkeypatch):
+    import app.routers.transactions as transactions_router
+
+    clock = {"now": datetime(2026, 11, 1, 12, 0, tzinfo=timezone.utc)}
+    manager = _sql_import_job_manager(now_fn=lambda: clock["now"])
+    monkeypatch.setattr(transactions_router, "_IMPORT_JOB_MANAGER", manager)
+
+    with TestClient(app) as client:
+        user = _register_user(client)
+        headers = _auth_headers(user["access"])
+        user_id = client.get("/api/me", headers=headers).json()["id"]
+        account_id = _create_account(client, headers, "stream-ndjson-account")
+        category_id = _create_category(client, headers, "stream-ndjson-income", "income")
+        item = {"type": "income", "account_id": account_id, "category_id": category_id, "amount_cents": 2500}
+        lines = [
+            json.dumps({**item, "date": "2026-11-10"}),
+            "{not json",
+            "",
+            json.dumps({**item, "date": "2026-11-11"}),
+        ]
+        job_id = str(uuid.uuid4())
+
+        response = client.post(
+            f"/api/transactions/import/jobs/{job_id}/stream?chunk_size=1",
+            content="\n".join(lines).encode("utf-8"),
+            headers={**headers, "content-type": "application/x-ndjson"},
+        )
+        assert response.status_code == 200
+        assert response.json()["status"] == "completed"
+        assert response.json()["progress"] == {"processed_rows": 3, "created_count": 2, "failed_count": 1}
+        assert response.json()["result"]["failures"][0]["index"] == 1
+
+    interrupted = manager.register_stream_job(user_id=user_id, job_id=str(uuid.uuid4()))
+    with pytest.raises(APIError) as duplicate:
+        manager.register_stream_job(user_id=user_id, job_id=interrupted.job_id)
+    assert duplicate.value.status == 409
+
+    clock["now"] += timedelta(seconds=61)
+    assert manager._claim_next() is None
+    record = manager.get_for_user(user_id=user_id, job_id=interrupted.job_id)
+    assert record is not None
+    assert record.status == "failed"
+    assert record.error_message == "Import stream was interrupted"
+
+
 def test_transactions_import_jobs_enforce_backpressure_429(monkeypatch):
     _configure_async_import_jobs_for_test(monkeypatch, per_user_limit=1, queue_limit=1, worker_count=0)
 
@@ -4677,6 +5966,66 @@ def test_transactions_import_jobs_enforce_backpressure_429(monkeypatch):
         _assert_rate_limited_problem(second)
 
 
+def test_transactions_import_job_long_poll_and_events_wake_on_completion(monkeypatch):
+    import app.routers.transactions as transactions_router
+
+    _configure_async_import_jobs_for_test(monkeypatch, per_user_limit=2, queue_limit=5, worker_count=0)
+    manager = transactions_router._IMPORT_JOB_MANAGER
+
+    with TestClient(app) as client:
+        user = _register_user(client)
+        headers = _auth_headers(user["access"])
+        user_id = client.get("/api/me", headers=headers).json()["id"]
+        job = manager.register_stream_job(user_id=user_id, job_id=str(uuid.uuid4()))
+
+        immediate = client.get(f"/api/transactions/import/jobs/{job.job_id}", headers=headers)
+        assert immediate.status_code == 200
+        assert immediate.json()["status"] == "running"
+
+        # The in-memory backend wakes waiters itself, so the poll interval must not cause re-reads.
+        monkeypatch.setattr(settings, "transactions_import_async_poll_interval_seconds", 0.01)
+        reads: list[str] = []
+        get_for_user = manager.get_for_user
+
+        def _counting_get_for_user(**kwargs):
+            reads.append(kwargs["job_id"])
+            return get_for_user(**kwargs)
+
+        monkeypatch.setattr(manager, "get_for_user", _counting_get_for_user)
+        finisher = Thread(target=lambda: (time.sleep(0.2), manager.complete_stream_job(job.job_id, error_message="boom")))
+        started = time.monotonic()
+        finisher.start()
+        waited = client.get(f"/api/transactions/import/jobs/{job.job_id}?wait=30", headers=headers)
+        finisher.join()
+        assert waited.status_code == 200
+        assert waited.json()["status"] == "failed"
+        assert waited.json()["error_message"] == "boom"
+        assert time.monotonic() - started < 5
+        assert len(reads) == 2
+
+        events = client.get(
+            f"/api/transactions/import/jobs/{job.job_id}/events",
+            headers={**headers, "accept": "text/event-stream"},
+        )
+        assert events.status_code == 200
+        assert events.headers["content-type"].startswith("text/event-stream")
+        frames = [frame for frame in events.text.split("\n\n") if frame]
+        assert len(frames) == 1
+        lines = frames[0].split("\n")
+        assert lines[:2] == ["event: status", "id: 1"]
+        assert json.loads(lines[2].removeprefix("data: "))["status"] == "failed"
+
+        other = _register_user(client)
+        forbidden = client.get(
+            f"/api/transactions/import/jobs/{job.job_id}/events",
+            headers={**_auth_headers(other["access"]), "accept": "text/event-stream"},
+        )
+        assert forbidden.status_code == 403
+
+        vendor_only = client.get(f"/api/transactions/import/jobs/{job.job_id}/events", headers=headers)
+        assert vendor_only.status_code == 406
+
+
 def test_transactions_import_jobs_idempotency_reuses_existing_job(monkeypatch):
     _configure_async_import_jobs_for_test(monkeypatch, per_user_limit=2, queue_limit=5, worker_count=0)
 
@@ -5072,6 +6421,36 @@ def test_transactions_export_returns_csv_headers_and_row_count():
         assert len(lines) == 3
 
 
+def test_transactions_export_negotiates_gzip_content_encoding():
+    with TestClient(app) as client:
+        user = _register_user(client)
+        headers = _auth_headers(user["access"])
+        account_id = _create_account(client, headers, "gzip-export-account")
+        category_id = _create_category(client, headers, "gzip-export-income", "income")
+        status, _ = _create_transaction(
+            client, headers, type_="income", account_id=account_id, category_id=category_id, note="gz", date="2026-10-03"
+        )
+        assert status == 201
+
+        export_headers = {"accept": "text/csv", "authorization": f"Bearer {user['access']}"}
+        compressed = client.get(
+            "/api/transactions/export?from=2026-10-01&to=2026-10-31",
+            headers={**export_headers, "accept-encoding": "gzip"},
+        )
+        assert compressed.status_code == 200
+        assert compressed.headers["content-encoding"] == "gzip"
+        assert compressed.headers["vary"] == "Accept-Encoding"
+
+        plain = client.get(
+            "/api/transactions/export?from=2026-10-01&to=2026-10-31",
+            headers={**export_headers, "accept-encoding": "identity"},
+        )
+        assert plain.status_code == 200
+        assert "content-encoding" not in plain.headers
+        assert compressed.text == plain.text
+        assert len(plain.text.strip().splitlines()) == 2
+
+
 def test_transactions_export_neutralizes_formula_prefixed_text_cells():
     with TestClient(app) as client:
         user = _register_user(client)
@@ -5312,6 +6691,90 @@ def test_audit_owner_only_pagination_and_sensitive_fields():
         assert owner["refresh"] not in serialized
 
 
+def test_compact_audit_events_moves_old_months_to_cold_storage_and_serves_them_on_demand(monkeypatch, tmp_path):
+    monkeypatch.setattr(app_main.settings, "audit_cold_storage_dir", str(tmp_path))
+    monkeypatch.setattr(app_main.settings, "audit_cold_storage_codec", "gzip")
+    monkeypatch.setattr(app_main.settings, "audit_retention_days", 90)
+    with TestClient(app) as client:
+        user = _register_user(client)
+        headers = _auth_headers(user["access"])
+        user_id = client.get("/api/me", headers=headers).json()["id"]
+        _create_account(client, headers, "audit-retained")
+
+        old_month = as_utc(utcnow() - timedelta(days=200)).replace(day=3, hour=12, minute=0, second=0, microsecond=0)
+        old_ids = []
+        with SessionLocal() as db:
+            for offset in range(3):
+                event = AuditEvent(
+                    id=str(uuid.uuid4()),
+                    request_id="old-request",
+                    user_id=user_id,
+                    resource_type="account",
+                    resource_id=str(uuid.uuid4()),
+                    action="account.update",
+                    created_at=old_month + timedelta(days=offset),
+                )
+                db.add(event)
+                old_ids.append(event.id)
+            # Left behind in the archive table by an interrupted run.
+            db.add(
+                AuditEventArchive(
+                    id=str(uuid.uuid4()),
+                    request_id="stranded-request",
+                    user_id=user_id,
+                    resource_type="account",
+                    resource_id=None,
+                    action="account.archive",
+                    created_at=old_month - timedelta(days=40),
+                )
+            )
+            db.commit()
+
+        before = client.get("/api/audit?limit=100&include_compacted=true", headers=headers).json()["items"]
+        assert len(before) == 5
+
+        logs: list[str] = []
+        assert compact_audit_events_cli.run(check_only=True, log_fn=logs.append) == 0
+        assert logs[-1].endswith("pending=4")
+        assert compact_audit_events_cli.run(log_fn=logs.append) == 0
+        assert "months=2 files=2 events=4" in logs[-1]
+        assert compact_audit_events_cli.run(log_fn=logs.append) == 0
+        assert "events=0" in logs[-1]
+
+        with SessionLocal() as db:
+            assert db.scalars(select(AuditEvent).where(AuditEvent.id.in_(old_ids))).all() == []
+            assert db.scalars(select(AuditEventArchive)).all() == []
+        cold_file = tmp_path / user_id / f"{old_month:%Y-%m}.ndjson.gz"
+        records = [json.loads(line) for line in gzip.decompress(cold_file.read_bytes()).splitlines()]
+        assert sorted(record["id"] for record in records) == sorted(old_ids)
+
+        hot_only = client.get("/api/audit?limit=100", headers=headers).json()["items"]
+        assert [item["action"] for item in hot_only] == ["account.create"]
+        assert not {item["id"] for item in hot_only} & set(old_ids)
+
+        seen = []
+        cursor = None
+        while True:
+            url = "/api/audit?limit=2&include_compacted=true" + (f"&cursor={cursor}" if cursor else "")
+            body = client.get(url, headers=headers).json()
+            seen.extend(item["id"] for item in body["items"])
+            cursor = body["next_cursor"]
+            if cursor is None:
+                break
+        assert seen == [item["id"] for item in before]
+
+        window = client.get(
+            "/api/audit",
+            params={
+                "include_compacted": "true",
+                "from": (old_month + timedelta(days=1)).isoformat(),
+                "to": (old_month + timedelta(days=1, hours=1)).isoformat(),
+            },
+            headers=headers,
+        ).json()["items"]
+        assert [item["id"] for item in window] == [old_ids[1]]
+
+
 def test_audit_endpoint_error_matrix_is_canonical():
     with TestClient(app) as client:
         user = _register_user(client)
@@ -5,6 +5,7 @@ from pathlib import Path
 import yaml
 from fastapi.testclient import TestClient
 
+from app.core.config import settings
 from app.main import app
 from app.schemas import PASSWORD_POLICY_PATTERN
 
@@ -44,6 +45,23 @@ SAVINGS_CONTRIBUTION_INVALID_AMOUNT_TITLE = "Contribution amount must be greater
 SAVINGS_GOAL_ALREADY_COMPLETED_TYPE = "https://api.bebudget.dev/problems/savings-goal-already-completed"
 SAVINGS_GOAL_ALREADY_COMPLETED_TITLE = "Savings goal is already completed"
 CANONICAL_EXAMPLE_STATUSES = {400, 401, 403, 406, 409, 429}
+CONDITIONAL_READ_OPERATIONS = [
+    ("/accounts", "get"),
+    ("/accounts/balances", "get"),
+    ("/accounts/{account_id}/balance-history", "get"),
+    ("/categories", "get"),
+    ("/income-sources", "get"),
+    ("/bills", "get"),
+    ("/bills/monthly-status", "get"),
+    ("/savings-goals", "get"),
+    ("/savings-goals/summary", "get"),
+    ("/budgets", "get"),
+    ("/analytics/by-month", "get"),
+    ("/analytics/by-category", "get"),
+    ("/analytics/income", "get"),
+    ("/analytics/impulse-summary", "get"),
+    ("/dashboard", "get"),
+]
 
 
 def _resolve_schema(schema: dict) -> dict:
@@ -81,16 +99,22 @@ def _validate_required(schema: dict, payload) -> None:
         _validate_array_required(schema, payload)
 
 
+def _resolve_response(response: dict) -> dict:
+    if "$ref" in response:
+        return SPEC["components"]["responses"][response["$ref"].split("/")[-1]]
+    return response
+
+
 def _assert_contract(response, path: str, method: str) -> None:
     op = SPEC["paths"][path][method.lower()]
     allowed = {int(code) for code in op["responses"].keys()}
     assert response.status_code in allowed
 
-    if response.status_code == 204:
+    if response.status_code in {204, 304}:
         assert response.text == ""
         return
 
-    content = op["responses"][str(response.status_code)].get("content", {})
+    content = _resolve_response(op["responses"][str(response.status_code)]).get("content", {})
     expected_types = list(content.keys())
     assert expected_types
     assert any(response.headers["content-type"].startswith(mt) for mt in expected_types)
@@ -554,6 +578,32 @@ def test_audit_contract_mappings_exist():
     assert "AuditListResponse" in schemas
 
 
+def test_conditional_read_contract_mappings_exist():
+    assert "ETag" in SPEC["components"]["headers"]
+    assert SPEC["components"]["parameters"]["If-None-Match"]["in"] == "header"
+    not_modified = SPEC["components"]["responses"]["NotModified"]
+    assert "content" not in not_modified
+    assert "ETag" in not_modified["headers"]
+
+    for path, method in CONDITIONAL_READ_OPERATIONS:
+        op = SPEC["paths"][path][method]
+        assert {"$ref": "#/components/parameters/If-None-Match"} in op["parameters"], path
+        assert "ETag" in op["responses"]["200"]["headers"], path
+        assert op["responses"]["304"] == {"$ref": "#/components/responses/NotModified"}, path
+
+
+def test_conditional_read_304_matches_contract():
+    with TestClient(app) as client:
+        access, _ = _auth_flow(client, f"u_{uuid.uuid4().hex[:8]}")
+        headers = {"accept": VENDOR, "authorization": f"Bearer {access}"}
+        first = client.get("/api/accounts", headers=headers)
+        _assert_contract(first, "/accounts", "get")
+        repeat = client.get("/api/accounts", headers={**headers, "if-none-match": first.headers["etag"]})
+        assert repeat.status_code == 304
+        _assert_contract(repeat, "/accounts", "get")
+        assert repeat.headers["etag"] == first.headers["etag"]
+
+
 def test_openapi_examples_coverage_and_canonical_problem_examples():
     schemas = SPEC["components"]["schemas"]
     problem_schema = schemas["ProblemDetails"]
@@ -769,3 +819,239 @@ def test_savings_error_responses_reference_problem_examples():
     assert "savings-contribution-invalid-amount" in contribution_post_422_examples
 
 
+def test_account_balance_routes_match_contract():
+    schemas = SPEC["components"]["schemas"]
+    assert "AccountBalanceOut" in schemas
+    assert "AccountBalancesOut" in schemas
+    assert "AccountBalanceHistoryOut" in schemas
+    history_400 = SPEC["paths"]["/accounts/{account_id}/balance-history"]["get"]["responses"]["400"]
+    assert "too-many-buckets" in history_400["content"][PROBLEM]["examples"]
+
+    with TestClient(app) as client:
+        access, _ = _auth_flow(client, f"u_{uuid.uuid4().hex[:8]}")
+        account_id = _account_flow(client, access)
+        headers = {"accept": VENDOR, "authorization": f"Bearer {access}"}
+
+        balances = client.get("/api/accounts/balances", headers=headers)
+        _assert_contract(balances, "/accounts/balances", "get")
+        assert balances.json()["items"]
+
+        history_path = "/accounts/{account_id}/balance-history"
+        history = client.get(
+            f"/api/accounts/{account_id}/balance-history?from=2026-01-01&to=2026-03-31&granularity=month",
+            headers=headers,
+        )
+        _assert_contract(history, history_path, "get")
+        assert len(history.json()["dates"]) == len(history.json()["balance_cents"]) == 3
+
+        too_many = client.get(
+            f"/api/accounts/{account_id}/balance-history?from=2020-01-01&to=2026-01-01&granularity=day",
+            headers=headers,
+        )
+        assert too_many.status_code == 400
+        _assert_contract(too_many, history_path, "get")
+        assert too_many.json()["type"] == "https://api.bebudget.dev/problems/invalid-date-range"
+
+
+def test_dashboard_matches_contract():
+    assert "DashboardOut" in SPEC["components"]["schemas"]
+
+    with TestClient(app) as client:
+        access, _ = _auth_flow(client, f"u_{uuid.uuid4().hex[:8]}")
+        account_id = _account_flow(client, access)
+        category_id = _category_flow(client, access)
+        _transaction_flow(client, access, account_id, category_id)
+        headers = {"accept": VENDOR, "authorization": f"Bearer {access}"}
+
+        first = client.get("/api/dashboard?month=2026-03", headers=headers)
+        _assert_contract(first, "/dashboard", "get")
+        assert first.json()["month"] == "2026-03"
+
+        repeat = client.get("/api/dashboard?month=2026-03", headers={**headers, "if-none-match": first.headers["etag"]})
+        assert repeat.status_code == 304
+        _assert_contract(repeat, "/dashboard", "get")
+
+        invalid = client.get("/api/dashboard?month=2026-13", headers=headers)
+        assert invalid.status_code == 400
+        _assert_contract(invalid, "/dashboard", "get")
+
+
+def test_transactions_batch_matches_contract(monkeypatch):
+    schemas = SPEC["components"]["schemas"]
+    for name in ("TransactionBatchRequest", "TransactionBatchOperation", "TransactionBatchResult"):
+        assert name in schemas
+    assert "problem" in schemas["TransactionBatchOpResult"]["properties"]
+    responses = SPEC["paths"]["/transactions/batch"]["post"]["responses"]
+    for status in ("400", "429"):
+        assert "canonical" in responses[status]["content"][PROBLEM]["examples"]
+
+    with TestClient(app) as client:
+        access, _ = _auth_flow(client, f"u_{uuid.uuid4().hex[:8]}")
+        account_id = _account_flow(client, access)
+        category_id = _category_flow(client, access)
+        tx_id = _transaction_flow(client, access, account_id, category_id)
+        headers = _auth_headers(access)
+
+        result = client.post(
+            "/api/transactions/batch",
+            json={
+                "operations": [
+                    {"op": "patch", "id": tx_id, "changes": {"note": "batched"}},
+                    {"op": "patch", "id": tx_id, "changes": {"note": "again"}},
+                    {"op": "archive", "id": str(uuid.uuid4())},
+                ]
+            },
+            headers=headers,
+        )
+        _assert_contract(result, "/transactions/batch", "post")
+        assert [item["status"] for item in result.json()["results"]] == ["applied", "failed", "failed"]
+        assert [item["problem"]["status"] for item in result.json()["results"][1:]] == [409, 403]
+
+        monkeypatch.setattr(settings, "transaction_batch_max_operations", 1)
+        oversized = client.post(
+            "/api/transactions/batch",
+            json={"operations": [{"op": "archive", "id": tx_id}] * 2},
+            headers=headers,
+        )
+        assert oversized.status_code == 400
+        _assert_contract(oversized, "/transactions/batch", "post")
+
+
+def test_transactions_recategorize_matches_contract():
+    schemas = SPEC["components"]["schemas"]
+    assert "merchant_match" in schemas["TransactionRecategorizeFilter"]["properties"]
+    assert schemas["TransactionRecategorizeResult"]["required"] == ["updated_count"]
+    conflict = SPEC["paths"]["/transactions/recategorize"]["post"]["responses"]["409"]
+    assert conflict["content"][PROBLEM]["examples"]["canonical"]["$ref"].endswith("Problem409CategoryTypeMismatch")
+
+    with TestClient(app) as client:
+        access, _ = _auth_flow(client, f"u_{uuid.uuid4().hex[:8]}")
+        account_id = _account_flow(client, access)
+        category_id = _category_flow(client, access)
+        _transaction_flow(client, access, account_id, category_id)
+        headers = _auth_headers(access)
+        bonus_id = client.post("/api/categories", json={"name": "bonus", "type": "income"}, headers=headers).json()["id"]
+        rent_id = client.post("/api/categories", json={"name": "rent", "type": "expense"}, headers=headers).json()["id"]
+
+        moved = client.post(
+            "/api/transactions/recategorize",
+            json={"category_id": bonus_id, "filter": {"merchant": "acm", "merchant_match": "contains"}},
+            headers=headers,
+        )
+        _assert_contract(moved, "/transactions/recategorize", "post")
+        assert moved.json() == {"updated_count": 1}
+
+        mismatch = client.post(
+            "/api/transactions/recategorize", json={"category_id": rent_id, "filter": {"type": "income"}}, headers=headers
+        )
+        assert mismatch.status_code == 409
+        _assert_contract(mismatch, "/transactions/recategorize", "post")
+        assert mismatch.json()["type"] == "https://api.bebudget.dev/problems/category-type-mismatch"
+
+
+def test_transactions_changes_matches_contract(monkeypatch):
+    monkeypatch.setattr(settings, "transactions_changes_settle_seconds", 0)
+    with TestClient(app) as client:
+        access, _ = _auth_flow(client, f"u_{uuid.uuid4().hex[:8]}")
+        account_id = _account_flow(client, access)
+        category_id = _category_flow(client, access)
+        tx_id = _transaction_flow(client, access, account_id, category_id)
+        headers = {"accept": VENDOR, "authorization": f"Bearer {access}"}
+
+        feed = client.get("/api/transactions/changes", headers=headers)
+        _assert_contract(feed, "/transactions/changes", "get")
+        assert feed.json()["items"][-1]["id"] == tx_id
+
+        idle = client.get(f"/api/transactions/changes?since={feed.json()['next_since']}", headers=headers)
+        _assert_contract(idle, "/transactions/changes", "get")
+        assert idle.json()["next_since"] == feed.json()["next_since"]
+
+        invalid = client.get("/api/transactions/changes?since=not-a-token", headers=headers)
+        assert invalid.status_code == 400
+        _assert_contract(invalid, "/transactions/changes", "get")
+
+
+def test_transactions_bulk_matches_contract():
+    page_schema = SPEC["components"]["schemas"]["TransactionBulkPage"]
+    assert page_schema["properties"]["items"]["items"]["type"] == "array"
+
+    with TestClient(app) as client:
+        access, _ = _auth_flow(client, f"u_{uuid.uuid4().hex[:8]}")
+        account_id = _account_flow(client, access)
+        category_id = _category_flow(client, access)
+        tx_id = _transaction_flow(client, access, account_id, category_id)
+        headers = {"accept": VENDOR, "authorization": f"Bearer {access}"}
+
+        projected = client.get("/api/transactions/bulk?fields=id,amount_cents", headers=headers)
+        _assert_contract(projected, "/transactions/bulk", "get")
+        assert projected.json()["fields"] == ["id", "amount_cents"]
+        assert [tx_id, 200000] in projected.json()["items"]
+
+        invalid = client.get("/api/transactions/bulk?fields=id,password_hash", headers=headers)
+        assert invalid.status_code == 400
+        _assert_contract(invalid, "/transactions/bulk", "get")
+
+
+def test_transactions_import_stream_matches_contract():
+    stream_op = SPEC["paths"]["/transactions/import/jobs/{job_id}/stream"]["post"]
+    assert {"text/csv", "application/x-ndjson"} <= set(stream_op["requestBody"]["content"])
+
+    with TestClient(app) as client:
+        access, _ = _auth_flow(client, f"u_{uuid.uuid4().hex[:8]}")
+        account_id = _account_flow(client, access)
+        category_id = _category_flow(client, access)
+        headers = {"accept": VENDOR, "authorization": f"Bearer {access}", "content-type": "application/x-ndjson"}
+        row = (
+            f'{{"type":"income","account_id":"{account_id}","category_id":"{category_id}",'
+            '"amount_cents":1200,"date":"2026-11-05"}\n'
+        )
+        job_id = str(uuid.uuid4())
+        path = "/transactions/import/jobs/{job_id}/stream"
+
+        finished = client.post(f"/api/transactions/import/jobs/{job_id}/stream", content=row.encode(), headers=headers)
+        _assert_contract(finished, path, "post")
+        assert finished.json()["job_id"] == job_id
+        assert finished.json()["progress"] == {"processed_rows": 1, "created_count": 1, "failed_count": 0}
+
+        duplicate = client.post(f"/api/transactions/import/jobs/{job_id}/stream", content=row.encode(), headers=headers)
+        assert duplicate.status_code == 409
+        _assert_contract(duplicate, path, "post")
+
+        bad_header = client.post(
+            f"/api/transactions/import/jobs/{uuid.uuid4()}/stream",
+            content=b"date,amount\n2026-11-05,1\n",
+            headers={**headers, "content-type": "text/csv"},
+        )
+        assert bad_header.status_code == 400
+        _assert_contract(bad_header, path, "post")
+
+
+def test_transactions_import_job_status_and_events_match_contract():
+    status_op = SPEC["paths"]["/transactions/import/jobs/{job_id}"]["get"]
+    assert "wait" in {param["name"] for param in status_op["parameters"]}
+    events_op = SPEC["paths"]["/transactions/import/jobs/{job_id}/events"]["get"]
+    assert "text/event-stream" in events_op["responses"]["200"]["content"]
+
+    with TestClient(app) as client:
+        access, _ = _auth_flow(client, f"u_{uuid.uuid4().hex[:8]}")
+        headers = {"accept": VENDOR, "authorization": f"Bearer {access}"}
+        job_id = str(uuid.uuid4())
+        streamed = client.post(
+            f"/api/transactions/import/jobs/{job_id}/stream",
+            content=b"",
+            headers={**headers, "content-type": "application/x-ndjson"},
+        )
+        assert streamed.status_code == 200
+
+        waited = client.get(f"/api/transactions/import/jobs/{job_id}?wait=5", headers=headers)
+        _assert_contract(waited, "/transactions/import/jobs/{job_id}", "get")
+        assert waited.json()["status"] == "completed"
+
+        events_path = "/transactions/import/jobs/{job_id}/events"
+        events = client.get(f"/api/transactions/import/jobs/{job_id}/events", headers={**headers, "accept": "text/event-stream"})
+        _assert_contract(events, events_path, "get")
+        assert events.text.startswith("event: status\nid: 1\n")
+
+        unknown = client.get(f"/api/transactions/import/jobs/{uuid.uuid4()}", headers=headers)
+        assert unknown.status_code == 403
+        _assert_contract(unknown, "/transactions/import/jobs/{job_id}", "get")
@@ -1,7 +1,10 @@
 import base64
+import gzip
 import json
 import logging
+import os
 import time
+from contextlib import asynccontextmanager
 from datetime import UTC, date, datetime, timedelta
 from threading import Barrier, BrokenBarrierError, Thread
 from types import SimpleNamespace
@@ -10,18 +13,23 @@ import jwt
 import pytest
 from fastapi import FastAPI
 from fastapi.testclient import TestClient
-from sqlalchemy import select
+from sqlalchemy import event as sa_event, select
 from starlette.requests import Request
 
 import app.core.audit as audit_core
+import app.core.audit_archive as audit_archive
 import app.core.network as network_core
 import app.core.utils as core_utils
+import app.routers.analytics as analytics_router
 import app.routers.auth as auth_router
+import app.routers.bills as bills_router
+import app.routers.transactions as transactions_router
 from app.core.config import Settings
 from app.core.errors import APIError, register_exception_handlers
 from app.core.network import resolve_rate_limit_client_ip
-from app.core.rate_limit import InMemoryRateLimiter, _BucketState
+from app.core.rate_limit import InMemoryRateLimiter, StripedSlidingWindowRateLimiter, _BucketState
 from app.core.pagination import decode_cursor, encode_cursor, parse_datetime
+from app.core.user_cache import CachedUser, InMemoryUserCacheBackend
 from app.core.security import (
     create_access_token,
     decode_access_token,
@@ -50,9 +58,11 @@ from app.repositories.interfaces import (
     UserRepository,
 )
 from app.cli import bootstrap as bootstrap_cli
+from app.db.async_session import dispose_async_engine
 from app.schemas import TransactionImportRequest
-from app.transactions.csv_export import csv_stream
+from app.transactions.csv_export import accepts_gzip, csv_stream, gzip_stream
 import app.transactions.pagination as tx_pagination
+from app.transactions.balances import history_bucket_count, history_buckets
 from app.transactions.import_jobs import _ImportJobManager
 from app.transactions.validation import validate_transaction_mood
 
@@ -101,6 +111,7 @@ def test_safe_resource_id_filters_blank_token_and_secret_values():
     assert audit_core._safe_resource_id("Bearer secret-token") is None
     assert audit_core._safe_resource_id("refresh_token_family") is None
     assert audit_core._safe_resource_id("x" * 80) == "x" * 64
+    assert audit_core._safe_resource_id("0b7c3f4e-5d9a-4c1b-8e2f-6a7b8c9d0e1f") == "0b7c3f4e-5d9a-4c1b-8e2f-6a7b8c9d0e1f"
 
 
 def test_emit_audit_event_defaults_unknown_request_id_and_preserves_created_at():
@@ -126,6 +137,95 @@ def test_emit_audit_event_defaults_unknown_request_id_and_preserves_created_at()
         db.close()
 
 
+def _audit_rows_for(db, user_id: str) -> list[AuditEvent]:
+    return list(db.scalars(select(AuditEvent).where(AuditEvent.user_id == user_id).order_by(AuditEvent.action)))
+
+
+def test_buffered_audit_sink_inserts_once_at_commit_and_discards_on_rollback():
+    sink = audit_core.BufferedAuditSink()
+    previous = audit_core._SINK
+    audit_core.configure_audit_sink(sink)
+    db = SessionLocal()
+    statements: list[str] = []
+
+    def _record(_conn, _cursor, statement, *_args):
+        if statement.lstrip().upper().startswith("INSERT INTO AUDIT_EVENTS"):
+            statements.append(statement)
+
+    sa_event.listen(db.get_bind(), "before_cursor_execute", _record)
+    try:
+        audit_core.emit_audit_event(
+            db, request=None, user_id="buffered-user", resource_type="category", resource_id="c-1", action="category.create"
+        )
+        audit_core.emit_audit_events(
+            db,
+            request=None,
+            user_id="buffered-user",
+            resource_type="transaction",
+            resource_ids=["t-1", "t-2"],
+            action="transaction.create",
+        )
+        assert statements == []
+        db.commit()
+        assert len(statements) == 1
+        assert [row.resource_id for row in _audit_rows_for(db, "buffered-user")] == ["c-1", "t-1", "t-2"]
+
+        audit_core.emit_audit_event(
+            db, request=None, user_id="rolled-back-user", resource_type="category", resource_id="c-2", action="category.update"
+        )
+        db.rollback()
+        db.commit()
+        assert _audit_rows_for(db, "rolled-back-user") == []
+    finally:
+        sa_event.remove(db.get_bind(), "before_cursor_execute", _record)
+        audit_core.configure_audit_sink(previous)
+        db.close()
+
+
+def test_background_audit_writer_hands_off_after_commit_and_drains_on_stop():
+    writer = audit_core.BackgroundAuditWriter(SessionLocal, batch_size=2, flush_interval_seconds=60)
+    previous = audit_core._SINK
+    audit_core.configure_audit_sink(audit_core.BufferedAuditSink(writer=writer))
+    db = SessionLocal()
+    try:
+        audit_core.emit_audit_event(
+            db, request=None, user_id="async-user", resource_type="category", resource_id="c-1", action="category.create"
+        )
+        db.commit()
+        assert writer.pending_count() == 1
+
+        audit_core.emit_audit_event(
+            db, request=None, user_id="async-user", resource_type="category", resource_id="c-2", action="category.update"
+        )
+        db.rollback()
+        assert writer.pending_count() == 1
+
+        writer.stop(timeout_seconds=1.0)
+        assert writer.pending_count() == 0
+        assert [row.resource_id for row in _audit_rows_for(db, "async-user")] == ["c-1"]
+    finally:
+        writer.stop(timeout_seconds=1.0)
+        audit_core.configure_audit_sink(previous)
+        db.close()
+
+
+def test_background_audit_writer_gets_its_own_pool_instead_of_the_jobs_pool(monkeypatch):
+    calls = []
+
+    def _factory(pool_name, *, pool_size, max_overflow=0):
+        calls.append((pool_name, pool_size, max_overflow))
+        return SessionLocal
+
+    monkeypatch.setattr(audit_core, "build_dedicated_session_factory", _factory)
+    monkeypatch.setattr(audit_core.settings, "audit_sink_mode", "buffered")
+    monkeypatch.setattr(audit_core.settings, "audit_same_transaction", False)
+
+    sink = audit_core.build_audit_sink()
+    assert calls == [("audit", 1, 0)]
+    assert sink.writer._session_factory is SessionLocal
+    assert db_session.build_dedicated_session_factory("audit", pool_size=1) is SessionLocal
+
+
 class _DB:
     def __init__(self, user=None):
         self._user = user
@@ -210,6 +310,39 @@ def test_password_and_token_security_paths(monkeypatch):
         decode_access_token(future_not_before)
 
 
+def test_decode_access_token_caches_verified_tokens_until_expiry(monkeypatch):
+    from app.core import security
+
+    monkeypatch.setattr(security, "_VERIFIED_TOKENS", security._VerifiedTokenCache(2))
+    calls: list[str] = []
+    real_decode = security.jwt.decode
+
+    def _counting_decode(token, *args, **kwargs):
+        calls.append(token)
+        return real_decode(token, *args, **kwargs)
+
+    monkeypatch.setattr(security.jwt, "decode", _counting_decode)
+    token = create_access_token("cached-user")
+    first = decode_access_token(token)
+    first["sub"] = "mutated"
+    assert decode_access_token(token)["sub"] == "cached-user"
+    assert len(calls) == 1
+
+    other_tokens = [create_access_token(f"other-{index}") for index in range(2)]
+    for other in other_tokens:
+        decode_access_token(other)
+    decode_access_token(token)
+    assert len(calls) == 4
+
+    cache_key = security._VerifiedTokenCache.key(token)
+    assert security._VERIFIED_TOKENS.get(cache_key, first["exp"] - 1) is not None
+    assert security._VERIFIED_TOKENS.get(cache_key, first["exp"]) is None
+
+    monkeypatch.setattr(security.settings, "jwt_secret", "rotated-secret-value-for-tests-0123456789")
+    with pytest.raises(ValueError):
+        decode_access_token(other_tokens[1])
+
+
 def _make_legacy_access_token(sub: str, *, exp_offset: int = 3600) -> str:
     payload = {"sub": sub, "exp": int(time.time()) + exp_offset, "iat": int(time.time())}
     payload_part = base64.urlsafe_b64encode(json.dumps(payload, separators=(",", ":")).encode("utf-8")).decode("ascii").rstrip("=")
@@ -428,6 +561,54 @@ def test_settings_uses_valid_log_level(monkeypatch):
     assert settings.log_level == "DEBUG"
 
 
+def test_settings_rejects_unknown_audit_cold_storage_codec(monkeypatch):
+    _set_minimum_config_env(monkeypatch)
+    monkeypatch.setenv("AUDIT_COLD_STORAGE_CODEC", "lz4")
+    with pytest.raises(ValueError, match="AUDIT_COLD_STORAGE_CODEC must be one of"):
+        Settings()
+
+
+def test_audit_retention_cutoff_compacts_only_whole_months_past_the_horizon():
+    now = datetime(2026, 3, 31, 23, 0, tzinfo=UTC)
+    assert audit_archive.retention_cutoff(now, retention_days=30) == datetime(2026, 3, 1, tzinfo=UTC)
+    assert audit_archive.retention_cutoff(now, retention_days=90) == datetime(2025, 12, 1, tzinfo=UTC)
+    assert audit_archive._next_month(datetime(2025, 12, 1, tzinfo=UTC)) == datetime(2026, 1, 1, tzinfo=UTC)
+
+
+def test_cold_audit_page_stops_reading_once_limit_rows_past_the_cursor_are_found(tmp_path, monkeypatch):
+    month = datetime(2025, 1, 1, tzinfo=UTC)
+    records = [
+        {
+            "id": f"evt-{index:03d}",
+            "user_id": "user-1",
+            "action": "transaction.create",
+            "resource_type": "transaction",
+            "resource_id": None,
+            "request_id": f"req-{index:03d}",
+            "details": None,
+            "created_at": (month + timedelta(hours=index)).isoformat(),
+        }
+        for index in range(100)
+    ]
+    audit_archive._write_cold_file(tmp_path, month, records, codec="gzip")
+
+    yielded = 0
+    original = audit_archive._iter_records
+
+    def _counting(path):
+        nonlocal yielded
+        for record in original(path):
+            yielded += 1
+            yield record
+
+    monkeypatch.setattr(audit_archive, "_iter_records", _counting)
+    before = (month + timedelta(hours=90), "evt-090")
+    page = audit_archive._load_cold_events(tmp_path, from_=None, to=None, before=before, limit=2)
+
+    assert [event.id for event in page] == ["evt-089", "evt-088"]
+    assert yielded == 12
+
+
 def test_settings_rejects_invalid_transactions_import_rate_limit(monkeypatch):
     _set_minimum_config_env(monkeypatch)
     monkeypatch.setenv("TRANSACTIONS_IMPORT_RATE_LIMIT_PER_MINUTE", "0")
@@ -470,6 +651,260 @@ def test_settings_uses_transactions_import_async_shutdown_timeout(monkeypatch):
     assert settings.transactions_import_async_shutdown_timeout_seconds == 3.5
 
 
+def test_settings_metrics_endpoint_is_off_by_default(monkeypatch):
+    _set_minimum_config_env(monkeypatch)
+    settings = Settings()
+    assert settings.metrics_enabled is False
+    assert settings.safe_log_fields()["metrics_token_configured"] is False
+
+    monkeypatch.setenv("METRICS_ENABLED", "true")
+    monkeypatch.setenv("METRICS_TOKEN", " scrape-secret ")
+    settings = Settings()
+    assert settings.metrics_enabled is True
+    assert settings.metrics_token == "scrape-secret"
+    assert "scrape-secret" not in str(settings.safe_log_fields())
+
+
+def test_settings_import_async_backend_defaults_to_memory_and_validates(monkeypatch):
+    _set_minimum_config_env(monkeypatch)
+    assert Settings().transactions_import_async_backend == "memory"
+
+    monkeypatch.setenv("TRANSACTIONS_IMPORT_ASYNC_BACKEND", " SQL ")
+    settings = Settings()
+    assert settings.transactions_import_async_backend == "sql"
+    assert settings.transactions_import_async_visibility_timeout_seconds == 300
+    assert settings.transactions_import_async_max_attempts == 3
+
+    monkeypatch.setenv("TRANSACTIONS_IMPORT_ASYNC_BACKEND", "redis")
+    with pytest.raises(ValueError, match="TRANSACTIONS_IMPORT_ASYNC_BACKEND"):
+        Settings()
+
+
+def test_in_memory_user_cache_expires_entries_and_evicts_least_recently_used(monkeypatch):
+    _set_minimum_config_env(monkeypatch)
+    assert Settings().auth_user_cache_enabled is False
+    monkeypatch.setenv("AUTH_USER_CACHE_TTL_SECONDS", "0")
+    with pytest.raises(ValueError, match="AUTH_USER_CACHE_TTL_SECONDS"):
+        Settings()
+
+    clock = {"now": 100.0}
+    cache = InMemoryUserCacheBackend(max_entries=2, now_fn=lambda: clock["now"])
+    created_at = datetime(2026, 1, 1, tzinfo=UTC)
+    for user_id in ("u1", "u2"):
+        cache.set(CachedUser(id=user_id, username=user_id, currency_code="USD", created_at=created_at), ttl_seconds=30)
+
+    assert cache.get("u1") is not None
+    cache.set(CachedUser(id="u3", username="u3", currency_code="USD", created_at=created_at), ttl_seconds=30)
+    assert cache.get("u2") is None
+    assert len(cache) == 2
+
+    clock["now"] += 30
+    assert cache.get("u1") is None
+    user = CachedUser(id="u4", username="u4", currency_code="COP", created_at=created_at).to_user()
+    assert (user.id, user.currency_code) == ("u4", "COP")
+
+
+def test_instrumented_pool_counts_checkouts_waits_and_timeouts(monkeypatch):
+    import sqlite3
+
+    from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+    from app.core import metrics
+    from app.db.pool_metrics import InstrumentedQueuePool, pool_metrics_snapshot
+
+    _set_minimum_config_env(monkeypatch)
+    monkeypatch.setenv("DB_MAX_OVERFLOW", "-1")
+    with pytest.raises(ValueError, match="DB_MAX_OVERFLOW"):
+        Settings()
+    monkeypatch.setenv("DB_MAX_OVERFLOW", "0")
+    assert Settings().db_max_overflow == 0
+
+    pool = InstrumentedQueuePool(
+        lambda: sqlite3.connect(":memory:"),
+        pool_size=1,
+        max_overflow=0,
+        timeout=0.05,
+        logging_name="unit-test-pool",
+    )
+    first = pool.connect()
+    with pytest.raises(PoolTimeoutError):
+        pool.connect()
+    first.close()
+    pool.connect().close()
+
+    stats = pool_metrics_snapshot()["unit-test-pool"]
+    assert stats["checkouts"] == 2
+    assert stats["waits"] == 1
+    assert stats["timeouts"] == 1
+    assert stats["checkout_seconds_max"] >= 0.05
+    assert stats["size"] == 1
+    assert stats["checked_out"] == 0
+
+    registry = metrics.REGISTRY.values
+    histogram = registry["bebudget_db_pool_checkout_seconds"][("unit-test-pool",)]
+    assert histogram[-1] == 3
+    assert histogram[-2] >= 0.05
+    assert registry["bebudget_db_pool_checkout_waits_total"][("unit-test-pool",)] == 1
+    assert registry["bebudget_db_pool_checkout_timeouts_total"][("unit-test-pool",)] == 1
+
+
+def test_metrics_multiprocess_exporter_merges_worker_snapshots(tmp_path, monkeypatch):
+    from app.core.metrics import MetricsRegistry, MultiprocessExporter, render_prometheus
+
+    _set_minimum_config_env(monkeypatch)
+    monkeypatch.setenv("METRICS_FLUSH_INTERVAL_SECONDS", "0")
+    with pytest.raises(ValueError, match="METRICS_FLUSH_INTERVAL_SECONDS"):
+        Settings()
+
+    registry = MetricsRegistry()
+    requests_total = registry.counter("t_requests_total", "Requests.", ("route",))
+    latency = registry.histogram("t_latency_seconds", "Latency.", buckets=(0.1, 1.0))
+    in_flight = registry.gauge("t_in_flight", "In flight.")
+    registry.register_collector("t_queue", "Queue.", (), lambda: [({}, 3)], aggregate="max")
+    requests_total.inc(route="/api/x")
+    latency.observe(0.05)
+    latency.observe(0.5)
+    in_flight.inc()
+
+    # A worker that has exited (pid 2**22 + 1 is never a live pid on Linux) and a live one.
+    dead_snapshot = registry.snapshot()
+    (tmp_path / f"metrics-{2**22 + 1}.json").write_text(json.dumps(dead_snapshot), encoding="utf-8")
+    (tmp_path / "metrics-1.json").write_text(json.dumps(dead_snapshot), encoding="utf-8")
+
+    text = render_prometheus(MultiprocessExporter(registry, str(tmp_path), flush_interval_seconds=5).collect())
+    assert 't_requests_total{route="/api/x"} 3' in text
+    assert 't_latency_seconds_bucket{le="0.1"} 3' in text
+    assert 't_latency_seconds_bucket{le="+Inf"} 6' in text
+    assert "t_latency_seconds_count 6" in text
+    assert "t_in_flight 2" in text
+    assert "t_queue 3" in text
+    assert "# TYPE t_latency_seconds histogram" in text
+
+
+def test_metrics_exporter_absorbs_and_deletes_exited_worker_snapshots(tmp_path):
+    from app.core.metrics import MetricsRegistry, MultiprocessExporter, render_prometheus
+
+    registry = MetricsRegistry()
+    requests_total = registry.counter("t_requests_total", "Requests.", ("route",))
+    latency = registry.histogram("t_latency_seconds", "Latency.", buckets=(0.1, 1.0))
+    in_flight = registry.gauge("t_in_flight", "In flight.")
+    requests_total.inc(route="/api/x")
+    latency.observe(0.5)
+    in_flight.inc()
+    dead_snapshot = registry.snapshot()
+    for pid in (2**22 + 1, 2**22 + 2):
+        (tmp_path / f"metrics-{pid}.json").write_text(json.dumps(dead_snapshot), encoding="utf-8")
+
+    exporter = MultiprocessExporter(registry, str(tmp_path), flush_interval_seconds=5)
+    assert exporter.absorb_exited_workers() == 2
+    assert sorted(path.name for path in tmp_path.iterdir()) == [f"metrics-{os.getpid()}.json"]
+
+    requests_total.inc(route="/api/x")
+    for _ in range(2):
+        text = render_prometheus(exporter.collect())
+        assert 't_requests_total{route="/api/x"} 4' in text
+        assert 't_latency_seconds_bucket{le="+Inf"} 3' in text
+        assert "t_in_flight 1" in text
+    assert exporter.absorb_exited_workers() == 0
+
+
+def test_async_database_url_maps_sync_drivers_to_async_ones():
+    from app.db.async_session import async_database_url
+
+    assert async_database_url("postgresql://u:p@db/app") == "postgresql+psycopg://u:p@db/app"
+    assert async_database_url("postgresql+psycopg://u:p@db/app") == "postgresql+psycopg://u:p@db/app"
+    assert async_database_url("postgresql+asyncpg://u:p@db/app") == "postgresql+asyncpg://u:p@db/app"
+    assert async_database_url("sqlite:///./app.db") == "sqlite+aiosqlite:///./app.db"
+
+
+_ASYNC_READ_ROUTES = (
+    ("/api/transactions", transactions_router.list_transactions_async),
+    ("/api/bills/monthly-status", bills_router.get_monthly_status_async),
+    ("/api/analytics/by-month", analytics_router.analytics_by_month_async),
+    ("/api/analytics/by-category", analytics_router.analytics_by_category_async),
+    ("/api/analytics/income", analytics_router.analytics_income_async),
+    ("/api/analytics/impulse-summary", analytics_router.analytics_impulse_summary_async),
+)
+
+
+def _async_read_routes_app() -> FastAPI:
+    """The read routes as ``DB_ASYNC_ENABLED=true`` registers them (the flag is read at import time)."""
+
+    @asynccontextmanager
+    async def lifespan(_app: FastAPI):
+        yield
+        await dispose_async_engine()
+
+    async_app = FastAPI(lifespan=lifespan)
+    register_exception_handlers(async_app)
+    for path, endpoint in _ASYNC_READ_ROUTES:
+        async_app.get(path)(endpoint)
+    return async_app
+
+
+def test_async_read_routes_match_sync_payloads_and_304s():
+    from app.main import app
+
+    vendor = "application/vnd.bebudget.v1+json"
+    with TestClient(app) as sync_client, TestClient(_async_read_routes_app()) as async_client:
+        registered = sync_client.post(
+            "/api/auth/register",
+            json={"username": "async_parity", "password": "StrongPwd123!", "currency_code": "USD"},
+            headers={"accept": vendor, "content-type": vendor},
+        )
+        headers = {"accept": vendor, "content-type": vendor, "authorization": f"Bearer {registered.json()['access_token']}"}
+        account_id = sync_client.post(
+            "/api/accounts", json={"name": "wallet", "type": "cash", "initial_balance_cents": 5000}, headers=headers
+        ).json()["id"]
+        category_id = sync_client.post("/api/categories", json={"name": "food", "type": "expense"}, headers=headers).json()[
+            "id"
+        ]
+        for day, amount, impulse in (("2026-03-02", 1200, True), ("2026-03-09", 800, False)):
+            created = sync_client.post(
+                "/api/transactions",
+                json={
+                    "type": "expense",
+                    "account_id": account_id,
+                    "category_id": category_id,
+                    "amount_cents": amount,
+                    "date": day,
+                    "is_impulse": impulse,
+                },
+                headers=headers,
+            )
+            assert created.status_code == 201
+        bill = sync_client.post(
+            "/api/bills",
+            json={"name": "rent", "category_id": category_id, "account_id": account_id, "budget_cents": 90000, "due_day": 5},
+            headers=headers,
+        )
+        assert bill.status_code == 201
+
+        range_query = "from=2026-03-01&to=2026-03-31"
+        urls = [
+            "/api/transactions?limit=1",
+            "/api/bills/monthly-status?month=2026-03",
+            f"/api/analytics/by-month?{range_query}",
+            f"/api/analytics/by-category?{range_query}",
+            f"/api/analytics/income?{range_query}",
+            f"/api/analytics/impulse-summary?{range_query}",
+        ]
+        for url in urls:
+            expected = sync_client.get(url, headers=headers)
+            actual = async_client.get(url, headers=headers)
+            assert expected.status_code == actual.status_code == 200, url
+            assert actual.json() == expected.json(), url
+            assert actual.headers.get("etag") == expected.headers.get("etag"), url
+            if expected.headers.get("etag"):
+                repeat = async_client.get(url, headers={**headers, "if-none-match": expected.headers["etag"]})
+                assert repeat.status_code == 304, url
+                assert repeat.content == b""
+
+        cursor = sync_client.get("/api/transactions?limit=1", headers=headers).json()["next_cursor"]
+        second_page = f"/api/transactions?limit=1&cursor={cursor}"
+        assert async_client.get(second_page, headers=headers).json() == sync_client.get(second_page, headers=headers).json()
+
+
 def test_settings_rejects_invalid_rate_limit_trusted_proxies(monkeypatch):
     _set_minimum_config_env(monkeypatch)
     monkeypatch.setenv("RATE_LIMIT_TRUSTED_PROXIES", "not-a-cidr")
@@ -577,6 +1012,57 @@ def test_in_memory_rate_limiter_expired_bucket_adopts_new_window_on_reset():
     assert state.count == 1
 
 
+def test_striped_rate_limiter_slides_window_locks_and_expires_via_timing_wheel():
+    clock = {"now": 0.0}
+    limiter = StripedSlidingWindowRateLimiter(stripes=4, wheel_slots=8, now_fn=lambda: clock["now"])
+
+    assert [limiter.check("user", limit=2, window_seconds=60)[0] for _ in range(3)] == [True, True, False]
+
+    # A quarter into the next window the previous two requests still weigh 1.5,
+    # and room for another request opens once that share decays below 1.0.
+    clock["now"] = 75.0
+    assert limiter.check("user", limit=2, window_seconds=60) == (True, None)
+    assert limiter.check("user", limit=2, window_seconds=60) == (False, 15)
+
+    assert limiter.check("locked", limit=1, window_seconds=60, lock_seconds=300) == (True, None)
+    assert limiter.check("locked", limit=1, window_seconds=60, lock_seconds=300) == (False, 300)
+    clock["now"] = 200.0
+    assert limiter.check("locked", limit=1, window_seconds=60, lock_seconds=300) == (False, 175)
+
+    # "user" expires at t=180 and is dropped once the wheel passes that tick; "locked" is held until t=375.
+    clock["now"] = 250.0
+    limiter.check("other", limit=5, window_seconds=60)
+    assert len(limiter) == 2
+    clock["now"] = 400.0
+    limiter.check("other", limit=5, window_seconds=60)
+    assert len(limiter) == 1
+
+
+def test_sql_rate_limiter_shares_sliding_window_across_instances():
+    from app.core.rate_limit_sql import SQLSlidingWindowRateLimiter
+    from app.models import RateLimitBucket
+
+    clock = {"now": 600.0}
+    first = SQLSlidingWindowRateLimiter(now_fn=lambda: clock["now"])
+    second = SQLSlidingWindowRateLimiter(now_fn=lambda: clock["now"])
+
+    assert first.check("login:alice", limit=2, window_seconds=60) == (True, None)
+    assert second.check("login:alice", limit=2, window_seconds=60) == (True, None)
+    assert first.check("login:alice", limit=2, window_seconds=60, lock_seconds=120) == (False, 120)
+    clock["now"] = 700.0
+    assert second.check("login:alice", limit=2, window_seconds=60) == (False, 20)
+
+    clock["now"] = 780.0
+    assert second.check("login:alice", limit=2, window_seconds=60) == (True, None)
+    with SessionLocal() as db:
+        row = db.scalar(select(RateLimitBucket))
+        assert "alice" not in row.key
+        assert (row.previous_count, row.current_count) == (0, 1)
+
+    clock["now"] = 2000.0
+    assert first.purge_expired() == 1
+
+
 def test_settings_rejects_invalid_db_pool_recycle_seconds(monkeypatch):
     _set_minimum_config_env(monkeypatch)
     monkeypatch.setenv("DB_POOL_RECYCLE_SECONDS", "0")
@@ -1301,6 +1787,37 @@ def test_transactions_csv_stream_escapes_formula_cells_and_keeps_header():
     assert lines[1].strip().endswith(",happy,true")
 
 
+def test_transactions_csv_stream_batches_rows_and_gzip_round_trips():
+    class _Tx:
+        def __init__(self, day: int):
+            self.date = date(2026, 1, day)
+            self.type = "income"
+            self.amount_cents = 100 * day
+            self.merchant = None
+            self.note = f"note-{day}"
+            self.mood = None
+            self.is_impulse = None
+
+    rows = [(_Tx(day), "acct", "cat") for day in range(1, 21)]
+    chunks = list(csv_stream(rows, chunk_chars=100))
+    assert chunks[0] == "date,type,account,category,amount_cents,merchant,note,mood,is_impulse\n"
+    assert 2 < len(chunks) < 21
+    text = "".join(chunks)
+    assert text.count("\n") == 21
+    assert "2026-01-20,income,acct,cat,2000,,note-20,," in text
+
+    assert gzip.decompress(b"".join(gzip_stream(chunks))).decode("utf-8") == text
+    assert accepts_gzip("gzip, deflate, br") is True
+    assert accepts_gzip("br;q=1.0, gzip;q=0.5") is True
+    assert accepts_gzip("gzip;q=0, identity") is False
+    assert accepts_gzip("identity") is False
+    assert accepts_gzip("*;q=0, gzip") is True
+    assert accepts_gzip("*, gzip;q=0") is False
+    assert accepts_gzip("br, *;q=0.1") is True
+    assert accepts_gzip("*;q=0") is False
+    assert accepts_gzip("gzip; Q=0.0") is False
+
+
 def test_transactions_pagination_build_page_and_invalid_cursor_shape(monkeypatch):
     class _Tx:
         def __init__(self, tx_id: str):
@@ -1371,3 +1888,53 @@ def test_import_job_manager_idempotency_conflict_on_payload_mismatch():
     assert exc.value.status == 409
 
 
+
+
+def test_import_job_manager_evicts_terminal_jobs_and_idempotency_keys_in_expiry_order():
+    clock = {"now": datetime(2026, 1, 1, tzinfo=UTC)}
+    manager = _ImportJobManager(
+        per_user_limit=10,
+        queue_limit=10,
+        worker_count=0,
+        terminal_ttl_seconds=60,
+        idempotency_ttl_seconds=30,
+        retained_terminal_cap=3,
+        now_fn=lambda: clock["now"],
+    )
+    job_ids = [f"00000000-0000-0000-0000-00000000000{index}" for index in range(5)]
+    for job_id in job_ids:
+        manager.register_stream_job(user_id="user-1", job_id=job_id)
+        manager.complete_stream_job(job_id, error_message="stopped")
+        clock["now"] += timedelta(seconds=1)
+
+    # The cap keeps the three most recently completed jobs.
+    assert [job_id for job_id in job_ids if job_id in manager._jobs] == job_ids[2:]
+    for _ in range(100):
+        assert manager.get_for_user(user_id="user-1", job_id=job_ids[4]) is not None
+    assert len(manager._terminal_heap) == 3
+
+    payload = TransactionImportRequest.model_validate(
+        {
+            "mode": "partial",
+            "items": [{"type": "expense", "account_id": "a", "category_id": "c", "amount_cents": 1, "date": "2026-01-10"}],
+        }
+    )
+    queued, _ = manager.submit(user_id="user-2", payload=payload, idempotency_key="key-1")
+    clock["now"] += timedelta(seconds=31)
+    assert manager.get_for_user(user_id="user-2", job_id=queued.job_id) is not None
+    assert manager._idempotency == {}
+
+    clock["now"] += timedelta(seconds=60)
+    assert manager.get_for_user(user_id="user-1", job_id=job_ids[4]) is None
+    assert manager._terminal_ids == set()
+    assert queued.job_id in manager._jobs
+
+
+@pytest.mark.parametrize("granularity", ["day", "week", "month"])
+def test_history_bucket_count_matches_history_buckets(granularity):
+    from_values = [date(2025, 12, 29), date(2026, 1, 1), date(2026, 1, 31), date(2026, 2, 28)]
+    to_values = [date(2026, 1, 1), date(2026, 1, 4), date(2026, 3, 1), date(2027, 1, 10)]
+    for from_ in from_values:
+        for to in to_values:
+            assert history_bucket_count(from_, to, granularity) == len(history_buckets(from_, to, granularity))
+    assert history_bucket_count(date(1, 1, 1), date(2026, 1, 1), granularity) > 1000
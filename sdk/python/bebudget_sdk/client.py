@@ -1,7 +1,7 @@
 """AUTO-GENERATED FILE. DO NOT EDIT.
 source: backend/openapi.yaml
 generator: bebudget-py-sdkgen@1.0.0
-spec_sha256: a8222dc57383f30508cb423e46f3761802b63c9b8b9ce009281fcdad55f15f2f
+spec_sha256: 1f32757e27c9be0e77987fd7bc3021947147c81d4005b80d9268dbfec8a5c568
 """
 
 from __future__ import annotations
@@ -56,6 +56,9 @@ class BeBudgetClient:
     def postAccounts(self, path: str = '/accounts', body: Any = None, headers: Mapping[str, str] | None = None) -> tuple[int, bytes]:
         return self._request('POST', path, body=body, headers=headers)
 
+    def getAccountsBalances(self, path: str = '/accounts/balances', body: Any = None, headers: Mapping[str, str] | None = None) -> tuple[int, bytes]:
+        return self._request('GET', path, body=body, headers=headers)
+
     def getAccountsAccountId(self, path: str = '/accounts/{account_id}', body: Any = None, headers: Mapping[str, str] | None = None) -> tuple[int, bytes]:
         return self._request('GET', path, body=body, headers=headers)
 
@@ -65,6 +68,9 @@ class BeBudgetClient:
     def deleteAccountsAccountId(self, path: str = '/accounts/{account_id}', body: Any = None, headers: Mapping[str, str] | None = None) -> tuple[int, bytes]:
         return self._request('DELETE', path, body=body, headers=headers)
 
+    def getAccountsAccountIdBalanceHistory(self, path: str = '/accounts/{account_id}/balance-history', body: Any = None, headers: Mapping[str, str] | None = None) -> tuple[int, bytes]:
+        return self._request('GET', path, body=body, headers=headers)
+
     def getCategories(self, path: str = '/categories', body: Any = None, headers: Mapping[str, str] | None = None) -> tuple[int, bytes]:
         return self._request('GET', path, body=body, headers=headers)
 
@@ -104,9 +110,30 @@ class BeBudgetClient:
     def postTransactionsImport(self, path: str = '/transactions/import', body: Any = None, headers: Mapping[str, str] | None = None) -> tuple[int, bytes]:
         return self._request('POST', path, body=body, headers=headers)
 
+    def getTransactionsImportJobsJobId(self, path: str = '/transactions/import/jobs/{job_id}', body: Any = None, headers: Mapping[str, str] | None = None) -> tuple[int, bytes]:
+        return self._request('GET', path, body=body, headers=headers)
+
+    def getTransactionsImportJobsJobIdEvents(self, path: str = '/transactions/import/jobs/{job_id}/events', body: Any = None, headers: Mapping[str, str] | None = None) -> tuple[int, bytes]:
+        return self._request('GET', path, body=body, headers=headers)
+
+    def postTransactionsImportJobsJobIdStream(self, path: str = '/transactions/import/jobs/{job_id}/stream', body: Any = None, headers: Mapping[str, str] | None = None) -> tuple[int, bytes]:
+        return self._request('POST', path, body=body, headers=headers)
+
+    def postTransactionsBatch(self, path: str = '/transactions/batch', body: Any = None, headers: Mapping[str, str] | None = None) -> tuple[int, bytes]:
+        return self._request('POST', path, body=body, headers=headers)
+
+    def postTransactionsRecategorize(self, path: str = '/transactions/recategorize', body: Any = None, headers: Mapping[str, str] | None = None) -> tuple[int, bytes]:
+        return self._request('POST', path, body=body, headers=headers)
+
     def getTransactionsExport(self, path: str = '/transactions/export', body: Any = None, headers: Mapping[str, str] | None = None) -> tuple[int, bytes]:
         return self._request('GET', path, body=body, headers=headers)
 
+    def getTransactionsBulk(self, path: str = '/transactions/bulk', body: Any = None, headers: Mapping[str, str] | None = None) -> tuple[int, bytes]:
+        return self._request('GET', path, body=body, headers=headers)
+
+    def getTransactionsChanges(self, path: str = '/transactions/changes', body: Any = None, headers: Mapping[str, str] | None = None) -> tuple[int, bytes]:
+        return self._request('GET', path, body=body, headers=headers)
+
     def getTransactionsTransactionId(self, path: str = '/transactions/{transaction_id}', body: Any = None, headers: Mapping[str, str] | None = None) -> tuple[int, bytes]:
         return self._request('GET', path, body=body, headers=headers)
 
@@ -205,3 +232,6 @@ class BeBudgetClient:
 
     def getAnalyticsByCategory(self, path: str = '/analytics/by-category', body: Any = None, headers: Mapping[str, str] | None = None) -> tuple[int, bytes]:
         return self._request('GET', path, body=body, headers=headers)
+
+    def getDashboard(self, path: str = '/dashboard', body: Any = None, headers: Mapping[str, str] | None = None) -> tuple[int, bytes]:
+        return self._request('GET', path, body=body, headers=headers)
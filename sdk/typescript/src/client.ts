@@ -1,7 +1,7 @@
 /* AUTO-GENERATED FILE. DO NOT EDIT.
  * source: backend/openapi.yaml
  * generator: bebudget-ts-sdkgen@1.0.0
- * spec_sha256: a8222dc57383f30508cb423e46f3761802b63c9b8b9ce009281fcdad55f15f2f
+ * spec_sha256: 1f32757e27c9be0e77987fd7bc3021947147c81d4005b80d9268dbfec8a5c568
  */
 
 export type HttpMethod = 'GET' | 'POST' | 'PATCH' | 'DELETE';
@@ -70,6 +70,10 @@ export class BeBudgetClient {
     return this.request('POST', path, body, headers);
   }
 
+  async getAccountsBalances(path: string = '/accounts/balances', body?: JsonValue, headers?: Record<string, string>): Promise<Response> {
+    return this.request('GET', path, body, headers);
+  }
+
   async getAccountsAccountId(path: string = '/accounts/{account_id}', body?: JsonValue, headers?: Record<string, string>): Promise<Response> {
     return this.request('GET', path, body, headers);
   }
@@ -82,6 +86,10 @@ export class BeBudgetClient {
     return this.request('DELETE', path, body, headers);
   }
 
+  async getAccountsAccountIdBalanceHistory(path: string = '/accounts/{account_id}/balance-history', body?: JsonValue, headers?: Record<string, string>): Promise<Response> {
+    return this.request('GET', path, body, headers);
+  }
+
   async getCategories(path: string = '/categories', body?: JsonValue, headers?: Record<string, string>): Promise<Response> {
     return this.request('GET', path, body, headers);
   }
@@ -134,10 +142,38 @@ export class BeBudgetClient {
     return this.request('POST', path, body, headers);
   }
 
+  async getTransactionsImportJobsJobId(path: string = '/transactions/import/jobs/{job_id}', body?: JsonValue, headers?: Record<string, string>): Promise<Response> {
+    return this.request('GET', path, body, headers);
+  }
+
+  async getTransactionsImportJobsJobIdEvents(path: string = '/transactions/import/jobs/{job_id}/events', body?: JsonValue, headers?: Record<string, string>): Promise<Response> {
+    return this.request('GET', path, body, headers);
+  }
+
+  async postTransactionsImportJobsJobIdStream(path: string = '/transactions/import/jobs/{job_id}/stream', body?: JsonValue, headers?: Record<string, string>): Promise<Response> {
+    return this.request('POST', path, body, headers);
+  }
+
+  async postTransactionsBatch(path: string = '/transactions/batch', body?: JsonValue, headers?: Record<string, string>): Promise<Response> {
+    return this.request('POST', path, body, headers);
+  }
+
+  async postTransactionsRecategorize(path: string = '/transactions/recategorize', body?: JsonValue, headers?: Record<string, string>): Promise<Response> {
+    return this.request('POST', path, body, headers);
+  }
+
   async getTransactionsExport(path: string = '/transactions/export', body?: JsonValue, headers?: Record<string, string>): Promise<Response> {
     return this.request('GET', path, body, headers);
   }
 
+  async getTransactionsBulk(path: string = '/transactions/bulk', body?: JsonValue, headers?: Record<string, string>): Promise<Response> {
+    return this.request('GET', path, body, headers);
+  }
+
+  async getTransactionsChanges(path: string = '/transactions/changes', body?: JsonValue, headers?: Record<string, string>): Promise<Response> {
+    return this.request('GET', path, body, headers);
+  }
+
   async getTransactionsTransactionId(path: string = '/transactions/{transaction_id}', body?: JsonValue, headers?: Record<string, string>): Promise<Response> {
     return this.request('GET', path, body, headers);
   }
@@ -270,4 +306,8 @@ export class BeBudgetClient {
     return this.request('GET', path, body, headers);
   }
 
+  async getDashboard(path: string = '/dashboard', body?: JsonValue, headers?: Record<string, string>): Promise<Response> {
+    return this.request('GET', path, body, headers);
+  }
+
 }
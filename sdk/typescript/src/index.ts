@@ -1,3 +1,3 @@
 /* AUTO-GENERATED FILE. DO NOT EDIT. */
-export const SPEC_SHA256 = 'a8222dc57383f30508cb423e46f3761802b63c9b8b9ce009281fcdad55f15f2f';
+export const SPEC_SHA256 = '1f32757e27c9be0e77987fd7bc3021947147c81d4005b80d9268dbfec8a5c568';
 export * from './client';
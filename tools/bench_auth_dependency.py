@@ -0,0 +1,71 @@
+"""Microbenchmark for the authenticated-request dependency.
+
+Calls ``get_current_user`` in a tight loop against a throwaway SQLite database
+and reports calls per second with the verified-token cache disabled and
+enabled (the user cache stays off so only token verification changes).
+
+Usage (from the repository root):
+    python tools/bench_auth_dependency.py [--iterations=20000]
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parents[1] / "backend"
+
+
+def _parse_iterations(argv: list[str]) -> int:
+    for arg in argv:
+        if arg.startswith("--iterations="):
+            return max(1, int(arg.split("=", 1)[1]))
+    return 20000
+
+
+def main() -> int:
+    iterations = _parse_iterations(sys.argv[1:])
+    db_dir = tempfile.mkdtemp(prefix="bebudget-bench-")
+    os.environ.setdefault("DATABASE_URL", f"sqlite:///{Path(db_dir) / 'bench.db'}")
+    os.environ.setdefault("JWT_SECRET", "bench-secret-value-0123456789abcdef")
+    os.environ["AUTH_USER_CACHE_ENABLED"] = "false"
+    sys.path.insert(0, str(BACKEND_DIR))
+
+    from starlette.requests import Request
+
+    from app.core import security
+    from app.db import Base, SessionLocal, engine
+    from app.dependencies import get_current_user
+    from app.models import User
+
+    Base.metadata.create_all(bind=engine)
+    with SessionLocal() as db:
+        user = User(username="bench_user", password_hash="x", currency_code="USD")
+        db.add(user)
+        db.commit()
+        authorization = f"Bearer {security.create_access_token(user.id)}"
+
+    def _run(label: str, cache_entries: int) -> float:
+        security._VERIFIED_TOKENS = security._VerifiedTokenCache(cache_entries)
+        request = Request({"type": "http", "method": "GET", "path": "/api/me", "headers": []})
+        with SessionLocal() as db:
+            get_current_user(request=request, authorization=authorization, db=db)
+            started = time.perf_counter()
+            for _ in range(iterations):
+                get_current_user(request=request, authorization=authorization, db=db)
+            elapsed = time.perf_counter() - started
+        rate = iterations / elapsed
+        print(f"bench-auth-dependency mode={label} iterations={iterations} calls_per_second={rate:,.0f}")
+        return rate
+
+    before = _run("token_cache_off", 0)
+    after = _run("token_cache_on", 4096)
+    print(f"bench-auth-dependency speedup={after / before:.2f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -6,6 +6,7 @@ import yaml
 
 SPEC_PATH = Path("backend/openapi.yaml")
 SUCCESS_MEDIA = "application/vnd.bebudget.v1+json"
+STREAM_MEDIA = ("text/csv", "text/event-stream")
 PROBLEM_MEDIA = "application/problem+json"
 CANONICAL_ERROR_STATUSES = {"400", "401", "403", "406", "409", "429"}
 
@@ -49,7 +50,9 @@ def _validate_operations(spec: dict) -> list[str]:
                 content = response.get("content", {})
 
                 if code_s.startswith("2"):
-                    media = content.get(SUCCESS_MEDIA) or content.get("text/csv")
+                    media = content.get(SUCCESS_MEDIA) or next(
+                        (content[media_type] for media_type in STREAM_MEDIA if media_type in content), None
+                    )
                     if isinstance(media, dict) and _has_example(media, components):
                         success_has_example = True
 